@@ -0,0 +1,158 @@
+-- ============================================================
+-- Migration Script: Incremental (delta) ratings import
+-- Adds a high-water mark table for 2_import_data.py --delta,
+-- a per-movie rating summary table, and the stored procedures
+-- that apply a delta batch and refresh only the affected movies.
+-- ============================================================
+
+USE movies_db;
+
+-- ============================================================
+-- Table: IMPORT_STATE
+-- One row per imported feed (e.g. 'ratings').
+-- max_timestamp  : newest rating timestamp loaded so far
+-- byte_offset    : end of the last complete line that was loaded
+-- prefix_sha256  : checksum of the file up to byte_offset, used to
+--                  detect an append-only file so only the tail is parsed
+-- (also created by 1_create_schema.sql for new databases)
+-- ============================================================
+CREATE TABLE IF NOT EXISTS IMPORT_STATE (
+    source VARCHAR(50) PRIMARY KEY,
+    max_timestamp BIGINT NOT NULL DEFAULT 0,
+    byte_offset BIGINT NOT NULL DEFAULT 0,
+    prefix_sha256 CHAR(64) NOT NULL,
+    rows_loaded BIGINT NOT NULL DEFAULT 0,
+    imported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB;
+
+-- ============================================================
+-- Table: MOVIE_RATING_STATS
+-- Per-movie rating aggregates (summary source).
+-- Rebuilt in full after a full import, refreshed per affected
+-- movie after a delta import.
+-- ============================================================
+CREATE TABLE IF NOT EXISTS MOVIE_RATING_STATS (
+    movieId INT PRIMARY KEY,
+    rating_count INT NOT NULL DEFAULT 0,
+    rating_sum DECIMAL(12,1) NOT NULL DEFAULT 0,
+    avg_rating DECIMAL(4,2),
+    min_rating DECIMAL(2,1),
+    max_rating DECIMAL(2,1),
+    updated_at BIGINT NOT NULL,
+    FOREIGN KEY (movieId) REFERENCES MOVIES(movieId)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE
+) ENGINE=InnoDB;
+
+-- The delta procedure joins staging rows back to RATINGS by (userId, movieId)
+ALTER TABLE ratings_staging ADD INDEX IF NOT EXISTS idx_staging_user_movie (userId, movieId);
+
+DELIMITER //
+
+-- ============================================================
+-- Stored Procedure: rebuild_movie_rating_stats
+-- Full rebuild of MOVIE_RATING_STATS from RATINGS
+-- ============================================================
+DROP PROCEDURE IF EXISTS rebuild_movie_rating_stats //
+
+CREATE PROCEDURE rebuild_movie_rating_stats()
+BEGIN
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'Error rebuilding movie rating stats';
+    END;
+
+    START TRANSACTION;
+
+    DELETE FROM MOVIE_RATING_STATS;
+
+    INSERT INTO MOVIE_RATING_STATS
+        (movieId, rating_count, rating_sum, avg_rating, min_rating, max_rating, updated_at)
+    SELECT movieId, COUNT(*), SUM(rating), ROUND(AVG(rating), 2), MIN(rating), MAX(rating),
+           UNIX_TIMESTAMP()
+    FROM RATINGS
+    GROUP BY movieId;
+
+    COMMIT;
+END //
+
+-- ============================================================
+-- Stored Procedure: load_ratings_delta
+-- Applies the rows currently in ratings_staging as a delta:
+--   1. drops staged rows already in RATINGS unchanged, and rows
+--      older than the rating RATINGS holds for that (userId, movieId)
+--   2. creates any new users
+--   3. a staged rating replaces the older (or same-time, different
+--      value) rating for the same (userId, movieId)
+--   4. inserts the new ratings
+--   5. refreshes MOVIE_RATING_STATS for the affected movies only
+-- Returns one row: unchanged / superseded staged rows it skipped.
+-- After a rewritten file every row is staged, so step 1 is what
+-- keeps the work down to the rows that actually differ.
+-- ============================================================
+DROP PROCEDURE IF EXISTS load_ratings_delta //
+
+CREATE PROCEDURE load_ratings_delta()
+BEGIN
+    DECLARE v_unchanged INT DEFAULT 0;
+    DECLARE v_superseded INT DEFAULT 0;
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'Error loading ratings delta from staging';
+    END;
+
+    START TRANSACTION;
+
+    DELETE s
+    FROM ratings_staging s
+    INNER JOIN RATINGS r
+        ON r.userId = s.userId AND r.movieId = s.movieId
+    WHERE r.timestamp = s.timestamp AND r.rating = s.rating;
+    SET v_unchanged = ROW_COUNT();
+
+    DELETE s
+    FROM ratings_staging s
+    INNER JOIN RATINGS r
+        ON r.userId = s.userId AND r.movieId = s.movieId
+    WHERE r.timestamp > s.timestamp;
+    SET v_superseded = ROW_COUNT();
+
+    INSERT IGNORE INTO USERS (userId)
+    SELECT DISTINCT userId FROM ratings_staging;
+
+    DELETE r
+    FROM RATINGS r
+    INNER JOIN ratings_staging s
+        ON r.userId = s.userId AND r.movieId = s.movieId
+    WHERE r.timestamp <= s.timestamp;
+
+    INSERT IGNORE INTO RATINGS (userId, movieId, rating, timestamp)
+    SELECT s.userId, s.movieId, s.rating, s.timestamp
+    FROM ratings_staging s
+    WHERE s.rating BETWEEN 0.5 AND 5.0
+      AND EXISTS (SELECT 1 FROM MOVIES m WHERE m.movieId = s.movieId);
+
+    REPLACE INTO MOVIE_RATING_STATS
+        (movieId, rating_count, rating_sum, avg_rating, min_rating, max_rating, updated_at)
+    SELECT r.movieId, COUNT(*), SUM(r.rating), ROUND(AVG(r.rating), 2), MIN(r.rating), MAX(r.rating),
+           UNIX_TIMESTAMP()
+    FROM RATINGS r
+    WHERE r.movieId IN (SELECT DISTINCT movieId FROM ratings_staging)
+    GROUP BY r.movieId;
+
+    COMMIT;
+
+    SELECT v_unchanged AS unchanged, v_superseded AS superseded;
+END //
+
+DELIMITER ;
+
+-- Initial fill of the summary table
+CALL rebuild_movie_rating_stats();
+
+SELECT 'Delta import support added' AS Status;
+SELECT COUNT(*) AS movies_with_stats FROM MOVIE_RATING_STATS;
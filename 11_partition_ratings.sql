@@ -0,0 +1,349 @@
+-- ============================================================
+-- Migration Script: Time-partitioned RATINGS
+-- Range-partitions RATINGS by timestamp so queries on recent
+-- activity (ORDER BY timestamp DESC, WHERE timestamp >= ...)
+-- only touch the newest partitions.
+--
+-- Layout (boundaries in UTC):
+--   pY<year>     one partition per past year (history)
+--   pM<yyyymm>   one partition per month of the current year,
+--                plus a few months ahead
+--   pmax         catch-all (VALUES LESS THAN MAXVALUE)
+--
+-- InnoDB does not allow foreign keys on partitioned tables, so
+-- the two RATINGS foreign keys are replaced by triggers with the
+-- same behaviour (reject unknown movie/user, cascade delete and
+-- update from MOVIES/USERS). Like real foreign keys, the triggers
+-- are skipped while FOREIGN_KEY_CHECKS = 0.
+--
+-- Safe to run again: partitioning is only applied once, and the
+-- maintenance procedures only add or merge what is missing.
+-- ============================================================
+
+USE movies_db;
+
+DELIMITER //
+
+-- ============================================================
+-- Stored Procedure: drop_ratings_foreign_keys
+-- Drops whatever foreign keys RATINGS still has (names differ
+-- between installs, e.g. ratings_ibfk_1)
+-- ============================================================
+DROP PROCEDURE IF EXISTS drop_ratings_foreign_keys //
+
+CREATE PROCEDURE drop_ratings_foreign_keys()
+BEGIN
+    DECLARE v_done INT DEFAULT 0;
+    DECLARE v_name VARCHAR(64);
+    DECLARE fk_cursor CURSOR FOR
+        SELECT CONSTRAINT_NAME
+        FROM information_schema.REFERENTIAL_CONSTRAINTS
+        WHERE CONSTRAINT_SCHEMA = DATABASE()
+          AND TABLE_NAME = 'RATINGS';
+    DECLARE CONTINUE HANDLER FOR NOT FOUND SET v_done = 1;
+
+    OPEN fk_cursor;
+    fk_loop: LOOP
+        FETCH fk_cursor INTO v_name;
+        IF v_done THEN
+            LEAVE fk_loop;
+        END IF;
+        SET @ddl = CONCAT('ALTER TABLE RATINGS DROP FOREIGN KEY `', v_name, '`');
+        PREPARE stmt FROM @ddl;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+    END LOOP;
+    CLOSE fk_cursor;
+END //
+
+-- ============================================================
+-- Stored Procedure: partition_ratings_table
+-- One-time conversion of RATINGS to range partitions.
+-- months_ahead: empty monthly partitions created past the
+-- current month (new ratings land there, not in pmax)
+-- ============================================================
+DROP PROCEDURE IF EXISTS partition_ratings_table //
+
+CREATE PROCEDURE partition_ratings_table(IN months_ahead INT)
+proc: BEGIN
+    DECLARE v_tz VARCHAR(64);
+    DECLARE v_year INT;
+    DECLARE v_month DATE;
+    DECLARE v_last_month DATE;
+    DECLARE v_parts TEXT DEFAULT '';
+
+    IF EXISTS (
+        SELECT 1 FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE()
+          AND TABLE_NAME = 'RATINGS'
+          AND PARTITION_NAME IS NOT NULL
+    ) THEN
+        LEAVE proc;
+    END IF;
+
+    SET v_tz = @@session.time_zone;
+    SET time_zone = '+00:00';
+
+    -- Yearly partitions from the oldest rating up to last year
+    -- (anything older than the first boundary also lands in the first one)
+    SELECT GREATEST(COALESCE(YEAR(FROM_UNIXTIME(MIN(timestamp))), YEAR(UTC_DATE())), 1995)
+    INTO v_year
+    FROM RATINGS;
+
+    WHILE v_year < YEAR(UTC_DATE()) DO
+        SET v_parts = CONCAT(v_parts,
+            'PARTITION pY', v_year,
+            ' VALUES LESS THAN (', UNIX_TIMESTAMP(CONCAT(v_year + 1, '-01-01')), '), ');
+        SET v_year = v_year + 1;
+    END WHILE;
+
+    -- Monthly partitions for this year and months_ahead months past now
+    SET v_month = MAKEDATE(YEAR(UTC_DATE()), 1);
+    SET v_last_month = DATE_ADD(DATE_FORMAT(UTC_DATE(), '%Y-%m-01'), INTERVAL months_ahead MONTH);
+    WHILE v_month <= v_last_month DO
+        SET v_parts = CONCAT(v_parts,
+            'PARTITION pM', DATE_FORMAT(v_month, '%Y%m'),
+            ' VALUES LESS THAN (', UNIX_TIMESTAMP(DATE_ADD(v_month, INTERVAL 1 MONTH)), '), ');
+        SET v_month = DATE_ADD(v_month, INTERVAL 1 MONTH);
+    END WHILE;
+
+    SET time_zone = v_tz;
+
+    SET @ddl = CONCAT('ALTER TABLE RATINGS PARTITION BY RANGE (timestamp) (',
+                      v_parts, 'PARTITION pmax VALUES LESS THAN MAXVALUE)');
+    PREPARE stmt FROM @ddl;
+    EXECUTE stmt;
+    DEALLOCATE PREPARE stmt;
+END //
+
+-- ============================================================
+-- Stored Procedure: add_ratings_partitions
+-- Splits new monthly partitions off pmax so there are always
+-- months_ahead empty months past the current one.
+-- ============================================================
+DROP PROCEDURE IF EXISTS add_ratings_partitions //
+
+CREATE PROCEDURE add_ratings_partitions(IN months_ahead INT)
+proc: BEGIN
+    DECLARE v_tz VARCHAR(64);
+    DECLARE v_last_bound BIGINT;
+    DECLARE v_month DATE;
+    DECLARE v_target BIGINT;
+    DECLARE v_parts TEXT DEFAULT '';
+
+    SELECT MAX(CAST(PARTITION_DESCRIPTION AS UNSIGNED))
+    INTO v_last_bound
+    FROM information_schema.PARTITIONS
+    WHERE TABLE_SCHEMA = DATABASE()
+      AND TABLE_NAME = 'RATINGS'
+      AND PARTITION_NAME IS NOT NULL
+      AND PARTITION_DESCRIPTION <> 'MAXVALUE';
+
+    IF v_last_bound IS NULL THEN
+        LEAVE proc;  -- not partitioned yet
+    END IF;
+
+    SET v_tz = @@session.time_zone;
+    SET time_zone = '+00:00';
+
+    -- Boundaries are always the first of a month (UTC)
+    SET v_month = DATE(FROM_UNIXTIME(v_last_bound));
+    SET v_target = UNIX_TIMESTAMP(
+        DATE_ADD(DATE_FORMAT(UTC_DATE(), '%Y-%m-01'), INTERVAL months_ahead + 1 MONTH));
+    WHILE UNIX_TIMESTAMP(v_month) < v_target DO
+        SET v_parts = CONCAT(v_parts,
+            'PARTITION pM', DATE_FORMAT(v_month, '%Y%m'),
+            ' VALUES LESS THAN (', UNIX_TIMESTAMP(DATE_ADD(v_month, INTERVAL 1 MONTH)), '), ');
+        SET v_month = DATE_ADD(v_month, INTERVAL 1 MONTH);
+    END WHILE;
+
+    SET time_zone = v_tz;
+
+    IF v_parts <> '' THEN
+        SET @ddl = CONCAT('ALTER TABLE RATINGS REORGANIZE PARTITION pmax INTO (',
+                          v_parts, 'PARTITION pmax VALUES LESS THAN MAXVALUE)');
+        PREPARE stmt FROM @ddl;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+    END IF;
+END //
+
+-- ============================================================
+-- Stored Procedure: rotate_ratings_partitions
+-- Merges monthly partitions older than keep_months into one
+-- yearly partition per year (pY<year>), so the partition count
+-- stays small while recent months stay individually prunable.
+-- ============================================================
+DROP PROCEDURE IF EXISTS rotate_ratings_partitions //
+
+CREATE PROCEDURE rotate_ratings_partitions(IN keep_months INT)
+BEGIN
+    DECLARE v_done INT DEFAULT 0;
+    DECLARE v_tz VARCHAR(64);
+    DECLARE v_cutoff BIGINT;
+    DECLARE v_year VARCHAR(4);
+    DECLARE v_names TEXT;
+    DECLARE v_bound BIGINT;
+    DECLARE year_cursor CURSOR FOR
+        SELECT SUBSTRING(PARTITION_NAME, 3, 4) AS part_year,
+               GROUP_CONCAT(PARTITION_NAME ORDER BY PARTITION_ORDINAL_POSITION) AS names,
+               MAX(CAST(PARTITION_DESCRIPTION AS UNSIGNED)) AS upper_bound
+        FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE()
+          AND TABLE_NAME = 'RATINGS'
+          AND PARTITION_NAME IS NOT NULL
+          AND PARTITION_DESCRIPTION <> 'MAXVALUE'
+          AND CAST(PARTITION_DESCRIPTION AS UNSIGNED) <= v_cutoff
+        GROUP BY part_year
+        HAVING SUM(PARTITION_NAME LIKE 'pM%') > 0;
+    DECLARE CONTINUE HANDLER FOR NOT FOUND SET v_done = 1;
+
+    SET v_tz = @@session.time_zone;
+    SET time_zone = '+00:00';
+    SET v_cutoff = UNIX_TIMESTAMP(
+        DATE_SUB(DATE_FORMAT(UTC_DATE(), '%Y-%m-01'), INTERVAL keep_months MONTH));
+    SET time_zone = v_tz;
+
+    OPEN year_cursor;
+    year_loop: LOOP
+        FETCH year_cursor INTO v_year, v_names, v_bound;
+        IF v_done THEN
+            LEAVE year_loop;
+        END IF;
+        -- The selected partitions of one year are adjacent, and an existing
+        -- pY<year> (from an earlier rotation) is part of the list
+        SET @ddl = CONCAT('ALTER TABLE RATINGS REORGANIZE PARTITION ', v_names,
+                          ' INTO (PARTITION pY', v_year, ' VALUES LESS THAN (', v_bound, '))');
+        PREPARE stmt FROM @ddl;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+    END LOOP;
+    CLOSE year_cursor;
+END //
+
+DELIMITER ;
+
+-- ============================================================
+-- Step 1: Replace the RATINGS foreign keys with triggers
+-- ============================================================
+CALL drop_ratings_foreign_keys();
+
+DROP TRIGGER IF EXISTS trg_ratings_check_insert;
+DROP TRIGGER IF EXISTS trg_ratings_check_update;
+DROP TRIGGER IF EXISTS trg_movies_ratings_delete;
+DROP TRIGGER IF EXISTS trg_movies_ratings_update;
+DROP TRIGGER IF EXISTS trg_users_ratings_delete;
+DROP TRIGGER IF EXISTS trg_users_ratings_update;
+
+DELIMITER //
+
+CREATE TRIGGER trg_ratings_check_insert
+BEFORE INSERT ON RATINGS
+FOR EACH ROW
+BEGIN
+    IF @@foreign_key_checks = 1 THEN
+        IF NOT EXISTS (SELECT 1 FROM MOVIES WHERE movieId = NEW.movieId) THEN
+            SIGNAL SQLSTATE '23000'
+            SET MYSQL_ERRNO = 1452,
+                MESSAGE_TEXT = 'Cannot add or update a child row: RATINGS.movieId has no matching MOVIES row';
+        END IF;
+        IF NEW.userId IS NOT NULL
+           AND NOT EXISTS (SELECT 1 FROM USERS WHERE userId = NEW.userId) THEN
+            SIGNAL SQLSTATE '23000'
+            SET MYSQL_ERRNO = 1452,
+                MESSAGE_TEXT = 'Cannot add or update a child row: RATINGS.userId has no matching USERS row';
+        END IF;
+    END IF;
+END //
+
+CREATE TRIGGER trg_ratings_check_update
+BEFORE UPDATE ON RATINGS
+FOR EACH ROW
+BEGIN
+    IF @@foreign_key_checks = 1 THEN
+        IF NEW.movieId <> OLD.movieId
+           AND NOT EXISTS (SELECT 1 FROM MOVIES WHERE movieId = NEW.movieId) THEN
+            SIGNAL SQLSTATE '23000'
+            SET MYSQL_ERRNO = 1452,
+                MESSAGE_TEXT = 'Cannot add or update a child row: RATINGS.movieId has no matching MOVIES row';
+        END IF;
+        IF NEW.userId IS NOT NULL
+           AND NOT (NEW.userId <=> OLD.userId)
+           AND NOT EXISTS (SELECT 1 FROM USERS WHERE userId = NEW.userId) THEN
+            SIGNAL SQLSTATE '23000'
+            SET MYSQL_ERRNO = 1452,
+                MESSAGE_TEXT = 'Cannot add or update a child row: RATINGS.userId has no matching USERS row';
+        END IF;
+    END IF;
+END //
+
+-- ON DELETE CASCADE / ON UPDATE CASCADE from MOVIES
+CREATE TRIGGER trg_movies_ratings_delete
+AFTER DELETE ON MOVIES
+FOR EACH ROW
+BEGIN
+    IF @@foreign_key_checks = 1 THEN
+        DELETE FROM RATINGS WHERE movieId = OLD.movieId;
+    END IF;
+END //
+
+CREATE TRIGGER trg_movies_ratings_update
+AFTER UPDATE ON MOVIES
+FOR EACH ROW
+BEGIN
+    IF @@foreign_key_checks = 1 AND NEW.movieId <> OLD.movieId THEN
+        UPDATE RATINGS SET movieId = NEW.movieId WHERE movieId = OLD.movieId;
+    END IF;
+END //
+
+-- ON DELETE CASCADE / ON UPDATE CASCADE from USERS
+CREATE TRIGGER trg_users_ratings_delete
+AFTER DELETE ON USERS
+FOR EACH ROW
+BEGIN
+    IF @@foreign_key_checks = 1 THEN
+        DELETE FROM RATINGS WHERE userId = OLD.userId;
+    END IF;
+END //
+
+CREATE TRIGGER trg_users_ratings_update
+AFTER UPDATE ON USERS
+FOR EACH ROW
+BEGIN
+    IF @@foreign_key_checks = 1 AND NEW.userId <> OLD.userId THEN
+        UPDATE RATINGS SET userId = NEW.userId WHERE userId = OLD.userId;
+    END IF;
+END //
+
+DELIMITER ;
+
+-- ============================================================
+-- Step 2: Partition RATINGS (first run only) and keep the
+-- monthly partitions current
+-- ============================================================
+CALL partition_ratings_table(3);
+CALL add_ratings_partitions(3);
+CALL rotate_ratings_partitions(12);
+
+-- Daily maintenance (needs SET GLOBAL event_scheduler = ON;
+-- start.sh also re-runs this script on every start)
+DROP EVENT IF EXISTS ev_ratings_partition_maintenance;
+
+DELIMITER //
+
+CREATE EVENT ev_ratings_partition_maintenance
+ON SCHEDULE EVERY 1 DAY
+DO
+BEGIN
+    CALL add_ratings_partitions(3);
+    CALL rotate_ratings_partitions(12);
+END //
+
+DELIMITER ;
+
+SELECT 'RATINGS partitioned by timestamp' AS Status;
+SELECT PARTITION_NAME, PARTITION_DESCRIPTION, TABLE_ROWS
+FROM information_schema.PARTITIONS
+WHERE TABLE_SCHEMA = DATABASE()
+  AND TABLE_NAME = 'RATINGS'
+ORDER BY PARTITION_ORDINAL_POSITION;
@@ -0,0 +1,37 @@
+-- ============================================================
+-- Migration Script: Prune redundant RATINGS indexes
+-- Every secondary index on RATINGS is updated on each rating
+-- insert/update/delete, so copies of the same key only cost
+-- write throughput and buffer pool space.
+--
+--   idx_ratings_movie_rating_composite (movieId, rating)
+--       same key as idx_movieId_rating from 1_create_schema.sql
+--   idx_ratings_timestamp (timestamp)
+--       same key as idx_timestamp from 1_create_schema.sql
+--   idx_userId (userId)
+--       left prefix of idx_ratings_user_timestamp (userId, timestamp)
+--
+-- idx_username is not touched: 4_add_security_features.sql uses
+-- CREATE INDEX IF NOT EXISTS with the same name as the schema index,
+-- so only one copy exists.
+--
+-- Found with index_advisor.py; safe to run again.
+-- ============================================================
+
+USE movies_db;
+
+DROP INDEX IF EXISTS idx_ratings_movie_rating_composite ON RATINGS;
+DROP INDEX IF EXISTS idx_ratings_timestamp ON RATINGS;
+DROP INDEX IF EXISTS idx_userId ON RATINGS;
+
+-- Make sure the indexes that replace them are there
+CREATE INDEX IF NOT EXISTS idx_movieId_rating ON RATINGS(movieId, rating);
+CREATE INDEX IF NOT EXISTS idx_timestamp ON RATINGS(timestamp);
+CREATE INDEX IF NOT EXISTS idx_ratings_user_timestamp ON RATINGS(userId, timestamp, movieId, rating);
+
+ANALYZE TABLE RATINGS;
+
+SELECT INDEX_NAME, GROUP_CONCAT(COLUMN_NAME ORDER BY SEQ_IN_INDEX) AS columns
+FROM information_schema.STATISTICS
+WHERE TABLE_SCHEMA = 'movies_db' AND TABLE_NAME = 'RATINGS'
+GROUP BY INDEX_NAME;
@@ -0,0 +1,56 @@
+-- ============================================================
+-- Migration Script: Covering index for per-user rating history
+-- The profile tab lists a user's ratings newest first and counts
+-- their high/low ratings. Both read RATINGS by userId only, so
+-- an index on (userId, timestamp) that also carries movieId and
+-- rating answers them without touching the table rows.
+--
+-- idx_ratings_user_timestamp (userId, timestamp) from
+-- 3_create_indexes.sql is widened in place to
+-- (userId, timestamp, movieId, rating). Movie averages and vote
+-- counts come from MOVIE_RATING_STATS (10_delta_import.sql),
+-- which triggers on RATINGS keep current (19_rating_stats_triggers.sql).
+--
+-- Safe to run again: the index is only rebuilt while it is
+-- still the two-column version.
+-- ============================================================
+
+USE movies_db;
+
+DELIMITER //
+
+-- ============================================================
+-- Stored Procedure: widen_user_history_index
+-- ============================================================
+DROP PROCEDURE IF EXISTS widen_user_history_index //
+
+CREATE PROCEDURE widen_user_history_index()
+BEGIN
+    DECLARE v_columns INT DEFAULT 0;
+
+    SELECT COUNT(*) INTO v_columns
+    FROM information_schema.STATISTICS
+    WHERE TABLE_SCHEMA = DATABASE()
+      AND TABLE_NAME = 'RATINGS'
+      AND INDEX_NAME = 'idx_ratings_user_timestamp';
+
+    IF v_columns = 0 THEN
+        CREATE INDEX idx_ratings_user_timestamp
+        ON RATINGS(userId, timestamp, movieId, rating)
+        COMMENT 'Covers user rating history queries';
+    ELSEIF v_columns < 4 THEN
+        -- One ALTER so the table is never without a userId index
+        ALTER TABLE RATINGS
+            DROP INDEX idx_ratings_user_timestamp,
+            ADD INDEX idx_ratings_user_timestamp (userId, timestamp, movieId, rating)
+            COMMENT 'Covers user rating history queries';
+    END IF;
+END //
+
+DELIMITER ;
+
+CALL widen_user_history_index();
+
+ANALYZE TABLE RATINGS;
+
+SELECT 'User history index is covering' AS Status;
@@ -0,0 +1,81 @@
+-- ============================================================
+-- Migration Script: Indexed placeholder flag on MOVIES
+-- load_from_staging creates a "Movie_<id>" row for every link
+-- before import_movies fills in the real title. The app hid those
+-- rows with `title NOT LIKE 'Movie_%'`, which cannot use an index,
+-- is evaluated on every row, and also hid real titles such as
+-- "Movie 43". MOVIES.is_placeholder (indexed) replaces it:
+--   load_from_staging  sets it to 1 on the rows it creates
+--   import_movies      clears it when it sets the real title
+--   admin add / edit   insert 0, clear it when the title changes
+--
+-- Safe to run again: the column and index are only added once,
+-- and the backfill only touches rows still flagged wrong.
+-- ============================================================
+
+USE movies_db;
+
+ALTER TABLE MOVIES
+    ADD COLUMN IF NOT EXISTS is_placeholder TINYINT(1) NOT NULL DEFAULT 0 AFTER release_date,
+    ADD INDEX IF NOT EXISTS idx_movies_placeholder (is_placeholder);
+
+-- Backfill: a row is a placeholder while it still has the generated title
+UPDATE MOVIES
+SET is_placeholder = 1
+WHERE is_placeholder = 0
+  AND title = CONCAT('Movie_', movieId);
+
+DELIMITER //
+
+-- ============================================================
+-- Stored Procedure: load_from_staging
+-- Same as 1_create_schema.sql; redefined here so databases
+-- created before the flag existed mark new placeholder rows.
+-- ============================================================
+DROP PROCEDURE IF EXISTS load_from_staging //
+
+CREATE PROCEDURE load_from_staging()
+BEGIN
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        SIGNAL SQLSTATE '45000' 
+        SET MESSAGE_TEXT = 'Error loading data from staging tables';
+    END;
+    
+    START TRANSACTION;
+    
+    -- Load unique users from ratings_staging
+    INSERT IGNORE INTO USERS (userId)
+    SELECT DISTINCT userId FROM ratings_staging;
+    
+    -- Load movies from links_staging (has movieId); titles are filled in
+    -- later by import_movies, which also clears is_placeholder
+    INSERT IGNORE INTO MOVIES (movieId, title, is_placeholder)
+    SELECT DISTINCT movieId, CONCAT('Movie_', movieId), 1
+    FROM links_staging;
+    
+    -- Load links
+    INSERT IGNORE INTO LINKS (movieId, imdbId, tmdbId)
+    SELECT movieId, imdbId, tmdbId
+    FROM links_staging;
+    
+    -- Load ratings (only valid ones, for known movies; once RATINGS is
+    -- partitioned the movie check is a trigger, which INSERT IGNORE does not skip)
+    INSERT IGNORE INTO RATINGS (userId, movieId, rating, timestamp)
+    SELECT s.userId, s.movieId, s.rating, s.timestamp
+    FROM ratings_staging s
+    WHERE s.rating BETWEEN 0.5 AND 5.0
+      AND EXISTS (SELECT 1 FROM MOVIES m WHERE m.movieId = s.movieId);
+    
+    COMMIT;
+END //
+
+DELIMITER ;
+
+ANALYZE TABLE MOVIES;
+
+-- Dashboard count: answered from idx_movies_placeholder alone ("Using index")
+EXPLAIN SELECT COUNT(*) FROM MOVIES WHERE is_placeholder = 0;
+
+SELECT is_placeholder, COUNT(*) AS movies FROM MOVIES GROUP BY is_placeholder;
@@ -0,0 +1,61 @@
+-- ============================================================
+-- Migration Script: Server-side login sessions
+-- A password login issues a signed session token (gui.py,
+-- create_session). Only a SHA256 of the token is stored here, so
+-- a copy of this table cannot be used to log in. Resuming a live,
+-- unrevoked session skips the bcrypt check.
+--
+-- Logout sets revoked_at on one row; a password change revokes
+-- every other session of that user. Deleting a user removes their
+-- sessions (cascade). Expired and long-revoked rows are purged
+-- daily by ev_purge_user_sessions (needs event_scheduler=ON) and
+-- each time this script runs.
+-- ============================================================
+
+USE movies_db;
+
+CREATE TABLE IF NOT EXISTS USER_SESSIONS (
+    session_id CHAR(32) PRIMARY KEY,
+    userId INT NOT NULL,
+    token_hash CHAR(64) NOT NULL,
+    created_at BIGINT NOT NULL,
+    expires_at BIGINT NOT NULL,
+    last_seen BIGINT NOT NULL,
+    revoked_at BIGINT NULL,
+    client VARCHAR(100),
+    INDEX idx_sessions_user (userId, revoked_at),
+    INDEX idx_sessions_expires (expires_at),
+    FOREIGN KEY (userId) REFERENCES USERS(userId)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE
+) ENGINE=InnoDB;
+
+DELIMITER //
+
+-- ============================================================
+-- Stored Procedure: purge_user_sessions
+-- Removes sessions that expired, or were revoked, over a day ago
+-- ============================================================
+DROP PROCEDURE IF EXISTS purge_user_sessions //
+
+CREATE PROCEDURE purge_user_sessions()
+BEGIN
+    DELETE FROM USER_SESSIONS
+    WHERE expires_at < UNIX_TIMESTAMP() - 86400
+       OR revoked_at < UNIX_TIMESTAMP() - 86400;
+END //
+
+DELIMITER ;
+
+CALL purge_user_sessions();
+
+DROP EVENT IF EXISTS ev_purge_user_sessions;
+
+CREATE EVENT ev_purge_user_sessions
+ON SCHEDULE EVERY 1 DAY
+DO CALL purge_user_sessions();
+
+SELECT 'User sessions table ready' AS Status;
+SELECT COUNT(*) AS live_sessions
+FROM USER_SESSIONS
+WHERE revoked_at IS NULL AND expires_at > UNIX_TIMESTAMP();
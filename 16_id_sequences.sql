@@ -0,0 +1,33 @@
+-- ============================================================
+-- Migration Script: ID sequences for USERS and MOVIES
+-- The app used SELECT COALESCE(MAX(id), 0) + 1 and then INSERT,
+-- so two sessions registering at the same time could pick the
+-- same id. Each app process now reserves a block of ids with one
+-- atomic statement (gui.py, IdAllocator):
+--
+--   UPDATE ID_SEQUENCES
+--   SET next_id = LAST_INSERT_ID(GREATEST(next_id, MAX(id) + 1) + <block>)
+--   WHERE name = 'users';
+--
+-- and hands them out from memory. Unused ids of a block are skipped.
+--
+-- Safe to run again: existing sequences are only ever moved forward.
+-- ============================================================
+
+USE movies_db;
+
+CREATE TABLE IF NOT EXISTS ID_SEQUENCES (
+    name VARCHAR(32) PRIMARY KEY,
+    next_id BIGINT NOT NULL
+) ENGINE=InnoDB;
+
+INSERT INTO ID_SEQUENCES (name, next_id)
+SELECT 'users', COALESCE(MAX(userId), 0) + 1 FROM USERS
+ON DUPLICATE KEY UPDATE next_id = GREATEST(next_id, VALUES(next_id));
+
+INSERT INTO ID_SEQUENCES (name, next_id)
+SELECT 'movies', COALESCE(MAX(movieId), 0) + 1 FROM MOVIES
+ON DUPLICATE KEY UPDATE next_id = GREATEST(next_id, VALUES(next_id));
+
+SELECT 'ID sequences ready' AS Status;
+SELECT * FROM ID_SEQUENCES;
@@ -0,0 +1,68 @@
+-- ============================================================
+-- Migration Script: Transactional outbox for MongoDB movie writes
+-- An admin movie save used to write MOVIES, then MongoDB, then
+-- LINKS as separate steps; a failure in between left the two
+-- stores disagreeing. The app now writes the movie/links rows and
+-- one MOVIE_OUTBOX row with the MongoDB change in the SAME
+-- transaction (gui.py, add_movie_with_outbox), and a background
+-- relay (OutboxRelay) applies pending rows to tmdb_movies:
+--
+--   SELECT ... FROM MOVIE_OUTBOX
+--   WHERE processed_at IS NULL AND next_attempt_at <= NOW()
+--   ORDER BY id LIMIT <batch> FOR UPDATE SKIP LOCKED;
+--
+-- Failed rows are retried with exponential backoff (attempts,
+-- next_attempt_at, last_error). Applied rows are purged after
+-- 7 days by ev_purge_movie_outbox (needs event_scheduler=ON).
+--
+-- Safe to run again: the table and index are only created once.
+-- ============================================================
+
+USE movies_db;
+
+CREATE TABLE IF NOT EXISTS MOVIE_OUTBOX (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    movieId INT NOT NULL,
+    tmdbId INT NOT NULL,
+    op ENUM('upsert', 'delete') NOT NULL,
+    payload LONGTEXT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    attempts INT NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    processed_at TIMESTAMP NULL,
+    last_error VARCHAR(500) NULL,
+    INDEX idx_outbox_pending (processed_at, next_attempt_at, id),
+    INDEX idx_outbox_tmdb (tmdbId, id)
+) ENGINE=InnoDB;
+
+-- The relay looks for newer rows of the same tmdbId when it claims one
+ALTER TABLE MOVIE_OUTBOX ADD INDEX IF NOT EXISTS idx_outbox_tmdb (tmdbId, id);
+
+DELIMITER //
+
+-- ============================================================
+-- Stored Procedure: purge_movie_outbox
+-- Removes rows that were applied to MongoDB over 7 days ago
+-- ============================================================
+DROP PROCEDURE IF EXISTS purge_movie_outbox //
+
+CREATE PROCEDURE purge_movie_outbox()
+BEGIN
+    DELETE FROM MOVIE_OUTBOX
+    WHERE processed_at < NOW() - INTERVAL 7 DAY;
+END //
+
+DELIMITER ;
+
+CALL purge_movie_outbox();
+
+DROP EVENT IF EXISTS ev_purge_movie_outbox;
+
+CREATE EVENT ev_purge_movie_outbox
+ON SCHEDULE EVERY 1 DAY
+DO CALL purge_movie_outbox();
+
+SELECT 'Movie outbox ready' AS Status;
+SELECT COUNT(*) AS pending_mongo_writes
+FROM MOVIE_OUTBOX
+WHERE processed_at IS NULL;
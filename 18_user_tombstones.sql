@@ -0,0 +1,28 @@
+-- ============================================================
+-- Migration Script: Tombstones for batched user deletion
+-- Deleting a user detaches their ratings (userId = NULL) so movie
+-- averages stay correct. Doing that in the same transaction as the
+-- DELETE locked every rating row of a prolific user until commit
+-- and stalled everyone's rating writes. The app now (gui.py,
+-- bulk_delete_users):
+--   1. sets USERS.deleted_at (login refused, sessions revoked)
+--   2. detaches ratings in small committed batches:
+--        UPDATE RATINGS SET userId = NULL WHERE userId = ? LIMIT <n>
+--   3. deletes watchlist, rating locks and the USERS row in one
+--      short transaction
+-- A user left tombstoned by an interrupted run is finished the
+-- next time the app starts.
+--
+-- Safe to run again: the column and index are only added once.
+-- ============================================================
+
+USE movies_db;
+
+ALTER TABLE USERS
+    ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMP NULL DEFAULT NULL,
+    ADD INDEX IF NOT EXISTS idx_users_deleted (deleted_at);
+
+SELECT 'User tombstones ready' AS Status;
+SELECT COUNT(*) AS users_pending_deletion
+FROM USERS
+WHERE deleted_at IS NOT NULL;
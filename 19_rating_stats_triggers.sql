@@ -0,0 +1,94 @@
+-- ============================================================
+-- Migration Script: Keep MOVIE_RATING_STATS current with triggers
+-- The summary table was refreshed only by the app's own rating
+-- add / delete, with a full COUNT/SUM recount of the movie's
+-- ratings inside each rating transaction. Every other writer
+-- (benchmark teardown, load test restore, bulk INSERT/UPDATE
+-- tests, index_advisor.py) left it drifting, and the recount
+-- scanned all ratings of popular movies while holding their
+-- summary row locked.
+--
+-- AFTER INSERT / UPDATE / DELETE triggers on RATINGS now adjust
+-- the movie's row incrementally:
+--   rating_count = rating_count +/- 1
+--   rating_sum   = rating_sum +/- rating (or + the delta)
+-- min / max are re-read with MIN() / MAX() on idx_movieId_rating,
+-- which is a single index lookup each.
+--
+-- Bulk loaders that rebuild the table themselves afterwards
+-- (2_import_data.py) set @rating_stats_deferred = 1 in their
+-- session to skip the per-row work.
+--
+-- Safe to run again: triggers are dropped and recreated, and the
+-- table is rebuilt once so it starts out exact.
+-- ============================================================
+
+USE movies_db;
+
+DROP TRIGGER IF EXISTS trg_ratings_stats_insert;
+DROP TRIGGER IF EXISTS trg_ratings_stats_update;
+DROP TRIGGER IF EXISTS trg_ratings_stats_delete;
+
+DELIMITER //
+
+-- ============================================================
+-- Stored Procedure: adjust_movie_rating_stats
+-- Adds (p_sign = 1) or removes (p_sign = -1) one rating
+-- ============================================================
+DROP PROCEDURE IF EXISTS adjust_movie_rating_stats //
+
+CREATE PROCEDURE adjust_movie_rating_stats(IN p_movie_id INT, IN p_rating DECIMAL(2,1), IN p_sign INT)
+BEGIN
+    INSERT INTO MOVIE_RATING_STATS
+        (movieId, rating_count, rating_sum, avg_rating, min_rating, max_rating, updated_at)
+    VALUES (p_movie_id, GREATEST(p_sign, 0), GREATEST(p_sign, 0) * p_rating,
+            IF(p_sign > 0, p_rating, NULL), NULL, NULL, UNIX_TIMESTAMP())
+    ON DUPLICATE KEY UPDATE
+        rating_count = GREATEST(rating_count + p_sign, 0),
+        rating_sum = IF(rating_count = 0, 0, rating_sum + p_sign * p_rating),
+        avg_rating = IF(rating_count = 0, NULL, ROUND(rating_sum / rating_count, 2)),
+        updated_at = UNIX_TIMESTAMP();
+
+    UPDATE MOVIE_RATING_STATS
+    SET min_rating = (SELECT MIN(rating) FROM RATINGS WHERE movieId = p_movie_id),
+        max_rating = (SELECT MAX(rating) FROM RATINGS WHERE movieId = p_movie_id)
+    WHERE movieId = p_movie_id;
+END //
+
+CREATE TRIGGER trg_ratings_stats_insert
+AFTER INSERT ON RATINGS
+FOR EACH ROW
+BEGIN
+    IF @rating_stats_deferred IS NULL OR @rating_stats_deferred = 0 THEN
+        CALL adjust_movie_rating_stats(NEW.movieId, NEW.rating, 1);
+    END IF;
+END //
+
+CREATE TRIGGER trg_ratings_stats_update
+AFTER UPDATE ON RATINGS
+FOR EACH ROW
+BEGIN
+    -- userId-only changes (user deletion, renumbering) leave the summary alone
+    IF (@rating_stats_deferred IS NULL OR @rating_stats_deferred = 0)
+       AND (NEW.movieId <> OLD.movieId OR NOT (NEW.rating <=> OLD.rating)) THEN
+        CALL adjust_movie_rating_stats(OLD.movieId, OLD.rating, -1);
+        CALL adjust_movie_rating_stats(NEW.movieId, NEW.rating, 1);
+    END IF;
+END //
+
+CREATE TRIGGER trg_ratings_stats_delete
+AFTER DELETE ON RATINGS
+FOR EACH ROW
+BEGIN
+    IF @rating_stats_deferred IS NULL OR @rating_stats_deferred = 0 THEN
+        CALL adjust_movie_rating_stats(OLD.movieId, OLD.rating, -1);
+    END IF;
+END //
+
+DELIMITER ;
+
+-- Start from exact numbers
+CALL rebuild_movie_rating_stats();
+
+SELECT 'Rating stats triggers ready' AS Status;
+SELECT COUNT(*) AS movies_with_stats FROM MOVIE_RATING_STATS;
@@ -39,8 +39,11 @@ CREATE TABLE MOVIES (
     movieId INT PRIMARY KEY AUTO_INCREMENT,
     title VARCHAR(500) NOT NULL,
     release_date DATE,
+    -- 1 while the title is still the Movie_<id> stand-in from load_from_staging
+    is_placeholder TINYINT(1) NOT NULL DEFAULT 0,
     INDEX idx_title (title),
-    INDEX idx_release_date (release_date)
+    INDEX idx_release_date (release_date),
+    INDEX idx_movies_placeholder (is_placeholder)
 ) ENGINE=InnoDB;
 
 -- ============================================================
@@ -121,6 +124,18 @@ CREATE TABLE links_staging (
     tmdbId INT
 ) ENGINE=InnoDB;
 
+-- High-water mark for 2_import_data.py --delta (see 10_delta_import.sql).
+-- Created here so the first full import, which runs before script 10,
+-- can already record it.
+CREATE TABLE IF NOT EXISTS IMPORT_STATE (
+    source VARCHAR(50) PRIMARY KEY,
+    max_timestamp BIGINT NOT NULL DEFAULT 0,
+    byte_offset BIGINT NOT NULL DEFAULT 0,
+    prefix_sha256 CHAR(64) NOT NULL,
+    rows_loaded BIGINT NOT NULL DEFAULT 0,
+    imported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB;
+
 -- ============================================================
 -- Stored Procedure: Clean and Load Data from Staging
 -- (ADVANCED FEATURE for extra credit!)
@@ -142,9 +157,10 @@ BEGIN
     INSERT IGNORE INTO USERS (userId)
     SELECT DISTINCT userId FROM ratings_staging;
     
-    -- Load movies from links_staging (has movieId)
-    INSERT IGNORE INTO MOVIES (movieId, title)
-    SELECT DISTINCT movieId, CONCAT('Movie_', movieId)
+    -- Load movies from links_staging (has movieId); titles are filled in
+    -- later by import_movies, which also clears is_placeholder
+    INSERT IGNORE INTO MOVIES (movieId, title, is_placeholder)
+    SELECT DISTINCT movieId, CONCAT('Movie_', movieId), 1
     FROM links_staging;
     
     -- Load links
@@ -152,11 +168,13 @@ BEGIN
     SELECT movieId, imdbId, tmdbId
     FROM links_staging;
     
-    -- Load ratings (only valid ones)
+    -- Load ratings (only valid ones, for known movies; once RATINGS is
+    -- partitioned the movie check is a trigger, which INSERT IGNORE does not skip)
     INSERT IGNORE INTO RATINGS (userId, movieId, rating, timestamp)
-    SELECT userId, movieId, rating, timestamp
-    FROM ratings_staging
-    WHERE rating BETWEEN 0.5 AND 5.0;
+    SELECT s.userId, s.movieId, s.rating, s.timestamp
+    FROM ratings_staging s
+    WHERE s.rating BETWEEN 0.5 AND 5.0
+      AND EXISTS (SELECT 1 FROM MOVIES m WHERE m.movieId = s.movieId);
     
     COMMIT;
 END //
@@ -0,0 +1,32 @@
+-- ============================================================
+-- Migration Script: User id generation marker
+-- renumber_users.py gives users new ids while the app runs. A GUI
+-- that logged in before the swap still holds the old userId and
+-- would rate, edit its watchlist or profile as whichever account
+-- owns that id now.
+--
+-- USER_ID_GENERATION holds one number. renumber_users.py swaps in
+-- a copy with generation + 1 in the same RENAME TABLE as the
+-- renumbered USERS, RATINGS, ... tables, so the new ids and the
+-- new generation appear together. The app (gui.py):
+--   - reads the generation with the user at login / session resume
+--   - re-reads it inside every user-scoped write transaction
+--     (require_user_generation) and polls it while idle
+--   - drops the login and asks again when it has changed
+--
+-- Safe to run again: the row is only inserted once.
+-- ============================================================
+
+USE movies_db;
+
+CREATE TABLE IF NOT EXISTS USER_ID_GENERATION (
+    id TINYINT PRIMARY KEY DEFAULT 1,
+    generation INT NOT NULL DEFAULT 1,
+    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT chk_user_id_generation_single CHECK (id = 1)
+) ENGINE=InnoDB;
+
+INSERT IGNORE INTO USER_ID_GENERATION (id, generation) VALUES (1, 1);
+
+SELECT 'User id generation ready' AS Status;
+SELECT * FROM USER_ID_GENERATION;
@@ -7,7 +7,12 @@ import pymysql
 import csv
 import json
 import ast
+import argparse
+import hashlib
+import re
+from collections import Counter
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 import sys
 
@@ -33,6 +38,10 @@ FILES = {
     'movies': BASE_DIR / 'movies_metadata.csv'
 }
 
+# Rejected rows and the import summary are written here
+REJECTS_DIR = BASE_DIR / 'rejects'
+BATCH_SIZE = 1000
+
 # ============================================================
 # Helper Functions
 # ============================================================
@@ -71,41 +80,202 @@ def extract_genres(genres_str):
         return ', '.join([g['name'] for g in genres_list if 'name' in g])
     return None
 
+_INT_RE = re.compile(r'^[+-]?\d+$')
+_FLOAT_RE = re.compile(r'^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$')
+_ISO_DATE_RE = re.compile(r'^\d{4}-\d{1,2}-\d{1,2}$')
+_US_DATE_RE = re.compile(r'^\d{1,2}/\d{1,2}/\d{4}$')
+
 def parse_date(date_str):
     """Parse date string to YYYY-MM-DD format"""
     if not date_str or date_str == '':
         return None
+    # Only call strptime for strings that have the right shape
+    if _ISO_DATE_RE.match(date_str):
+        fmt = '%Y-%m-%d'
+    elif _US_DATE_RE.match(date_str):
+        fmt = '%m/%d/%Y'
+    else:
+        return None
     try:
-        # Try parsing as YYYY-MM-DD
-        dt = datetime.strptime(date_str, '%Y-%m-%d')
-        return dt.strftime('%Y-%m-%d')
+        return datetime.strptime(date_str, fmt).strftime('%Y-%m-%d')
     except ValueError:
-        try:
-            # Try other formats
-            dt = datetime.strptime(date_str, '%m/%d/%Y')
-            return dt.strftime('%Y-%m-%d')
-        except ValueError:
-            return None
+        # Right shape but impossible date (e.g. 2019-02-30)
+        return None
 
 def safe_int(value, default=None):
-    """Safely convert value to int"""
-    try:
-        return int(value)
-    except (ValueError, TypeError):
-        return default
+    """Convert value to int, pattern-checked instead of exception-driven"""
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        value = value.strip()
+        return int(value) if _INT_RE.match(value) else default
+    return default
 
 def safe_float(value, default=None):
-    """Safely convert value to float"""
-    try:
+    """Convert value to float, pattern-checked instead of exception-driven"""
+    if isinstance(value, (int, float)):
         return float(value)
-    except (ValueError, TypeError):
-        return default
+    if isinstance(value, str):
+        value = value.strip()
+        return float(value) if _FLOAT_RE.match(value) else default
+    return default
+
+# ============================================================
+# Validation & Reject Files
+# ============================================================
+
+class RejectLog:
+    """
+    Collects rejected rows for one feed.
+    Each reject is written to rejects/<feed>_rejects.csv as
+    (line_number, reason, original columns...) and counted by reason.
+    Warnings are counted but the row is still loaded.
+    """
+
+    def __init__(self, feed, rejects_dir=REJECTS_DIR):
+        self.feed = feed
+        self.path = Path(rejects_dir) / f"{feed}_rejects.csv"
+        self.read = 0
+        self.loaded = 0
+        self.reasons = Counter()
+        self.warnings = Counter()
+        self._file = None
+        self._writer = None
+
+    def reject(self, line_no, reason, row):
+        self.reasons[reason] += 1
+        if self._writer is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'w', encoding='utf-8', newline='')
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(['line', 'reason'] + list(row.keys()))
+        self._writer.writerow([line_no, reason] + list(row.values()))
+
+    def warn(self, reason):
+        self.warnings[reason] += 1
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+            self._writer = None
+
+    @property
+    def rejected(self):
+        return sum(self.reasons.values())
+
+    def summary(self):
+        return {
+            'feed': self.feed,
+            'read': self.read,
+            'loaded': self.loaded,
+            'rejected': self.rejected,
+            'reasons': dict(self.reasons.most_common()),
+            'warnings': dict(self.warnings.most_common()),
+            'reject_file': str(self.path) if self.rejected else None,
+        }
+
+def validate_link_row(row):
+    """Return ((movieId, imdbId, tmdbId), None) or (None, reason)"""
+    movie_id = safe_int(row.get('movieId'))
+    if not movie_id:
+        return None, 'bad_movie_id'
+    imdb_id = (row.get('imdbId') or '').strip()
+    if not imdb_id:
+        return None, 'missing_imdb_id'
+    tmdb_id = safe_int(row.get('tmdbId'))
+    if not tmdb_id:
+        return None, 'bad_tmdb_id'
+    return (movie_id, imdb_id, tmdb_id), None
+
+def validate_rating_row(row):
+    """Return ((userId, movieId, rating, timestamp), None) or (None, reason)"""
+    user_id = safe_int(row.get('userId'))
+    if not user_id:
+        return None, 'bad_user_id'
+    movie_id = safe_int(row.get('movieId'))
+    if not movie_id:
+        return None, 'bad_movie_id'
+    rating = safe_float(row.get('rating'))
+    if rating is None:
+        return None, 'bad_rating'
+    if not 0.5 <= rating <= 5.0:
+        return None, 'rating_out_of_range'
+    timestamp = safe_int(row.get('timestamp'))
+    if not timestamp:
+        return None, 'bad_timestamp'
+    return (user_id, movie_id, rating, timestamp), None
+
+def validate_movie_row(row, log):
+    """Return ((title, release_date, movieId), None) or (None, reason)"""
+    movie_id = safe_int(row.get('id'))
+    if not movie_id:
+        return None, 'bad_movie_id'
+    title = (row.get('title') or '').strip()
+    if not title:
+        return None, 'missing_title'
+    raw_date = (row.get('release_date') or '').strip()
+    release_date = parse_date(raw_date)
+    if raw_date and release_date is None:
+        log.warn('unparsed_release_date')
+    return (title, release_date, movie_id), None
+
+def iter_valid_batches(reader, validate, log, batch_size=BATCH_SIZE):
+    """
+    Streaming validation stage: pull rows from a csv.DictReader, send rejects
+    to the RejectLog with their line number, and yield valid rows in batches.
+    """
+    batch = []
+    for row in reader:
+        log.read += 1
+        if None in row:
+            # More columns than the header - the line is malformed
+            row.pop(None)
+            log.reject(reader.line_num, 'extra_columns', row)
+            continue
+        try:
+            values, reason = validate(row)
+        except Exception as e:
+            values, reason = None, f"unexpected_{type(e).__name__}"
+        if values is None:
+            log.reject(reader.line_num, reason, row)
+            continue
+        batch.append(values)
+        if len(batch) >= batch_size:
+            log.loaded += len(batch)
+            yield batch
+            batch = []
+    if batch:
+        log.loaded += len(batch)
+        yield batch
+
+def write_import_report(logs, rejects_dir=REJECTS_DIR):
+    """Print the per-feed validation summary and save it as JSON"""
+    print("\n" + "="*60)
+    print("🧹 VALIDATION SUMMARY")
+    print("="*60)
+    for log in logs:
+        print(f"  {log.feed:10s}: {log.read:,} read | {log.loaded:,} loaded | {log.rejected:,} rejected")
+        for reason, n in log.reasons.most_common():
+            print(f"      ✗ {reason:25s} {n:,}")
+        for reason, n in log.warnings.most_common():
+            print(f"      ! {reason:25s} {n:,} (loaded)")
+        if log.rejected:
+            print(f"      → {log.path}")
+    report_path = Path(rejects_dir) / 'import_report.json'
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'feeds': [log.summary() for log in logs],
+        }, f, indent=2)
+    print(f"  Report saved to {report_path}")
 
 # ============================================================
 # Import Functions
 # ============================================================
 
-def import_links(conn):
+def import_links(conn, log):
     """Import links_small.csv into LINKS table"""
     print("\n📂 Importing LINKS data...")
     cursor = conn.cursor()
@@ -113,42 +283,21 @@ def import_links(conn):
     # First, load into staging
     cursor.execute("TRUNCATE TABLE links_staging")
     
-    with open(FILES['links'], 'r', encoding='utf-8') as f:
+    with open(FILES['links'], 'r', encoding='utf-8', newline='') as f:
         reader = csv.DictReader(f)
-        batch = []
-        count = 0
-        
-        for row in reader:
-            movie_id = safe_int(row['movieId'])
-            imdb_id = row['imdbId'].strip()
-            tmdb_id = safe_int(row['tmdbId'])
-            
-            if movie_id and imdb_id and tmdb_id:
-                batch.append((movie_id, imdb_id, tmdb_id))
-                count += 1
-                
-                # Insert in batches of 1000
-                if len(batch) >= 1000:
-                    cursor.executemany(
-                        "INSERT INTO links_staging (movieId, imdbId, tmdbId) VALUES (%s, %s, %s)",
-                        batch
-                    )
-                    conn.commit()
-                    batch = []
-                    print(f"  Processed {count} rows...", end='\r')
-        
-        # Insert remaining rows
-        if batch:
+        for batch in iter_valid_batches(reader, validate_link_row, log):
             cursor.executemany(
                 "INSERT INTO links_staging (movieId, imdbId, tmdbId) VALUES (%s, %s, %s)",
                 batch
             )
             conn.commit()
+            print(f"  Processed {log.loaded} rows...", end='\r')
     
-    print(f"✅ Loaded {count} rows into links_staging")
+    log.close()
+    print(f"✅ Loaded {log.loaded} rows into links_staging ({log.rejected} rejected)")
     cursor.close()
 
-def import_ratings(conn):
+def import_ratings(conn, log):
     """Import ratings_small.csv into RATINGS table"""
     print("\n📂 Importing RATINGS data...")
     cursor = conn.cursor()
@@ -156,45 +305,21 @@ def import_ratings(conn):
     # First, load into staging
     cursor.execute("TRUNCATE TABLE ratings_staging")
     
-    with open(FILES['ratings'], 'r', encoding='utf-8') as f:
+    with open(FILES['ratings'], 'r', encoding='utf-8', newline='') as f:
         reader = csv.DictReader(f)
-        batch = []
-        count = 0
-        
-        for row in reader:
-            user_id = safe_int(row['userId'])
-            movie_id = safe_int(row['movieId'])
-            rating = safe_float(row['rating'])
-            timestamp = safe_int(row['timestamp'])
-            
-            # Validate rating range
-            if user_id and movie_id and rating and timestamp:
-                if 0.5 <= rating <= 5.0:
-                    batch.append((user_id, movie_id, rating, timestamp))
-                    count += 1
-                    
-                    # Insert in batches of 1000
-                    if len(batch) >= 1000:
-                        cursor.executemany(
-                            "INSERT INTO ratings_staging (userId, movieId, rating, timestamp) VALUES (%s, %s, %s, %s)",
-                            batch
-                        )
-                        conn.commit()
-                        batch = []
-                        print(f"  Processed {count} rows...", end='\r')
-        
-        # Insert remaining rows
-        if batch:
+        for batch in iter_valid_batches(reader, validate_rating_row, log):
             cursor.executemany(
                 "INSERT INTO ratings_staging (userId, movieId, rating, timestamp) VALUES (%s, %s, %s, %s)",
                 batch
             )
             conn.commit()
+            print(f"  Processed {log.loaded} rows...", end='\r')
     
-    print(f"✅ Loaded {count} rows into ratings_staging")
+    log.close()
+    print(f"✅ Loaded {log.loaded} rows into ratings_staging ({log.rejected} rejected)")
     cursor.close()
 
-def import_movies(conn):
+def import_movies(conn, log):
     """
     Import movies_metadata.csv into MOVIES table
     Note: This extracts only basic info. Complex JSON fields go to MongoDB!
@@ -202,56 +327,241 @@ def import_movies(conn):
     print("\n📂 Importing MOVIES basic data...")
     cursor = conn.cursor()
     
-    movie_data = []
-    count = 0
-    skipped = 0
-    
-    with open(FILES['movies'], 'r', encoding='utf-8', errors='replace') as f:
+    with open(FILES['movies'], 'r', encoding='utf-8', errors='replace', newline='') as f:
         reader = csv.DictReader(f)
-        
-        for row in reader:
-            try:
-                # Extract basic fields for SQL
-                movie_id = safe_int(row.get('id'))
-                title = row.get('title', '').strip()
-                release_date = parse_date(row.get('release_date', ''))
-                
-                if movie_id and title:
-                    # Update existing movie with title and date
-                    movie_data.append((title, release_date, movie_id))
-                    count += 1
-                    
-                    if len(movie_data) >= 1000:
-                        cursor.executemany(
-                            """UPDATE MOVIES 
-                               SET title = %s, release_date = %s 
-                               WHERE movieId = %s""",
-                            movie_data
-                        )
-                        conn.commit()
-                        movie_data = []
-                        print(f"  Processed {count} rows...", end='\r')
-                else:
-                    skipped += 1
-                    
-            except Exception as e:
-                skipped += 1
-                continue
-        
-        # Update remaining rows
-        if movie_data:
+        validate = partial(validate_movie_row, log=log)
+        for batch in iter_valid_batches(reader, validate, log):
+            # Update existing movie with title and date
             cursor.executemany(
                 """UPDATE MOVIES 
-                   SET title = %s, release_date = %s 
+                   SET title = %s, release_date = %s, is_placeholder = 0 
                    WHERE movieId = %s""",
-                movie_data
+                batch
             )
             conn.commit()
+            print(f"  Processed {log.loaded} rows...", end='\r')
     
-    print(f"✅ Updated {count} movie records")
-    print(f"⚠️  Skipped {skipped} invalid rows")
+    log.close()
+    print(f"✅ Updated {log.loaded} movie records")
+    print(f"⚠️  Skipped {log.rejected} invalid rows (see {log.path})")
+    cursor.close()
+
+# ============================================================
+# Delta Import (high-water mark on ratings timestamp)
+# ============================================================
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def file_sha256(path, limit=None):
+    """SHA-256 of the first `limit` bytes of a file (whole file if None)"""
+    digest = hashlib.sha256()
+    remaining = limit
+    with open(path, 'rb') as f:
+        while remaining is None or remaining > 0:
+            size = HASH_CHUNK_SIZE if remaining is None else min(HASH_CHUNK_SIZE, remaining)
+            chunk = f.read(size)
+            if not chunk:
+                break
+            digest.update(chunk)
+            if remaining is not None:
+                remaining -= len(chunk)
+    return digest.hexdigest()
+
+def last_line_boundary(path):
+    """Byte offset just past the last newline (so a partial last line is re-read next time)"""
+    size = path.stat().st_size
+    with open(path, 'rb') as f:
+        pos = size
+        while pos > 0:
+            step = min(HASH_CHUNK_SIZE, pos)
+            f.seek(pos - step)
+            chunk = f.read(step)
+            idx = chunk.rfind(b'\n')
+            if idx != -1:
+                return pos - step + idx + 1
+            pos -= step
+    return 0
+
+def get_import_state(conn, source):
+    """Read the high-water mark for a feed, or None if never recorded"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            "SELECT max_timestamp, byte_offset, prefix_sha256, rows_loaded FROM IMPORT_STATE WHERE source = %s",
+            (source,)
+        )
+        return cursor.fetchone()
+    except pymysql.err.ProgrammingError:
+        print("⚠️  IMPORT_STATE table not found - run 10_delta_import.sql first")
+        return None
+    finally:
+        cursor.close()
+
+def save_import_state(conn, source, max_timestamp, byte_offset, prefix_sha256, rows_loaded):
+    """Record the high-water mark after a successful load"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            """REPLACE INTO IMPORT_STATE (source, max_timestamp, byte_offset, prefix_sha256, rows_loaded)
+               VALUES (%s, %s, %s, %s, %s)""",
+            (source, max_timestamp, byte_offset, prefix_sha256, rows_loaded)
+        )
+        conn.commit()
+        return True
+    except pymysql.err.ProgrammingError:
+        conn.rollback()
+        print("⚠️  IMPORT_STATE table not found - high-water mark not recorded (run 10_delta_import.sql)")
+        return False
+    finally:
+        cursor.close()
+
+def count_lines(path, limit):
+    """Number of newline-terminated lines in the first `limit` bytes of a file"""
+    n = 0
+    with open(path, 'rb') as f:
+        remaining = limit
+        while remaining > 0:
+            chunk = f.read(min(1 << 20, remaining))
+            if not chunk:
+                break
+            n += chunk.count(b'\n')
+            remaining -= len(chunk)
+    return n
+
+def iter_ratings_delta(path, state, end_offset, log):
+    """
+    Yield (userId, movieId, rating, timestamp) rows that may be new since `state`.
+    If the file still starts with exactly the bytes we loaded last time it was
+    only appended to, so we seek past them and parse just the tail.
+    Otherwise (rewritten, truncated, or never loaded) every row is yielded:
+    edited or back-dated rows would be missed by a timestamp filter, so
+    load_ratings_delta compares them against RATINGS instead.
+    Invalid rows go to the RejectLog with their line number in the file.
+    """
+    start_offset = 0
+    if state and 0 < state['byte_offset'] <= end_offset \
+            and file_sha256(path, state['byte_offset']) == state['prefix_sha256']:
+        start_offset = state['byte_offset']
+        print(f"  File was appended to - parsing from byte {start_offset:,}")
+    elif state:
+        print("  File was rewritten - staging every row to compare against RATINGS")
+
+    def _lines(raw, pos):
+        # Stop at end_offset so a half-written last line is left for next time
+        for line in raw:
+            pos += len(line)
+            if pos > end_offset:
+                return
+            yield line.decode('utf-8')
+
+    with open(path, 'rb') as raw:
+        header_line = raw.readline()
+        header = next(csv.reader([header_line.decode('utf-8')]))
+        pos = len(header_line)
+        if start_offset:
+            raw.seek(start_offset)
+            pos = start_offset
+        reader = csv.DictReader(_lines(raw, pos), fieldnames=header)
+        # reader.line_num counts from where we started reading; the offset
+        # is only worked out if there is actually something to reject
+        base_line = None
+        for row in reader:
+            values, reason = validate_rating_row(row)
+            if values is None:
+                if base_line is None:
+                    base_line = count_lines(path, start_offset) if start_offset else 1
+                log.read += 1
+                log.reject(base_line + reader.line_num, reason, row)
+                continue
+            log.read += 1
+            log.loaded += 1
+            yield values
+
+def import_ratings_delta(conn, log):
+    """
+    Delta import of ratings_small.csv.
+    Only rows past the recorded byte offset go through staging (the whole
+    file if it was rewritten); load_ratings_delta skips staged rows that
+    RATINGS already has, or has a newer rating for, and only the movies
+    actually changed get their MOVIE_RATING_STATS refreshed.
+    """
+    print("\n📂 Delta-importing RATINGS data...")
+    path = FILES['ratings']
+    state = get_import_state(conn, 'ratings')
+    end_offset = last_line_boundary(path)
+
+    if state and state['byte_offset'] == end_offset \
+            and file_sha256(path, end_offset) == state['prefix_sha256']:
+        print("✅ Ratings file unchanged since last import - nothing to do")
+        return 0
+
+    cursor = conn.cursor()
+    cursor.execute("TRUNCATE TABLE ratings_staging")
+    batch = []
+    count = 0
+    max_ts = state['max_timestamp'] if state else 0
+    for row in iter_ratings_delta(path, state, end_offset, log):
+        batch.append(row)
+        count += 1
+        max_ts = max(max_ts, row[3])
+        if len(batch) >= 1000:
+            cursor.executemany(
+                "INSERT INTO ratings_staging (userId, movieId, rating, timestamp) VALUES (%s, %s, %s, %s)",
+                batch
+            )
+            conn.commit()
+            batch = []
+            print(f"  Staged {count} new rows...", end='\r')
+    if batch:
+        cursor.executemany(
+            "INSERT INTO ratings_staging (userId, movieId, rating, timestamp) VALUES (%s, %s, %s, %s)",
+            batch
+        )
+        conn.commit()
+    log.close()
+    print(f"✅ Staged {count} rating rows ({log.rejected} rejected)")
+
+    applied = 0
+    if count:
+        try:
+            cursor.callproc('load_ratings_delta')
+            skipped = cursor.fetchone()
+            conn.commit()
+        except pymysql.Error as err:
+            print(f"❌ Error applying ratings delta: {err}")
+            conn.rollback()
+            cursor.close()
+            return 0
+        applied = count - skipped['unchanged'] - skipped['superseded']
+        if skipped['unchanged'] or skipped['superseded']:
+            print(f"  Skipped {skipped['unchanged']} rows already in RATINGS and "
+                  f"{skipped['superseded']} rows older than the rating stored for that user and movie")
+        cursor.execute("SELECT COUNT(DISTINCT movieId) AS n FROM ratings_staging")
+        affected = cursor.fetchone()['n']
+        print(f"✅ Applied {applied} rows and refreshed aggregates for {affected} movies")
     cursor.close()
 
+    rows_loaded = (state['rows_loaded'] if state else 0) + applied
+    save_import_state(conn, 'ratings', max_ts, end_offset, file_sha256(path, end_offset), rows_loaded)
+    return applied
+
+def record_full_import_state(conn):
+    """After a full import: rebuild per-movie aggregates and record the high-water mark"""
+    path = FILES['ratings']
+    cursor = conn.cursor()
+    try:
+        cursor.callproc('rebuild_movie_rating_stats')
+        conn.commit()
+        print("✅ Rebuilt MOVIE_RATING_STATS")
+    except pymysql.Error as err:
+        conn.rollback()
+        print(f"⚠️  Could not rebuild MOVIE_RATING_STATS ({err}) - run 10_delta_import.sql")
+    cursor.execute("SELECT COALESCE(MAX(timestamp), 0) AS max_ts, COUNT(*) AS n FROM ratings_staging")
+    row = cursor.fetchone()
+    cursor.close()
+    end_offset = last_line_boundary(path)
+    save_import_state(conn, 'ratings', row['max_ts'], end_offset, file_sha256(path, end_offset), row['n'])
+
 def load_staging_to_final(conn):
     """Call stored procedure to move data from staging to final tables"""
     print("\n🔄 Loading data from staging to final tables...")
@@ -298,10 +608,10 @@ def show_statistics(conn):
 # Main Execution
 # ============================================================
 
-def main():
+def main(delta=False, rejects_dir=REJECTS_DIR):
     """Main import process"""
     print("\n" + "="*60)
-    print("🎬 INF2003 MOVIE DATABASE - DATA IMPORT")
+    print("🎬 INF2003 MOVIE DATABASE - DATA IMPORT" + (" (DELTA)" if delta else ""))
     print("="*60)
     
     # Check if files exist
@@ -313,17 +623,43 @@ def main():
     
     # Connect to database
     conn = connect_db()
+    # Both paths recompute MOVIE_RATING_STATS at the end; skip the per-row trigger updates
+    with conn.cursor() as cursor:
+        cursor.execute("SET @rating_stats_deferred = 1")
+    
+    if delta:
+        ratings_log = RejectLog('ratings', rejects_dir)
+        try:
+            import_ratings_delta(conn, ratings_log)
+            write_import_report([ratings_log], rejects_dir)
+            print("\n✅ DELTA IMPORT COMPLETED")
+        except Exception as e:
+            print(f"\n❌ Error during delta import: {e}")
+            conn.rollback()
+        finally:
+            conn.close()
+            print("\n🔌 Database connection closed")
+        return
+    
+    logs = [RejectLog(feed, rejects_dir) for feed in ('links', 'ratings', 'movies')]
+    links_log, ratings_log, movies_log = logs
     
     try:
         # Import data in order (respecting foreign keys)
-        import_links(conn)      # 1. Links first (creates movies)
-        import_ratings(conn)    # 2. Ratings (creates users and references movies)
+        import_links(conn, links_log)      # 1. Links first (creates movies)
+        import_ratings(conn, ratings_log)  # 2. Ratings (creates users and references movies)
         
         # Load staging to final tables
         load_staging_to_final(conn)
         
         # Update movie details
-        import_movies(conn)     # 3. Update movie titles and dates
+        import_movies(conn, movies_log)    # 3. Update movie titles and dates
+        
+        # Per-feed reject counts and reasons
+        write_import_report(logs, rejects_dir)
+        
+        # Remember where this load ended so the next run can be a delta
+        record_full_import_state(conn)
         
         # Show statistics
         show_statistics(conn)
@@ -344,4 +680,17 @@ def main():
         print("\n🔌 Database connection closed")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Import MovieLens CSV data into MariaDB")
+    parser.add_argument(
+        "--delta",
+        action="store_true",
+        help="only load ratings added or changed since the last recorded import (needs 10_delta_import.sql)"
+    )
+    parser.add_argument(
+        "--rejects-dir",
+        type=Path,
+        default=REJECTS_DIR,
+        help=f"where rejected rows and import_report.json are written (default: {REJECTS_DIR})"
+    )
+    args = parser.parse_args()
+    main(delta=args.delta, rejects_dir=args.rejects_dir)
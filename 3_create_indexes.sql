@@ -41,20 +41,17 @@ LIMIT 10;
 -- Index for rating-based filtering (already exists in schema)
 -- CREATE INDEX idx_ratings_rating ON RATINGS(rating);
 
--- Composite index for JOIN + filter operations
-CREATE INDEX idx_ratings_movie_rating_composite 
-ON RATINGS(movieId, rating) 
-COMMENT 'Optimizes queries filtering by movie and rating';
+-- Composite index for JOIN + filter operations (already exists in schema
+-- as idx_movieId_rating; a second copy only slows down every write)
+-- CREATE INDEX idx_ratings_movie_rating_composite ON RATINGS(movieId, rating);
 
--- Index for timestamp-based queries (e.g., "ratings in 2020")
-CREATE INDEX idx_ratings_timestamp 
-ON RATINGS(timestamp)
-COMMENT 'Optimizes time-based filtering';
+-- Index for timestamp-based queries (already exists in schema as idx_timestamp)
+-- CREATE INDEX idx_ratings_timestamp ON RATINGS(timestamp);
 
--- Index for user activity queries
+-- Covering index for user activity queries (rating history, profile stats)
 CREATE INDEX idx_ratings_user_timestamp 
-ON RATINGS(userId, timestamp)
-COMMENT 'Optimizes user rating history queries';
+ON RATINGS(userId, timestamp, movieId, rating)
+COMMENT 'Covers user rating history queries';
 
 -- Full-text search index on movie titles (ADVANCED!)
 ALTER TABLE MOVIES ADD FULLTEXT INDEX idx_title_fulltext (title)
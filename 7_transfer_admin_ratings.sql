@@ -0,0 +1,125 @@
+-- ============================================================================
+-- ADMIN RATINGS TRANSFER (was 7_renumber_user_ids.sql)
+-- User ids are no longer renumbered during setup. Closing the gaps in
+-- USERS.userId is a one-off operator step (renumber_users.py, see README),
+-- so ids here may or may not have been renumbered: the admin and the target
+-- account are looked up by username instead of fixed ids.
+-- ============================================================================
+
+USE movies_db;
+
+-- Disable safe update mode
+SET SQL_SAFE_UPDATES = 0;
+
+-- ===================================================================
+-- TRANSFER ADMIN RATINGS TO ANOTHER USER
+-- ===================================================================
+-- This section transfers all RATINGS made by admin (username 'admin')
+-- to another user to keep admin account clean (no RATINGS).
+--
+-- SAFETY CHECKS:
+-- 1. Check how many RATINGS admin has
+-- 2. Verify target user exists
+-- 3. Check for conflicts (if target user already rated same movies)
+-- 4. Perform the transfer
+-- ===================================================================
+
+SELECT '============================================' as info;
+SELECT 'STARTING ADMIN RATINGS TRANSFER' as info;
+SELECT '============================================' as info;
+
+-- Step 1: Check admin's RATINGS
+SET @admin_user_id = (SELECT userId FROM USERS WHERE username = 'admin' AND role = 'admin' LIMIT 1);
+SELECT CONCAT('Admin (userId=', COALESCE(@admin_user_id, 'missing'), ') currently has these RATINGS:') AS info;
+SELECT 
+    r.userId,
+    r.movieId,
+    m.title,
+    r.rating,
+    FROM_UNIXTIME(r.timestamp) AS rated_at
+FROM RATINGS r
+INNER JOIN movies m ON r.movieId = m.movieId
+WHERE r.userId = @admin_user_id
+ORDER BY r.timestamp DESC;
+
+SELECT COUNT(*) AS admin_rating_count 
+FROM RATINGS 
+WHERE userId = @admin_user_id;
+
+-- Step 2: Choose a target user
+-- Transfer to emma_wilson (userId 3 on a fresh import; NOT testuser)
+-- This keeps testuser's profile clean for testing
+SET @target_user_id = (SELECT userId FROM USERS WHERE username = 'emma_wilson' LIMIT 1);
+
+-- Step 3: Verify target user exists
+SELECT 
+    CASE 
+        WHEN COUNT(*) > 0 THEN CONCAT('Target user ', @target_user_id, ' exists')
+        ELSE CONCAT('ERROR: Target user ', @target_user_id, ' does NOT exist!')
+    END AS user_check
+FROM USERS 
+WHERE userId = @target_user_id;
+
+-- Step 4: Check for conflicts (movies both USERS rated)
+SELECT 'Potential conflicts (both USERS rated same movies):' AS info;
+SELECT 
+    admin_r.movieId,
+    m.title,
+    admin_r.rating AS admin_rating,
+    target_r.rating AS target_user_rating
+FROM RATINGS admin_r
+INNER JOIN RATINGS target_r ON admin_r.movieId = target_r.movieId
+INNER JOIN movies m ON admin_r.movieId = m.movieId
+WHERE admin_r.userId = @admin_user_id 
+  AND target_r.userId = @target_user_id;
+
+-- Step 5: Handle conflicts - Delete target user's RATINGS for conflicting movies
+-- (We'll keep admin's RATINGS and transfer them)
+SELECT 'Deleting conflicting RATINGS from target user...' AS info;
+DELETE FROM RATINGS
+WHERE userId = @target_user_id
+  AND movieId IN (
+      SELECT movieId 
+      FROM RATINGS 
+      WHERE userId = @admin_user_id
+  );
+
+-- Step 6: Transfer all admin RATINGS to target user
+SELECT 'Transferring admin RATINGS to target user...' AS info;
+UPDATE RATINGS
+SET userId = @target_user_id
+WHERE userId = @admin_user_id
+  AND @target_user_id IS NOT NULL;
+
+-- Step 7: Verify the transfer
+SELECT 'Admin RATINGS after transfer:' AS info;
+SELECT COUNT(*) AS admin_rating_count 
+FROM RATINGS 
+WHERE userId = @admin_user_id;
+
+SELECT CONCAT('Target user (', @target_user_id, ') RATINGS after transfer:') AS info;
+SELECT COUNT(*) AS target_user_rating_count 
+FROM RATINGS 
+WHERE userId = @target_user_id;
+
+-- Step 8: Show sample of transferred RATINGS
+SELECT 'Sample of transferred RATINGS:' AS info;
+SELECT 
+    r.userId,
+    r.movieId,
+    m.title,
+    r.rating,
+    FROM_UNIXTIME(r.timestamp) AS rated_at
+FROM RATINGS r
+INNER JOIN movies m ON r.movieId = m.movieId
+WHERE r.userId = @target_user_id
+ORDER BY r.timestamp DESC
+LIMIT 10;
+
+SELECT '============================================' as info;
+SELECT 'TRANSFER COMPLETE!' as info;
+SELECT 'Admin account now has 0 RATINGS.' as info;
+SELECT '============================================' as info;
+
+-- Re-enable safe update mode
+SET SQL_SAFE_UPDATES = 1;
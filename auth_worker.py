@@ -0,0 +1,29 @@
+"""
+INF2003 Movie Database - bcrypt calls for the auth worker pool
+gui.py hashes and checks passwords in a ProcessPoolExecutor. The tasks it
+submits live here, in a module that imports nothing but bcrypt, so running
+one never needs gui.py's database, MongoDB or Tk state.
+
+Spawned workers still import the parent's main script once at start-up
+(multiprocessing does that for every spawned process); gui.py notices it is
+running in a worker (IN_AUTH_WORKER) and skips its log files, MongoDB
+connection and TMDB cache. The app starts the workers in the background
+(warm_auth_pool) so that import is not paid by the first login.
+"""
+
+import bcrypt
+
+
+def ready():
+    """No-op task that makes the pool start its workers ahead of the first login."""
+    return True
+
+
+def hashpw(password, salt):
+    """bcrypt hash of `password` (bytes) with `salt` from bcrypt.gensalt()."""
+    return bcrypt.hashpw(password, salt)
+
+
+def checkpw(password, hashed):
+    """True if `password` (bytes) matches the bcrypt `hashed` (bytes)."""
+    return bcrypt.checkpw(password, hashed)
@@ -0,0 +1,168 @@
+"""
+INF2003 Movie Database - Benchmark Suite
+Runs the named benchmark scenarios from gui.py (same code the Performance
+tab uses) without opening the window, and saves the results as JSON.
+
+Every run is stored with its git commit, dataset size and environment,
+so a run can be compared against an earlier baseline.
+
+Examples:
+    python benchmark.py                      # all scenarios
+    python benchmark.py -s title_search -s top_n -n 100 -w 5
+    python benchmark.py --list
+    python benchmark.py --history
+    python benchmark.py --baseline latest    # run, then compare with the previous run
+    python benchmark.py --compare benchmarks/bench_A.json benchmarks/bench_B.json
+    python benchmark.py --calibrate-bcrypt 250   # pick BCRYPT_ROUNDS for ~250 ms per hash
+"""
+
+import argparse
+import sys
+
+import gui
+
+# ============================================================
+# History & Comparison
+# ============================================================
+
+def resolve_run(ref, history):
+    """'latest' / 'previous' / a path -> (path, results)"""
+    if ref in ("latest", "previous"):
+        index = -1 if ref == "latest" else -2
+        if len(history) < abs(index):
+            raise SystemExit(f"❌ Not enough saved runs for '{ref}' in {gui.BENCHMARK_RESULTS_DIR}/")
+        return history[index]
+    return ref, gui.load_benchmark_results(ref)
+
+
+def show_history(history):
+    if not history:
+        print(f"No saved runs in {gui.BENCHMARK_RESULTS_DIR}/")
+        return
+    print(f"{'Started':<20} {'Commit':<12} {'Ratings':>10} {'Scenarios':>10}  File")
+    print("-" * 80)
+    for path, res in history:
+        env = res.get("environment") or {}
+        commit = (env.get("git_commit") or "unknown")[:10] + ("*" if env.get("git_dirty") else "")
+        ratings = (env.get("dataset") or {}).get("ratings", "?")
+        print(f"{res.get('started_at', '?'):<20} {commit:<12} {ratings:>10} {len(res.get('scenarios', [])):>10}  {path}")
+
+
+def report_comparison(baseline, candidate, threshold):
+    cmp = gui.compare_benchmark_runs(baseline, candidate, threshold_pct=threshold)
+    print("\n" + gui.format_benchmark_comparison(cmp))
+    if cmp["regressions"]:
+        print(f"\n❌ Regressions: {', '.join(cmp['regressions'])}")
+        return 2
+    print("\n✅ No regressions above the threshold")
+    return 0
+
+def calibrate_bcrypt(target_ms):
+    print(f"⏱️  Timing bcrypt.hashpw (target {target_ms:.0f} ms per hash)...")
+    rounds, timings = gui.calibrate_bcrypt_rounds(target_ms)
+    for t in timings:
+        marker = "  <- suggested" if t["rounds"] == rounds else ""
+        print(f"  rounds {t['rounds']:2d}: {t['p50_ms']:8.1f} ms{marker}")
+    print(f"\n✅ BCRYPT_ROUNDS={rounds} (current: {gui.BCRYPT_ROUNDS})")
+    print("   Existing hashes move to the new cost on each user's next login.")
+    return 0
+
+# ============================================================
+# Main Execution
+# ============================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run the movie database benchmark scenarios",
+        epilog="No login is asked for: the tool runs as an admin with this machine's database "
+               "credentials, so rating_upsert may create (and afterwards delete) its own benchmark "
+               "user and movie.",
+    )
+    parser.add_argument(
+        "-s", "--scenario",
+        action="append",
+        choices=list(gui.BENCHMARK_SCENARIOS),
+        help="scenario to run (repeatable, default: all)"
+    )
+    parser.add_argument("-n", "--iterations", type=int, default=gui.BENCHMARK_ITERATIONS,
+                        help=f"timed iterations per scenario (default: {gui.BENCHMARK_ITERATIONS})")
+    parser.add_argument("-w", "--warmup", type=int, default=gui.BENCHMARK_WARMUP,
+                        help=f"untimed warmup iterations (default: {gui.BENCHMARK_WARMUP})")
+    parser.add_argument("--keyword", default=gui.BENCHMARK_DEFAULT_PARAMS["keyword"],
+                        help="title keyword for the search scenarios")
+    parser.add_argument("--genre", default=gui.BENCHMARK_DEFAULT_PARAMS["genre"],
+                        help="genre for genre_search")
+    parser.add_argument("--limit", type=int, default=gui.BENCHMARK_DEFAULT_PARAMS["limit"],
+                        help="N for top_n")
+    parser.add_argument("--warm-cache", action="store_true",
+                        help="let details_view hit the in-process cache instead of the database")
+    parser.add_argument("-o", "--output", help="JSON output path (default: benchmarks/bench_<time>.json)")
+    parser.add_argument("--list", action="store_true", help="list scenarios and exit")
+    parser.add_argument("--history", action="store_true", help="list saved runs and exit")
+    parser.add_argument("--compare", nargs="+", metavar="RUN",
+                        help="compare BASELINE [CANDIDATE] (paths, 'latest' or 'previous'; "
+                             "candidate defaults to latest) without running anything")
+    parser.add_argument("--baseline", metavar="RUN",
+                        help="after running, compare against this run ('latest' = newest saved run)")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="p50 slowdown in %% that counts as a regression (default: 10)")
+    parser.add_argument("--calibrate-bcrypt", type=float, nargs="?", const=250.0, metavar="TARGET_MS",
+                        help="time bcrypt on this machine and suggest BCRYPT_ROUNDS for TARGET_MS per hash "
+                             "(default: 250)")
+    args = parser.parse_args(argv)
+
+    if args.calibrate_bcrypt is not None:
+        return calibrate_bcrypt(args.calibrate_bcrypt)
+    if args.list:
+        for name, scenario in gui.BENCHMARK_SCENARIOS.items():
+            print(f"  {name:17s} {scenario.description}")
+        return 0
+
+    history = gui.list_benchmark_history()
+    if args.history:
+        show_history(history)
+        return 0
+    if args.compare:
+        if len(args.compare) > 2:
+            parser.error("--compare takes BASELINE [CANDIDATE]")
+        _, baseline = resolve_run(args.compare[0], history)
+        _, candidate = resolve_run(args.compare[1] if len(args.compare) == 2 else "latest", history)
+        return report_comparison(baseline, candidate, args.threshold)
+    # Resolve the baseline before this run is saved, so 'latest' means the previous run
+    baseline = resolve_run(args.baseline, history)[1] if args.baseline else None
+
+    if args.iterations <= 0 or args.warmup < 0:
+        parser.error("iterations must be positive and warmup must not be negative")
+
+    params = {
+        "keyword": args.keyword,
+        "genre": args.genre,
+        "limit": args.limit,
+        "cold_cache": not args.warm_cache,
+    }
+
+    print("\n" + "=" * 80)
+    print("🎬 INF2003 MOVIE DATABASE - BENCHMARK SUITE")
+    print("=" * 80)
+
+    def _progress(name, res):
+        if res["status"] == "ok":
+            print(f"  ✅ {name:17s} p50 {res['p50_ms']:.2f} ms | p95 {res['p95_ms']:.2f} ms")
+        else:
+            print(f"  ⚠️  {name:17s} {res['status']}: {res.get('reason', '')}")
+
+    # The CLI runs with the database credentials of this machine and does not
+    # authenticate; it acts as an admin (rating_upsert needs it, see --help)
+    gui.CURRENT_USER.update({"userId": None, "username": "BENCHMARK", "email": None, "role": "admin"})
+    results = gui.run_benchmark_suite(args.scenario, args.iterations, args.warmup, params, progress=_progress)
+    path = gui.save_benchmark_results(results, args.output)
+
+    print("\n" + gui.format_benchmark_table(results))
+    print(f"\n💾 Results saved to {path}")
+    if baseline is not None:
+        return report_comparison(baseline, results, args.threshold)
+    return 0 if all(r["status"] != "error" for r in results["scenarios"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
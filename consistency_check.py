@@ -0,0 +1,317 @@
+"""
+INF2003 Movie Database - Cross-store Consistency Check
+Compares MariaDB (MOVIES + LINKS) with MongoDB (tmdb_movies) and reports:
+  - missing:   a LINKS.tmdbId with no tmdb_movies document
+  - orphaned:  a tmdb_movies document whose id no LINKS row points at
+  - title:     both sides exist but the titles differ (after ignoring case,
+               a trailing "(1995)" year and "Matrix, The" style articles)
+
+Both sides are streamed in keyset order (LINKS by movieId, tmdb_movies by id)
+in chunks, and each chunk is checked against the other store with one
+batched IN / $in lookup, so memory stays bounded by the chunk size on the
+full dataset. Every finding is written as one JSON line to
+reports/consistency_<time>.jsonl as it is found.
+
+With --repair the job also fixes what it finds, chunk by chunk:
+  - missing: a minimal document (id, title, release_date from MariaDB) is
+    upserted with $setOnInsert, so a document written meanwhile is kept
+  - title:   the MongoDB title is set to the MariaDB title (admin saves treat
+    MariaDB as the source of truth)
+Orphaned documents are only reported; the TMDB dataset has many movies that
+are not in MovieLens. --delete-orphans removes them.
+
+Examples:
+    python consistency_check.py                     # report only
+    python consistency_check.py --repair            # report + fix missing docs and titles
+    python consistency_check.py --skip-orphans --chunk 5000
+    python consistency_check.py --repair --delete-orphans
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+
+import gui
+
+# ============================================================
+# Configuration
+# ============================================================
+
+DEFAULT_CHUNK = 1000
+REPORT_DIR = "reports"
+SAMPLES_PER_KIND = 5
+
+_YEAR_SUFFIX = re.compile(r"\s*\(\d{4}\)\s*$")
+_TRAILING_ARTICLE = re.compile(r"^(.*), (the|a|an)$")
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def normalize_title(title):
+    """'Matrix, The (1999)' and 'The Matrix' -> 'the matrix'"""
+    text = _YEAR_SUFFIX.sub("", (title or "").strip()).casefold()
+    match = _TRAILING_ARTICLE.match(text)
+    if match:
+        text = f"{match.group(2)} {match.group(1)}"
+    return _NON_WORD.sub(" ", text).strip()
+
+# ============================================================
+# Report
+# ============================================================
+
+class Report:
+    """Streams findings to a JSONL file; keeps only counters and a few samples in memory."""
+
+    def __init__(self, path):
+        self.path = path
+        self.counts = Counter()
+        self.samples = {}
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "w", encoding="utf-8")
+
+    def add(self, kind, **fields):
+        self.counts[kind] += 1
+        entry = {"kind": kind, **fields}
+        samples = self.samples.setdefault(kind, [])
+        if len(samples) < SAMPLES_PER_KIND:
+            samples.append(entry)
+        self._file.write(json.dumps(entry, default=str) + "\n")
+
+    def close(self, summary):
+        self._file.write(json.dumps({"kind": "summary", **summary}, default=str) + "\n")
+        self._file.close()
+
+
+class Progress:
+    def __init__(self, label, total):
+        self.label = label
+        self.total = total
+        self.done = 0
+        self.started = time.perf_counter()
+
+    def advance(self, n):
+        self.done += n
+        elapsed = time.perf_counter() - self.started
+        pct = f"{100.0 * self.done / self.total:5.1f}%" if self.total else "  ?  "
+        rate = self.done / elapsed if elapsed > 0 else 0
+        print(f"  {self.label}: {self.done}/{self.total or '?'} ({pct}) {rate:,.0f} rows/s", flush=True)
+
+# ============================================================
+# Lookups
+# ============================================================
+
+def fetch_links_chunk(after_movie_id, chunk):
+    """Next LINKS rows (with the movie title) after a movieId, in movieId order."""
+    conn = gui.get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT l.movieId, l.tmdbId, m.title, m.release_date
+                FROM links l
+                INNER JOIN movies m ON m.movieId = l.movieId
+                WHERE l.movieId > %s
+                ORDER BY l.movieId
+                LIMIT %s
+                """,
+                (after_movie_id, chunk)
+            )
+            return cur.fetchall()
+    finally:
+        conn.close()
+
+
+def find_mongo_titles(tmdb_ids):
+    """{tmdbId: title} for the ids that have a document (by "id", then the legacy "tmdbId" field)."""
+    found = {}
+    projection = {"_id": 0, "id": 1, "tmdbId": 1, "title": 1}
+    for doc in gui.tmdb_collection.find({"id": {"$in": tmdb_ids}}, projection):
+        found[doc["id"]] = doc.get("title")
+    rest = [t for t in tmdb_ids if t not in found]
+    if rest:
+        # Same fallback as get_tmdb_metadata
+        for doc in gui.tmdb_collection.find({"tmdbId": {"$in": rest}}, projection):
+            found.setdefault(doc["tmdbId"], doc.get("title"))
+    return found
+
+
+def find_linked_tmdb_ids(tmdb_ids):
+    conn = gui.get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                f"SELECT tmdbId FROM links WHERE tmdbId IN ({', '.join(['%s'] * len(tmdb_ids))})",
+                tmdb_ids
+            )
+            return {r["tmdbId"] for r in cur.fetchall()}
+    finally:
+        conn.close()
+
+
+def count_links():
+    conn = gui.get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT COUNT(*) AS n FROM links")
+            return cur.fetchone()["n"]
+    finally:
+        conn.close()
+
+# ============================================================
+# Repairs
+# ============================================================
+
+def _bulk_write(ops):
+    """Unordered bulk_write; returns the number of failed operations."""
+    from pymongo.errors import BulkWriteError
+
+    if not ops:
+        return 0
+    try:
+        gui.tmdb_collection.bulk_write(ops, ordered=False)
+        return 0
+    except BulkWriteError as e:
+        return len(e.details.get("writeErrors", []))
+
+
+def repair_links_chunk(missing, mismatched):
+    from pymongo import UpdateOne
+
+    ops = []
+    for row in missing:
+        release_date = row["release_date"].isoformat() if row["release_date"] else ""
+        doc = gui.build_tmdb_movie_doc(row["tmdbId"], row["title"], release_date=release_date)
+        ops.append(UpdateOne({"id": row["tmdbId"]}, {"$setOnInsert": doc}, upsert=True))
+    for row in mismatched:
+        ops.append(UpdateOne({"id": row["tmdbId"]}, {"$set": {"title": row["title"]}}))
+    failed = _bulk_write(ops)
+    tmdb_cache = gui.get_tmdb_cache(create=False)
+    if tmdb_cache is not None:
+        tmdb_cache.invalidate_many(row["tmdbId"] for row in missing + mismatched)
+    return len(ops) - failed, failed
+
+# ============================================================
+# Scans
+# ============================================================
+
+def scan_links(chunk, report, repair):
+    """LINKS -> tmdb_movies: missing documents and title mismatches."""
+    progress = Progress("LINKS", count_links())
+    repaired = failed = 0
+    last_id = 0
+    while True:
+        rows = fetch_links_chunk(last_id, chunk)
+        if not rows:
+            break
+        last_id = rows[-1]["movieId"]
+        titles = find_mongo_titles([r["tmdbId"] for r in rows])
+        missing, mismatched = [], []
+        for row in rows:
+            if row["tmdbId"] not in titles:
+                missing.append(row)
+                report.add("missing", movieId=row["movieId"], tmdbId=row["tmdbId"], sql_title=row["title"])
+            elif normalize_title(row["title"]) != normalize_title(titles[row["tmdbId"]]):
+                mismatched.append(row)
+                report.add("title", movieId=row["movieId"], tmdbId=row["tmdbId"],
+                           sql_title=row["title"], mongo_title=titles[row["tmdbId"]])
+        if repair and (missing or mismatched):
+            ok, bad = repair_links_chunk(missing, mismatched)
+            repaired += ok
+            failed += bad
+        progress.advance(len(rows))
+    return repaired, failed
+
+
+def scan_mongo(chunk, report, delete_orphans):
+    """tmdb_movies -> LINKS: documents no movie links to."""
+    from pymongo import DeleteOne
+
+    try:
+        gui.tmdb_collection.create_index("id")  # the keyset scan below sorts and seeks on it
+    except gui.mongo_errors.PyMongoError as e:
+        print(f"⚠️  Could not ensure an index on tmdb_movies.id ({e}); the scan may be slow")
+    progress = Progress("tmdb_movies", gui.tmdb_collection.estimated_document_count())
+    deleted = 0
+    last_id = None
+    while True:
+        query = {"id": {"$gt": last_id}} if last_id is not None else {"id": {"$type": "number"}}
+        docs = list(gui.tmdb_collection.find(query, {"_id": 0, "id": 1, "title": 1}).sort("id", 1).limit(chunk))
+        if not docs:
+            break
+        last_id = docs[-1]["id"]
+        linked = find_linked_tmdb_ids([d["id"] for d in docs])
+        orphans = [d for d in docs if d["id"] not in linked]
+        for doc in orphans:
+            report.add("orphaned", tmdbId=doc["id"], mongo_title=doc.get("title"))
+        if delete_orphans and orphans:
+            deleted += len(orphans) - _bulk_write([DeleteOne({"id": d["id"]}) for d in orphans])
+            tmdb_cache = gui.get_tmdb_cache(create=False)
+            if tmdb_cache is not None:
+                tmdb_cache.invalidate_many(d["id"] for d in orphans)
+        progress.advance(len(docs))
+    return deleted
+
+# ============================================================
+# Main Execution
+# ============================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check (and optionally repair) MariaDB vs MongoDB consistency")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK,
+                        help=f"rows per keyset chunk and per IN / $in lookup (default: {DEFAULT_CHUNK})")
+    parser.add_argument("--repair", action="store_true",
+                        help="create missing MongoDB documents and copy MariaDB titles over mismatched ones")
+    parser.add_argument("--skip-orphans", action="store_true",
+                        help="do not scan tmdb_movies for documents without a LINKS row")
+    parser.add_argument("--delete-orphans", action="store_true",
+                        help="delete orphaned MongoDB documents (TMDB movies that are not in MovieLens too)")
+    parser.add_argument("-o", "--output", help="JSONL report path (default: reports/consistency_<time>.jsonl)")
+    args = parser.parse_args(argv)
+    if args.chunk <= 0:
+        parser.error("--chunk must be positive")
+    if args.delete_orphans and args.skip_orphans:
+        parser.error("--delete-orphans needs the orphan scan")
+    if gui.tmdb_collection is None:
+        print("❌ MongoDB is not connected - nothing to compare against")
+        return 1
+
+    path = args.output or os.path.join(REPORT_DIR, f"consistency_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl")
+    report = Report(path)
+
+    print("\n" + "=" * 80)
+    print("🔍 INF2003 MOVIE DATABASE - CROSS-STORE CONSISTENCY CHECK")
+    print("=" * 80)
+    started = time.perf_counter()
+    summary = {}
+    try:
+        print("\n📋 LINKS -> MongoDB (missing documents, title mismatches)")
+        repaired, failed = scan_links(args.chunk, report, args.repair)
+        summary.update(repaired=repaired, repair_failed=failed)
+        if not args.skip_orphans:
+            print("\n📋 MongoDB -> LINKS (orphaned documents)")
+            summary["orphans_deleted"] = scan_mongo(args.chunk, report, args.delete_orphans)
+    finally:
+        summary.update(counts=dict(report.counts), seconds=round(time.perf_counter() - started, 1))
+        report.close(summary)
+
+    print("\n" + "-" * 80)
+    for kind in ("missing", "title", "orphaned"):
+        print(f"  {kind:10s} {report.counts.get(kind, 0):8d}")
+        for sample in report.samples.get(kind, []):
+            print(f"      {json.dumps({k: v for k, v in sample.items() if k != 'kind'}, default=str)}")
+    if args.repair:
+        print(f"\n🔧 Repaired {summary['repaired']} documents ({summary['repair_failed']} failed)")
+    if args.delete_orphans:
+        print(f"🗑️  Deleted {summary['orphans_deleted']} orphaned documents")
+    print(f"\n💾 Report saved to {path} ({summary['seconds']} s)")
+    if args.repair:
+        return 1 if summary["repair_failed"] else 0
+    return 2 if report.counts.get("missing", 0) + report.counts.get("title", 0) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
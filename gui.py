@@ -1,44 +1,212 @@
+import atexit
+import copy
+import csv
 import time
 import re
 import hashlib
+import hmac
 import sys
 import random
+import secrets
 import os
+import json
+import functools
+import multiprocessing
+import platform
+import queue
+import subprocess
+import sqlite3
+import threading
 import bcrypt
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
 from datetime import datetime
 from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog, simpledialog
 import pymysql
 import pymysql.err
+import bson
 from pymongo import MongoClient
 from pymongo import errors as mongo_errors
+from pymongo import monitoring
+
+import auth_worker
+
+try:
+    import numpy as np  # optional: columnar analytics engine
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
 
 ###############################################################################
 # LOGGING CONFIGURATION
 ###############################################################################
 
+# Auth worker processes (section 1B) are spawned, and multiprocessing makes
+# each of them import the running script again before its first task. They
+# only run auth_worker's bcrypt calls, so they skip everything here that
+# opens log files, sockets or caches (the main process owns those).
+IN_AUTH_WORKER = multiprocessing.current_process().name != "MainProcess"
+
 # Create logs directory if it doesn't exist
-if not os.path.exists('logs'):
+if not IN_AUTH_WORKER and not os.path.exists('logs'):
     os.makedirs('logs')
 
-# Configure logging
+# Log calls only put the record on an in-memory queue (QueueHandler); one
+# QueueListener thread does the formatting and the file/console I/O, so a
+# log line never adds disk latency to a DB helper or the Tk thread.
+# The file log is JSON lines (LOG_FORMAT=text for the old plain format).
+# Subsystem loggers (movieapp.sql / .mongo / .locks / .auth) can be tuned
+# individually, e.g. LOG_LEVELS="movieapp.mongo=DEBUG,movieapp.locks=WARNING",
+# and chatty INFO/DEBUG events can be sampled, e.g. LOG_SAMPLE="lock.acquired=0.1".
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+LOG_SAMPLE = os.getenv("LOG_SAMPLE", "")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+
+
+def _parse_log_settings(spec, convert):
+    settings = {}
+    for item in spec.split(","):
+        if "=" in item:
+            key, value = item.split("=", 1)
+            settings[key.strip()] = convert(value.strip())
+    return settings
+
+
+class JsonLogFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, event and its fields."""
+
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+        }
+        event = getattr(record, "event", None)
+        if event:
+            entry["event"] = event
+            entry.update(getattr(record, "fields", {}))
+        else:
+            entry["msg"] = record.getMessage()
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    Enqueues the record with only its message merged; formatting (JSON, text)
+    happens on the listener thread. The traceback text is kept separately so
+    each downstream formatter can still render it.
+    """
+
+    def prepare(self, record):
+        if record.exc_info and not record.exc_text:
+            record.exc_text = _traceback_formatter.formatException(record.exc_info)
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+_traceback_formatter = logging.Formatter()
+_log_listeners = []
+
+
+def queued_handler(*handlers):
+    """QueueHandler whose records are written by a background QueueListener."""
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _log_listeners.append(listener)
+    return _DeferredQueueHandler(log_queue)
+
+
+@atexit.register
+def _stop_log_listeners():
+    # Flush whatever is still queued before the interpreter exits
+    for listener in _log_listeners:
+        listener.stop()
+    _log_listeners.clear()
+
+
+def queued_file_logger(name, path, max_bytes, backup_count):
+    """Dedicated logger writing raw messages to its own rotating file, off-thread."""
+    log = logging.getLogger(name)
+    log.propagate = False
+    log.setLevel(logging.INFO)
+    if IN_AUTH_WORKER:
+        log.addHandler(logging.NullHandler())
+    elif not log.handlers:
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        log.addHandler(queued_handler(handler))
+    return log
+
+
+_console_handler = logging.StreamHandler()
+_console_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+
+if IN_AUTH_WORKER:
+    # Only the main process rotates logs/movies_db.log
+    _root_handlers = [_console_handler]
+else:
+    _file_handler = RotatingFileHandler(
+        'logs/movies_db.log',
+        maxBytes=5*1024*1024,  # 5MB
+        backupCount=5,
+        encoding='utf-8'
+    )
+    _file_handler.setFormatter(
+        JsonLogFormatter() if LOG_FORMAT == "json"
+        else logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    )
+    _root_handlers = [queued_handler(_file_handler, _console_handler)]
+
 logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        RotatingFileHandler(
-            'logs/movies_db.log',
-            maxBytes=5*1024*1024,  # 5MB
-            backupCount=5,
-            encoding='utf-8'
-        ),
-        logging.StreamHandler()
-    ]
+    level=getattr(logging, LOG_LEVEL, logging.INFO),
+    handlers=_root_handlers
 )
 logger = logging.getLogger(__name__)
+sql_log = logging.getLogger("movieapp.sql")
+mongo_log = logging.getLogger("movieapp.mongo")
+lock_log = logging.getLogger("movieapp.locks")
+auth_log = logging.getLogger("movieapp.auth")
+for _name, _level in _parse_log_settings(LOG_LEVELS, str.upper).items():
+    logging.getLogger(_name).setLevel(_level)
+
+_LOG_SAMPLE_RATES = _parse_log_settings(LOG_SAMPLE, float)
+
+
+def log_event(log, level, event, exc_info=None, **fields):
+    """
+    Structured log line: `event` is a stable dotted name, `fields` are the
+    values (ids, counts, timings). Returns immediately when the subsystem's
+    level filters it out; INFO/DEBUG events listed in LOG_SAMPLE are kept
+    with the configured probability.
+    """
+    if not log.isEnabledFor(level):
+        return
+    rate = _LOG_SAMPLE_RATES.get(event)
+    if rate is not None and level < logging.WARNING:
+        if random.random() >= rate:
+            return
+        fields["sample_rate"] = rate
+    text = " ".join(f"{k}={v}" for k, v in fields.items())
+    log.log(level, f"{event} {text}" if text else event, exc_info=exc_info,
+            extra={"event": event, "fields": fields})
 
 ###############################################################################
 # 1. DB CONNECTION SETTINGS
@@ -69,6 +237,700 @@ MONGO_CLUSTER = os.getenv("MONGO_CLUSTER", "cluster0.qrc4kkf.mongodb.net")
 MONGO_DB = os.getenv("MONGO_DB", "movies_nosql")
 MONGO_COLL = os.getenv("MONGO_COLL", "tmdb_movies")
 
+###############################################################################
+# 1A. QUERY INSTRUMENTATION (SQL cursor + Mongo command listener)
+###############################################################################
+
+# Every MariaDB execute and every MongoDB command is timed and tagged with a
+# stable query name: the function that issued it (e.g. search_movies_by_title),
+# or an explicit name set with query_name(). SQL is measured by the cursor
+# class used by get_connection(); Mongo through a pymongo CommandListener
+# registered on the client. Stats are kept as Prometheus-style histograms
+# and can be served on QUERY_METRICS_PORT (/metrics) or exported to a file.
+QUERY_METRICS_PORT = int(os.getenv("QUERY_METRICS_PORT", "0"))  # 0 = no HTTP endpoint
+QUERY_HISTOGRAM_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_query_name_local = threading.local()
+
+
+class query_name:
+    """Context manager that names every query issued inside it: with query_name("warm_cache"): ..."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self._previous = getattr(_query_name_local, "name", None)
+        _query_name_local.name = self.name
+        return self
+
+    def __exit__(self, *exc):
+        _query_name_local.name = self._previous
+        return False
+
+
+def _caller_query_name(frame):
+    """Explicit query_name() if set, else the qualified name of the calling function."""
+    explicit = getattr(_query_name_local, "name", None)
+    if explicit:
+        return explicit
+    code = frame.f_code
+    return getattr(code, "co_qualname", code.co_name)
+
+
+class QueryStats:
+    """Per (backend, query) latency histogram, row/byte totals and error counts."""
+
+    def __init__(self, buckets=QUERY_HISTOGRAM_BUCKETS):
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    # Distinct statement templates kept per query name (for the index advisor)
+    MAX_STATEMENTS = 5
+
+    def record(self, backend, name, elapsed_ns, rows=0, nbytes=0, error=False, template=None, statement=None):
+        seconds = elapsed_ns / 1e9
+        with self._lock:
+            s = self._series.get((backend, name))
+            if s is None:
+                s = self._series[(backend, name)] = {
+                    "count": 0, "errors": 0, "sum": 0.0, "max": 0.0, "rows": 0, "bytes": 0,
+                    "buckets": [0] * (len(self.buckets) + 1),   # last slot is +Inf
+                    "statements": {},
+                }
+            if template is not None and (template in s["statements"]
+                                         or len(s["statements"]) < self.MAX_STATEMENTS):
+                # Last executed text per template, i.e. with real parameter values
+                s["statements"][template] = statement
+            s["count"] += 1
+            s["sum"] += seconds
+            s["max"] = max(s["max"], seconds)
+            s["rows"] += rows
+            s["bytes"] += nbytes
+            if error:
+                s["errors"] += 1
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    s["buckets"][i] += 1
+                    break
+            else:
+                s["buckets"][-1] += 1
+
+    def _quantile(self, s, q):
+        """histogram_quantile-style estimate: linear interpolation inside the bucket."""
+        if not s["count"]:
+            return 0.0
+        rank = q * s["count"]
+        seen = 0
+        lower = 0.0
+        for i, n in enumerate(s["buckets"]):
+            # The largest observation caps the bucket bound (and stands in for +Inf)
+            upper = min(self.buckets[i], s["max"]) if i < len(self.buckets) else s["max"]
+            if n and seen + n >= rank:
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+            lower = upper
+        return s["max"]
+
+    def snapshot(self):
+        """List of per-query dicts, slowest total time first."""
+        with self._lock:
+            items = [(k, dict(v, buckets=list(v["buckets"]), statements=dict(v["statements"])))
+                     for k, v in self._series.items()]
+        rows = []
+        for (backend, name), s in items:
+            rows.append({
+                "backend": backend,
+                "query": name,
+                "count": s["count"],
+                "errors": s["errors"],
+                "total_s": s["sum"],
+                "mean_ms": s["sum"] / s["count"] * 1000 if s["count"] else 0.0,
+                "p50_ms": self._quantile(s, 0.50) * 1000,
+                "p95_ms": self._quantile(s, 0.95) * 1000,
+                "max_ms": s["max"] * 1000,
+                "rows": s["rows"],
+                "bytes": s["bytes"],
+                "statements": [stmt for stmt in s["statements"].values() if stmt],
+            })
+        rows.sort(key=lambda r: r["total_s"], reverse=True)
+        return rows
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def to_prometheus(self, prefix="movieapp"):
+        """Prometheus text exposition format (version 0.0.4)."""
+        def labels(backend, name, extra=""):
+            esc = name.replace("\\", "\\\\").replace('"', '\\"')
+            return f'{{backend="{backend}",query="{esc}"{extra}}}'
+
+        with self._lock:
+            items = sorted((k, dict(v, buckets=list(v["buckets"]))) for k, v in self._series.items())
+        out = [
+            f"# HELP {prefix}_query_duration_seconds Query latency by backend and query name.",
+            f"# TYPE {prefix}_query_duration_seconds histogram",
+        ]
+        for (backend, name), s in items:
+            cumulative = 0
+            for i, bound in enumerate(self.buckets):
+                cumulative += s["buckets"][i]
+                le = labels(backend, name, f',le="{bound}"')
+                out.append(f"{prefix}_query_duration_seconds_bucket{le} {cumulative}")
+            le = labels(backend, name, ',le="+Inf"')
+            out.append(f"{prefix}_query_duration_seconds_bucket{le} {s['count']}")
+            out.append(f"{prefix}_query_duration_seconds_sum{labels(backend, name)} {s['sum']:.6f}")
+            out.append(f"{prefix}_query_duration_seconds_count{labels(backend, name)} {s['count']}")
+        for metric, key, help_text in (
+            ("query_rows_total", "rows", "Rows returned or affected."),
+            ("query_bytes_total", "bytes", "Bytes received from the server."),
+            ("query_errors_total", "errors", "Queries that raised an error."),
+        ):
+            out.append(f"# HELP {prefix}_{metric} {help_text}")
+            out.append(f"# TYPE {prefix}_{metric} counter")
+            for (backend, name), s in items:
+                out.append(f"{prefix}_{metric}{labels(backend, name)} {s[key]}")
+        return "\n".join(out) + "\n"
+
+
+query_stats = QueryStats()
+
+
+class InstrumentedConnection(pymysql.connections.Connection):
+    """pymysql connection that counts bytes read from the server socket."""
+
+    bytes_received = 0
+
+    def _read_bytes(self, num_bytes):
+        data = super()._read_bytes(num_bytes)
+        self.bytes_received += len(data)
+        return data
+
+
+# Statements carrying password or session-token hashes are recorded as their
+# %s template only, never with the interpolated values
+_SENSITIVE_SQL = re.compile(r"\b(password_hash|token_hash)\b", re.IGNORECASE)
+
+
+class InstrumentedDictCursor(pymysql.cursors.DictCursor):
+    """DictCursor whose execute/executemany are recorded in query_stats."""
+
+    _batch_depth = 0
+
+    def _timed(self, method, frame, query, args):
+        name = _caller_query_name(frame)
+        conn = self.connection
+        before = getattr(conn, "bytes_received", 0)
+        self._batch_depth += 1
+        t0 = time.perf_counter_ns()
+        try:
+            result = method(query, args)
+        except Exception:
+            query_stats.record("mysql", name, time.perf_counter_ns() - t0, error=True)
+            tracer.record(name, "db", time.perf_counter_ns() - t0, error=True, **{"db.system": "mariadb"})
+            raise
+        finally:
+            self._batch_depth -= 1
+        elapsed = time.perf_counter_ns() - t0
+        rows = max(self.rowcount, 0)
+        sensitive = bool(_SENSITIVE_SQL.search(query))
+        query_stats.record("mysql", name, elapsed, rows=rows, nbytes=getattr(conn, "bytes_received", 0) - before,
+                           template=query, statement=None if sensitive else self._executed)
+        tracer.record(name, "db", elapsed, **{"db.system": "mariadb", "db.rows": rows})
+        if elapsed >= SLOW_QUERY_MS * 1e6:
+            slow_queries.record_sql(name, query if sensitive else self._executed, args, elapsed, rows,
+                                    batch=method.__name__ == "executemany", redacted=sensitive)
+        return result
+
+    def execute(self, query, args=None):
+        if self._batch_depth:
+            # executemany() calls execute() per statement; it is recorded once by the outer call
+            return super().execute(query, args)
+        return self._timed(super().execute, sys._getframe(1), query, args)
+
+    def executemany(self, query, args):
+        return self._timed(super().executemany, sys._getframe(1), query, args)
+
+
+class MongoQueryListener(monitoring.CommandListener):
+    """Records every MongoDB command under the name of the app function that issued it."""
+
+    def __init__(self):
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _app_frame():
+        """First stack frame outside pymongo/bson, i.e. the app code that issued the command."""
+        frame = sys._getframe(2)
+        while frame is not None:
+            if not frame.f_globals.get("__name__", "").startswith(("pymongo", "bson")):
+                return frame
+            frame = frame.f_back
+        return None
+
+    def started(self, event):
+        frame = self._app_frame()
+        name = _caller_query_name(frame) if frame is not None else event.command_name
+        command = None
+        if event.command_name in ("find", "aggregate"):
+            # Keep a clean copy in case the call turns out slow and needs an explain()
+            command = {k: v for k, v in event.command.items() if k not in _MONGO_COMMAND_NOISE}
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = (f"{name}:{event.command_name}", command)
+
+    def _finish(self, event, error):
+        with self._lock:
+            name, command = self._pending.pop((event.connection_id, event.request_id), (event.command_name, None))
+        rows = nbytes = 0
+        if not error:
+            reply = event.reply or {}
+            cursor = reply.get("cursor") or {}
+            batch = cursor.get("firstBatch", cursor.get("nextBatch"))
+            rows = len(batch) if batch is not None else int(reply.get("n", 0) or 0)
+            try:
+                nbytes = len(bson.encode(reply))
+            except Exception:
+                nbytes = 0
+        elapsed = event.duration_micros * 1000
+        query_stats.record("mongo", name, elapsed, rows=rows, nbytes=nbytes, error=error)
+        tracer.record(name, "mongo", elapsed, error=error, **{"db.system": "mongodb", "db.rows": rows})
+        if not error and command is not None and elapsed >= SLOW_QUERY_MS * 1e6:
+            slow_queries.record_mongo(name, event.database_name, event.command_name, command, elapsed, rows)
+
+    def succeeded(self, event):
+        self._finish(event, error=False)
+
+    def failed(self, event):
+        self._finish(event, error=True)
+
+
+mongo_query_listener = MongoQueryListener()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = query_stats.to_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        pass  # keep scrapes out of the console
+
+
+def start_metrics_server(port=None):
+    """Serve query_stats at http://0.0.0.0:<port>/metrics on a daemon thread."""
+    port = QUERY_METRICS_PORT if port is None else port
+    if not port:
+        return None
+    server = ThreadingHTTPServer(("0.0.0.0", port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logger.info(f"Query metrics available at http://localhost:{port}/metrics")
+    return server
+
+
+def export_query_stats(path=os.path.join("logs", "query_metrics.prom")):
+    """Write the Prometheus text export to a file. Returns the path written."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(query_stats.to_prometheus())
+    return path
+
+
+# ---------------- Slow-query capture (EXPLAIN on the slow ones) ----------------
+# Any SQL statement or Mongo find/aggregate slower than SLOW_QUERY_MS is
+# written to a rotating JSON-lines store together with its parameters and
+# the server's plan: EXPLAIN FORMAT=JSON for MariaDB, explain("executionStats")
+# for MongoDB. EXPLAIN runs on a background thread with its own connection so
+# the slow call itself is not made slower; each query name is explained at
+# most once per SLOW_QUERY_EXPLAIN_INTERVAL seconds.
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_LOG = os.getenv("SLOW_QUERY_LOG", os.path.join("logs", "slow_queries.jsonl"))
+SLOW_QUERY_EXPLAIN_INTERVAL = float(os.getenv("SLOW_QUERY_EXPLAIN_INTERVAL", "60"))
+SLOW_QUERY_RECENT = 200
+
+_EXPLAINABLE_SQL = re.compile(r"^\s*(SELECT|WITH|UPDATE|DELETE)\b", re.IGNORECASE)
+_MONGO_COMMAND_NOISE = ("lsid", "$clusterTime", "$db", "$readPreference", "txnNumber", "signature")
+
+
+def _plan_tables(node, out):
+    """Collect the per-table access info from a MariaDB EXPLAIN FORMAT=JSON tree."""
+    if isinstance(node, dict):
+        if "table_name" in node:
+            out.append({
+                "table": node.get("table_name"),
+                "access_type": node.get("access_type"),
+                "key": node.get("key"),
+                "rows": node.get("rows"),
+                "filtered": node.get("filtered"),
+            })
+        for value in node.values():
+            _plan_tables(value, out)
+    elif isinstance(node, list):
+        for value in node:
+            _plan_tables(value, out)
+    return out
+
+
+def _find_key(node, key):
+    """First value stored under `key` anywhere in a nested explain document."""
+    if isinstance(node, dict):
+        if key in node:
+            return node[key]
+        node = list(node.values())
+    if isinstance(node, list):
+        for value in node:
+            found = _find_key(value, key)
+            if found is not None:
+                return found
+    return None
+
+
+def _plan_stages(plan, out):
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            out.append(plan["stage"])
+        for key in ("inputStage", "inputStages", "queryPlan"):
+            _plan_stages(plan.get(key), out)
+    elif isinstance(plan, list):
+        for p in plan:
+            _plan_stages(p, out)
+    return out
+
+
+class SlowQueryRecorder:
+    """Background recorder for slow SQL and Mongo operations."""
+
+    def __init__(self, path=SLOW_QUERY_LOG, recent=SLOW_QUERY_RECENT):
+        self.recent = deque(maxlen=recent)
+        self._queue = queue.Queue(maxsize=1000)
+        self._last_explained = {}
+        self._local = threading.local()
+        self._log = queued_file_logger("movieapp.slow_queries", path, 5 * 1024 * 1024, 3)
+        self._worker = None
+
+    @property
+    def capturing(self):
+        # The EXPLAIN calls made by the worker must not capture themselves
+        return not getattr(self._local, "suppress", False)
+
+    def submit(self, entry):
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name="slow-query-explain", daemon=True)
+            self._worker.start()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            pass  # never block the caller; a burst of slow queries just loses some samples
+
+    def _should_explain(self, key):
+        now = time.monotonic()
+        if now - self._last_explained.get(key, -SLOW_QUERY_EXPLAIN_INTERVAL) < SLOW_QUERY_EXPLAIN_INTERVAL:
+            return False
+        self._last_explained[key] = now
+        return True
+
+    def _run(self):
+        self._local.suppress = True
+        while True:
+            entry = self._queue.get()
+            try:
+                key = (entry["backend"], entry["query_name"])
+                if entry.pop("_explain", False) and self._should_explain(key):
+                    with query_name("slow_query_explain"):
+                        if entry["backend"] == "mysql":
+                            self._explain_sql(entry)
+                        else:
+                            self._explain_mongo(entry)
+            except Exception as e:
+                entry["explain_error"] = str(e)
+            entry.pop("_command", None)
+            self.recent.append(entry)
+            self._log.info(json.dumps(entry, default=str))
+
+    def _explain_sql(self, entry):
+        conn = get_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("EXPLAIN FORMAT=JSON " + entry["sql"])
+                row = cur.fetchone()
+        finally:
+            conn.rollback()  # EXPLAIN of UPDATE/DELETE does not modify anything, but be explicit
+            conn.close()
+        plan = json.loads(next(iter(row.values())))
+        tables = _plan_tables(plan, [])
+        entry["explain"] = plan
+        entry["tables"] = tables
+        entry["estimated_rows"] = sum(t["rows"] or 0 for t in tables)
+        entry["full_scan"] = any(t["access_type"] in ("ALL", "index") for t in tables)
+
+    def _explain_mongo(self, entry):
+        if mongo_client is None:
+            return
+        db = mongo_client[entry["database"]]
+        result = db.command({"explain": entry["_command"], "verbosity": "executionStats"})
+        stats = _find_key(result, "executionStats") or {}
+        stages = _plan_stages(_find_key(result, "winningPlan"), [])
+        entry["explain"] = {
+            "winning_stages": stages,
+            "nReturned": stats.get("nReturned"),
+            "totalDocsExamined": stats.get("totalDocsExamined"),
+            "totalKeysExamined": stats.get("totalKeysExamined"),
+            "executionTimeMillis": stats.get("executionTimeMillis"),
+        }
+        entry["estimated_rows"] = stats.get("totalDocsExamined")
+        entry["full_scan"] = "COLLSCAN" in stages
+
+    def record_sql(self, name, sql, args, elapsed_ns, rows, batch=False, redacted=False):
+        if not self.capturing:
+            return
+        if redacted:
+            args, batch = "<redacted>", False
+        self.submit({
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "backend": "mysql",
+            "query_name": name,
+            "elapsed_ms": round(elapsed_ns / 1e6, 3),
+            "rows": rows,
+            "sql": (sql or "")[:8000],
+            "params": args if not batch else f"<executemany: {len(args or [])} rows>",
+            "_explain": bool(sql) and not batch and not redacted and bool(_EXPLAINABLE_SQL.match(sql)),
+        })
+
+    def record_mongo(self, name, database, command_name, command, elapsed_ns, rows):
+        if not self.capturing:
+            return
+        self.submit({
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "backend": "mongo",
+            "query_name": name,
+            "elapsed_ms": round(elapsed_ns / 1e6, 3),
+            "rows": rows,
+            "database": database,
+            "command": command_name,
+            "filter": command.get("filter") or command.get("pipeline") if command else None,
+            "_command": command,
+            "_explain": command is not None,
+        })
+
+
+slow_queries = SlowQueryRecorder()
+
+
+# ---------------- Tracing (one trace per UI action) ----------------
+# A UI handler decorated with @traced_action opens a root span; SQL executes
+# and Mongo commands are attached to it automatically as child spans (from
+# the cursor / command listener above), and code can add its own spans with
+# `with tracer.span(name, kind=...)` for cache lookups, rendering, bcrypt, etc.
+# Outside an action, span() is a no-op. Finished traces are appended to
+# TRACE_LOG as OTLP/JSON (one ExportTraceServiceRequest per line), so they
+# can be replayed into any OpenTelemetry collector.
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+TRACE_LOG = os.getenv("TRACE_LOG", os.path.join("logs", "traces.jsonl"))
+TRACE_RECENT = int(os.getenv("TRACE_RECENT", "100"))
+
+# Span kinds used by the summary; "wait" is time spent in modal dialogs and
+# is reported separately instead of counting against the action
+_OTLP_CLIENT_KINDS = ("db", "mongo")
+
+
+class Span:
+    __slots__ = ("name", "kind", "trace_id", "span_id", "parent_id",
+                 "start_ns", "end_ns", "attributes", "error", "children")
+
+    def __init__(self, name, kind, trace_id, parent_id, attributes):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = attributes
+        self.error = None
+        self.children = []
+
+    @property
+    def duration_ns(self):
+        return (self.end_ns or time.time_ns()) - self.start_ns
+
+    def walk(self, depth=0):
+        yield depth, self
+        for child in self.children:
+            yield from child.walk(depth + 1)
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class Tracer:
+    """Thread-local span stack; finished root spans are exported and kept in `recent`."""
+
+    def __init__(self, path=TRACE_LOG, recent=TRACE_RECENT):
+        self.recent = deque(maxlen=recent)
+        self._local = threading.local()
+        self._log = queued_file_logger("movieapp.traces", path, 10 * 1024 * 1024, 3)
+
+    def current(self):
+        stack = getattr(self._local, "stack", None)
+        return stack[-1] if stack else None
+
+    @contextmanager
+    def action(self, name, **attributes):
+        """Root span for one UI action (nested actions become child spans)."""
+        if not TRACING_ENABLED:
+            yield None
+            return
+        if self.current() is not None:
+            with self.span(name, kind="action", **attributes) as span:
+                yield span
+            return
+        root = Span(name, "action", os.urandom(16).hex(), None, attributes)
+        self._local.stack = [root]
+        try:
+            yield root
+        except BaseException as e:
+            root.error = repr(e)
+            raise
+        finally:
+            root.end_ns = time.time_ns()
+            self._local.stack = []
+            self.recent.append(root)
+            try:
+                self._log.info(json.dumps(self.to_otlp(root), default=str))
+            except (OSError, TypeError, ValueError) as e:
+                logger.warning(f"Could not export trace {root.name}: {e}")
+
+    @contextmanager
+    def span(self, name, kind="internal", **attributes):
+        parent = self.current()
+        if parent is None:
+            yield None
+            return
+        span = Span(name, kind, parent.trace_id, parent.span_id, attributes)
+        parent.children.append(span)
+        self._local.stack.append(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = repr(e)
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            self._local.stack.pop()
+
+    def annotate(self, **attributes):
+        """Add attributes to the innermost open span, if any."""
+        span = self.current()
+        if span is not None:
+            span.attributes.update(attributes)
+
+    def record(self, name, kind, duration_ns, error=False, **attributes):
+        """Attach an already-finished call (timed elsewhere) to the current span."""
+        parent = self.current()
+        if parent is None:
+            return
+        span = Span(name, kind, parent.trace_id, parent.span_id, attributes)
+        span.end_ns = time.time_ns()
+        span.start_ns = span.end_ns - int(duration_ns)
+        span.error = "error" if error else None
+        parent.children.append(span)
+
+    @staticmethod
+    def to_otlp(root):
+        spans = []
+        for _, s in root.walk():
+            attributes = [{"key": "app.span_kind", "value": {"stringValue": s.kind}}]
+            attributes += [{"key": k, "value": _otlp_value(v)} for k, v in s.attributes.items()]
+            item = {
+                "traceId": s.trace_id,
+                "spanId": s.span_id,
+                "name": s.name,
+                "kind": 3 if s.kind in _OTLP_CLIENT_KINDS else 1,  # SPAN_KIND_CLIENT / SPAN_KIND_INTERNAL
+                "startTimeUnixNano": str(s.start_ns),
+                "endTimeUnixNano": str(s.end_ns),
+                "attributes": attributes,
+                "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+            }
+            if s.parent_id:
+                item["parentSpanId"] = s.parent_id
+            spans.append(item)
+        return {"resourceSpans": [{
+            "resource": {"attributes": [
+                {"key": "service.name", "value": {"stringValue": "movieapp-gui"}},
+                {"key": "host.name", "value": {"stringValue": platform.node()}},
+            ]},
+            "scopeSpans": [{"scope": {"name": "movieapp.tracer"}, "spans": spans}],
+        }]}
+
+
+tracer = Tracer()
+
+
+def traced_action(fn):
+    """Decorator: run a UI handler inside a root span named after it."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with tracer.action(fn.__name__):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+def _self_time_by_kind(root):
+    totals = {}
+    for _, s in root.walk():
+        own = s.duration_ns - sum(c.duration_ns for c in s.children)
+        totals[s.kind] = totals.get(s.kind, 0) + max(own, 0)
+    return totals
+
+
+def format_trace_summary(limit=5, width=40):
+    """
+    Flame-style text view of the slowest recent actions: each span is a bar
+    placed on the action's timeline, followed by self time per kind
+    (db / mongo / cache / render / compute / action).
+    """
+    def active_ns(root):
+        return root.duration_ns - _self_time_by_kind(root).get("wait", 0)
+
+    roots = sorted(tracer.recent, key=active_ns, reverse=True)[:limit]
+    out = []
+    if not roots:
+        return "No traced actions yet."
+    for root in roots:
+        total = max(root.duration_ns, 1)
+        stamp = datetime.fromtimestamp(root.start_ns / 1e9).strftime("%H:%M:%S")
+        out.append(f"{root.name}  {active_ns(root) / 1e6:.1f} ms  (at {stamp}, trace {root.trace_id[:8]})"
+                   + (f"  ERROR {root.error}" if root.error else ""))
+        for depth, s in root.walk():
+            offset = int((s.start_ns - root.start_ns) / total * width)
+            bar = max(1, round(s.duration_ns / total * width))
+            label = ("  " * depth + s.name)[:38]
+            out.append(f"  {label:<38} {s.duration_ns / 1e6:>9.2f} ms |{' ' * offset}{'█' * bar}")
+        by_kind = _self_time_by_kind(root)
+        out.append("  self time: " + ", ".join(
+            f"{k} {v / 1e6:.1f} ms" for k, v in sorted(by_kind.items(), key=lambda kv: -kv[1])))
+        out.append("")
+    return "\n".join(out)
+
+
 # MongoDB connection - supports both local Docker and Atlas
 def get_mongo_connection():
     """
@@ -90,7 +952,11 @@ def get_mongo_connection():
             mongo_connection_string = f"mongodb+srv://{MONGO_USERNAME}:{MONGO_PASSWORD}@{MONGO_CLUSTER}/?retryWrites=true&w=majority"
             logger.info(f"Connecting to MongoDB Atlas: {MONGO_CLUSTER}")
         
-        client = MongoClient(mongo_connection_string, serverSelectionTimeoutMS=5000)
+        client = MongoClient(
+            mongo_connection_string,
+            serverSelectionTimeoutMS=5000,
+            event_listeners=[mongo_query_listener]
+        )
         # Test connection
         client.admin.command('ping')
         db = client[MONGO_DB]
@@ -107,10 +973,13 @@ def get_mongo_connection():
         logger.error(f"MongoDB connection failed: {e}")
         return None, None, None
 
-# Initialize MongoDB connection
-mongo_client, mongo_db, tmdb_collection = get_mongo_connection()
+# Initialize MongoDB connection (not in auth workers, which never query it)
+if IN_AUTH_WORKER:
+    mongo_client, mongo_db, tmdb_collection = None, None, None
+else:
+    mongo_client, mongo_db, tmdb_collection = get_mongo_connection()
 
-if mongo_client is None:
+if mongo_client is None and not IN_AUTH_WORKER:
     logger.warning("MongoDB connection failed. Some features may be unavailable.")
     # Don't show messagebox during import - it may not be in GUI context
 
@@ -124,15 +993,16 @@ CURRENT_USER = {
 
 
 def get_connection():
-    """Open a MariaDB connection using DictCursor."""
-    return pymysql.connect(
-        host=DB_HOST,
-        user=DB_USER,
-        password=DB_PASS,
-        database=DB_NAME,
-        cursorclass=pymysql.cursors.DictCursor,
-        autocommit=False  # we explicitly control commit for ACID demo
-    )
+    """Open a MariaDB connection using DictCursor (instrumented, see query_stats)."""
+    with tracer.span("mariadb.connect", kind="db"):
+        return InstrumentedConnection(
+            host=DB_HOST,
+            user=DB_USER,
+            password=DB_PASS,
+            database=DB_NAME,
+            cursorclass=InstrumentedDictCursor,
+            autocommit=False  # we explicitly control commit for ACID demo
+        )
 
 
 ###############################################################################
@@ -145,38 +1015,192 @@ def is_valid_email(email: str) -> bool:
     return re.match(pattern, email) is not None
 
 
-def hash_password(password: str) -> str:
+# bcrypt at 12 rounds is ~250 ms of CPU per call. Hashing and checking run
+# in a small process pool so they neither hold the Tk thread nor compete
+# with it for a core; login / registration run on a helper thread and the
+# UI polls for the result (see when_done). AUTH_WORKERS=0 hashes in-process.
+# The pool runs auth_worker.hashpw / checkpw, which need nothing but bcrypt.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+AUTH_WORKERS = int(os.getenv("AUTH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# spawn on every platform: by the time the pool starts this process already
+# runs threads (log QueueListener, pymongo monitors, outbox relay, Tk), and a
+# forked child can inherit a lock one of them held and deadlock. forkserver
+# would fork from a server that imported this module too.
+AUTH_POOL_START_METHOD = os.getenv("AUTH_POOL_START_METHOD", "spawn")
+BCRYPT_PREFIXES = ('$2b$', '$2a$', '$2y$')
+
+_auth_pool = None
+_auth_pool_lock = threading.Lock()
+_auth_threads = ThreadPoolExecutor(max_workers=4, thread_name_prefix="auth")
+
+
+def _get_auth_pool():
+    global _auth_pool
+    with _auth_pool_lock:
+        if _auth_pool is None and AUTH_WORKERS > 0:
+            _auth_pool = ProcessPoolExecutor(
+                max_workers=AUTH_WORKERS,
+                mp_context=multiprocessing.get_context(AUTH_POOL_START_METHOD),
+            )
+        return _auth_pool
+
+
+def warm_auth_pool():
+    """Start every auth worker now (each imports the main script once) instead of on the first login."""
+    pool = _get_auth_pool()
+    if pool is None:
+        return
+    try:
+        for future in [pool.submit(auth_worker.ready) for _ in range(AUTH_WORKERS)]:
+            future.result()
+    except BrokenProcessPool as e:
+        _discard_auth_pool(pool, e)
+
+
+def _discard_auth_pool(pool, error):
+    global _auth_pool
+    with _auth_pool_lock:
+        if _auth_pool is pool:
+            _auth_pool = None
+    log_event(auth_log, logging.WARNING, "auth.pool_broken", error=error)
+
+
+def _run_bcrypt(fn, *args):
+    """Run one bcrypt call in the worker pool and wait for it (in-process if the pool is off or broken)."""
+    pool = _get_auth_pool()
+    if pool is not None:
+        try:
+            return pool.submit(fn, *args).result()
+        except BrokenProcessPool as e:
+            _discard_auth_pool(pool, e)
+    return fn(*args)
+
+
+def hash_password(password: str, rounds: int = None) -> str:
     """Hash password using bcrypt (industry standard with salt)."""
-    salt = bcrypt.gensalt(rounds=12)
-    hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
+    salt = bcrypt.gensalt(rounds=rounds or BCRYPT_ROUNDS)
+    with tracer.span("bcrypt.hashpw", kind="compute"):
+        hashed = _run_bcrypt(auth_worker.hashpw, password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
 
+def hash_passwords(passwords, rounds: int = None):
+    """Hash many passwords at once, spread over every auth worker. Same order as the input."""
+    args = [(p.encode('utf-8'), bcrypt.gensalt(rounds=rounds or BCRYPT_ROUNDS)) for p in passwords]
+    pool = _get_auth_pool()
+    with tracer.span("bcrypt.hashpw", kind="compute", count=len(args)):
+        if pool is not None:
+            try:
+                hashed = list(pool.map(auth_worker.hashpw, *zip(*args))) if args else []
+                return [h.decode('utf-8') for h in hashed]
+            except BrokenProcessPool as e:
+                _discard_auth_pool(pool, e)
+        return [auth_worker.hashpw(pw, salt).decode('utf-8') for pw, salt in args]
+
+
 def verify_password(password: str, hashed: str) -> bool:
     """Verify password against bcrypt hash OR legacy SHA256 hash."""
     try:
         # Check if it's a bcrypt hash (starts with $2b$ or $2a$ or $2y$)
-        if hashed.startswith(('$2b$', '$2a$', '$2y$')):
-            return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+        if hashed.startswith(BCRYPT_PREFIXES):
+            with tracer.span("bcrypt.checkpw", kind="compute"):
+                return _run_bcrypt(auth_worker.checkpw, password.encode('utf-8'), hashed.encode('utf-8'))
         else:
             # Legacy SHA256 hash (64 hex characters)
-            import hashlib
             sha256_hash = hashlib.sha256(password.encode()).hexdigest()
-            return sha256_hash == hashed
+            return hmac.compare_digest(sha256_hash, hashed)
     except Exception as e:
         logger.error(f"Password verification error: {e}")
         return False
 
 
+def password_needs_rehash(hashed: str) -> bool:
+    """True for legacy SHA256 hashes and bcrypt hashes with a cost other than BCRYPT_ROUNDS."""
+    if not hashed or not hashed.startswith(BCRYPT_PREFIXES):
+        return True
+    try:
+        return int(hashed[4:6]) != BCRYPT_ROUNDS
+    except ValueError:
+        return True
+
+
+def _rehash_password(conn, user_id, old_hash, password):
+    """
+    Replace a stored hash after a successful login (the only time the
+    plain password is known). Compare-and-set on the old hash, so a
+    password change made meanwhile is never overwritten. Failures are
+    logged and ignored: the user is logged in either way.
+    """
+    try:
+        new_hash = hash_password(password)
+        with conn.cursor() as cur:
+            cur.execute(
+                "UPDATE users SET password_hash = %s WHERE userId = %s AND password_hash = %s",
+                (new_hash, user_id, old_hash)
+            )
+            updated = cur.rowcount
+        conn.commit()
+        log_event(auth_log, logging.INFO, "auth.rehashed", userId=user_id, rounds=BCRYPT_ROUNDS,
+                  previous="bcrypt" if old_hash.startswith(BCRYPT_PREFIXES) else "sha256", updated=updated)
+    except pymysql.MySQLError as e:
+        conn.rollback()
+        log_event(auth_log, logging.WARNING, "auth.rehash_failed", userId=user_id, error=e)
+
+
+def calibrate_bcrypt_rounds(target_ms=250.0, min_rounds=10, max_rounds=16, samples=3):
+    """
+    Time bcrypt.hashpw on this machine for each cost from min_rounds up
+    (each step doubles the work) and pick the highest cost whose median
+    stays within target_ms. Returns (rounds, [{"rounds", "p50_ms"}, ...]).
+    """
+    timings = []
+    chosen = min_rounds
+    for rounds in range(min_rounds, max_rounds + 1):
+        salt = bcrypt.gensalt(rounds=rounds)
+        stats, _, _ = measure_callable(lambda i: bcrypt.hashpw(b"calibrate-password", salt),
+                                       iterations=samples, warmup=0)
+        timings.append({"rounds": rounds, "p50_ms": stats["p50_ms"]})
+        if stats["p50_ms"] > target_ms:
+            break
+        chosen = rounds
+    return chosen, timings
+
+
+def run_auth_async(fn, *args):
+    """Run fn(*args) on an auth helper thread; returns a Future (see when_done)."""
+    return _auth_threads.submit(fn, *args)
+
+
+def when_done(widget, future, callback, poll_ms=25):
+    """
+    Call callback(result, error) on the Tk thread once `future` finishes.
+    Polls with widget.after, so the window keeps repainting meanwhile;
+    nothing is called if the widget was closed first.
+    """
+    def _poll():
+        try:
+            if not widget.winfo_exists():
+                return
+        except tk.TclError:
+            return
+        if not future.done():
+            widget.after(poll_ms, _poll)
+            return
+        error = future.exception()
+        callback(None if error else future.result(), error)
+    _poll()
+
+
 def authenticate_user(username: str, password: str):
     """
     Look up user in USERS table, compare password hash, return user dict with role.
     Expected table columns (as per your GUI file): userId, username, email, role, password_hash.
     """
     sql = """
-        SELECT userId, username, email, role, password_hash
-        FROM USERS
-        WHERE username = %s
+        SELECT u.userId, u.username, u.email, u.role, u.password_hash, g.generation
+        FROM USERS u
+        CROSS JOIN USER_ID_GENERATION g
+        WHERE u.username = %s AND u.deleted_at IS NULL
     """
     conn = get_connection()
     try:
@@ -190,6 +1214,10 @@ def authenticate_user(username: str, password: str):
             # Use verify_password instead of direct hash comparison
             if not verify_password(password, user['password_hash']):
                 return None
+
+            # Transparently move legacy SHA256 / old-cost hashes to the current bcrypt cost
+            if password_needs_rehash(user['password_hash']):
+                _rehash_password(conn, user['userId'], user['password_hash'], password)
                 
             # Update global state
             global CURRENT_USER
@@ -197,31 +1225,272 @@ def authenticate_user(username: str, password: str):
                 "userId": user['userId'],
                 "username": user['username'],
                 "email": user['email'],
-                "role": user['role']
+                "role": user['role'],
+                "generation": user['generation']
             })
                 
             return user
     finally:
         conn.close()
 
+###############################################################################
+# 1C. LOCAL TMDB DOCUMENT CACHE (read-through, SQLite + mmap)
+###############################################################################
+
+# Every details view used to go to MongoDB Atlas over the internet.
+# We keep a local on-disk copy of TMDB metadata keyed by tmdbId so hot
+# reads are served from a memory-mapped SQLite file, and the app keeps
+# showing metadata when Atlas is unreachable.
+TMDB_CACHE_ENABLED = os.getenv("TMDB_CACHE_ENABLED", "true").lower() == "true"
+TMDB_CACHE_PATH = os.getenv("TMDB_CACHE_PATH", os.path.join("cache", "tmdb_cache.sqlite3"))
+TMDB_CACHE_MMAP_BYTES = int(os.getenv("TMDB_CACHE_MMAP_BYTES", str(256 * 1024 * 1024)))
+TMDB_CACHE_WARM_ON_START = os.getenv("TMDB_CACHE_WARM_ON_START", "false").lower() == "true"
+# Invalidation only reaches this process's cache file; other app instances
+# pick up an edited / deleted document once their entry is this old.
+# Expired entries are still served while MongoDB is unreachable.
+TMDB_CACHE_TTL_SECONDS = int(os.getenv("TMDB_CACHE_TTL_SECONDS", "900"))
+
+
+def _normalize_tmdb_doc(doc):
+    """Project a raw tmdb_movies document into the metadata dict the GUI uses."""
+    return {
+        "tmdbId": doc.get("id") or doc.get("tmdbId"),  # Use "id" field from Atlas
+        "title": doc.get("title"),
+        "overview": doc.get("overview"),
+        "genres": doc.get("genres"),
+        "keywords": doc.get("keywords"),
+        "vote_average": doc.get("vote_average"),
+        "vote_count": doc.get("vote_count"),
+        "revenue": doc.get("revenue"),
+        "runtime": doc.get("runtime"),
+        "original_language": doc.get("original_language"),
+        "release_date": doc.get("release_date"),
+        "tagline": doc.get("tagline"),
+        "popularity": doc.get("popularity"),
+    }
+
+
+class TMDBDocumentCache:
+    """
+    Read-through cache of normalized TMDB documents stored in SQLite.
+    The database file is memory-mapped (PRAGMA mmap_size) so point lookups
+    by tmdbId are served from the page cache without a network round trip.
+    One connection is shared across threads and guarded by a lock.
+    """
+
+    def __init__(self, path, mmap_bytes=TMDB_CACHE_MMAP_BYTES, ttl=TMDB_CACHE_TTL_SECONDS):
+        self.path = path
+        self.mmap_bytes = mmap_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA mmap_size={int(mmap_bytes)}")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS tmdb_docs (
+                tmdbId    INTEGER PRIMARY KEY,
+                doc       TEXT NOT NULL,
+                cached_at INTEGER NOT NULL
+            )
+        """)
+
+    def get(self, tmdb_id, allow_stale=False):
+        """Return the cached metadata dict for tmdb_id, or None on a miss (or an entry older than ttl)."""
+        meta, fresh = self.lookup(tmdb_id)
+        return meta if fresh or allow_stale else None
+
+    def lookup(self, tmdb_id):
+        """
+        (metadata, fresh) for tmdb_id: (None, False) when it is not cached,
+        fresh False for an entry older than ttl. Counted once, as a hit or a miss.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT doc, cached_at FROM tmdb_docs WHERE tmdbId = ?", (tmdb_id,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None, False
+            fresh = not self.ttl or time.time() - row[1] <= self.ttl
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+                self.expired += 1
+        return json.loads(row[0]), fresh
+
+    def put(self, meta):
+        """Store one normalized metadata dict (keyed by its tmdbId)."""
+        self.put_many([meta])
+
+    def put_many(self, metas):
+        """Store many normalized metadata dicts in a single transaction."""
+        now_ts = int(time.time())
+        rows = [
+            (int(m["tmdbId"]), json.dumps(m, default=str), now_ts)
+            for m in metas if m.get("tmdbId") is not None
+        ]
+        if not rows:
+            return 0
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO tmdb_docs (tmdbId, doc, cached_at) VALUES (?, ?, ?)",
+                    rows
+                )
+                self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def invalidate(self, tmdb_id):
+        """Drop one tmdbId so the next read goes back to MongoDB."""
+        with self._lock:
+            self._conn.execute("DELETE FROM tmdb_docs WHERE tmdbId = ?", (int(tmdb_id),))
+
+    def invalidate_many(self, tmdb_ids):
+        """Drop many tmdbIds in one transaction (bulk imports)."""
+        rows = [(int(t),) for t in tmdb_ids]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany("DELETE FROM tmdb_docs WHERE tmdbId = ?", rows)
+                self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM tmdb_docs")
+
+    def stats(self):
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM tmdb_docs").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "entries": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "hit_rate": (self.hits / total) if total else 0.0,
+            "ttl_s": self.ttl,
+            "path": self.path,
+        }
+
+
+def _open_tmdb_cache():
+    if not TMDB_CACHE_ENABLED:
+        return None
+    try:
+        return TMDBDocumentCache(TMDB_CACHE_PATH)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"TMDB cache disabled - could not open {TMDB_CACHE_PATH}: {e}")
+        return None
+
+
+# Opened on first use, so CLI tools and auth workers that never read TMDB
+# metadata do not create the cache directory and file
+_tmdb_cache = None
+_tmdb_cache_opened = False
+_tmdb_cache_lock = threading.Lock()
+
+
+def get_tmdb_cache(create=True):
+    """
+    The local TMDB cache (None if disabled or it could not be opened).
+    create=False only opens a cache file that already exists - enough for
+    invalidation, since a file that was never written has nothing to drop.
+    """
+    global _tmdb_cache, _tmdb_cache_opened
+    if _tmdb_cache_opened or IN_AUTH_WORKER or not TMDB_CACHE_ENABLED:
+        return _tmdb_cache
+    if not create and not os.path.exists(TMDB_CACHE_PATH):
+        return None
+    with _tmdb_cache_lock:
+        if not _tmdb_cache_opened:
+            _tmdb_cache = _open_tmdb_cache()
+            _tmdb_cache_opened = True
+    return _tmdb_cache
+
+
+def warm_tmdb_cache(tmdb_ids=None, batch_size=1000):
+    """
+    Bulk-load TMDB documents into the local cache.
+    If tmdb_ids is None we warm every tmdbId referenced by LINKS (the only
+    ids the details view can ask for), using batched $in queries.
+    Returns the number of documents cached.
+    """
+    cache = get_tmdb_cache()
+    if cache is None or tmdb_collection is None:
+        return 0
+
+    if tmdb_ids is None:
+        conn = get_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT tmdbId FROM links WHERE tmdbId IS NOT NULL")
+                tmdb_ids = [row["tmdbId"] for row in cur.fetchall()]
+        finally:
+            conn.close()
+
+    ids = [int(t) for t in tmdb_ids]
+    cached = 0
+    start = time.time()
+    try:
+        for i in range(0, len(ids), batch_size):
+            chunk = ids[i:i + batch_size]
+            cursor = tmdb_collection.find(
+                {"$or": [{"id": {"$in": chunk}}, {"tmdbId": {"$in": chunk}}]}
+            ).batch_size(batch_size)
+            cached += cache.put_many([_normalize_tmdb_doc(d) for d in cursor])
+    except (mongo_errors.ConnectionFailure, mongo_errors.OperationFailure) as e:
+        logger.warning(f"TMDB cache warm stopped early after {cached} docs: {e}")
+    logger.info(f"TMDB cache warmed with {cached} documents in {time.time() - start:.2f}s")
+    return cached
+
+
 def get_tmdb_metadata(tmdb_id):
     if not tmdb_id:
         return None
-    
+
+    # try int cast
+    try:
+        tmdb_id_int = int(tmdb_id)
+    except (TypeError, ValueError):
+        tmdb_id_int = tmdb_id
+
+    # Local cache first - served without touching Atlas. An expired entry
+    # is kept aside and returned only if MongoDB cannot be reached.
+    cache = get_tmdb_cache()
+    stale = None
+    if cache is not None and isinstance(tmdb_id_int, int):
+        with tracer.span("tmdb_cache.get", kind="cache"):
+            try:
+                cached, fresh = cache.lookup(tmdb_id_int)
+            except sqlite3.Error as e:
+                logger.warning(f"TMDB cache lookup failed for {tmdb_id_int}: {e}")
+                cached, fresh = None, False
+            tracer.annotate(**{"cache.hit": fresh})
+        if fresh:
+            return cached
+        stale = cached
+
     # Check MongoDB connection
     if tmdb_collection is None:
-        print("[WARN] MongoDB Atlas not connected. Cannot fetch TMDB metadata.")
-        return None
+        log_event(mongo_log, logging.DEBUG, "mongo.unavailable", op="get_tmdb_metadata", tmdbId=tmdb_id_int)
+        return stale
         
     try:
-        # try int cast
-        try:
-            tmdb_id_int = int(tmdb_id)
-        except:
-            tmdb_id_int = tmdb_id
-
-        print(f"[SEARCH] Looking for TMDB ID: {tmdb_id_int} in MongoDB Atlas...")
-        
         # Try both "id" and "tmdbId" fields (Atlas collection uses "id")
         doc = tmdb_collection.find_one({"id": tmdb_id_int})
         
@@ -230,35 +1499,165 @@ def get_tmdb_metadata(tmdb_id):
             doc = tmdb_collection.find_one({"tmdbId": tmdb_id_int})
 
         if not doc:
-            print(f"[NOT FOUND] No document found for TMDB ID: {tmdb_id_int}")
+            log_event(mongo_log, logging.DEBUG, "tmdb.not_found", tmdbId=tmdb_id_int)
+            if cache is not None and isinstance(tmdb_id_int, int):
+                cache.invalidate(tmdb_id_int)
             return None
-        
-        print(f"[OK] Found movie: {doc.get('title', 'Unknown')}")
 
-        return {
-            "tmdbId": doc.get("id") or doc.get("tmdbId"),  # Use "id" field from Atlas
-            "title": doc.get("title"),
-            "overview": doc.get("overview"),
-            "genres": doc.get("genres"),
-            "keywords": doc.get("keywords"),
-            "vote_average": doc.get("vote_average"),
-            "vote_count": doc.get("vote_count"),
-            "revenue": doc.get("revenue"),
-            "runtime": doc.get("runtime"),
-            "original_language": doc.get("original_language"),
-            "release_date": doc.get("release_date"),
-            "tagline": doc.get("tagline"),
-            "popularity": doc.get("popularity"),
-        }
+        meta = _normalize_tmdb_doc(doc)
+        if cache is not None:
+            try:
+                cache.put(meta)
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                logger.warning(f"Could not cache TMDB ID {tmdb_id_int}: {e}")
+        return meta
     except mongo_errors.ConnectionFailure as e:
-        print(f"[ERROR] MongoDB connection failed in get_tmdb_metadata: {e}")
-        return None
+        log_event(mongo_log, logging.ERROR, "mongo.failed", op="get_tmdb_metadata", reason="connection", error=e)
+        return stale
     except mongo_errors.OperationFailure as e:
-        print(f"[ERROR] MongoDB operation failed in get_tmdb_metadata: {e}")
-        return None
+        log_event(mongo_log, logging.ERROR, "mongo.failed", op="get_tmdb_metadata", reason="operation", error=e)
+        return stale
     except Exception as e:
-        print(f"[ERROR] Unexpected error in get_tmdb_metadata: {e}")
-        return None
+        log_event(mongo_log, logging.ERROR, "mongo.failed", op="get_tmdb_metadata", reason="unexpected", error=e)
+        return stale
+
+
+###############################################################################
+# 1D. IN-PROCESS LRU CACHES (per entity, write-through invalidation)
+###############################################################################
+
+# Clicking between search rows re-ran get_movie_details / is_in_watchlist /
+# get_user_rating on a fresh connection every time. These bounded caches
+# keep recent answers in memory; every write helper that changes the
+# underlying rows invalidates the matching keys. The TTL bounds how stale
+# a cache can get when another GUI session writes the same rows.
+APP_CACHE_MAX_ENTRIES = int(os.getenv("APP_CACHE_MAX_ENTRIES", "2048"))
+APP_CACHE_TTL_SECONDS = float(os.getenv("APP_CACHE_TTL_SECONDS", "60"))
+
+_CACHE_MISS = object()
+
+
+class LRUCache:
+    """Thread-safe LRU cache with an optional per-entry TTL and hit/miss counters."""
+
+    def __init__(self, name, maxsize=APP_CACHE_MAX_ENTRIES, ttl=APP_CACHE_TTL_SECONDS):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value or _CACHE_MISS (None is a valid cached value)."""
+        with self._lock:
+            entry = self._data.get(key, _CACHE_MISS)
+            if entry is _CACHE_MISS:
+                self.misses += 1
+                return _CACHE_MISS
+            value, stored_at = entry
+            if self.ttl and time.monotonic() - stored_at > self.ttl:
+                del self._data[key]
+                self.misses += 1
+                return _CACHE_MISS
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            if self._data.pop(key, _CACHE_MISS) is not _CACHE_MISS:
+                self.invalidations += 1
+
+    def invalidate_where(self, predicate):
+        """Drop every key for which predicate(key) is true (e.g. all keys of one user)."""
+        with self._lock:
+            doomed = [k for k in self._data if predicate(k)]
+            for k in doomed:
+                del self._data[k]
+            self.invalidations += len(doomed)
+
+    def clear(self):
+        with self._lock:
+            self.invalidations += len(self._data)
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            size = len(self._data)
+        total = self.hits + self.misses
+        return {
+            "entries": size,
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+def _entity_key(*parts):
+    """Normalize ids coming from Tk widgets (str) and DB rows (int) to one key."""
+    key = []
+    for part in parts:
+        try:
+            key.append(int(part))
+        except (TypeError, ValueError):
+            key.append(part)
+    return key[0] if len(key) == 1 else tuple(key)
+
+
+movie_details_cache = LRUCache("movie_details")   # movieId -> get_movie_details row
+user_rating_cache = LRUCache("user_rating")       # (userId, movieId) -> rating row / None
+watchlist_cache = LRUCache("watchlist")           # (userId, movieId) -> bool
+
+ENTITY_CACHES = {
+    cache.name: cache
+    for cache in (movie_details_cache, user_rating_cache, watchlist_cache)
+}
+
+
+def invalidate_movie_caches(movie_id):
+    """A movie row, its links or its ratings changed."""
+    key = _entity_key(movie_id)
+    movie_details_cache.invalidate(key)
+    user_rating_cache.invalidate_where(lambda k: k[1] == key)
+    watchlist_cache.invalidate_where(lambda k: k[1] == key)
+
+
+def invalidate_user_caches(user_id):
+    """A user was deleted or renumbered - forget everything keyed on them."""
+    key = _entity_key(user_id)
+    user_rating_cache.invalidate_where(lambda k: k[0] == key)
+    watchlist_cache.invalidate_where(lambda k: k[0] == key)
+    verified_session_cache.invalidate_where(lambda k: k[0] == key)
+
+
+def clear_entity_caches():
+    for cache in ENTITY_CACHES.values():
+        cache.clear()
+
+
+def get_cache_stats():
+    """Snapshot of every in-process cache plus the on-disk TMDB cache."""
+    stats = {name: cache.stats() for name, cache in ENTITY_CACHES.items()}
+    tmdb_cache = get_tmdb_cache(create=False)
+    if tmdb_cache is not None:
+        stats["tmdb_documents"] = tmdb_cache.stats()
+    return stats
+
 
 # ---------------- Concurrency lock helpers for ratings ----------------
 # prof asked: can 1 user update same row in 2 windows at once and break stuff?
@@ -359,10 +1758,11 @@ def acquire_rating_lock(user_id, movie_id, locked_by_username):
         ON DUPLICATE KEY UPDATE locked_by=%s, locked_at=%s
     """
     ts = int(time.time())
-    logger.info(f"[LOCK ACQUIRED] User '{locked_by_username}' locked rating (userId={user_id}, movieId={movie_id})")
+    log_event(lock_log, logging.INFO, "lock.acquired", userId=user_id, movieId=movie_id, by=locked_by_username)
     conn = get_connection()
     try:
         with conn.cursor() as cur:
+            require_user_generation(cur)
             cur.execute(
                 sql,
                 (user_id, movie_id, locked_by_username, ts,
@@ -371,15 +1771,18 @@ def acquire_rating_lock(user_id, movie_id, locked_by_username):
         conn.commit()
         return True
     except pymysql.err.OperationalError as e:
-        print(f"[ERROR] Database connection error in acquire_rating_lock: {e}")
+        log_event(lock_log, logging.ERROR, "lock.acquire_failed", userId=user_id, movieId=movie_id,
+                  reason="connection", error=e)
         conn.rollback()
         return False
     except pymysql.MySQLError as e:
-        print(f"[ERROR] Database error in acquire_rating_lock: {e}")
+        log_event(lock_log, logging.ERROR, "lock.acquire_failed", userId=user_id, movieId=movie_id,
+                  reason="database", error=e)
         conn.rollback()
         return False
     except Exception as e:
-        print(f"[ERROR] Unexpected error in acquire_rating_lock: {e}")
+        log_event(lock_log, logging.ERROR, "lock.acquire_failed", userId=user_id, movieId=movie_id,
+                  reason="unexpected", error=e)
         conn.rollback()
         return False
     finally:
@@ -392,7 +1795,7 @@ def release_rating_lock(user_id, movie_id):
     This unlocks the rating so other users can edit it.
     """
     sql = "DELETE FROM RATING_LOCKS WHERE userId = %s AND movieId = %s"
-    logger.info(f"[LOCK RELEASED] Rating unlocked (userId={user_id}, movieId={movie_id})")
+    log_event(lock_log, logging.INFO, "lock.released", userId=user_id, movieId=movie_id)
     conn = get_connection()
     try:
         with conn.cursor() as cur:
@@ -403,26 +1806,433 @@ def release_rating_lock(user_id, movie_id):
 
 
 ###############################################################################
-# 2. SQL HELPERS – MOVIES (MariaDB side)
+# 1E. SESSION TOKENS (skip the bcrypt check on reconnect / restart)
 ###############################################################################
 
-def search_movies_by_title(keyword):
-    """
-    Simple search by title.
-    Returns rows + runtime (sec).
-    Skips weird placeholder titles like 'Movie_%'.
-    """
-    start = time.time()
-    sql = """
-        SELECT
-            m.movieId,
+# A successful login issues a signed token:
+#     <session_id>.<userId>.<expires_at>.<hmac-sha256>
+# saved in SESSION_TOKEN_PATH. USER_SESSIONS (15_user_sessions.sql) holds a
+# SHA256 of each token, its expiry and a revoked_at stamp. On start-up the
+# saved token is resumed instead of showing the login dialog:
+#   1. signature + expiry are checked in memory (forged/expired tokens never hit the DB)
+#   2. a session verified in the last SESSION_RECHECK_SECONDS is taken from
+#      verified_session_cache
+#   3. otherwise one indexed lookup confirms the row is still live
+# Logout and password changes revoke rows; other processes notice within
+# SESSION_RECHECK_SECONDS.
+#
+# renumber_users.py swaps in tables where users may have new ids. Its RENAME
+# also swaps in USER_ID_GENERATION (20_user_id_generation.sql) with the
+# generation bumped. Every login records the generation next to the userId.
+# User-scoped writes re-read it inside their own transaction
+# (require_user_generation), and the GUI polls it every
+# USER_GENERATION_POLL_SECONDS. On a mismatch the login is dropped and the
+# user has to log in again, so a stale userId never writes as another account.
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", str(12 * 3600)))
+SESSION_RECHECK_SECONDS = float(os.getenv("SESSION_RECHECK_SECONDS", "60"))
+SESSION_TOKEN_PATH = os.getenv("SESSION_TOKEN_PATH", os.path.join("cache", "session.token"))
+SESSION_SECRET_PATH = os.getenv("SESSION_SECRET_PATH", os.path.join("cache", "session.secret"))
+USER_GENERATION_POLL_SECONDS = float(os.getenv("USER_GENERATION_POLL_SECONDS", "30"))
+
+verified_session_cache = LRUCache("verified_sessions", ttl=SESSION_RECHECK_SECONDS)  # (userId, session_id) -> user
+ENTITY_CACHES[verified_session_cache.name] = verified_session_cache
+
+_session_secret = None
+_session_secret_lock = threading.Lock()
+
+
+def _get_session_secret():
+    """HMAC key: SESSION_SECRET, else a random key kept next to the token (created once, mode 600)."""
+    global _session_secret
+    with _session_secret_lock:
+        if _session_secret is None:
+            secret = os.getenv("SESSION_SECRET")
+            if not secret:
+                try:
+                    with open(SESSION_SECRET_PATH, encoding="utf-8") as f:
+                        secret = f.read().strip()
+                except FileNotFoundError:
+                    secret = secrets.token_hex(32)
+                    os.makedirs(os.path.dirname(SESSION_SECRET_PATH) or ".", exist_ok=True)
+                    fd = os.open(SESSION_SECRET_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                    with os.fdopen(fd, "w", encoding="utf-8") as f:
+                        f.write(secret)
+            _session_secret = secret.encode("utf-8")
+        return _session_secret
+
+
+def _sign_session(session_id, user_id, expires_at):
+    payload = f"{session_id}.{user_id}.{expires_at}".encode("utf-8")
+    return hmac.new(_get_session_secret(), payload, hashlib.sha256).hexdigest()
+
+
+def _token_digest(token):
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def parse_session_token(token):
+    """(session_id, userId, expires_at) for a well-signed, unexpired token, else None. No DB access."""
+    try:
+        session_id, user_id, expires_at, signature = token.strip().split(".")
+        user_id, expires_at = int(user_id), int(expires_at)
+    except (AttributeError, ValueError):
+        return None
+    if not hmac.compare_digest(signature, _sign_session(session_id, user_id, expires_at)):
+        return None
+    if expires_at <= time.time():
+        return None
+    return session_id, user_id, expires_at
+
+
+def create_session(user, client=None):
+    """Store a new session for a user who just passed the password check; returns its token."""
+    session_id = secrets.token_hex(16)
+    now = int(time.time())
+    expires_at = now + SESSION_TTL_SECONDS
+    token = f"{session_id}.{user['userId']}.{expires_at}.{_sign_session(session_id, user['userId'], expires_at)}"
+    conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO user_sessions (session_id, userId, token_hash, created_at, expires_at, last_seen, client)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                """,
+                (session_id, user['userId'], _token_digest(token), now, expires_at, now,
+                 (client or platform.node())[:100])
+            )
+        conn.commit()
+    finally:
+        conn.close()
+    verified_session_cache.put((user['userId'], session_id), _session_user(user))
+    log_event(auth_log, logging.INFO, "session.created", userId=user['userId'], session=session_id[:8],
+              expires_at=expires_at)
+    return token
+
+
+def _session_user(user):
+    return {k: user.get(k) for k in ("userId", "username", "email", "role", "generation")}
+
+
+def resume_session(token):
+    """User dict for a live session token (no bcrypt), else None."""
+    parsed = parse_session_token(token) if token else None
+    if parsed is None:
+        return None
+    session_id, user_id, _ = parsed
+    key = (user_id, session_id)
+    cached = verified_session_cache.get(key)
+    if cached is not _CACHE_MISS:
+        return dict(cached)
+
+    now = int(time.time())
+    conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT u.userId, u.username, u.email, u.role, g.generation
+                FROM user_sessions s
+                INNER JOIN users u ON u.userId = s.userId AND u.deleted_at IS NULL
+                CROSS JOIN user_id_generation g
+                WHERE s.session_id = %s
+                  AND s.userId = %s
+                  AND s.token_hash = %s
+                  AND s.revoked_at IS NULL
+                  AND s.expires_at > %s
+                """,
+                (session_id, user_id, _token_digest(token), now)
+            )
+            user = cur.fetchone()
+            if user:
+                cur.execute("UPDATE user_sessions SET last_seen = %s WHERE session_id = %s", (now, session_id))
+        conn.commit()
+    except pymysql.MySQLError as e:
+        conn.rollback()
+        log_event(auth_log, logging.WARNING, "session.check_failed", session=session_id[:8], error=e)
+        return None
+    finally:
+        conn.close()
+    if not user:
+        verified_session_cache.invalidate(key)
+        log_event(auth_log, logging.INFO, "session.rejected", userId=user_id, session=session_id[:8])
+        return None
+    verified_session_cache.put(key, dict(user))
+    return dict(user)
+
+
+def revoke_session(token):
+    """Revoke one session (logout)."""
+    parsed = parse_session_token(token) if token else None
+    if parsed is None:
+        return False
+    session_id, user_id, _ = parsed
+    verified_session_cache.invalidate((user_id, session_id))
+    conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                "UPDATE user_sessions SET revoked_at = %s WHERE session_id = %s AND revoked_at IS NULL",
+                (int(time.time()), session_id)
+            )
+            revoked = cur.rowcount
+        conn.commit()
+    finally:
+        conn.close()
+    log_event(auth_log, logging.INFO, "session.revoked", userId=user_id, session=session_id[:8])
+    return revoked == 1
+
+
+def revoke_user_sessions(user_id, keep_token=None):
+    """Revoke every live session of a user (password change), optionally keeping the caller's own."""
+    keep = parse_session_token(keep_token) if keep_token else None
+    keep_id = keep[0] if keep and keep[1] == _entity_key(user_id) else ""
+    verified_session_cache.invalidate_where(lambda k: k[0] == _entity_key(user_id) and k[1] != keep_id)
+    conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                UPDATE user_sessions SET revoked_at = %s
+                WHERE userId = %s AND session_id <> %s AND revoked_at IS NULL
+                """,
+                (int(time.time()), user_id, keep_id)
+            )
+            revoked = cur.rowcount
+        conn.commit()
+    finally:
+        conn.close()
+    log_event(auth_log, logging.INFO, "session.revoked_all", userId=user_id, count=revoked)
+    return revoked
+
+
+def load_session_token():
+    try:
+        with open(SESSION_TOKEN_PATH, encoding="utf-8") as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def save_session_token(token):
+    os.makedirs(os.path.dirname(SESSION_TOKEN_PATH) or ".", exist_ok=True)
+    fd = os.open(SESSION_TOKEN_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(token)
+
+
+def clear_session_token():
+    try:
+        os.remove(SESSION_TOKEN_PATH)
+    except FileNotFoundError:
+        pass
+
+
+def login_with_session(username, password):
+    """
+    Password login (bcrypt) that also starts a session and saves its token.
+    A failure to store the session does not fail the login.
+    """
+    user = authenticate_user(username, password)
+    if user:
+        try:
+            save_session_token(create_session(user))
+        except (pymysql.MySQLError, OSError) as e:
+            log_event(auth_log, logging.WARNING, "session.create_failed", userId=user['userId'], error=e)
+    return user
+
+
+def resume_saved_session():
+    """Log in from the saved token without a password check; None if there is no live session."""
+    token = load_session_token()
+    if not token:
+        return None
+    user = resume_session(token)
+    if user is None:
+        clear_session_token()
+        return None
+    CURRENT_USER.update(user)
+    log_event(auth_log, logging.INFO, "session.resumed", userId=user['userId'])
+    return user
+
+
+def end_current_session():
+    """Logout: revoke the saved session server-side and forget the token."""
+    token = load_session_token()
+    clear_session_token()
+    if token:
+        try:
+            revoke_session(token)
+        except pymysql.MySQLError as e:
+            log_event(auth_log, logging.WARNING, "session.revoke_failed", error=e)
+
+
+class UserIdsChanged(PermissionError):
+    """User ids were renumbered since this login; the user must log in again."""
+
+
+_user_ids_changed_hook = None
+
+
+def on_user_ids_changed(callback):
+    """Register the GUI's re-login callback (called once per detected renumbering)."""
+    global _user_ids_changed_hook
+    _user_ids_changed_hook = callback
+
+
+def read_user_generation(cur=None):
+    """Current USER_ID_GENERATION value (on `cur` to read it inside a transaction)."""
+    if cur is not None:
+        cur.execute("SELECT generation FROM user_id_generation")
+        return cur.fetchone()["generation"]
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            generation = read_user_generation(c)
+        conn.commit()
+        return generation
+    finally:
+        conn.close()
+
+
+def drop_stale_login():
+    """
+    The userId held by this process belongs to an older numbering: forget the
+    login, the saved token and every cached id, then let the GUI ask again.
+    """
+    log_event(auth_log, logging.WARNING, "session.user_ids_changed", userId=CURRENT_USER.get("userId"),
+              generation=CURRENT_USER.get("generation"))
+    clear_session_token()
+    clear_entity_caches()
+    CURRENT_USER.pop("generation", None)
+    CURRENT_USER.update({"userId": None, "username": "guest", "email": None, "role": "guest"})
+    if _user_ids_changed_hook is not None:
+        _user_ids_changed_hook()
+
+
+def require_user_generation(cur, user=None):
+    """
+    Call first inside a user-scoped write transaction. Reading USER_ID_GENERATION
+    there holds its metadata lock until commit, so the renumbering RENAME cannot
+    slip in between this check and the write. `user` defaults to CURRENT_USER.
+    """
+    expected = (CURRENT_USER if user is None else user).get("generation")
+    if expected is None:
+        return  # CLI tools and explicit identities that never logged in
+    if read_user_generation(cur) != expected:
+        drop_stale_login()
+        raise UserIdsChanged("User ids were renumbered since you logged in - please log in again")
+
+
+###############################################################################
+# 1F. ID ALLOCATION (block-reserving sequences)
+###############################################################################
+
+# New userId / movieId values come from ID_SEQUENCES (16_id_sequences.sql)
+# instead of SELECT MAX(id) + 1. Each process reserves a block of
+# ID_BLOCK_SIZE ids with one atomic UPDATE ... LAST_INSERT_ID(), then hands
+# them out from memory, so two GUI sessions registering at the same moment
+# can never get the same id. The reservation also lifts the sequence past
+# MAX(id), so rows imported with explicit ids are skipped over. Ids left in
+# a block when the process exits are simply never used.
+ID_BLOCK_SIZE = int(os.getenv("ID_BLOCK_SIZE", "20"))
+
+
+def is_duplicate_primary_key(e):
+    """True for a 1062 duplicate-key error on the PRIMARY KEY (not on another unique index)."""
+    return isinstance(e, pymysql.IntegrityError) and e.args and e.args[0] == 1062 and "PRIMARY" in str(e)
+
+
+class IdAllocator:
+    """Hands out ids for one table from blocks reserved in ID_SEQUENCES."""
+
+    def __init__(self, name, table, column, block_size=ID_BLOCK_SIZE):
+        self.name = name
+        self.table = table
+        self.column = column
+        self.block_size = block_size
+        self.reservations = 0
+        self._next = 0
+        self._end = 0
+        self._lock = threading.Lock()
+
+    def _reserve(self, count):
+        """Atomically take `count` ids; returns the first one."""
+        conn = get_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    f"""
+                    UPDATE id_sequences
+                    SET next_id = LAST_INSERT_ID(
+                        GREATEST(next_id, (SELECT COALESCE(MAX({self.column}), 0) + 1 FROM {self.table})) + %s
+                    )
+                    WHERE name = %s
+                    """,
+                    (count, self.name)
+                )
+                if cur.rowcount != 1:
+                    raise LookupError(f"No '{self.name}' row in ID_SEQUENCES - run 16_id_sequences.sql")
+                cur.execute("SELECT LAST_INSERT_ID() AS end_id")
+                end = int(cur.fetchone()["end_id"])
+            conn.commit()
+        finally:
+            conn.close()
+        self.reservations += 1
+        log_event(sql_log, logging.DEBUG, "ids.reserved", sequence=self.name, first=end - count, count=count)
+        return end - count
+
+    def next_id(self):
+        with self._lock:
+            if self._next >= self._end:
+                self._next = self._reserve(self.block_size)
+                self._end = self._next + self.block_size
+            value = self._next
+            self._next += 1
+            return value
+
+    def reserve(self, count):
+        """`count` consecutive ids in one round trip (bulk inserts); returns a range."""
+        if count <= 0:
+            return range(0)
+        first = self._reserve(count)
+        return range(first, first + count)
+
+    def discard(self):
+        """Forget the rest of the current block (after it collided with an explicit insert)."""
+        with self._lock:
+            self._next = self._end = 0
+
+
+user_ids = IdAllocator("users", "users", "userId")
+movie_ids = IdAllocator("movies", "movies", "movieId")
+
+# Attempts for an insert whose allocated id collides with a row inserted
+# with an explicit id (imports) after the block was reserved
+ID_INSERT_ATTEMPTS = 3
+
+
+###############################################################################
+# 2. SQL HELPERS – MOVIES (MariaDB side)
+###############################################################################
+
+def search_movies_by_title(keyword):
+    """
+    Simple search by title.
+    Returns rows + runtime (sec).
+    Skips weird placeholder titles like 'Movie_%'.
+    """
+    start = time.time()
+    sql = """
+        SELECT
+            m.movieId,
             m.title,
             COUNT(r.rating) AS vote_count,
             ROUND(AVG(r.rating), 2) AS avg_rating
         FROM movies m
         LEFT JOIN ratings r ON m.movieId = r.movieId
         WHERE m.title LIKE %s
-          AND m.title NOT LIKE 'Movie_%%'
+          AND m.is_placeholder = 0
         GROUP BY m.movieId, m.title
         ORDER BY
             ROUND(AVG(r.rating), 2) IS NULL ASC,
@@ -457,7 +2267,7 @@ def search_movies_advanced(title=None, min_rating=None, max_rating=None, min_vot
         LEFT JOIN ratings r ON m.movieId = r.movieId
     """
 
-    conditions = ["m.title NOT LIKE 'Movie_%%'"]
+    conditions = ["m.is_placeholder = 0"]
     params = []
 
     if title:
@@ -497,7 +2307,15 @@ def get_movie_details(movie_id):
     """
     Join movies, ratings, links to get SQL info for one movie.
     Includes tmdbId so we can jump into Mongo.
+    Served from movie_details_cache when the movie was looked up recently.
     """
+    key = _entity_key(movie_id)
+    with tracer.span("movie_details_cache.get", kind="cache"):
+        cached = movie_details_cache.get(key)
+        tracer.annotate(**{"cache.hit": cached is not _CACHE_MISS})
+    if cached is not _CACHE_MISS:
+        return dict(cached) if cached else cached
+
     sql = """
         SELECT
             m.movieId,
@@ -520,7 +2338,8 @@ def get_movie_details(movie_id):
             row = cur.fetchone()
     finally:
         conn.close()
-    return row
+    movie_details_cache.put(key, row)
+    return dict(row) if row else row
 
 
 def find_movie_by_title_sql(title):
@@ -532,7 +2351,7 @@ def find_movie_by_title_sql(title):
         SELECT movieId, title
         FROM movies
         WHERE title LIKE %s
-          AND title NOT LIKE 'Movie_%%'
+          AND is_placeholder = 0
         ORDER BY title ASC
         LIMIT 10
     """
@@ -551,56 +2370,58 @@ def find_movie_by_title_sql(title):
 # 2B. MOVIE CRUD OPERATIONS (ADMIN ONLY)
 ###############################################################################
 
+def _insert_movie_row(cur, title, release_date):
+    """INSERT one movie with an allocated movieId on the caller's transaction; returns the id."""
+    sql = """
+        INSERT INTO movies (movieId, title, release_date, is_placeholder)
+        VALUES (%s, %s, %s, 0)
+    """
+    for attempt in range(ID_INSERT_ATTEMPTS):
+        # Insert with an explicit movieId from this process's reserved block
+        movie_id = movie_ids.next_id()
+        try:
+            cur.execute(sql, (movie_id, title, release_date))
+            return movie_id
+        except pymysql.IntegrityError as e:
+            if not is_duplicate_primary_key(e) or attempt == ID_INSERT_ATTEMPTS - 1:
+                raise
+            movie_ids.discard()
+
+
 def add_movie_to_sql(title, release_date=None):
     """
     Add a new movie to MariaDB movies table.
     Returns (success, movie_id) tuple.
     """
-    print(f"[DEBUG add_movie_to_sql] CURRENT_USER: {CURRENT_USER}")
-    print(f"[DEBUG add_movie_to_sql] role check: '{CURRENT_USER['role']}' != 'admin' = {CURRENT_USER['role'] != 'admin'}")
-    
     if CURRENT_USER['role'] != 'admin':
-        print(f"[ERROR add_movie_to_sql] Permission denied - role is '{CURRENT_USER['role']}', not 'admin'")
+        log_event(auth_log, logging.WARNING, "permission.denied", op="add_movie_to_sql",
+                  user=CURRENT_USER['username'], role=CURRENT_USER['role'])
         return False, None
     
     conn = get_connection()
     try:
         with conn.cursor() as cur:
-            # Get the next available movieId (handles both AUTO_INCREMENT and non-AUTO_INCREMENT tables)
-            cur.execute("SELECT COALESCE(MAX(movieId), 0) + 1 AS next_id FROM movies")
-            next_id = cur.fetchone()['next_id']
-            
-            # Insert with explicit movieId
-            sql = """
-                INSERT INTO movies (movieId, title, release_date)
-                VALUES (%s, %s, %s)
-            """
-            cur.execute(sql, (next_id, title, release_date))
-            movie_id = next_id
+            movie_id = _insert_movie_row(cur, title, release_date)
         conn.commit()
-        print(f"[DEBUG add_movie_to_sql] Success! movie_id={movie_id}")
+        invalidate_movie_caches(movie_id)
+        log_event(sql_log, logging.DEBUG, "movie.added", movieId=movie_id)
         return True, movie_id
     except pymysql.MySQLError as e:
         conn.rollback()
-        print(f"[ERROR add_movie_to_sql] Database error: {e}")
+        log_event(sql_log, logging.ERROR, "movie.add_failed", title=title, error=e)
         return False, None
     finally:
         conn.close()
 
 
-def update_movie_in_sql(movie_id, title=None, release_date=None):
-    """
-    Update movie details in MariaDB.
-    Only updates fields that are provided (not None).
-    """
-    if CURRENT_USER['role'] != 'admin':
-        return False
-        
+def _update_movie_row(cur, movie_id, title=None, release_date=None):
+    """UPDATE the provided (not None) columns; False when there is nothing to set."""
     updates = []
     params = []
     
     if title is not None:
-        updates.append("title = %s")
+        # A title set by an admin is a real title, even on a Movie_<id> placeholder row
+        updates.append("title = %s, is_placeholder = 0")
         params.append(title)
     if release_date is not None:
         updates.append("release_date = %s")
@@ -610,13 +2431,26 @@ def update_movie_in_sql(movie_id, title=None, release_date=None):
         return False
         
     params.append(movie_id)
-    sql = f"UPDATE movies SET {', '.join(updates)} WHERE movieId = %s"
+    cur.execute(f"UPDATE movies SET {', '.join(updates)} WHERE movieId = %s", tuple(params))
+    return True
+
+
+def update_movie_in_sql(movie_id, title=None, release_date=None):
+    """
+    Update movie details in MariaDB.
+    Only updates fields that are provided (not None).
+    """
+    if CURRENT_USER['role'] != 'admin':
+        return False
+    if title is None and release_date is None:
+        return False
     
     conn = get_connection()
     try:
         with conn.cursor() as cur:
-            cur.execute(sql, tuple(params))
+            _update_movie_row(cur, movie_id, title, release_date)
         conn.commit()
+        invalidate_movie_caches(movie_id)
         return True
     except pymysql.MySQLError as e:
         conn.rollback()
@@ -626,6 +2460,15 @@ def update_movie_in_sql(movie_id, title=None, release_date=None):
         conn.close()
 
 
+def _delete_movie_rows(cur, movie_id):
+    # Delete ratings first (foreign key constraint)
+    cur.execute("DELETE FROM ratings WHERE movieId = %s", (movie_id,))
+    # Delete links
+    cur.execute("DELETE FROM links WHERE movieId = %s", (movie_id,))
+    # Delete movie
+    cur.execute("DELETE FROM movies WHERE movieId = %s", (movie_id,))
+
+
 def delete_movie_from_sql(movie_id):
     """
     Delete a movie from MariaDB movies table.
@@ -637,13 +2480,9 @@ def delete_movie_from_sql(movie_id):
     conn = get_connection()
     try:
         with conn.cursor() as cur:
-            # Delete ratings first (foreign key constraint)
-            cur.execute("DELETE FROM ratings WHERE movieId = %s", (movie_id,))
-            # Delete links
-            cur.execute("DELETE FROM links WHERE movieId = %s", (movie_id,))
-            # Delete movie
-            cur.execute("DELETE FROM movies WHERE movieId = %s", (movie_id,))
+            _delete_movie_rows(cur, movie_id)
         conn.commit()
+        invalidate_movie_caches(movie_id)
         return True
     except pymysql.MySQLError as e:
         conn.rollback()
@@ -653,42 +2492,65 @@ def delete_movie_from_sql(movie_id):
         conn.close()
 
 
+def _upsert_movie_links(cur, movie_id, imdb_id=None, tmdb_id=None):
+    cur.execute(
+        """
+        INSERT INTO links (movieId, imdbId, tmdbId)
+        VALUES (%s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            imdbId = VALUES(imdbId),
+            tmdbId = VALUES(tmdbId)
+        """,
+        (movie_id, imdb_id, tmdb_id)
+    )
+
+
 def update_movie_links(movie_id, imdb_id=None, tmdb_id=None):
     """
     Update or insert links for a movie.
     """
-    print(f"[DEBUG update_movie_links] Called with movie_id={movie_id}, imdb_id={imdb_id}, tmdb_id={tmdb_id}")
-    print(f"[DEBUG update_movie_links] CURRENT_USER['role']={CURRENT_USER['role']}")
-    
     if CURRENT_USER['role'] != 'admin':
-        print("[ERROR update_movie_links] Permission denied - not admin")
+        log_event(auth_log, logging.WARNING, "permission.denied", op="update_movie_links",
+                  user=CURRENT_USER['username'], role=CURRENT_USER['role'])
         return False
         
-    sql = """
-        INSERT INTO links (movieId, imdbId, tmdbId)
-        VALUES (%s, %s, %s)
-        ON DUPLICATE KEY UPDATE
-            imdbId = VALUES(imdbId),
-            tmdbId = VALUES(tmdbId)
-    """
     conn = get_connection()
     try:
         with conn.cursor() as cur:
-            print(f"[DEBUG update_movie_links] Executing SQL: INSERT INTO links VALUES ({movie_id}, {imdb_id}, {tmdb_id})")
-            cur.execute(sql, (movie_id, imdb_id, tmdb_id))
+            _upsert_movie_links(cur, movie_id, imdb_id, tmdb_id)
         conn.commit()
-        print(f"[SUCCESS update_movie_links] Links updated successfully")
+        invalidate_movie_caches(movie_id)
+        log_event(sql_log, logging.DEBUG, "links.upserted", movieId=movie_id, imdbId=imdb_id, tmdbId=tmdb_id)
         return True
     except pymysql.MySQLError as e:
         conn.rollback()
-        import traceback
-        print(f"[ERROR update_movie_links] Database error: {e}")
-        print(f"[ERROR update_movie_links] Traceback: {traceback.format_exc()}")
+        log_event(sql_log, logging.ERROR, "links.upsert_failed", movieId=movie_id, error=e, exc_info=True)
         return False
     finally:
         conn.close()
 
 
+def build_tmdb_movie_doc(tmdb_id, title, overview="", genres="", keywords="",
+                         vote_average=0, vote_count=0, revenue=0, runtime=0,
+                         original_language="en", release_date="", tagline="", popularity=0):
+    """The tmdb_movies document an admin save writes (keyed by "id" = tmdbId)."""
+    return {
+        "id": int(tmdb_id),
+        "title": title,
+        "overview": overview,
+        "genres": genres,
+        "keywords": keywords,
+        "vote_average": float(vote_average) if vote_average else 0,
+        "vote_count": int(vote_count) if vote_count else 0,
+        "revenue": float(revenue) if revenue else 0,
+        "runtime": float(runtime) if runtime else 0,
+        "original_language": original_language,
+        "release_date": release_date,
+        "tagline": tagline,
+        "popularity": float(popularity) if popularity else 0,
+    }
+
+
 def add_movie_to_mongo(tmdb_id, title, overview="", genres="", keywords="", 
                        vote_average=0, vote_count=0, revenue=0, runtime=0,
                        original_language="en", release_date="", tagline="", popularity=0):
@@ -696,38 +2558,18 @@ def add_movie_to_mongo(tmdb_id, title, overview="", genres="", keywords="",
     Add or update a movie in MongoDB tmdb_movies collection.
     This allows admin to add rich metadata for movies.
     """
-    print(f"[DEBUG add_movie_to_mongo] Called with tmdb_id={tmdb_id}, title={title}")
-    print(f"[DEBUG add_movie_to_mongo] CURRENT_USER['role']={CURRENT_USER['role']}")
-    
     if CURRENT_USER['role'] != 'admin':
-        print("[ERROR add_movie_to_mongo] Permission denied - not admin")
+        log_event(auth_log, logging.WARNING, "permission.denied", op="add_movie_to_mongo",
+                  user=CURRENT_USER['username'], role=CURRENT_USER['role'])
         return False
         
     if tmdb_collection is None:
-        print("[ERROR add_movie_to_mongo] MongoDB not connected (tmdb_collection is None)")
+        log_event(mongo_log, logging.WARNING, "mongo.unavailable", op="add_movie_to_mongo", tmdbId=tmdb_id)
         return False
-    
-    print(f"[DEBUG add_movie_to_mongo] MongoDB connection OK, preparing document...")
         
     try:
-        doc = {
-            "id": int(tmdb_id),
-            "title": title,
-            "overview": overview,
-            "genres": genres,
-            "keywords": keywords,
-            "vote_average": float(vote_average) if vote_average else 0,
-            "vote_count": int(vote_count) if vote_count else 0,
-            "revenue": float(revenue) if revenue else 0,
-            "runtime": float(runtime) if runtime else 0,
-            "original_language": original_language,
-            "release_date": release_date,
-            "tagline": tagline,
-            "popularity": float(popularity) if popularity else 0,
-        }
-        
-        print(f"[DEBUG add_movie_to_mongo] Document prepared: {doc}")
-        print(f"[DEBUG add_movie_to_mongo] Executing upsert operation...")
+        doc = build_tmdb_movie_doc(tmdb_id, title, overview, genres, keywords, vote_average, vote_count,
+                                   revenue, runtime, original_language, release_date, tagline, popularity)
         
         # Upsert (update if exists, insert if not)
         result = tmdb_collection.update_one(
@@ -736,13 +2578,14 @@ def add_movie_to_mongo(tmdb_id, title, overview="", genres="", keywords="",
             upsert=True
         )
         
-        print(f"[DEBUG add_movie_to_mongo] Upsert result: matched={result.matched_count}, modified={result.modified_count}, upserted_id={result.upserted_id}")
-        print(f"[SUCCESS add_movie_to_mongo] MongoDB operation completed successfully")
+        log_event(mongo_log, logging.DEBUG, "movie.upserted", tmdbId=tmdb_id, matched=result.matched_count,
+                  modified=result.modified_count, inserted=result.upserted_id is not None)
+        tmdb_cache = get_tmdb_cache(create=False)
+        if tmdb_cache is not None:
+            tmdb_cache.invalidate(tmdb_id)
         return True
     except Exception as e:
-        import traceback
-        print(f"[ERROR add_movie_to_mongo] Exception: {e}")
-        print(f"[ERROR add_movie_to_mongo] Traceback: {traceback.format_exc()}")
+        log_event(mongo_log, logging.ERROR, "movie.upsert_failed", tmdbId=tmdb_id, error=e, exc_info=True)
         return False
 
 
@@ -759,6 +2602,9 @@ def delete_movie_from_mongo(tmdb_id):
         
     try:
         tmdb_collection.delete_one({"id": int(tmdb_id)})
+        tmdb_cache = get_tmdb_cache(create=False)
+        if tmdb_cache is not None:
+            tmdb_cache.invalidate(tmdb_id)
         return True
     except Exception as e:
         print(f"[ERROR] Failed to delete movie from MongoDB: {e}")
@@ -766,82 +2612,750 @@ def delete_movie_from_mongo(tmdb_id):
 
 
 ###############################################################################
-# 3. NoSQL HELPERS – MongoDB side
+# 2C. MOVIE OUTBOX (MariaDB -> MongoDB relay)
 ###############################################################################
 
+# An admin save used to write MariaDB, then MongoDB, then LINKS as three
+# separate steps, so a failure in between left the stores disagreeing. Now
+# the movie/links rows and a MOVIE_OUTBOX row (17_movie_outbox.sql) holding
+# the Mongo change are committed in ONE MariaDB transaction, and
+# OutboxRelay applies pending rows to tmdb_movies in the background. The
+# Mongo writes are upserts/deletes keyed by "id", so applying a row twice
+# (crash after bulk_write, two app processes) is harmless.
+OUTBOX_BATCH = int(os.getenv("OUTBOX_BATCH", "100"))
+OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "5"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "10"))
+OUTBOX_RETRY_SECONDS = float(os.getenv("OUTBOX_RETRY_SECONDS", "2"))
+OUTBOX_RETRY_MAX_SECONDS = 300
+
+
+def _enqueue_outbox(cur, op, movie_id, tmdb_id, doc=None):
+    """Queue a tmdb_movies change on the caller's transaction; returns the outbox id."""
+    cur.execute(
+        "INSERT INTO movie_outbox (movieId, tmdbId, op, payload) VALUES (%s, %s, %s, %s)",
+        (movie_id, int(tmdb_id), op, json.dumps(doc) if doc is not None else None)
+    )
+    return cur.lastrowid
 
-def search_movies_by_genre_mongo(genre):
+
+def _commit_movie_change(write):
     """
-    Regex match on genres field.
-    This shows flexible text search in NoSQL.
+    Run write(cur) -> {"movieId", ...} in one transaction, then wake the relay.
+    Returns (True, result) or (False, None).
     """
-    # Check MongoDB connection
-    if tmdb_collection is None:
-        print("[WARN] MongoDB Atlas not connected. Cannot search by genre.")
-        return [], 0.0
-        
+    conn = get_connection()
     try:
-        start = time.time()
-        print(f"[SEARCH] Searching MongoDB Atlas for genre: {genre}")
-        cursor = tmdb_collection.find(
-            {"genres": {"$regex": genre, "$options": "i"}},
-            {
-                "id": 1,  # Changed from "tmdbId" to "id" for Atlas
-                "title": 1,
-                "genres": 1,
-                "vote_average": 1,
-                "overview": 1,
-                "runtime": 1,
-            }
-        ).limit(50)
-        docs = list(cursor)
-        print(f"[OK] Found {len(docs)} movies for genre '{genre}'")
-        return docs, time.time() - start
-    except mongo_errors.ConnectionFailure as e:
-        print(f"[ERROR] MongoDB connection failed in genre search: {e}")
-        return [], 0.0
-    except mongo_errors.OperationFailure as e:
-        print(f"[ERROR] MongoDB operation failed in genre search: {e}")
-        return [], 0.0
-    except Exception as e:
-        print(f"[ERROR] Unexpected error in genre search: {e}")
-        return [], 0.0
+        with conn.cursor() as cur:
+            result = write(cur)
+        conn.commit()
+    except pymysql.MySQLError as e:
+        conn.rollback()
+        log_event(sql_log, logging.ERROR, "movie.save_failed", error=e, exc_info=True)
+        return False, None
+    finally:
+        conn.close()
+    invalidate_movie_caches(result["movieId"])
+    outbox_relay.wake()
+    return True, result
 
 
-def search_movies_by_keyword_mongo(keyword):
+def add_movie_with_outbox(title, release_date=None, imdb_id=None, tmdb_id=None, mongo_fields=None):
     """
-    Regex match on keywords field.
-    Used in performance tab to show NoSQL shines on text-y stuff.
+    Create the movie, its LINKS row (when imdb_id is given) and the queued Mongo upsert
+    in one commit. tmdb_id defaults to the new movieId.
+    Returns (success, {"movieId", "tmdbId", "outboxId", "linked"}).
     """
-    # Check MongoDB connection
-    if tmdb_collection is None:
-        print("[WARN] MongoDB Atlas not connected. Cannot search by keyword.")
-        return [], 0.0
-        
-    try:
-        start = time.time()
-        print(f"[SEARCH] Searching MongoDB Atlas for keyword: {keyword}")
-        cursor = tmdb_collection.find(
-            {"keywords": {"$regex": keyword, "$options": "i"}},
-            {
-                "id": 1,  # Changed from "tmdbId" to "id" for Atlas
-                "title": 1,
+    if CURRENT_USER['role'] != 'admin':
+        log_event(auth_log, logging.WARNING, "permission.denied", op="add_movie_with_outbox",
+                  user=CURRENT_USER['username'], role=CURRENT_USER['role'])
+        return False, None
+
+    def _write(cur):
+        movie_id = _insert_movie_row(cur, title, release_date)
+        tmdb = tmdb_id or movie_id
+        # LINKS.imdbId is NOT NULL: without an IMDb id there is no links row to write
+        if imdb_id:
+            _upsert_movie_links(cur, movie_id, imdb_id, tmdb)
+        doc = build_tmdb_movie_doc(tmdb, title, **(mongo_fields or {}))
+        outbox_id = _enqueue_outbox(cur, "upsert", movie_id, tmdb, doc)
+        return {"movieId": movie_id, "tmdbId": tmdb, "outboxId": outbox_id, "linked": bool(imdb_id)}
+
+    ok, result = _commit_movie_change(_write)
+    if ok:
+        log_event(sql_log, logging.DEBUG, "movie.added", movieId=result["movieId"], outboxId=result["outboxId"])
+    return ok, result
+
+
+def update_movie_with_outbox(movie_id, title=None, release_date=None, imdb_id=None, tmdb_id=None,
+                             mongo_fields=None):
+    """
+    Update the movie row and LINKS (when imdb_id is given), and queue a Mongo upsert when
+    mongo_fields is given, in one commit. Returns (success, {"movieId", "tmdbId", "outboxId",
+    "linked"}); outboxId is None when nothing was queued.
+    """
+    if CURRENT_USER['role'] != 'admin':
+        log_event(auth_log, logging.WARNING, "permission.denied", op="update_movie_with_outbox",
+                  user=CURRENT_USER['username'], role=CURRENT_USER['role'])
+        return False, None
+    tmdb = tmdb_id or movie_id
+
+    def _write(cur):
+        _update_movie_row(cur, movie_id, title, release_date)
+        if imdb_id:
+            _upsert_movie_links(cur, movie_id, imdb_id, tmdb)
+        outbox_id = None
+        if mongo_fields is not None:
+            doc = build_tmdb_movie_doc(tmdb, title or "Unknown", **mongo_fields)
+            outbox_id = _enqueue_outbox(cur, "upsert", movie_id, tmdb, doc)
+        return {"movieId": movie_id, "tmdbId": tmdb, "outboxId": outbox_id, "linked": bool(imdb_id)}
+
+    return _commit_movie_change(_write)
+
+
+def delete_movie_with_outbox(movie_id, tmdb_id=None):
+    """Delete the movie (ratings, links, row) and queue the Mongo delete in one commit."""
+    if CURRENT_USER['role'] != 'admin':
+        return False, None
+    tmdb = tmdb_id or movie_id
+
+    def _write(cur):
+        _delete_movie_rows(cur, movie_id)
+        outbox_id = _enqueue_outbox(cur, "delete", movie_id, tmdb)
+        return {"movieId": movie_id, "tmdbId": tmdb, "outboxId": outbox_id}
+
+    return _commit_movie_change(_write)
+
+
+class OutboxRelay:
+    """Background thread that applies pending MOVIE_OUTBOX rows to tmdb_movies."""
+
+    def __init__(self, batch_size=OUTBOX_BATCH, poll_seconds=OUTBOX_POLL_SECONDS,
+                 max_attempts=OUTBOX_MAX_ATTEMPTS):
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max_attempts
+        self.applied = 0
+        self.failed = 0
+        # outboxId -> "applied" / "retry" / "dead", for the admin log to poll
+        self.recent = OrderedDict()
+        self._wake = threading.Event()
+        self._worker = None
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        with self._start_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="movie-outbox-relay", daemon=True)
+                self._worker.start()
+
+    def wake(self):
+        """A row was just committed - apply it now instead of at the next poll."""
+        self.start()
+        self._wake.set()
+
+    def status(self, outbox_id):
+        return self.recent.get(outbox_id)
+
+    def _remember(self, outbox_id, state):
+        self.recent[outbox_id] = state
+        self.recent.move_to_end(outbox_id)
+        while len(self.recent) > 1000:
+            self.recent.popitem(last=False)
+
+    def _run(self):
+        while True:
+            self._wake.clear()
+            try:
+                done = self.drain_once()
+            except Exception as e:
+                log_event(mongo_log, logging.ERROR, "outbox.relay_failed", error=e, exc_info=True)
+                done = 0
+            if done < self.batch_size:
+                self._wake.wait(self.poll_seconds)
+
+    def drain(self):
+        """Apply batches until nothing is due (CLI tools, tests); returns rows handled."""
+        total = 0
+        while True:
+            done = self.drain_once()
+            total += done
+            if done < self.batch_size:
+                return total
+
+    def _retry_delay(self, attempts):
+        return min(OUTBOX_RETRY_SECONDS * (2 ** attempts), OUTBOX_RETRY_MAX_SECONDS)
+
+    def drain_once(self):
+        """
+        Claim one batch of due rows (SKIP LOCKED, so several app processes can relay),
+        apply it with one unordered bulk_write and record the outcome. Returns rows handled.
+
+        Only the newest row per tmdbId is ever applied. Older rows are marked done when
+        claimed, and the newest row waits while another relay still holds an older one,
+        so a retried or slower row can never overwrite a newer save in MongoDB.
+        """
+        if tmdb_collection is None:
+            return 0
+        from pymongo import DeleteOne, UpdateOne
+        from pymongo.errors import BulkWriteError
+
+        conn = get_connection()
+        try:
+            with conn.cursor() as cur, query_name("outbox_claim"):
+                cur.execute(
+                    """
+                    SELECT o.id, o.tmdbId, o.op, o.payload, o.attempts,
+                           EXISTS (SELECT 1 FROM movie_outbox n
+                                   WHERE n.tmdbId = o.tmdbId AND n.id > o.id) AS superseded
+                    FROM movie_outbox o
+                    WHERE o.processed_at IS NULL
+                      AND ((o.attempts < %s AND o.next_attempt_at <= NOW())
+                           OR EXISTS (SELECT 1 FROM movie_outbox n
+                                      WHERE n.tmdbId = o.tmdbId AND n.id > o.id))
+                    ORDER BY o.id
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                    """,
+                    (self.max_attempts, self.batch_size)
+                )
+                rows = cur.fetchall()
+            if not rows:
+                conn.rollback()
+                return 0
+
+            superseded = [row["id"] for row in rows if row["superseded"]]
+            heads = {row["tmdbId"]: row for row in rows if not row["superseded"]}
+            deferred = set()
+            if heads:
+                # Older pending rows of the same movies outside this batch: lock what we can
+                # and retire it with the batch; one we cannot lock is being applied by
+                # another relay right now, so its newer row waits for the next drain.
+                claimed = [row["id"] for row in rows]
+                tmdb_marks = ", ".join(["%s"] * len(heads))
+                id_marks = ", ".join(["%s"] * len(claimed))
+                older_sql = f"""
+                    SELECT id, tmdbId FROM movie_outbox
+                    WHERE tmdbId IN ({tmdb_marks}) AND processed_at IS NULL AND id NOT IN ({id_marks})
+                """
+                params = list(heads) + claimed
+                with conn.cursor() as cur, query_name("outbox_claim_older"):
+                    cur.execute(older_sql, params)
+                    pending = {row["id"]: row["tmdbId"] for row in cur.fetchall()}
+                    locked = set()
+                    if pending:
+                        cur.execute(older_sql + " FOR UPDATE SKIP LOCKED", params)
+                        locked = {row["id"] for row in cur.fetchall()}
+                stale = set()
+                for outbox_id, tmdb_id in pending.items():
+                    if outbox_id > heads[tmdb_id]["id"]:
+                        stale.add(tmdb_id)  # saved again since the claim; that row is applied instead
+                    elif outbox_id in locked:
+                        superseded.append(outbox_id)
+                    else:
+                        deferred.add(tmdb_id)
+                superseded += [heads[tmdb_id]["id"] for tmdb_id in stale]
+                deferred -= stale
+            batch = [row for tmdb_id, row in heads.items()
+                     if tmdb_id not in deferred and row["id"] not in superseded]
+            ops = []
+            for row in batch:
+                if row["op"] == "delete":
+                    ops.append(DeleteOne({"id": row["tmdbId"]}))
+                else:
+                    ops.append(UpdateOne({"id": row["tmdbId"]}, {"$set": json.loads(row["payload"])}, upsert=True))
+
+            errors = {}
+            try:
+                if ops:
+                    tmdb_collection.bulk_write(ops, ordered=False)
+            except BulkWriteError as e:
+                for err in e.details.get("writeErrors", []):
+                    errors[batch[err["index"]]["id"]] = err.get("errmsg", "write error")
+            except mongo_errors.PyMongoError as e:
+                errors = {row["id"]: str(e) for row in batch}
+
+            applied = [row for row in batch if row["id"] not in errors]
+            with conn.cursor() as cur:
+                done_ids = superseded + [row["id"] for row in applied]
+                if done_ids:
+                    placeholders = ", ".join(["%s"] * len(done_ids))
+                    cur.execute(f"UPDATE movie_outbox SET processed_at = NOW() WHERE id IN ({placeholders})",
+                                done_ids)
+                if errors:
+                    cur.executemany(
+                        """
+                        UPDATE movie_outbox
+                        SET attempts = attempts + 1, last_error = %s,
+                            next_attempt_at = NOW() + INTERVAL %s SECOND
+                        WHERE id = %s
+                        """,
+                        [(errors[row["id"]][:500], self._retry_delay(row["attempts"]), row["id"])
+                         for row in batch if row["id"] in errors]
+                    )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        tmdb_cache = get_tmdb_cache(create=False)
+        for row in applied:
+            if tmdb_cache is not None:
+                tmdb_cache.invalidate(row["tmdbId"])
+            self._remember(row["id"], "applied")
+        for outbox_id in superseded:
+            self._remember(outbox_id, "applied")
+        for row in batch:
+            if row["id"] in errors:
+                dead = row["attempts"] + 1 >= self.max_attempts
+                self._remember(row["id"], "dead" if dead else "retry")
+                log_event(mongo_log, logging.ERROR if dead else logging.WARNING,
+                          "outbox.dead" if dead else "outbox.retry",
+                          outboxId=row["id"], tmdbId=row["tmdbId"], attempts=row["attempts"] + 1,
+                          error=errors[row["id"]])
+        self.applied += len(applied) + len(superseded)
+        self.failed += len(errors)
+        log_event(mongo_log, logging.DEBUG, "outbox.batch", rows=len(rows), applied=len(applied),
+                  superseded=len(superseded), deferred=len(deferred), failed=len(errors))
+        return len(rows)
+
+
+def outbox_backlog():
+    """Counts of pending and dead (out of attempts) outbox rows."""
+    conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT COALESCE(SUM(attempts < %s), 0) AS pending,
+                       COALESCE(SUM(attempts >= %s), 0) AS dead
+                FROM movie_outbox
+                WHERE processed_at IS NULL
+                """,
+                (OUTBOX_MAX_ATTEMPTS, OUTBOX_MAX_ATTEMPTS)
+            )
+            row = cur.fetchone()
+        return {"pending": int(row["pending"]), "dead": int(row["dead"])}
+    finally:
+        conn.close()
+
+
+outbox_relay = OutboxRelay()
+
+
+# ---------------- Bulk movie import ----------------
+# Loading a catalog drop through the admin form costs a form submit and three
+# round trips per movie. bulk_import_movies() validates the whole file, looks
+# existing movies/links up with chunked IN queries, reserves all new ids in
+# one call and upserts MOVIES and LINKS with multi-row statements, one
+# transaction per chunk. While the next chunk is written to MariaDB, the
+# previous one goes to MongoDB as unordered bulk_write batches on a small
+# thread pool. Rows whose Mongo write fails (or MongoDB is down) are queued
+# in MOVIE_OUTBOX, so the relay converges them like any admin save.
+BULK_MOVIE_CHUNK = int(os.getenv("BULK_MOVIE_CHUNK", "1000"))
+BULK_MOVIE_MONGO_WORKERS = int(os.getenv("BULK_MOVIE_MONGO_WORKERS", "4"))
+MOVIE_DOC_FIELDS = ("overview", "genres", "keywords", "vote_average", "vote_count", "revenue",
+                    "runtime", "original_language", "release_date", "tagline", "popularity")
+MOVIE_IMPORT_REPORT_COLUMNS = ("line", "movieId", "tmdbId", "title", "action", "status", "mongo", "reason")
+
+
+def read_movie_file(path):
+    """
+    Rows of a movie CSV or JSON Lines file (*.jsonl / *.ndjson) as dicts with
+    their 1-based file line number under "line". Columns: title and optionally
+    movieId, release_date, imdbId, tmdbId and the TMDB fields of MOVIE_DOC_FIELDS.
+    """
+    rows = []
+    if path.lower().endswith((".jsonl", ".ndjson")):
+        with open(path, encoding="utf-8-sig") as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    raise ValueError(f"line {line_no}: invalid JSON ({e})")
+                if not isinstance(row, dict):
+                    raise ValueError(f"line {line_no}: expected a JSON object")
+                row["line"] = line_no
+                rows.append(row)
+        return rows
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f)
+        if "title" not in {c.strip() for c in (reader.fieldnames or [])}:
+            raise ValueError("CSV is missing the 'title' column")
+        for row in reader:
+            clean = {k.strip(): (v or "").strip() for k, v in row.items() if k}
+            clean["line"] = reader.line_num
+            rows.append(clean)
+    return rows
+
+
+def _optional_number(value, cast):
+    if value is None or value == "":
+        return None
+    return cast(value)
+
+
+def _clean_movie_row(row, position):
+    """(clean row, None) or (None, reason) for one input row."""
+    line = row.get("line", position)
+    title = str(row.get("title") or "").strip()
+    if not title:
+        return None, "title is empty"
+    if len(title) > 500:
+        return None, "title is longer than 500 characters"
+    try:
+        movie_id = _optional_number(row.get("movieId"), int)
+        tmdb_id = _optional_number(row.get("tmdbId"), int)
+    except (TypeError, ValueError):
+        return None, "movieId/tmdbId must be whole numbers"
+    if (movie_id is not None and movie_id <= 0) or (tmdb_id is not None and tmdb_id <= 0):
+        return None, "movieId/tmdbId must be positive"
+    release_date = str(row.get("release_date") or "").strip() or None
+    if release_date:
+        try:
+            datetime.strptime(release_date, "%Y-%m-%d")
+        except ValueError:
+            return None, f"invalid release_date '{release_date}' (use YYYY-MM-DD)"
+    imdb_id = str(row.get("imdbId") or "").strip() or None
+    if imdb_id and len(imdb_id) > 20:
+        return None, "imdbId is longer than 20 characters"
+
+    fields = {}
+    for name in MOVIE_DOC_FIELDS:
+        value = row.get(name)
+        if isinstance(value, list):  # JSONL genres/keywords as arrays
+            value = ", ".join(str(v) for v in value)
+        if value is not None and value != "":
+            fields[name] = value
+    if release_date:
+        fields["release_date"] = release_date
+    try:
+        # build_tmdb_movie_doc does the numeric conversion; fail here, per row, instead
+        build_tmdb_movie_doc(tmdb_id or 1, title, **fields)
+    except (TypeError, ValueError) as e:
+        return None, f"bad TMDB field value ({e})"
+    return {"line": line, "movieId": movie_id, "tmdbId": tmdb_id, "imdbId": imdb_id,
+            "title": title, "release_date": release_date, "fields": fields}, None
+
+
+def _existing_values(cur, sql_head, column, values, chunk_size):
+    """{value: row} for values present, looked up in chunks of IN (...)."""
+    found = {}
+    values = list(values)
+    for i in range(0, len(values), chunk_size):
+        chunk = values[i:i + chunk_size]
+        cur.execute(f"{sql_head} WHERE {column} IN ({', '.join(['%s'] * len(chunk))})", chunk)
+        for r in cur.fetchall():
+            found[r[column]] = r
+    return found
+
+
+def _write_movie_rows(cur, rows):
+    """Multi-row upsert of MOVIES and LINKS for rows that all have a movieId/tmdbId."""
+    cur.execute(
+        "INSERT INTO movies (movieId, title, release_date, is_placeholder) VALUES "
+        + ", ".join(["(%s, %s, %s, 0)"] * len(rows))
+        + """
+        ON DUPLICATE KEY UPDATE
+            title = VALUES(title),
+            release_date = COALESCE(VALUES(release_date), release_date),
+            is_placeholder = 0
+        """,
+        [v for r in rows for v in (r["movieId"], r["title"], r["release_date"])]
+    )
+    linked = [r for r in rows if r["imdbId"]]  # LINKS.imdbId is NOT NULL
+    if linked:
+        cur.execute(
+            "INSERT INTO links (movieId, imdbId, tmdbId) VALUES "
+            + ", ".join(["(%s, %s, %s)"] * len(linked))
+            + " ON DUPLICATE KEY UPDATE imdbId = VALUES(imdbId), tmdbId = VALUES(tmdbId)",
+            [v for r in linked for v in (r["movieId"], r["imdbId"], r["tmdbId"])]
+        )
+
+
+def _bulk_write_movie_docs(rows):
+    """One unordered bulk_write of upserts; returns {position in rows: error message}."""
+    from pymongo import UpdateOne
+    from pymongo.errors import BulkWriteError
+
+    ops = [UpdateOne({"id": r["tmdbId"]}, {"$set": r["doc"]}, upsert=True) for r in rows]
+    try:
+        with query_name("bulk_import_movies"):
+            tmdb_collection.bulk_write(ops, ordered=False)
+        return {}
+    except BulkWriteError as e:
+        return {err["index"]: err.get("errmsg", "write error") for err in e.details.get("writeErrors", [])}
+    except mongo_errors.PyMongoError as e:
+        return {i: str(e) for i in range(len(rows))}
+
+
+def bulk_import_movies(rows, dry_run=False, chunk_size=BULK_MOVIE_CHUNK, progress=None):
+    """
+    Insert or update many movies in MariaDB and MongoDB (ADMIN ONLY).
+    rows: dicts as returned by read_movie_file. A row updates the movie with its
+    movieId, or else the movie already linked to its tmdbId; otherwise it is a new
+    movie (new movieId; tmdbId defaults to the movieId, as in the admin form).
+    With dry_run nothing is written and new rows get no movieId.
+    progress(done, total), if given, is called after every chunk.
+    Returns {"results": [one dict per row, see MOVIE_IMPORT_REPORT_COLUMNS],
+             "inserted", "updated", "errors", "mongo_queued"}.
+    Invalid or conflicting rows are reported, never raised.
+    """
+    if CURRENT_USER['role'] != 'admin':
+        raise PermissionError("Only administrators can import movies")
+
+    results = []
+
+    def _result(r, action, status, mongo="", reason=""):
+        results.append({"line": r["line"], "movieId": r.get("movieId"), "tmdbId": r.get("tmdbId"),
+                        "title": r.get("title", ""), "action": action, "status": status,
+                        "mongo": mongo, "reason": reason})
+
+    valid = []
+    seen = {"movieId": set(), "tmdbId": set(), "imdbId": set()}
+    for position, row in enumerate(rows, 1):
+        clean, reason = _clean_movie_row(row, position)
+        if clean is None:
+            _result({"line": row.get("line", position), "title": str(row.get("title") or "")}, "", "error",
+                    reason=reason)
+            continue
+        duplicate = next((k for k in seen if clean[k] is not None and clean[k] in seen[k]), None)
+        if duplicate:
+            _result(clean, "", "error", reason=f"duplicate {duplicate} in this file")
+            continue
+        for k in seen:
+            if clean[k] is not None:
+                seen[k].add(clean[k])
+        valid.append(clean)
+
+    conn = get_connection()
+    try:
+        # Resolve every row against what is already stored, before writing anything
+        with conn.cursor() as cur:
+            by_tmdb = _existing_values(cur, "SELECT movieId, tmdbId FROM links", "tmdbId",
+                                       seen["tmdbId"], chunk_size)
+            by_imdb = _existing_values(cur, "SELECT movieId, imdbId FROM links", "imdbId",
+                                       seen["imdbId"], chunk_size)
+            for r in valid:
+                if r["movieId"] is None and r["tmdbId"] in by_tmdb:
+                    r["movieId"] = by_tmdb[r["tmdbId"]]["movieId"]
+            known_ids = {r["movieId"] for r in valid if r["movieId"] is not None}
+            existing = _existing_values(cur, "SELECT movieId FROM movies", "movieId", known_ids, chunk_size)
+            by_movie = _existing_values(cur, "SELECT movieId, tmdbId FROM links", "movieId", known_ids, chunk_size)
+        conn.commit()
+        for r in valid:
+            # An update without a tmdbId keeps the movie's current Mongo document
+            if r["tmdbId"] is None and r["movieId"] in by_movie:
+                r["tmdbId"] = by_movie[r["movieId"]]["tmdbId"]
+
+        todo = []
+        for r in valid:
+            r["action"] = "update" if r["movieId"] in existing else "insert"
+            tmdb_owner = by_tmdb.get(r["tmdbId"], {}).get("movieId")
+            imdb_owner = by_imdb.get(r["imdbId"], {}).get("movieId")
+            if tmdb_owner is not None and tmdb_owner != r["movieId"]:
+                _result(r, r["action"], "error", reason=f"tmdbId already linked to movie {tmdb_owner}")
+            elif imdb_owner is not None and imdb_owner != r["movieId"]:
+                _result(r, r["action"], "error", reason=f"imdbId already linked to movie {imdb_owner}")
+            else:
+                todo.append(r)
+
+        if dry_run:
+            for r in todo:
+                _result(r, r["action"], "dry-run")
+            return _movie_import_summary(results)
+
+        # One id reservation for every new movie without an explicit movieId
+        fresh = [r for r in todo if r["movieId"] is None]
+        for r, movie_id in zip(fresh, movie_ids.reserve(len(fresh))):
+            r["movieId"] = movie_id
+        for r in todo:
+            r["tmdbId"] = r["tmdbId"] or r["movieId"]
+            doc = build_tmdb_movie_doc(r["tmdbId"], r["title"], **r["fields"])
+            if r["action"] == "update":
+                # Only $set what the file provides; keep the rest of an existing document
+                doc = {k: v for k, v in doc.items() if k in ("id", "title") or k in r["fields"]}
+            r["doc"] = doc
+
+        written, pending = [], []
+        with ThreadPoolExecutor(max_workers=max(1, BULK_MOVIE_MONGO_WORKERS),
+                                thread_name_prefix="movie-import") as mongo_pool:
+            for i in range(0, len(todo), chunk_size):
+                chunk = todo[i:i + chunk_size]
+                try:
+                    with conn.cursor() as cur:
+                        _write_movie_rows(cur, chunk)
+                    conn.commit()
+                    done = chunk
+                except pymysql.MySQLError as e:
+                    conn.rollback()
+                    log_event(sql_log, logging.WARNING, "movies.bulk_chunk_failed", rows=len(chunk), error=e)
+                    # Find the offending row(s): replay this chunk one row per transaction
+                    done = []
+                    for r in chunk:
+                        try:
+                            with conn.cursor() as cur:
+                                _write_movie_rows(cur, [r])
+                            conn.commit()
+                            done.append(r)
+                        except pymysql.MySQLError as row_error:
+                            conn.rollback()
+                            _result(r, r["action"], "error", reason=str(row_error))
+                if done:
+                    written.extend(done)
+                    if tmdb_collection is not None:
+                        pending.append((done, mongo_pool.submit(_bulk_write_movie_docs, done)))
+                if progress:
+                    progress(min(i + chunk_size, len(todo)), len(todo))
+
+            # Rows MongoDB did not take go through the outbox relay instead
+            mongo_errors_by_row = {}
+            if tmdb_collection is None:
+                mongo_errors_by_row = {id(r): "MongoDB unavailable" for r in written}
+            for done, future in pending:
+                for index, message in future.result().items():
+                    mongo_errors_by_row[id(done[index])] = message
+
+        queued = [r for r in written if id(r) in mongo_errors_by_row]
+        queue_error = None
+        if queued:
+            try:
+                with conn.cursor() as cur:
+                    cur.executemany(
+                        "INSERT INTO movie_outbox (movieId, tmdbId, op, payload) VALUES (%s, %s, 'upsert', %s)",
+                        [(r["movieId"], r["tmdbId"], json.dumps(r["doc"])) for r in queued]
+                    )
+                conn.commit()
+                outbox_relay.wake()
+            except pymysql.MySQLError as e:
+                conn.rollback()
+                queue_error = str(e)
+    finally:
+        conn.close()
+
+    for r in written:
+        if id(r) not in mongo_errors_by_row:
+            _result(r, r["action"], "ok", mongo="written")
+        elif queue_error is None:
+            _result(r, r["action"], "ok", mongo="queued", reason=mongo_errors_by_row[id(r)])
+        else:
+            _result(r, r["action"], "ok", mongo="failed",
+                    reason=f"{mongo_errors_by_row[id(r)]}; outbox: {queue_error}")
+
+    clear_entity_caches()
+    tmdb_cache = get_tmdb_cache(create=False)
+    if tmdb_cache is not None:
+        tmdb_cache.invalidate_many(r["tmdbId"] for r in written)
+    summary = _movie_import_summary(results)
+    log_event(sql_log, logging.INFO, "movies.bulk_imported", inserted=summary["inserted"],
+              updated=summary["updated"], errors=summary["errors"], mongo_queued=summary["mongo_queued"])
+    return summary
+
+
+def _movie_import_summary(results):
+    results.sort(key=lambda r: r["line"])
+    ok = [r for r in results if r["status"] != "error"]
+    return {
+        "results": results,
+        "inserted": sum(r["action"] == "insert" for r in ok),
+        "updated": sum(r["action"] == "update" for r in ok),
+        "errors": len(results) - len(ok),
+        "mongo_queued": sum(r["mongo"] == "queued" for r in ok),
+    }
+
+
+def write_movie_import_report(results, path):
+    """Per-row results of bulk_import_movies as CSV (MOVIE_IMPORT_REPORT_COLUMNS)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=MOVIE_IMPORT_REPORT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(results)
+    return path
+
+
+###############################################################################
+# 3. NoSQL HELPERS – MongoDB side
+###############################################################################
+
+
+def search_movies_by_genre_mongo(genre):
+    """
+    Regex match on genres field.
+    This shows flexible text search in NoSQL.
+    """
+    # Check MongoDB connection
+    if tmdb_collection is None:
+        log_event(mongo_log, logging.DEBUG, "mongo.unavailable", op="search_movies_by_genre_mongo")
+        return [], 0.0
+        
+    try:
+        start = time.time()
+        cursor = tmdb_collection.find(
+            {"genres": {"$regex": genre, "$options": "i"}},
+            {
+                "id": 1,  # Changed from "tmdbId" to "id" for Atlas
+                "title": 1,
+                "genres": 1,
+                "vote_average": 1,
+                "overview": 1,
+                "runtime": 1,
+            }
+        ).limit(50)
+        docs = list(cursor)
+        elapsed = time.time() - start
+        log_event(mongo_log, logging.DEBUG, "mongo.search", field="genres", term=genre,
+                  rows=len(docs), ms=round(elapsed * 1000, 2))
+        return docs, elapsed
+    except mongo_errors.ConnectionFailure as e:
+        log_event(mongo_log, logging.ERROR, "mongo.failed", op="search_movies_by_genre_mongo", reason="connection", error=e)
+        return [], 0.0
+    except mongo_errors.OperationFailure as e:
+        log_event(mongo_log, logging.ERROR, "mongo.failed", op="search_movies_by_genre_mongo", reason="operation", error=e)
+        return [], 0.0
+    except Exception as e:
+        log_event(mongo_log, logging.ERROR, "mongo.failed", op="search_movies_by_genre_mongo", reason="unexpected", error=e)
+        return [], 0.0
+
+
+def search_movies_by_keyword_mongo(keyword):
+    """
+    Regex match on keywords field.
+    Used in performance tab to show NoSQL shines on text-y stuff.
+    """
+    # Check MongoDB connection
+    if tmdb_collection is None:
+        log_event(mongo_log, logging.DEBUG, "mongo.unavailable", op="search_movies_by_keyword_mongo")
+        return [], 0.0
+        
+    try:
+        start = time.time()
+        cursor = tmdb_collection.find(
+            {"keywords": {"$regex": keyword, "$options": "i"}},
+            {
+                "id": 1,  # Changed from "tmdbId" to "id" for Atlas
+                "title": 1,
                 "keywords": 1,
                 "genres": 1,
                 "vote_average": 1,
             }
         ).limit(50)
         docs = list(cursor)
-        print(f"[OK] Found {len(docs)} movies with keyword '{keyword}'")
-        return docs, time.time() - start
+        elapsed = time.time() - start
+        log_event(mongo_log, logging.DEBUG, "mongo.search", field="keywords", term=keyword,
+                  rows=len(docs), ms=round(elapsed * 1000, 2))
+        return docs, elapsed
     except mongo_errors.ConnectionFailure as e:
-        print(f"[ERROR] MongoDB connection failed in keyword search: {e}")
+        log_event(mongo_log, logging.ERROR, "mongo.failed", op="search_movies_by_keyword_mongo", reason="connection", error=e)
         return [], 0.0
     except mongo_errors.OperationFailure as e:
-        print(f"[ERROR] MongoDB operation failed in keyword search: {e}")
+        log_event(mongo_log, logging.ERROR, "mongo.failed", op="search_movies_by_keyword_mongo", reason="operation", error=e)
         return [], 0.0
     except Exception as e:
-        print(f"[ERROR] Unexpected error in keyword search: {e}")
+        log_event(mongo_log, logging.ERROR, "mongo.failed", op="search_movies_by_keyword_mongo", reason="unexpected", error=e)
         return [], 0.0
 
 
@@ -852,12 +3366,11 @@ def get_genre_statistics_mongo():
     """
     # Check MongoDB connection
     if tmdb_collection is None:
-        print("[WARN] MongoDB Atlas not connected. Cannot get genre statistics.")
+        log_event(mongo_log, logging.DEBUG, "mongo.unavailable", op="get_genre_statistics_mongo")
         return [], 0.0
         
     try:
         start = time.time()
-        print("[STATS] Calculating genre statistics from MongoDB Atlas...")
         pipeline = [
             {"$match": {"genres": {"$exists": True, "$ne": ""}}},
             {"$group": {
@@ -870,16 +3383,17 @@ def get_genre_statistics_mongo():
             {"$limit": 20},
         ]
         agg = list(tmdb_collection.aggregate(pipeline))
-        print(f"[OK] Generated statistics for {len(agg)} genre groups")
-        return agg, time.time() - start
+        elapsed = time.time() - start
+        log_event(mongo_log, logging.DEBUG, "mongo.genre_stats", groups=len(agg), ms=round(elapsed * 1000, 2))
+        return agg, elapsed
     except mongo_errors.ConnectionFailure as e:
-        print(f"[ERROR] MongoDB connection failed in genre statistics: {e}")
+        log_event(mongo_log, logging.ERROR, "mongo.failed", op="get_genre_statistics_mongo", reason="connection", error=e)
         return [], 0.0
     except mongo_errors.OperationFailure as e:
-        print(f"[ERROR] MongoDB operation failed in genre statistics: {e}")
+        log_event(mongo_log, logging.ERROR, "mongo.failed", op="get_genre_statistics_mongo", reason="operation", error=e)
         return [], 0.0
     except Exception as e:
-        print(f"[ERROR] Unexpected error in genre statistics: {e}")
+        log_event(mongo_log, logging.ERROR, "mongo.failed", op="get_genre_statistics_mongo", reason="unexpected", error=e)
         return [], 0.0
 
 
@@ -890,22 +3404,18 @@ def find_similar_movies_mongo(tmdb_id):
     """
     # Check MongoDB connection
     if tmdb_collection is None:
-        print("[WARN] MongoDB Atlas not connected. Cannot find similar movies.")
+        log_event(mongo_log, logging.DEBUG, "mongo.unavailable", op="find_similar_movies_mongo")
         return [], 0.0
         
     try:
         start = time.time()
         tmdb_id_int = int(tmdb_id) if not isinstance(tmdb_id, int) else tmdb_id
         
-        print(f"[SEARCH] Finding similar movies for TMDB ID: {tmdb_id_int}")
-        
-        # Try with "id" field first (Atlas schema), then fallback to "tmdbId"
-        base = tmdb_collection.find_one({"id": tmdb_id_int})
-        if not base:
-            base = tmdb_collection.find_one({"tmdbId": tmdb_id_int})
+        # Base document comes through the local cache (falls back to Atlas on a miss)
+        base = get_tmdb_metadata(tmdb_id_int)
             
         if not base or not base.get("genres"):
-            print(f"[NOT FOUND] Base movie not found or has no genres for ID: {tmdb_id_int}")
+            log_event(mongo_log, logging.DEBUG, "mongo.similar.no_base", tmdbId=tmdb_id_int)
             return [], 0.0
 
         # take first genre token
@@ -913,8 +3423,7 @@ def find_similar_movies_mongo(tmdb_id):
             base["genres"].split(",")[0].strip()
             if "," in base["genres"] else base["genres"]
         )
-        
-        print(f"[INFO] Searching for movies with genre: {first_genre}")
+
 
         cursor = tmdb_collection.find(
             {
@@ -930,16 +3439,18 @@ def find_similar_movies_mongo(tmdb_id):
             }
         ).limit(10)
         docs = list(cursor)
-        print(f"[OK] Found {len(docs)} similar movies")
-        return docs, time.time() - start
+        elapsed = time.time() - start
+        log_event(mongo_log, logging.DEBUG, "mongo.similar", tmdbId=tmdb_id_int, genre=first_genre,
+                  rows=len(docs), ms=round(elapsed * 1000, 2))
+        return docs, elapsed
     except mongo_errors.ConnectionFailure as e:
-        print(f"[ERROR] MongoDB connection failed in find similar movies: {e}")
+        log_event(mongo_log, logging.ERROR, "mongo.failed", op="find_similar_movies_mongo", reason="connection", error=e)
         return [], 0.0
     except mongo_errors.OperationFailure as e:
-        print(f"[ERROR] MongoDB operation failed in find similar movies: {e}")
+        log_event(mongo_log, logging.ERROR, "mongo.failed", op="find_similar_movies_mongo", reason="operation", error=e)
         return [], 0.0
     except Exception as e:
-        print(f"[ERROR] Unexpected error in find similar movies: {e}")
+        log_event(mongo_log, logging.ERROR, "mongo.failed", op="find_similar_movies_mongo", reason="unexpected", error=e)
         return [], 0.0
 
 
@@ -949,12 +3460,10 @@ def find_movie_by_title_mongo(title):
     Returns the movie document or None.
     """
     if tmdb_collection is None:
-        print("[WARN] MongoDB Atlas not connected. Cannot search by title.")
+        log_event(mongo_log, logging.DEBUG, "mongo.unavailable", op="find_movie_by_title_mongo")
         return None
         
     try:
-        print(f"[SEARCH] Looking for movie title: '{title}'")
-        
         # Try exact match first (case-insensitive)
         doc = tmdb_collection.find_one({"title": {"$regex": f"^{title}$", "$options": "i"}})
         
@@ -967,62 +3476,67 @@ def find_movie_by_title_mongo(title):
             results = list(cursor)
             
             if results:
-                print(f"[INFO] Found {len(results)} movies matching '{title}':")
-                for idx, movie in enumerate(results, 1):
-                    movie_id = movie.get('id') or movie.get('tmdbId', 'N/A')
-                    print(f"  {idx}. [{movie_id}] {movie.get('title', 'Unknown')}")
                 # Return the first match
                 doc = results[0]
             else:
-                print(f"[NOT FOUND] No movies found matching '{title}'")
+                log_event(mongo_log, logging.DEBUG, "mongo.title.not_found", title=title)
                 return None
         
         if doc:
-            movie_id = doc.get('id') or doc.get('tmdbId', 'N/A')
-            print(f"[OK] Using movie: [{movie_id}] {doc.get('title', 'Unknown')}")
+            log_event(mongo_log, logging.DEBUG, "mongo.title.match", title=title,
+                      tmdbId=doc.get('id') or doc.get('tmdbId'))
             return doc
             
         return None
     except mongo_errors.ConnectionFailure as e:
-        print(f"[ERROR] MongoDB connection failed in find_movie_by_title: {e}")
+        log_event(mongo_log, logging.ERROR, "mongo.failed", op="find_movie_by_title_mongo", reason="connection", error=e)
         return None
     except mongo_errors.OperationFailure as e:
-        print(f"[ERROR] MongoDB operation failed in find_movie_by_title: {e}")
+        log_event(mongo_log, logging.ERROR, "mongo.failed", op="find_movie_by_title_mongo", reason="operation", error=e)
         return None
     except Exception as e:
-        print(f"[ERROR] Unexpected error in find_movie_by_title: {e}")
+        log_event(mongo_log, logging.ERROR, "mongo.failed", op="find_movie_by_title_mongo", reason="unexpected", error=e)
         return None
 
 
-def compare_sql_vs_nosql_performance(keyword):
+def compare_sql_vs_nosql_performance(keyword, iterations=None, warmup=None):
     """
     For Performance tab.
     We'll time:
       - SQL: search_movies_by_title(keyword)  (structured tables)
       - Mongo: search_movies_by_keyword_mongo(keyword) (unstructured text)
+    Each side gets `warmup` untimed calls and `iterations` timed calls;
+    sql_time / mongo_time are the median (p50) latency in seconds and the
+    full percentile stats are returned under sql_stats / mongo_stats.
     """
-    sql_start = time.time()
-    sql_res, _ = search_movies_by_title(keyword)
-    sql_t = time.time() - sql_start
-
-    mongo_start = time.time()
-    mongo_res, _ = search_movies_by_keyword_mongo(keyword)
-    mongo_t = time.time() - mongo_start
+    iterations = BENCHMARK_ITERATIONS if iterations is None else iterations
+    warmup = BENCHMARK_WARMUP if warmup is None else warmup
+    sql_stats, sql_res, _ = measure_callable(
+        lambda i: search_movies_by_title(keyword)[0], iterations, warmup
+    )
+    mongo_stats, mongo_res, _ = measure_callable(
+        lambda i: search_movies_by_keyword_mongo(keyword)[0], iterations, warmup
+    )
 
     return {
-        "sql_time": sql_t,
-        "sql_count": len(sql_res),
-        "mongo_time": mongo_t,
-        "mongo_count": len(mongo_res),
+        "sql_time": sql_stats["p50_ms"] / 1000,
+        "sql_count": len(sql_res or []),
+        "sql_stats": sql_stats,
+        "mongo_time": mongo_stats["p50_ms"] / 1000,
+        "mongo_count": len(mongo_res or []),
+        "mongo_stats": mongo_stats,
     }
 
 
-def test_bulk_insert_performance(num_records=100):
+def test_bulk_insert_performance(num_records=100, runs=None, warmup=1):
     """
     Test bulk insert performance for SQL vs NoSQL.
     ZERO IMPACT: Creates temporary records, measures performance, then deletes them.
     Returns metrics for both databases without affecting the dataset.
+    The batch is inserted `warmup` + `runs` times; times and throughput are
+    the median over the timed runs, with percentile stats in sql_stats / mongo_stats.
     """
+    runs = BENCHMARK_BULK_RUNS if runs is None else runs
     print(f"\n[INSERT PERFORMANCE TEST] Testing {num_records} inserts (ZERO IMPACT MODE)...")
     
     # Get real user IDs and movie IDs from the database
@@ -1046,34 +3560,48 @@ def test_bulk_insert_performance(num_records=100):
             "mongo_time": 0,
             "mongo_throughput": 0,
             "mongo_success": False,
-            "record_count": num_records
+            "record_count": num_records,
+            "runs": 0
         }
     
-    # Generate test data using REAL user and movie IDs
+    # Generate test data using REAL user and movie IDs.
+    # Every run gets its own block of timestamps so rows never collide,
+    # and everything >= cleanup_timestamp is removed afterwards.
     cleanup_timestamp = int(time.time())
-    test_ratings = [
-        (random.choice(user_ids), random.choice(movie_ids), 
-         round(random.uniform(0.5, 5.0), 1), cleanup_timestamp + i)
-        for i in range(num_records)
-    ]
+
+    def _test_ratings(run):
+        base = cleanup_timestamp + run * num_records
+        return [
+            (random.choice(user_ids), random.choice(movie_ids),
+             round(random.uniform(0.5, 5.0), 1), base + i)
+            for i in range(num_records)
+        ]
     
     # SQL bulk insert test
     sql_time = 0
     sql_throughput = 0
     sql_success = False
+    sql_stats = summarize_samples([])
     
     conn = get_connection()
     try:
-        sql_start = time.time()
-        conn.begin()
-        with conn.cursor() as cur:
-            insert_sql = "INSERT INTO ratings (userId, movieId, rating, timestamp) VALUES (%s, %s, %s, %s)"
-            cur.executemany(insert_sql, test_ratings)
-        conn.commit()
-        sql_time = time.time() - sql_start
+        insert_sql = "INSERT INTO ratings (userId, movieId, rating, timestamp) VALUES (%s, %s, %s, %s)"
+        samples = []
+        for run in range(warmup + runs):
+            batch = _test_ratings(run)
+            t0 = time.perf_counter_ns()
+            conn.begin()
+            with conn.cursor() as cur:
+                cur.executemany(insert_sql, batch)
+            conn.commit()
+            if run >= warmup:
+                samples.append(time.perf_counter_ns() - t0)
+        sql_stats = summarize_samples(samples, num_records)
+        sql_time = sql_stats["p50_ms"] / 1000
         sql_throughput = num_records / sql_time if sql_time > 0 else 0
         sql_success = True
-        print(f"[SQL INSERT] Successfully inserted {num_records} records in {sql_time:.3f}s ({sql_throughput:.1f} inserts/sec)")
+        print(f"[SQL INSERT] {runs} runs of {num_records} records: p50 {sql_time:.3f}s, "
+              f"p95 {sql_stats['p95_ms'] / 1000:.3f}s ({sql_throughput:.1f} inserts/sec)")
     except pymysql.err.OperationalError as e:
         conn.rollback()
         print(f"[SQL INSERT ERROR] Database connection error: {e}")
@@ -1089,53 +3617,63 @@ def test_bulk_insert_performance(num_records=100):
     finally:
         conn.close()
     
-    # Clean up SQL test data (ZERO IMPACT - remove all test records)
-    if sql_success:
-        cleanup_conn = get_connection()
-        try:
-            cleanup_conn.begin()
-            with cleanup_conn.cursor() as cur:
-                cur.execute("DELETE FROM ratings WHERE timestamp >= %s", (cleanup_timestamp,))
-                deleted_count = cur.rowcount
-            cleanup_conn.commit()
-            print(f"[SQL CLEANUP] Removed {deleted_count} test records - dataset restored to original state")
-        except Exception as e:
-            cleanup_conn.rollback()
-            print(f"[SQL CLEANUP ERROR] {e}")
-        finally:
-            cleanup_conn.close()
+    # Clean up SQL test data (ZERO IMPACT - remove all test records).
+    # Runs before a failure were already committed, so always clean up.
+    cleanup_conn = get_connection()
+    try:
+        cleanup_conn.begin()
+        with cleanup_conn.cursor() as cur:
+            # Test rows are all >= cleanup_timestamp, so the range delete is
+            # pruned to the newest RATINGS partition(s)
+            cur.execute("DELETE FROM ratings WHERE timestamp >= %s", (cleanup_timestamp,))
+            deleted_count = cur.rowcount
+        cleanup_conn.commit()
+        print(f"[SQL CLEANUP] Removed {deleted_count} test records - dataset restored to original state")
+    except Exception as e:
+        cleanup_conn.rollback()
+        print(f"[SQL CLEANUP ERROR] {e}")
+    finally:
+        cleanup_conn.close()
     
     # MongoDB bulk insert test (simulated with tmdb_movies collection)
     mongo_time = 0
     mongo_throughput = 0
     mongo_success = False
+    mongo_stats = summarize_samples([])
     mongo_inserted_ids = []
     
     if tmdb_collection is not None:
         try:
-            mongo_start = time.time()
-            
-            # Create temporary test documents
-            test_docs = []
-            for i in range(num_records):
-                test_docs.append({
-                    "_test_doc": True,  # Marker for cleanup
-                    "id": 999000 + i,  # Use non-conflicting IDs
-                    "title": f"Test_Movie_{i}",
-                    "popularity": random.uniform(1.0, 100.0),
-                    "vote_average": round(random.uniform(0.5, 10.0), 1),
-                    "test_timestamp": cleanup_timestamp
-                })
-            
-            result = tmdb_collection.insert_many(test_docs)
-            mongo_inserted_ids = result.inserted_ids
-            mongo_time = time.time() - mongo_start
+            samples = []
+            for run in range(warmup + runs):
+                # Create temporary test documents
+                test_docs = []
+                for i in range(num_records):
+                    test_docs.append({
+                        "_test_doc": True,  # Marker for cleanup
+                        "id": 999000 + i,  # Use non-conflicting IDs
+                        "title": f"Test_Movie_{i}",
+                        "popularity": random.uniform(1.0, 100.0),
+                        "vote_average": round(random.uniform(0.5, 10.0), 1),
+                        "test_timestamp": cleanup_timestamp
+                    })
+
+                t0 = time.perf_counter_ns()
+                result = tmdb_collection.insert_many(test_docs)
+                elapsed = time.perf_counter_ns() - t0
+                mongo_inserted_ids = result.inserted_ids
+                if run >= warmup:
+                    samples.append(elapsed)
+
+                # Clean up MongoDB test data (ZERO IMPACT) before the next run
+                delete_result = tmdb_collection.delete_many({"_test_doc": True})
+
+            mongo_stats = summarize_samples(samples, num_records)
+            mongo_time = mongo_stats["p50_ms"] / 1000
             mongo_throughput = num_records / mongo_time if mongo_time > 0 else 0
             mongo_success = True
-            print(f"[MONGO INSERT] Successfully inserted {len(mongo_inserted_ids)} documents in {mongo_time:.3f}s ({mongo_throughput:.1f} inserts/sec)")
-            
-            # Clean up MongoDB test data (ZERO IMPACT)
-            delete_result = tmdb_collection.delete_many({"_test_doc": True})
+            print(f"[MONGO INSERT] {runs} runs of {num_records} documents: p50 {mongo_time:.3f}s, "
+                  f"p95 {mongo_stats['p95_ms'] / 1000:.3f}s ({mongo_throughput:.1f} inserts/sec)")
             print(f"[MONGO CLEANUP] Removed {delete_result.deleted_count} test documents - dataset restored to original state")
             
         except mongo_errors.ConnectionFailure as e:
@@ -1169,19 +3707,25 @@ def test_bulk_insert_performance(num_records=100):
         "sql_time": sql_time,
         "sql_throughput": sql_throughput,
         "sql_success": sql_success,
+        "sql_stats": sql_stats,
         "mongo_time": mongo_time,
         "mongo_throughput": mongo_throughput,
         "mongo_success": mongo_success,
-        "record_count": num_records
+        "mongo_stats": mongo_stats,
+        "record_count": num_records,
+        "runs": runs
     }
 
 
-def test_bulk_update_performance(num_records=100):
+def test_bulk_update_performance(num_records=100, runs=None, warmup=1):
     """
     Test bulk update performance for SQL vs NoSQL.
     ZERO IMPACT: Saves original values, performs updates, measures performance, then restores original data.
     Returns metrics for both databases without permanently affecting the dataset.
+    The update batch is applied `warmup` + `runs` times before restoring;
+    times are the median over the timed runs (stats in sql_stats / mongo_stats).
     """
+    runs = BENCHMARK_BULK_RUNS if runs is None else runs
     print(f"\n[UPDATE PERFORMANCE TEST] Testing {num_records} updates (ZERO IMPACT MODE)...")
     
     # Get real user IDs and movie IDs WITH their current ratings for backup
@@ -1210,39 +3754,51 @@ def test_bulk_update_performance(num_records=100):
             "mongo_time": 0,
             "mongo_throughput": 0,
             "mongo_success": False,
-            "record_count": num_records
+            "record_count": num_records,
+            "runs": 0
         }
     
     print(f"[BACKUP] Saved {len(original_ratings)} original ratings for restoration")
     
     # Prepare update pairs with NEW random values (userId, movieId, new_rating, new_timestamp)
-    update_pairs = [
-        (orig[0], orig[1], round(random.uniform(0.5, 5.0), 1), int(time.time()) + i)
-        for i, orig in enumerate(original_ratings)
-    ]
+    def _update_pairs(run):
+        base = int(time.time()) + run * len(original_ratings)
+        return [
+            (orig[0], orig[1], round(random.uniform(0.5, 5.0), 1), base + i)
+            for i, orig in enumerate(original_ratings)
+        ]
+    update_pairs = _update_pairs(0)
     
     # SQL bulk update test
     sql_time = 0
     sql_throughput = 0
     sql_success = False
+    sql_stats = summarize_samples([])
     
     conn = get_connection()
     try:
-        sql_start = time.time()
-        conn.begin()
-        with conn.cursor() as cur:
-            update_sql = """
-                UPDATE ratings 
-                SET rating = %s, timestamp = %s 
-                WHERE userId = %s AND movieId = %s
-            """
-            for user_id, movie_id, rating, timestamp in update_pairs:
-                cur.execute(update_sql, (rating, timestamp, user_id, movie_id))
-        conn.commit()
-        sql_time = time.time() - sql_start
+        update_sql = """
+            UPDATE ratings 
+            SET rating = %s, timestamp = %s 
+            WHERE userId = %s AND movieId = %s
+        """
+        samples = []
+        for run in range(warmup + runs):
+            update_pairs = _update_pairs(run)
+            t0 = time.perf_counter_ns()
+            conn.begin()
+            with conn.cursor() as cur:
+                for user_id, movie_id, rating, timestamp in update_pairs:
+                    cur.execute(update_sql, (rating, timestamp, user_id, movie_id))
+            conn.commit()
+            if run >= warmup:
+                samples.append(time.perf_counter_ns() - t0)
+        sql_stats = summarize_samples(samples, len(update_pairs))
+        sql_time = sql_stats["p50_ms"] / 1000
         sql_throughput = len(update_pairs) / sql_time if sql_time > 0 else 0
         sql_success = True
-        print(f"[SQL UPDATE] Successfully updated {len(update_pairs)} records in {sql_time:.3f}s ({sql_throughput:.1f} updates/sec)")
+        print(f"[SQL UPDATE] {runs} runs of {len(update_pairs)} records: p50 {sql_time:.3f}s, "
+              f"p95 {sql_stats['p95_ms'] / 1000:.3f}s ({sql_throughput:.1f} updates/sec)")
     except pymysql.err.OperationalError as e:
         conn.rollback()
         print(f"[SQL UPDATE ERROR] Database connection error: {e}")
@@ -1258,31 +3814,32 @@ def test_bulk_update_performance(num_records=100):
     finally:
         conn.close()
     
-    # RESTORE original SQL data (ZERO IMPACT)
-    if sql_success:
-        restore_conn = get_connection()
-        try:
-            restore_conn.begin()
-            with restore_conn.cursor() as cur:
-                restore_sql = """
-                    UPDATE ratings 
-                    SET rating = %s, timestamp = %s 
-                    WHERE userId = %s AND movieId = %s
-                """
-                for user_id, movie_id, orig_rating, orig_timestamp in original_ratings:
-                    cur.execute(restore_sql, (orig_rating, orig_timestamp, user_id, movie_id))
-            restore_conn.commit()
-            print(f"[SQL RESTORE] Restored {len(original_ratings)} ratings to original values - dataset unchanged")
-        except Exception as e:
-            restore_conn.rollback()
-            print(f"[SQL RESTORE ERROR] {e}")
-        finally:
-            restore_conn.close()
+    # RESTORE original SQL data (ZERO IMPACT).
+    # Earlier runs were committed even if a later one failed, so always restore.
+    restore_conn = get_connection()
+    try:
+        restore_conn.begin()
+        with restore_conn.cursor() as cur:
+            restore_sql = """
+                UPDATE ratings 
+                SET rating = %s, timestamp = %s 
+                WHERE userId = %s AND movieId = %s
+            """
+            for user_id, movie_id, orig_rating, orig_timestamp in original_ratings:
+                cur.execute(restore_sql, (orig_rating, orig_timestamp, user_id, movie_id))
+        restore_conn.commit()
+        print(f"[SQL RESTORE] Restored {len(original_ratings)} ratings to original values - dataset unchanged")
+    except Exception as e:
+        restore_conn.rollback()
+        print(f"[SQL RESTORE ERROR] {e}")
+    finally:
+        restore_conn.close()
     
     # MongoDB bulk update test (simulated with tmdb_movies collection)
     mongo_time = 0
     mongo_throughput = 0
     mongo_success = False
+    mongo_stats = summarize_samples([])
     mongo_original_docs = []
     
     if tmdb_collection is not None:
@@ -1299,33 +3856,33 @@ def test_bulk_update_performance(num_records=100):
                                        for doc in mongo_sample]
                 print(f"[BACKUP] Saved {len(mongo_original_docs)} original MongoDB documents")
                 
-                mongo_start = time.time()
-                
-                # Bulk update operations with NEW random values
-                bulk_ops = []
-                for doc in mongo_sample:
-                    doc_id = doc.get('_id')
-                    bulk_ops.append({
-                        "update_one": {
-                            "filter": {"_id": doc_id},
-                            "update": {"$set": {
+                from pymongo import UpdateOne
+                samples = []
+                for run in range(warmup + runs):
+                    # Bulk update operations with NEW random values
+                    bulk_ops = [
+                        UpdateOne(
+                            {"_id": doc.get('_id')},
+                            {"$set": {
                                 "popularity": random.uniform(1.0, 100.0),
                                 "vote_average": round(random.uniform(0.5, 10.0), 1)
                             }}
-                        }
-                    })
-                
-                # Execute bulk write
-                if bulk_ops:
-                    from pymongo import UpdateOne
-                    result = tmdb_collection.bulk_write([
-                        UpdateOne(op["update_one"]["filter"], op["update_one"]["update"])
-                        for op in bulk_ops
-                    ])
-                    mongo_time = time.time() - mongo_start
-                    mongo_throughput = len(bulk_ops) / mongo_time if mongo_time > 0 else 0
-                    mongo_success = True
-                    print(f"[MONGO UPDATE] Successfully updated {result.modified_count} documents in {mongo_time:.3f}s ({mongo_throughput:.1f} updates/sec)")
+                        )
+                        for doc in mongo_sample
+                    ]
+                    
+                    # Execute bulk write
+                    t0 = time.perf_counter_ns()
+                    tmdb_collection.bulk_write(bulk_ops)
+                    if run >= warmup:
+                        samples.append(time.perf_counter_ns() - t0)
+
+                mongo_stats = summarize_samples(samples, len(mongo_sample))
+                mongo_time = mongo_stats["p50_ms"] / 1000
+                mongo_throughput = len(mongo_sample) / mongo_time if mongo_time > 0 else 0
+                mongo_success = True
+                print(f"[MONGO UPDATE] {runs} runs of {len(mongo_sample)} documents: p50 {mongo_time:.3f}s, "
+                      f"p95 {mongo_stats['p95_ms'] / 1000:.3f}s ({mongo_throughput:.1f} updates/sec)")
                 
                 # RESTORE original MongoDB data (ZERO IMPACT)
                 restore_ops = []
@@ -1359,47 +3916,566 @@ def test_bulk_update_performance(num_records=100):
         "sql_time": sql_time,
         "sql_throughput": sql_throughput,
         "sql_success": sql_success,
+        "sql_stats": sql_stats,
         "mongo_time": mongo_time,
         "mongo_throughput": mongo_throughput,
         "mongo_success": mongo_success,
-        "record_count": len(update_pairs) if sql_success else 0
+        "mongo_stats": mongo_stats,
+        "record_count": len(update_pairs) if sql_success else 0,
+        "runs": runs
     }
 
 
 ###############################################################################
-# 4. SQL HELPERS – USERS
+# 3B. BENCHMARK HARNESS (named scenarios, warmup + repeated iterations)
 ###############################################################################
 
-def get_user(user_id):
-    sql = """
-        SELECT userId, username, email, created_at
-        FROM users
-        WHERE userId = %s
+# The Performance tab used to time a single call with time.time(), which is
+# mostly noise (connection setup, cold caches, scheduler jitter). Scenarios
+# below are run with a warmup phase and N timed iterations using
+# time.perf_counter_ns, and reported as percentiles. The same suite is run
+# from the tab and from benchmark.py on the command line.
+BENCHMARK_WARMUP = int(os.getenv("BENCHMARK_WARMUP", "3"))
+BENCHMARK_ITERATIONS = int(os.getenv("BENCHMARK_ITERATIONS", "30"))
+BENCHMARK_BULK_RUNS = int(os.getenv("BENCHMARK_BULK_RUNS", "5"))
+BENCHMARK_RESULTS_DIR = os.getenv("BENCHMARK_RESULTS_DIR", "benchmarks")
+
+
+def _percentile(sorted_values, pct):
+    """Linear-interpolated percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    pos = (len(sorted_values) - 1) * pct / 100.0
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+def summarize_samples(samples_ns, ops_per_sample=1):
     """
-    conn = get_connection()
-    try:
-        with conn.cursor() as cur:
-            cur.execute(sql, (user_id,))
-            return cur.fetchone()
-    finally:
-        conn.close()
+    Turn a list of per-iteration durations (nanoseconds) into latency stats.
+    Latencies are reported in milliseconds, throughput in operations/second.
+    """
+    n = len(samples_ns)
+    if not n:
+        return {"iterations": 0, "min_ms": 0.0, "mean_ms": 0.0, "stddev_ms": 0.0,
+                "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0,
+                "throughput_ops": 0.0}
+    ms = sorted(s / 1e6 for s in samples_ns)
+    mean = sum(ms) / n
+    variance = sum((x - mean) ** 2 for x in ms) / (n - 1) if n > 1 else 0.0
+    total_s = sum(samples_ns) / 1e9
+    return {
+        "iterations": n,
+        "min_ms": ms[0],
+        "mean_ms": mean,
+        "stddev_ms": variance ** 0.5,
+        "p50_ms": _percentile(ms, 50),
+        "p95_ms": _percentile(ms, 95),
+        "p99_ms": _percentile(ms, 99),
+        "max_ms": ms[-1],
+        "throughput_ops": (n * ops_per_sample) / total_s if total_s > 0 else 0.0,
+    }
 
 
-def search_users(keyword=""):
+def measure_callable(fn, iterations=BENCHMARK_ITERATIONS, warmup=BENCHMARK_WARMUP,
+                     before_each=None, ops_per_iteration=1):
     """
-    Returns up to 50 users.
-    If keyword is provided, filter by username/email LIKE.
-    Only admins can search users.
+    Call fn(i) `warmup` times untimed, then `iterations` times timed.
+    before_each(i), if given, runs outside the timed region.
+    Returns (stats, last_result, errors). Iterations that raise are counted
+    as errors and left out of the latency samples.
     """
-    # Check permissions
-    if CURRENT_USER['role'] != 'admin':
-        raise PermissionError("Only administrators can search users")
-        
-    if keyword:
-        sql = """
-            SELECT userId, username, email, created_at
-            FROM users
-            WHERE (username LIKE %s OR email LIKE %s)
+    for i in range(warmup):
+        if before_each:
+            before_each(i)
+        try:
+            fn(i)
+        except Exception as e:
+            logger.warning(f"[BENCHMARK] warmup iteration {i} failed: {e}")
+
+    samples = []
+    errors = 0
+    result = None
+    for i in range(iterations):
+        if before_each:
+            before_each(i)
+        t0 = time.perf_counter_ns()
+        try:
+            result = fn(i)
+        except Exception as e:
+            errors += 1
+            logger.warning(f"[BENCHMARK] iteration {i} failed: {e}")
+            continue
+        samples.append(time.perf_counter_ns() - t0)
+
+    stats = summarize_samples(samples, ops_per_iteration)
+    stats["errors"] = errors
+    stats["warmup"] = warmup
+    # Raw samples are kept so two runs can be compared statistically later
+    stats["samples_ms"] = [round(x / 1e6, 4) for x in samples]
+    return stats, result, errors
+
+
+class BenchmarkScenario:
+    """
+    A named, repeatable unit of work.
+    setup(params) -> ctx is run once (untimed), run(ctx, i) is the timed call,
+    before_each(ctx, i) prepares each iteration (untimed) and teardown(ctx)
+    restores anything the scenario changed.
+    """
+
+    def __init__(self, name, description, run, setup=None, before_each=None,
+                 teardown=None, ops_per_iteration=1):
+        self.name = name
+        self.description = description
+        self.run = run
+        self.setup = setup
+        self.before_each = before_each
+        self.teardown = teardown
+        self.ops_per_iteration = ops_per_iteration
+
+
+def _result_count(result):
+    """Row count of a helper result: (rows, elapsed), a list, or a single row."""
+    if isinstance(result, tuple):
+        result = result[0]
+    if isinstance(result, list):
+        return len(result)
+    return 1 if result else 0
+
+
+def _bench_sample_movie_ids(params):
+    conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT movieId FROM movies WHERE is_placeholder = 0 ORDER BY movieId LIMIT %s",
+                (params.get("sample_size", 200),)
+            )
+            ids = [r["movieId"] for r in cur.fetchall()]
+    finally:
+        conn.close()
+    if not ids:
+        raise RuntimeError("no movies in the database")
+    return {"movie_ids": ids, "cold": params.get("cold_cache", True)}
+
+
+def _bench_details_before_each(ctx, i):
+    # Measure the database path unless warm-cache numbers were asked for
+    if ctx["cold"]:
+        movie_details_cache.invalidate(_entity_key(ctx["movie_ids"][i % len(ctx["movie_ids"])]))
+
+
+# rating_upsert writes through add_or_update_rating as a dedicated account on
+# a hidden placeholder movie (created by setup, removed again by teardown), so
+# no real user's rating is touched and the logged-in user is never swapped out
+BENCH_USERNAME = "__benchmark__"
+BENCH_MOVIE_TITLE = "__benchmark__"
+
+
+def _bench_fixture_ids():
+    """(userId, movieId) of the benchmark user and placeholder movie, creating them if needed."""
+    conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT userId FROM users WHERE username = %s", (BENCH_USERNAME,))
+            row = cur.fetchone()
+            if row:
+                user_id = row["userId"]
+            else:
+                user_id = user_ids.next_id()
+                # No password hash: the account cannot log in
+                cur.execute("INSERT INTO users (userId, username, email, role) VALUES (%s, %s, NULL, 'user')",
+                            (user_id, BENCH_USERNAME))
+            cur.execute("SELECT movieId FROM movies WHERE title = %s AND is_placeholder = 1 LIMIT 1",
+                        (BENCH_MOVIE_TITLE,))
+            row = cur.fetchone()
+            if row:
+                movie_id = row["movieId"]
+            else:
+                movie_id = movie_ids.next_id()
+                cur.execute("INSERT INTO movies (movieId, title, is_placeholder) VALUES (%s, %s, 1)",
+                            (movie_id, BENCH_MOVIE_TITLE))
+        conn.commit()
+        return user_id, movie_id
+    finally:
+        conn.close()
+
+
+def _bench_rating_setup(params):
+    if CURRENT_USER.get("role") != "admin":
+        raise PermissionError("rating_upsert writes to the database - admins only")
+    user_id, movie_id = _bench_fixture_ids()
+    acting_user = {"userId": user_id, "username": BENCH_USERNAME, "email": None, "role": "user"}
+    return {"userId": user_id, "movieId": movie_id, "acting_user": acting_user}
+
+
+def _bench_rating_run(ctx, i):
+    if not add_or_update_rating(ctx["userId"], ctx["movieId"], 0.5 + (i % 10) * 0.5,
+                                acting_user=ctx["acting_user"]):
+        raise RuntimeError("rating upsert rolled back")
+    return True
+
+
+def _bench_rating_teardown(ctx):
+    conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            _delete_movie_rows(cur, ctx["movieId"])
+            cur.execute("DELETE FROM users WHERE userId=%s", (ctx["userId"],))
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        logger.error(f"[BENCHMARK] could not remove the benchmark user and movie: {e}")
+    finally:
+        conn.close()
+    invalidate_movie_caches(ctx["movieId"])
+    invalidate_user_caches(ctx["userId"])
+
+
+def _bench_require_mongo(params):
+    if tmdb_collection is None:
+        raise RuntimeError("MongoDB not connected")
+    return params
+
+
+BENCHMARK_SCENARIOS = {
+    s.name: s for s in (
+        BenchmarkScenario(
+            "title_search", "SQL title LIKE search with rating aggregates",
+            run=lambda p, i: search_movies_by_title(p["keyword"]),
+            setup=lambda p: p,
+        ),
+        BenchmarkScenario(
+            "advanced_search", "SQL title search + HAVING on avg rating and votes",
+            run=lambda p, i: search_movies_advanced(title=p["keyword"], min_rating=3.0, min_votes=10),
+            setup=lambda p: p,
+        ),
+        BenchmarkScenario(
+            "details_view", "Single-movie details join (movies/ratings/links)",
+            run=lambda ctx, i: get_movie_details(ctx["movie_ids"][i % len(ctx["movie_ids"])]),
+            setup=_bench_sample_movie_ids,
+            before_each=_bench_details_before_each,
+        ),
+        BenchmarkScenario(
+            "rating_upsert", "Transactional delete+insert of one rating (benchmark user, admins only)",
+            run=_bench_rating_run,
+            setup=_bench_rating_setup,
+            teardown=_bench_rating_teardown,
+        ),
+        BenchmarkScenario(
+            "genre_search", "MongoDB regex search on genres",
+            run=lambda p, i: search_movies_by_genre_mongo(p["genre"]),
+            setup=_bench_require_mongo,
+        ),
+        BenchmarkScenario(
+            "top_n", "Top-N movies by average rating (GROUP BY + HAVING)",
+            run=lambda p, i: get_top_rated_movies(p["limit"]),
+            setup=lambda p: p,
+        ),
+    )
+}
+
+BENCHMARK_DEFAULT_PARAMS = {
+    "keyword": "love",
+    "genre": "Action",
+    "limit": 20,
+    "sample_size": 200,
+    "cold_cache": True,
+}
+
+
+def run_benchmark_scenario(name, iterations=BENCHMARK_ITERATIONS, warmup=BENCHMARK_WARMUP, params=None):
+    """Run one named scenario. Returns a result dict (status 'ok', 'skipped' or 'error')."""
+    scenario = BENCHMARK_SCENARIOS[name]
+    p = dict(BENCHMARK_DEFAULT_PARAMS)
+    p.update(params or {})
+    result = {"scenario": name, "description": scenario.description}
+    try:
+        ctx = scenario.setup(p) if scenario.setup else p
+    except Exception as e:
+        result.update(status="skipped", reason=str(e))
+        return result
+    try:
+        before = (lambda i: scenario.before_each(ctx, i)) if scenario.before_each else None
+        stats, last, _ = measure_callable(
+            lambda i: scenario.run(ctx, i), iterations, warmup,
+            before_each=before, ops_per_iteration=scenario.ops_per_iteration
+        )
+        result.update(status="ok", rows=_result_count(last), **stats)
+    except Exception as e:
+        result.update(status="error", reason=str(e))
+    finally:
+        if scenario.teardown:
+            scenario.teardown(ctx)
+    return result
+
+
+def run_benchmark_suite(names=None, iterations=BENCHMARK_ITERATIONS, warmup=BENCHMARK_WARMUP,
+                        params=None, progress=None):
+    """
+    Run the given scenarios (default: all) and return a results document.
+    progress(name, result), if given, is called after each scenario.
+    """
+    names = list(names or BENCHMARK_SCENARIOS)
+    results = {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "iterations": iterations,
+        "warmup": warmup,
+        "params": dict(BENCHMARK_DEFAULT_PARAMS, **(params or {})),
+        "environment": collect_benchmark_environment(),
+        "scenarios": [],
+    }
+    for name in names:
+        res = run_benchmark_scenario(name, iterations, warmup, params)
+        results["scenarios"].append(res)
+        if progress:
+            progress(name, res)
+    results["finished_at"] = datetime.now().isoformat(timespec="seconds")
+    return results
+
+
+def save_benchmark_results(results, path=None):
+    """Write a results document as JSON. Returns the path written."""
+    if path is None:
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(BENCHMARK_RESULTS_DIR, f"bench_{stamp}.json")
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, default=str)
+    return path
+
+
+def format_benchmark_table(results):
+    """Fixed-width text table of a results document (used by the tab and the CLI)."""
+    env = results.get("environment") or {}
+    dataset = env.get("dataset") or {}
+    commit = (env.get("git_commit") or "unknown")[:10] + (" (dirty)" if env.get("git_dirty") else "")
+    lines = [
+        f"Iterations: {results['iterations']} (warmup {results['warmup']})",
+        f"Commit: {commit} | Ratings: {dataset.get('ratings', '?')} | Movies: {dataset.get('movies', '?')}",
+        "",
+        f"{'Scenario':<17} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'mean':>9} {'stddev':>9} {'ops/s':>9} {'err':>4}",
+        "-" * 80,
+    ]
+    for r in results["scenarios"]:
+        if r["status"] != "ok":
+            lines.append(f"{r['scenario']:<17} {r['status'].upper()}: {r.get('reason', '')}")
+            continue
+        lines.append(
+            f"{r['scenario']:<17} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f} "
+            f"{r['mean_ms']:>9.2f} {r['stddev_ms']:>9.2f} {r['throughput_ops']:>9.1f} {r['errors']:>4}"
+        )
+    return "\n".join(lines)
+
+
+def _git_output(*args):
+    try:
+        out = subprocess.run(
+            ["git", *args], capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() if out.returncode == 0 else None
+
+
+def collect_benchmark_environment():
+    """
+    Metadata stored with every benchmark run so results can be compared
+    fairly later: code version, dataset size and where it ran.
+    """
+    env = {
+        "git_commit": _git_output("rev-parse", "HEAD"),
+        "git_branch": _git_output("rev-parse", "--abbrev-ref", "HEAD"),
+        "git_dirty": bool(_git_output("status", "--porcelain", "--untracked-files=no")),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "hostname": platform.node(),
+        "cpu_count": os.cpu_count(),
+        "db_host": DB_HOST,
+        "mongo": "local" if USE_LOCAL_MONGO else ("atlas" if tmdb_collection is not None else "none"),
+        "tmdb_cache": TMDB_CACHE_ENABLED,
+        "dataset": {},
+    }
+    conn = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cur:
+            cur.execute("SELECT VERSION() AS v")
+            env["mariadb_version"] = cur.fetchone()["v"]
+            for table in ("USERS", "MOVIES", "RATINGS", "LINKS"):
+                cur.execute(f"SELECT COUNT(*) AS n FROM {table}")
+                env["dataset"][table.lower()] = cur.fetchone()["n"]
+    except Exception as e:
+        env["dataset_error"] = str(e)
+    finally:
+        if conn is not None:
+            conn.close()
+    if tmdb_collection is not None:
+        try:
+            env["dataset"]["tmdb_documents"] = tmdb_collection.estimated_document_count()
+        except Exception:
+            pass
+    return env
+
+
+def list_benchmark_history(directory=None):
+    """Saved suite runs (bench_*.json), oldest first, as (path, results) pairs."""
+    directory = directory or BENCHMARK_RESULTS_DIR
+    if not os.path.isdir(directory):
+        return []
+    runs = []
+    for name in sorted(os.listdir(directory)):
+        if not (name.startswith("bench_") and name.endswith(".json")):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            with open(path, encoding="utf-8") as f:
+                runs.append((path, json.load(f)))
+        except (OSError, ValueError) as e:
+            logger.warning(f"[BENCHMARK] skipping unreadable result file {path}: {e}")
+    runs.sort(key=lambda run: run[1].get("started_at", ""))
+    return runs
+
+
+def load_benchmark_results(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _median(values):
+    return _percentile(sorted(values), 50)
+
+
+def bootstrap_median_diff(baseline, candidate, resamples=2000, confidence=0.95, seed=2003):
+    """
+    Bootstrap confidence interval for median(candidate) - median(baseline).
+    Both inputs are lists of latency samples (ms).
+    """
+    rng = random.Random(seed)
+    diffs = sorted(
+        _median(rng.choices(candidate, k=len(candidate))) - _median(rng.choices(baseline, k=len(baseline)))
+        for _ in range(resamples)
+    )
+    tail = (1 - confidence) / 2 * 100
+    return _percentile(diffs, tail), _percentile(diffs, 100 - tail)
+
+
+def compare_benchmark_runs(baseline, candidate, threshold_pct=10.0, confidence=0.95, resamples=2000):
+    """
+    Compare two saved suite runs scenario by scenario.
+    A scenario is flagged 'regression' when p50 got slower by more than
+    threshold_pct AND the bootstrap CI of the p50 difference is entirely
+    above zero; 'improvement' is the mirror image. Everything else is
+    'unchanged' (within threshold or not statistically significant).
+    """
+    base_by_name = {r["scenario"]: r for r in baseline.get("scenarios", []) if r.get("status") == "ok"}
+    rows = []
+    for cand in candidate.get("scenarios", []):
+        name = cand["scenario"]
+        base = base_by_name.get(name)
+        if cand.get("status") != "ok" or base is None:
+            rows.append({"scenario": name, "verdict": "not comparable"})
+            continue
+        b_samples, c_samples = base.get("samples_ms") or [], cand.get("samples_ms") or []
+        change_pct = ((cand["p50_ms"] - base["p50_ms"]) / base["p50_ms"] * 100) if base["p50_ms"] else 0.0
+        row = {
+            "scenario": name,
+            "baseline_p50_ms": base["p50_ms"],
+            "candidate_p50_ms": cand["p50_ms"],
+            "change_pct": change_pct,
+            "ci_low_ms": None,
+            "ci_high_ms": None,
+        }
+        if len(b_samples) >= 2 and len(c_samples) >= 2:
+            lo, hi = bootstrap_median_diff(b_samples, c_samples, resamples, confidence)
+            row["ci_low_ms"], row["ci_high_ms"] = lo, hi
+            significant_up, significant_down = lo > 0, hi < 0
+        else:
+            # Older result files without raw samples: threshold only
+            significant_up = significant_down = True
+        if change_pct > threshold_pct and significant_up:
+            row["verdict"] = "regression"
+        elif change_pct < -threshold_pct and significant_down:
+            row["verdict"] = "improvement"
+        else:
+            row["verdict"] = "unchanged"
+        rows.append(row)
+    return {
+        "baseline": {k: baseline.get(k) for k in ("started_at", "iterations")},
+        "candidate": {k: candidate.get(k) for k in ("started_at", "iterations")},
+        "baseline_commit": (baseline.get("environment") or {}).get("git_commit"),
+        "candidate_commit": (candidate.get("environment") or {}).get("git_commit"),
+        "threshold_pct": threshold_pct,
+        "confidence": confidence,
+        "scenarios": rows,
+        "regressions": [r["scenario"] for r in rows if r["verdict"] == "regression"],
+    }
+
+
+def format_benchmark_comparison(cmp):
+    """Fixed-width text report of compare_benchmark_runs()."""
+    short = lambda sha: sha[:10] if sha else "unknown"
+    lines = [
+        f"Baseline:  {cmp['baseline']['started_at']} ({short(cmp['baseline_commit'])})",
+        f"Candidate: {cmp['candidate']['started_at']} ({short(cmp['candidate_commit'])})",
+        f"Regression threshold: {cmp['threshold_pct']:g}% on p50, {cmp['confidence'] * 100:g}% bootstrap CI",
+        "",
+        f"{'Scenario':<17} {'base p50':>9} {'new p50':>9} {'change':>8} {'CI of diff (ms)':>21}  Verdict",
+        "-" * 80,
+    ]
+    for r in cmp["scenarios"]:
+        if "change_pct" not in r:
+            lines.append(f"{r['scenario']:<17} {'':>9} {'':>9} {'':>8} {'':>21}  {r['verdict']}")
+            continue
+        ci = (f"[{r['ci_low_ms']:+.2f}, {r['ci_high_ms']:+.2f}]"
+              if r["ci_low_ms"] is not None else "n/a")
+        flag = {"regression": "REGRESSION", "improvement": "improved"}.get(r["verdict"], r["verdict"])
+        lines.append(
+            f"{r['scenario']:<17} {r['baseline_p50_ms']:>9.2f} {r['candidate_p50_ms']:>9.2f} "
+            f"{r['change_pct']:>+7.1f}% {ci:>21}  {flag}"
+        )
+    return "\n".join(lines)
+
+
+###############################################################################
+# 4. SQL HELPERS – USERS
+###############################################################################
+
+def get_user(user_id):
+    sql = """
+        SELECT userId, username, email, created_at
+        FROM users
+        WHERE userId = %s
+    """
+    conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(sql, (user_id,))
+            return cur.fetchone()
+    finally:
+        conn.close()
+
+
+def search_users(keyword=""):
+    """
+    Returns up to 50 users.
+    If keyword is provided, filter by username/email LIKE.
+    Only admins can search users.
+    """
+    # Check permissions
+    if CURRENT_USER['role'] != 'admin':
+        raise PermissionError("Only administrators can search users")
+        
+    if keyword:
+        sql = """
+            SELECT userId, username, email, created_at
+            FROM users
+            WHERE (username LIKE %s OR email LIKE %s)
               AND username IS NOT NULL
               AND email IS NOT NULL
             ORDER BY userId ASC
@@ -1460,6 +4536,30 @@ def find_user_by_name_or_email(username=None, email=None):
         conn.close()
 
 
+def _insert_user_row(cur, user_id, username, email, pwd_hash):
+    """
+    INSERT one USERS row; user_id None takes the next allocated id and
+    moves on to a fresh one if it collides with an explicitly inserted row.
+    Returns the userId used.
+    """
+    sql = """
+        INSERT INTO users (userId, username, email, password_hash, role, created_at)
+        VALUES (%s, %s, %s, %s, 'user', NOW())
+    """
+    if user_id is not None:
+        cur.execute(sql, (user_id, username, email, pwd_hash))
+        return user_id
+    for attempt in range(ID_INSERT_ATTEMPTS):
+        user_id = user_ids.next_id()
+        try:
+            cur.execute(sql, (user_id, username, email, pwd_hash))
+            return user_id
+        except pymysql.IntegrityError as e:
+            if not is_duplicate_primary_key(e) or attempt == ID_INSERT_ATTEMPTS - 1:
+                raise
+            user_ids.discard()
+
+
 def register_new_user(username, email, password):
     """
     Register a new user account (public registration - no admin required).
@@ -1482,17 +4582,8 @@ def register_new_user(username, email, password):
             if cur.fetchone():
                 return False, "Email already exists"
             
-            # Get next available user ID
-            cur.execute("SELECT COALESCE(MAX(userId), 0) + 1 AS next_id FROM users")
-            result = cur.fetchone()
-            user_id = result['next_id']
-            
-            # Insert new user
-            sql = """
-                INSERT INTO users (userId, username, email, password_hash, role, created_at)
-                VALUES (%s, %s, %s, %s, 'user', NOW())
-            """
-            cur.execute(sql, (user_id, username, email, pwd_hash))
+            # Insert new user with an id from the reserved block (no MAX() race)
+            user_id = _insert_user_row(cur, None, username, email, pwd_hash)
         conn.commit()
         return True, user_id
     except pymysql.MySQLError as e:
@@ -1519,17 +4610,8 @@ def add_user(username, email, password="password123", user_id=None):
     conn = get_connection()
     try:
         with conn.cursor() as cur:
-            # If no user_id provided, get the next available ID
-            if user_id is None:
-                cur.execute("SELECT COALESCE(MAX(userId), 0) + 1 AS next_id FROM users")
-                result = cur.fetchone()
-                user_id = result['next_id']
-            
-            sql = """
-                INSERT INTO users (userId, username, email, password_hash, role, created_at)
-                VALUES (%s, %s, %s, %s, 'user', NOW())
-            """
-            cur.execute(sql, (user_id, username, email, pwd_hash))
+            # If no user_id provided, take the next one from the reserved block
+            user_id = _insert_user_row(cur, user_id, username, email, pwd_hash)
         conn.commit()
         return True, user_id
     except pymysql.MySQLError as e:
@@ -1540,14 +4622,166 @@ def add_user(username, email, password="password123", user_id=None):
         conn.close()
 
 
-def update_user(user_id, username, email, password=None):
+# ---------------- Bulk user provisioning ----------------
+# Onboarding thousands of accounts through add_user() costs one bcrypt hash
+# on one core and one commit per row. bulk_add_users() validates everything
+# first, hashes on every auth worker at once, reserves all ids with one
+# sequence update and inserts multi-row chunks, each in its own transaction.
+# A chunk that fails is retried row by row, so one bad row only costs itself.
+BULK_USER_CHUNK = int(os.getenv("BULK_USER_CHUNK", "500"))
+BULK_USER_DEFAULT_PASSWORD = "password123"  # same default as add_user()
+USER_IMPORT_COLUMNS = ("username", "email", "password", "role")
+
+
+def read_user_csv(path):
+    """
+    Rows of a user CSV (header: username,email[,password][,role]) as dicts
+    with their 1-based file line number under "line".
+    """
+    rows = []
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f)
+        missing = {"username", "email"} - {c.strip().lower() for c in (reader.fieldnames or [])}
+        if missing:
+            raise ValueError(f"CSV is missing column(s): {', '.join(sorted(missing))}")
+        for row in reader:
+            clean = {k.strip().lower(): (v or "").strip() for k, v in row.items() if k}
+            clean["line"] = reader.line_num
+            rows.append(clean)
+    return rows
+
+
+def _existing_user_values(cur, column, values, chunk_size):
+    found = set()
+    values = list(values)
+    for i in range(0, len(values), chunk_size):
+        chunk = values[i:i + chunk_size]
+        cur.execute(
+            f"SELECT LOWER({column}) AS v FROM users WHERE {column} IN ({', '.join(['%s'] * len(chunk))})",
+            chunk
+        )
+        found.update(r["v"] for r in cur.fetchall())
+    return found
+
+
+def bulk_add_users(rows, default_password=BULK_USER_DEFAULT_PASSWORD, chunk_size=BULK_USER_CHUNK, progress=None):
+    """
+    Create many users at once (ADMIN ONLY).
+    rows: dicts with username, email and optionally password, role and line
+    (a CSV line number; the row's position is used otherwise).
+    progress(done, total), if given, is called after every chunk.
+    Returns {"created": [{"line", "userId", "username"}], "errors": [{"line", "username", "reason"}]}.
+    Invalid or duplicate rows are reported, never raised.
+    """
+    if CURRENT_USER['role'] != 'admin':
+        raise PermissionError("Only administrators can create new users")
+
+    created, errors = [], []
+    valid = []
+    seen_usernames, seen_emails = set(), set()
+    for position, row in enumerate(rows, 1):
+        line = row.get("line", position)
+        username = (row.get("username") or "").strip()
+        email = (row.get("email") or "").strip()
+        password = row.get("password") or default_password
+        role = (row.get("role") or "user").strip().lower()
+        if not username:
+            reason = "username is empty"
+        elif not is_valid_email(email):
+            reason = f"invalid email '{email}'"
+        elif not password or len(password) < 6:
+            reason = "password must be at least 6 characters"
+        elif role not in ("user", "admin"):
+            reason = f"unknown role '{role}'"
+        elif username.lower() in seen_usernames:
+            reason = "duplicate username in this batch"
+        elif email.lower() in seen_emails:
+            reason = "duplicate email in this batch"
+        else:
+            reason = None
+        if reason:
+            errors.append({"line": line, "username": username, "reason": reason})
+            continue
+        seen_usernames.add(username.lower())
+        seen_emails.add(email.lower())
+        valid.append({"line": line, "username": username, "email": email, "password": password, "role": role})
+
+    conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            taken_usernames = _existing_user_values(cur, "username", [r["username"] for r in valid], chunk_size)
+            taken_emails = _existing_user_values(cur, "email", [r["email"] for r in valid], chunk_size)
+        conn.commit()
+        fresh = []
+        for r in valid:
+            if r["username"].lower() in taken_usernames:
+                errors.append({"line": r["line"], "username": r["username"], "reason": "username already exists"})
+            elif r["email"].lower() in taken_emails:
+                errors.append({"line": r["line"], "username": r["username"], "reason": "email already exists"})
+            else:
+                fresh.append(r)
+
+        # Parallel bcrypt across the auth worker pool, then one id reservation for the whole batch
+        for r, pwd_hash in zip(fresh, hash_passwords([r["password"] for r in fresh])):
+            r["password_hash"] = pwd_hash
+        for r, user_id in zip(fresh, user_ids.reserve(len(fresh))):
+            r["userId"] = user_id
+
+        insert_head = "INSERT INTO users (userId, username, email, password_hash, role, created_at) VALUES "
+        for i in range(0, len(fresh), chunk_size):
+            chunk = fresh[i:i + chunk_size]
+            params = []
+            for r in chunk:
+                params.extend((r["userId"], r["username"], r["email"], r["password_hash"], r["role"]))
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(insert_head + ", ".join(["(%s, %s, %s, %s, %s, NOW())"] * len(chunk)), params)
+                conn.commit()
+                created.extend({"line": r["line"], "userId": r["userId"], "username": r["username"]} for r in chunk)
+            except pymysql.MySQLError as e:
+                conn.rollback()
+                log_event(sql_log, logging.WARNING, "users.bulk_chunk_failed", rows=len(chunk), error=e)
+                # Find the offending row(s): replay this chunk one row per transaction
+                for r in chunk:
+                    try:
+                        with conn.cursor() as cur:
+                            cur.execute(insert_head + "(%s, %s, %s, %s, %s, NOW())",
+                                        (r["userId"], r["username"], r["email"], r["password_hash"], r["role"]))
+                        conn.commit()
+                        created.append({"line": r["line"], "userId": r["userId"], "username": r["username"]})
+                    except pymysql.MySQLError as row_error:
+                        conn.rollback()
+                        errors.append({"line": r["line"], "username": r["username"], "reason": str(row_error)})
+            if progress:
+                progress(min(i + chunk_size, len(fresh)), len(fresh))
+    finally:
+        conn.close()
+
+    errors.sort(key=lambda e: e["line"])
+    log_event(sql_log, logging.INFO, "users.bulk_added", created=len(created), errors=len(errors))
+    return {"created": created, "errors": errors}
+
+
+def write_user_import_errors(errors, path):
+    """Per-row errors of bulk_add_users as CSV (line, username, reason)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["line", "username", "reason"])
+        writer.writeheader()
+        writer.writerows(errors)
+    return path
+
+
+def update_user(user_id, username, email, password=None, password_hash=None):
     """
     Update user information. If password is provided, it will be hashed and updated.
     If password is None or empty, the password will not be changed.
+    Callers on the Tk thread pass an already computed password_hash instead
+    (see hash_password / run_auth_async).
     """
-    if password:
+    if password or password_hash:
         # Hash the new password
-        pwd_hash = hash_password(password)
+        pwd_hash = password_hash or hash_password(password)
         sql = """
             UPDATE users
             SET username = %s, email = %s, password_hash = %s
@@ -1565,9 +4799,13 @@ def update_user(user_id, username, email, password=None):
     conn = get_connection()
     try:
         with conn.cursor() as cur:
+            require_user_generation(cur)
             cur.execute(sql, params)
         conn.commit()
         return True
+    except UserIdsChanged:
+        conn.rollback()
+        return False
     except pymysql.MySQLError as e:
         conn.rollback()
         messagebox.showerror("DB Error (Update User)", str(e))
@@ -1576,63 +4814,255 @@ def update_user(user_id, username, email, password=None):
         conn.close()
 
 
-def delete_user(user_id):
-    """
-    Delete a user while preserving their ratings.
-    Sets userId to NULL in ratings table to maintain rating data for averages.
-    This ensures that movie averages and vote counts remain accurate even after user deletion.
-    """
+# ---------------- Batched user deletion ----------------
+# Deleting a user keeps their ratings for the movie averages by setting
+# RATINGS.userId to NULL. Doing that in the DELETE's transaction locked
+# every rating row of a prolific user until commit. Instead the users are
+# tombstoned first (USERS.deleted_at, 18_user_tombstones.sql: no login, no
+# sessions), their ratings are detached USER_DELETE_BATCH rows per
+# committed transaction, and only the last, short transaction removes the
+# watchlist, rating locks and USERS row. A tombstoned user left behind by an
+# interrupted run is finished by finish_pending_user_deletions().
+USER_DELETE_BATCH = int(os.getenv("USER_DELETE_BATCH", "500"))
+USER_DELETE_PAUSE_MS = int(os.getenv("USER_DELETE_PAUSE_MS", "0"))
+
+
+def parse_user_id_list(text):
+    """'12, 15 40-42' -> [12, 15, 40, 41, 42]; raises ValueError on anything else."""
+    ids = []
+    for part in re.split(r"[\s,;]+", text.strip()):
+        if not part:
+            continue
+        first, sep, last = part.partition("-")
+        if sep:
+            lo, hi = int(first), int(last)
+            if hi < lo or hi - lo > 100000:
+                raise ValueError(f"bad range '{part}'")
+            ids.extend(range(lo, hi + 1))
+        else:
+            ids.append(int(part))
+    return list(dict.fromkeys(ids))
+
+
+def _tombstone_users(user_ids):
+    """Mark users as being deleted and revoke their sessions; returns the ids that exist."""
+    if not user_ids:
+        return []
+    placeholders = ", ".join(["%s"] * len(user_ids))
     conn = get_connection()
     try:
         with conn.cursor() as cur:
-            # First, set userId to NULL in ratings (preserves rating data)
-            cur.execute(
-                "UPDATE ratings SET userId = NULL WHERE userId = %s",
-                (user_id,)
-            )
-            logger.info(f"Set userId to NULL for user {user_id}'s ratings (preserving data)")
-            
-            # Delete from watchlist (CASCADE DELETE is OK here)
+            cur.execute(f"SELECT userId FROM users WHERE userId IN ({placeholders})", list(user_ids))
+            found = [r["userId"] for r in cur.fetchall()]
+            if found:
+                marks = ", ".join(["%s"] * len(found))
+                cur.execute(f"UPDATE users SET deleted_at = COALESCE(deleted_at, NOW()) WHERE userId IN ({marks})",
+                            found)
+                try:
+                    cur.execute(
+                        f"UPDATE user_sessions SET revoked_at = %s WHERE userId IN ({marks}) AND revoked_at IS NULL",
+                        [int(time.time())] + found
+                    )
+                except pymysql.err.ProgrammingError:
+                    pass  # USER_SESSIONS might not exist
+        conn.commit()
+    finally:
+        conn.close()
+    gone = {_entity_key(uid) for uid in found}
+    verified_session_cache.invalidate_where(lambda k: k[0] in gone)
+    return found
+
+
+def _detach_user_ratings(conn, user_id, batch_size, on_batch=None):
+    """Set userId = NULL on a user's ratings, batch_size rows per transaction; returns the row count."""
+    total = 0
+    while True:
+        with conn.cursor() as cur:
+            cur.execute("UPDATE ratings SET userId = NULL WHERE userId = %s LIMIT %s", (user_id, batch_size))
+            changed = cur.rowcount
+        conn.commit()
+        total += changed
+        if on_batch and changed:
+            on_batch(changed)
+        if changed < batch_size:
+            return total
+        if USER_DELETE_PAUSE_MS:
+            time.sleep(USER_DELETE_PAUSE_MS / 1000.0)  # let queued rating writes through
+
+
+def _remove_user_rows(conn, user_id):
+    """Last, short transaction: stragglers, watchlist, rating locks and the user row."""
+    with conn.cursor() as cur:
+        # Ratings written while the batches ran (the trigger on USERS would delete them)
+        cur.execute("UPDATE ratings SET userId = NULL WHERE userId = %s", (user_id,))
+        for table in ("WATCHLIST", "RATING_LOCKS"):
             try:
-                cur.execute(
-                    "DELETE FROM WATCHLIST WHERE userId = %s",
-                    (user_id,)
-                )
-                logger.info(f"Deleted watchlist entries for user {user_id}")
+                cur.execute(f"DELETE FROM {table} WHERE userId = %s", (user_id,))
             except pymysql.err.ProgrammingError:
-                # Watchlist table might not exist
-                pass
-            
-            # Delete from rating_locks (CASCADE DELETE is OK here)
+                pass  # table might not exist
+        cur.execute("DELETE FROM users WHERE userId = %s", (user_id,))
+    conn.commit()
+
+
+def _delete_tombstoned_users(user_ids, batch_size, progress):
+    deleted, errors = [], []
+    detached = 0
+    conn = get_connection()
+    try:
+        for position, user_id in enumerate(user_ids, 1):
+            def _on_batch(n, user_id=user_id, position=position):
+                nonlocal detached
+                detached += n
+                if progress:
+                    progress(position - 1, len(user_ids), detached)
             try:
-                cur.execute(
-                    "DELETE FROM RATING_LOCKS WHERE userId = %s",
-                    (user_id,)
-                )
-                logger.info(f"Deleted rating locks for user {user_id}")
-            except pymysql.err.ProgrammingError:
-                # Rating_locks table might not exist
-                pass
-            
-            # Finally, delete the user
-            cur.execute("DELETE FROM users WHERE userId = %s", (user_id,))
-            logger.info(f"Deleted user {user_id} (ratings preserved with NULL userId)")
-            
-        conn.commit()
-        return True
+                _detach_user_ratings(conn, user_id, batch_size, _on_batch)
+                _remove_user_rows(conn, user_id)
+                deleted.append(user_id)
+            except pymysql.MySQLError as e:
+                conn.rollback()
+                errors.append({"userId": user_id, "reason": str(e)})
+                log_event(sql_log, logging.ERROR, "user.delete_failed", userId=user_id, error=e)
+            invalidate_user_caches(user_id)
+            if progress:
+                progress(position, len(user_ids), detached)
+    finally:
+        conn.close()
+    log_event(sql_log, logging.INFO, "users.deleted", deleted=len(deleted), errors=len(errors),
+              ratings_detached=detached)
+    return {"deleted": deleted, "errors": errors, "ratings_detached": detached}
+
+
+def bulk_delete_users(user_ids, batch_size=USER_DELETE_BATCH, progress=None):
+    """
+    Delete users while preserving their ratings (userId set to NULL), without
+    long lock holds: tombstone, detach ratings in batches, then delete.
+    Admins may delete anyone; a user only themselves.
+    progress(users_done, users_total, ratings_detached), if given, is called
+    after every rating batch and every user.
+    Returns {"deleted": [ids], "errors": [{"userId", "reason"}], "ratings_detached": n};
+    ids that do not exist are reported as errors.
+    """
+    user_ids = list(dict.fromkeys(int(u) for u in user_ids))
+    if CURRENT_USER['role'] != 'admin' and user_ids != [CURRENT_USER['userId']]:
+        raise PermissionError("Only administrators can delete other users")
+    found = _tombstone_users(user_ids)
+    result = _delete_tombstoned_users(found, batch_size, progress)
+    missing = set(user_ids) - set(found)
+    result["errors"].extend({"userId": u, "reason": "no such user"} for u in user_ids if u in missing)
+    return result
+
+
+def finish_pending_user_deletions(batch_size=USER_DELETE_BATCH):
+    """Finish users an interrupted bulk_delete_users left tombstoned (run at app start)."""
+    conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT userId FROM users WHERE deleted_at IS NOT NULL ORDER BY userId")
+            pending = [r["userId"] for r in cur.fetchall()]
     except pymysql.MySQLError as e:
-        conn.rollback()
+        log_event(sql_log, logging.WARNING, "users.pending_delete_check_failed", error=e)
+        return None
+    finally:
+        conn.close()
+    if not pending:
+        return None
+    log_event(sql_log, logging.INFO, "users.resuming_delete", users=len(pending))
+    return _delete_tombstoned_users(pending, batch_size, None)
+
+
+def delete_user(user_id):
+    """
+    Delete a user while preserving their ratings.
+    Sets userId to NULL in ratings table to maintain rating data for averages.
+    This ensures that movie averages and vote counts remain accurate even after user deletion.
+    The ratings are detached in small batches (see bulk_delete_users).
+    """
+    try:
+        result = bulk_delete_users([user_id])
+    except (pymysql.MySQLError, PermissionError) as e:
         messagebox.showerror("DB Error (Delete User)", str(e))
         logger.error(f"Failed to delete user {user_id}: {e}")
         return False
-    finally:
-        conn.close()
+    if result["errors"]:
+        reason = result["errors"][0]["reason"]
+        messagebox.showerror("DB Error (Delete User)", reason)
+        logger.error(f"Failed to delete user {user_id}: {reason}")
+        return False
+    logger.info(f"Deleted user {user_id} ({result['ratings_detached']} ratings preserved with NULL userId)")
+    return True
 
 
 ###############################################################################
 # 5. SQL HELPERS – RATINGS + TRANSACTIONS / ROLLBACK
 ###############################################################################
 
+# RATINGS is range-partitioned by timestamp (11_partition_ratings.sql).
+# "Newest N ratings" queries put a lower bound on timestamp so MariaDB only
+# reads the newest partitions; the bound moves back over older partitions
+# only while fewer than N rows qualify. Without partitioning the bound is 0
+# and the query runs once, unchanged.
+RATINGS_PARTITION_TTL_SECONDS = int(os.getenv("RATINGS_PARTITION_TTL_SECONDS", "300"))
+_ratings_partitions = {"bounds": None, "loaded_at": 0.0}
+_ratings_partitions_lock = threading.Lock()
+
+
+def ratings_partition_bounds(refresh=False):
+    """Lower timestamp bound of every RATINGS range partition, newest first (always ends with 0)."""
+    with _ratings_partitions_lock:
+        fresh = time.monotonic() - _ratings_partitions["loaded_at"] < RATINGS_PARTITION_TTL_SECONDS
+        if _ratings_partitions["bounds"] is not None and fresh and not refresh:
+            return _ratings_partitions["bounds"]
+
+    sql = """
+        SELECT PARTITION_DESCRIPTION
+        FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE()
+          AND TABLE_NAME = 'RATINGS'
+          AND PARTITION_NAME IS NOT NULL
+    """
+    conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(sql)
+            rows = cur.fetchall()
+    finally:
+        conn.close()
+    # A partition starts where the previous one ends
+    uppers = [int(r["PARTITION_DESCRIPTION"]) for r in rows if r["PARTITION_DESCRIPTION"] != "MAXVALUE"]
+    bounds = sorted(set([0] + uppers), reverse=True)
+    with _ratings_partitions_lock:
+        _ratings_partitions["bounds"] = bounds
+        _ratings_partitions["loaded_at"] = time.monotonic()
+    return bounds
+
+
+def fetch_newest_ratings(sql, limit, params=()):
+    """
+    Run a newest-first RATINGS query, pruned to the newest partitions.
+    `sql` takes the timestamp lower bound as its first parameter
+    (`WHERE r.timestamp >= %s ... ORDER BY r.timestamp DESC LIMIT n`).
+    Every row older than the bound is older than every row returned, so
+    once `limit` rows come back they are the true newest `limit`.
+    """
+    now_ts = int(time.time())
+    # Start at the partition holding "now"; partitions created ahead are empty
+    bounds = [b for b in ratings_partition_bounds() if b <= now_ts]
+    conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            step = 0
+            while True:
+                since = bounds[min(step, len(bounds) - 1)]
+                cur.execute(sql, (since,) + tuple(params))
+                rows = cur.fetchall()
+                if len(rows) >= limit or since == 0:
+                    return rows
+                step = step * 2 + 1  # widen over 1, 2, 4, ... more partitions
+    finally:
+        conn.close()
+
+
 def sql_user_exists(user_id):
     """Check referential integrity: user must exist before inserting rating."""
     conn = get_connection()
@@ -1657,7 +5087,37 @@ def sql_movie_exists(movie_id):
         conn.close()
 
 
-def add_or_update_rating(user_id, movie_id, rating_val):
+# MariaDB reports these when InnoDB picks our transaction as a deadlock
+# victim or a row lock could not be obtained in time. The transaction was
+# rolled back by the server, so replaying it from the start is safe.
+RETRYABLE_TX_ERRNOS = {1213: "deadlocks", 1205: "lock_wait_timeouts"}
+TX_RETRY_LIMIT = int(os.getenv("TX_RETRY_LIMIT", "3"))
+TX_RETRY_BACKOFF_SECONDS = float(os.getenv("TX_RETRY_BACKOFF_SECONDS", "0.05"))
+
+tx_retry_stats = {"deadlocks": 0, "lock_wait_timeouts": 0, "retries": 0, "gave_up": 0}
+_tx_retry_lock = threading.Lock()
+
+
+def _retryable_tx_error(e):
+    """Return the tx_retry_stats counter for a retryable MariaDB error, else None."""
+    if isinstance(e, pymysql.MySQLError) and e.args:
+        return RETRYABLE_TX_ERRNOS.get(e.args[0])
+    return None
+
+
+def _note_tx_retry(kind, gave_up):
+    with _tx_retry_lock:
+        tx_retry_stats[kind] += 1
+        tx_retry_stats["gave_up" if gave_up else "retries"] += 1
+
+
+def get_tx_retry_stats():
+    """Snapshot of deadlock / lock-wait / retry counters since start-up."""
+    with _tx_retry_lock:
+        return dict(tx_retry_stats)
+
+
+def add_or_update_rating(user_id, movie_id, rating_val, acting_user=None):
     """
     Upsert style rating write with ACID transaction.
     
@@ -1681,67 +5141,90 @@ def add_or_update_rating(user_id, movie_id, rating_val):
     the entire transaction is rolled back to maintain data integrity.
     
     Regular users can only modify their own ratings.
+    acting_user (same keys as CURRENT_USER) is checked instead of the logged-in
+    user when given, for callers that write as an account of their own.
     """
     # Convert rating to Decimal for consistent comparison
     rating_val = Decimal(str(rating_val))
+    user = CURRENT_USER if acting_user is None else acting_user
     
     # Check permissions
-    if not CURRENT_USER['userId']:
+    if not user['userId']:
         raise PermissionError("Guests cannot add or modify ratings")
         
-    if CURRENT_USER['role'] != 'admin' and str(CURRENT_USER['userId']) != str(user_id):
+    if user['role'] != 'admin' and str(user['userId']) != str(user_id):
         raise PermissionError("You can only modify your own ratings")
         
     now_ts = int(time.time())
-    conn = get_connection()
-    try:
-        logger.info(f"[TRANSACTION BEGIN] Updating rating for userId={user_id}, movieId={movie_id}")
-        conn.begin()
-        with conn.cursor() as cur:
-            # Delete any old rating
-            cur.execute(
-                "DELETE FROM ratings WHERE userId=%s AND movieId=%s",
-                (user_id, movie_id)
-            )
-            deleted_count = cur.rowcount
-            logger.info(f"[TRANSACTION] Deleted {deleted_count} old rating(s)")
+    for attempt in range(TX_RETRY_LIMIT + 1):
+        conn = get_connection()
+        try:
+            log_event(sql_log, logging.DEBUG, "rating.tx_begin", userId=user_id, movieId=movie_id, attempt=attempt)
+            conn.begin()
+            with conn.cursor() as cur:
+                require_user_generation(cur, user)
+                # Delete any old rating
+                cur.execute(
+                    "DELETE FROM ratings WHERE userId=%s AND movieId=%s",
+                    (user_id, movie_id)
+                )
+                deleted_count = cur.rowcount
             
-            # Insert new rating
-            cur.execute(
-                """
-                INSERT INTO ratings(userId, movieId, rating, timestamp)
-                VALUES (%s,%s,%s,%s)
-                """,
-                (user_id, movie_id, rating_val, now_ts)
-            )
-            logger.info(f"[TRANSACTION] Inserted new rating: {rating_val}")
+                # Insert new rating
+                cur.execute(
+                    """
+                    INSERT INTO ratings(userId, movieId, rating, timestamp)
+                    VALUES (%s,%s,%s,%s)
+                    """,
+                    (user_id, movie_id, rating_val, now_ts)
+                )
             
-            # Verify the insert worked
-            cur.execute(
-                "SELECT rating FROM ratings WHERE userId=%s AND movieId=%s",
-                (user_id, movie_id)
-            )
-            row = cur.fetchone()
-            if not row or abs(row["rating"] - rating_val) > 0.01:
-                logger.error("[TRANSACTION ROLLBACK] Verification failed - rating not found or incorrect")
-                conn.rollback()
-                return False
-                
-            logger.info(f"[TRANSACTION] Verification passed: rating={row['rating']}")
-        
-        conn.commit()
-        logger.info("[TRANSACTION COMMIT] Rating update successful")
-        return True
-    except Exception as e:
-        logger.error(f"[TRANSACTION ROLLBACK] Exception occurred: {e}")
-        print(f"[ROLLBACK] {e}")
-        conn.rollback()
-        return False
-    finally:
-        conn.close()
+                # Verify the insert worked
+                cur.execute(
+                    "SELECT rating FROM ratings WHERE userId=%s AND movieId=%s",
+                    (user_id, movie_id)
+                )
+                row = cur.fetchone()
+                if not row or abs(row["rating"] - rating_val) > 0.01:
+                    log_event(sql_log, logging.ERROR, "rating.verify_failed", userId=user_id, movieId=movie_id,
+                              expected=rating_val, found=row["rating"] if row else None)
+                    conn.rollback()
+                    return False
+
+            # MOVIE_RATING_STATS follows through the RATINGS triggers (19_rating_stats_triggers.sql)
+            conn.commit()
+            log_event(sql_log, logging.INFO, "rating.upserted", userId=user_id, movieId=movie_id,
+                      rating=rating_val, replaced=deleted_count, attempt=attempt)
+            movie_details_cache.invalidate(_entity_key(movie_id))
+            user_rating_cache.invalidate(_entity_key(user_id, movie_id))
+            return True
+        except UserIdsChanged:
+            conn.rollback()
+            raise
+        except Exception as e:
+            conn.rollback()
+            kind = _retryable_tx_error(e)
+            if kind and attempt < TX_RETRY_LIMIT:
+                # Deadlock victim / lock wait timeout: the whole transaction is safe to replay
+                _note_tx_retry(kind, gave_up=False)
+                log_event(sql_log, logging.WARNING, "rating.tx_retry", userId=user_id, movieId=movie_id,
+                          kind=kind, attempt=attempt + 1, error=e)
+                time.sleep(TX_RETRY_BACKOFF_SECONDS * (2 ** attempt) * random.random())
+                continue
+            if kind:
+                _note_tx_retry(kind, gave_up=True)
+            log_event(sql_log, logging.ERROR, "rating.tx_rollback", userId=user_id, movieId=movie_id, error=e)
+            return False
+        finally:
+            conn.close()
 
 
 def get_user_rating(user_id, movie_id):
+    key = _entity_key(user_id, movie_id)
+    cached = user_rating_cache.get(key)
+    if cached is not _CACHE_MISS:
+        return dict(cached) if cached else cached
+
     sql = """
         SELECT rating, timestamp
         FROM ratings
@@ -1753,15 +5236,20 @@ def get_user_rating(user_id, movie_id):
     try:
         with conn.cursor() as cur:
             cur.execute(sql, (user_id, movie_id))
-            return cur.fetchone()
+            row = cur.fetchone()
     finally:
         conn.close()
+    user_rating_cache.put(key, row)
+    return dict(row) if row else row
 
 
 def get_all_user_ratings(user_id):
     """
     Get all ratings by a specific user with movie details.
     Excludes placeholder movies with titles like 'Movie_123'.
+    One newest-first pass over idx_ratings_user_timestamp (which carries
+    movieId and rating); movie averages and vote counts come from
+    MOVIE_RATING_STATS instead of re-aggregating every rating of every movie.
     """
     sql = """
         SELECT 
@@ -1769,14 +5257,13 @@ def get_all_user_ratings(user_id):
             m.title,
             r.rating,
             r.timestamp,
-            ROUND(AVG(r2.rating), 2) AS movie_avg_rating,
-            COUNT(r2.rating) AS movie_vote_count
+            s.avg_rating AS movie_avg_rating,
+            COALESCE(s.rating_count, 0) AS movie_vote_count
         FROM ratings r
         INNER JOIN movies m ON r.movieId = m.movieId
-        LEFT JOIN ratings r2 ON m.movieId = r2.movieId
+        LEFT JOIN movie_rating_stats s ON s.movieId = r.movieId
         WHERE r.userId = %s
-          AND m.title NOT LIKE 'Movie_%%'
-        GROUP BY m.movieId, m.title, r.rating, r.timestamp
+          AND m.is_placeholder = 0
         ORDER BY r.timestamp DESC
     """
     conn = get_connection()
@@ -1804,6 +5291,7 @@ def delete_rating(user_id, movie_id):
     try:
         conn.begin()
         with conn.cursor() as cur:
+            require_user_generation(cur)
             # ensure it exists
             cur.execute(
                 "SELECT rating FROM ratings WHERE userId=%s AND movieId=%s",
@@ -1824,6 +5312,8 @@ def delete_rating(user_id, movie_id):
                 return False
 
         conn.commit()
+        movie_details_cache.invalidate(_entity_key(movie_id))
+        user_rating_cache.invalidate(_entity_key(user_id, movie_id))
         return True
     except Exception as e:
         print(f"[ROLLBACK delete_rating] {e}")
@@ -1854,10 +5344,15 @@ def add_to_watchlist(user_id, movie_id, notes="", priority="medium"):
     conn = get_connection()
     try:
         with conn.cursor() as cur:
+            require_user_generation(cur)
             cur.execute(sql, (user_id, movie_id, notes, priority))
         conn.commit()
+        watchlist_cache.put(_entity_key(user_id, movie_id), True)
         logger.info(f"User {user_id} added movie {movie_id} to watchlist")
         return True
+    except UserIdsChanged:
+        conn.rollback()
+        return False
     except pymysql.MySQLError as e:
         conn.rollback()
         logger.error(f"Failed to add to watchlist: {e}")
@@ -1873,10 +5368,15 @@ def remove_from_watchlist(user_id, movie_id):
     conn = get_connection()
     try:
         with conn.cursor() as cur:
+            require_user_generation(cur)
             cur.execute(sql, (user_id, movie_id))
         conn.commit()
+        watchlist_cache.put(_entity_key(user_id, movie_id), False)
         logger.info(f"User {user_id} removed movie {movie_id} from watchlist")
         return True
+    except UserIdsChanged:
+        conn.rollback()
+        return False
     except pymysql.MySQLError as e:
         conn.rollback()
         logger.error(f"Failed to remove from watchlist: {e}")
@@ -1919,12 +5419,19 @@ def get_user_watchlist(user_id):
 
 def is_in_watchlist(user_id, movie_id):
     """Check if movie is in user's watchlist"""
+    key = _entity_key(user_id, movie_id)
+    cached = watchlist_cache.get(key)
+    if cached is not _CACHE_MISS:
+        return cached
+
     sql = "SELECT 1 FROM WATCHLIST WHERE userId = %s AND movieId = %s"
     conn = get_connection()
     try:
         with conn.cursor() as cur:
             cur.execute(sql, (user_id, movie_id))
-            return cur.fetchone() is not None
+            found = cur.fetchone() is not None
+        watchlist_cache.put(key, found)
+        return found
     except pymysql.err.ProgrammingError as e:
         if "doesn't exist" in str(e):
             logger.warning("WATCHLIST table doesn't exist")
@@ -1952,7 +5459,7 @@ def get_top_rated_movies(limit=20):
             MAX(r.rating) AS max_rating
         FROM movies m
         INNER JOIN ratings r ON m.movieId = r.movieId
-        WHERE m.title NOT LIKE 'Movie_%%'
+        WHERE m.is_placeholder = 0
         GROUP BY m.movieId, m.title
         HAVING COUNT(r.rating) >= 10
         ORDER BY avg_rating DESC, vote_count DESC
@@ -1970,8 +5477,8 @@ def get_top_rated_movies(limit=20):
 
 def get_user_statistics(user_id):
     """
-    Correlated subqueries:
-      total ratings, avg given, highs >=4.0, lows <=2.0 etc. :contentReference[oaicite:10]{index=10}
+    Per-user totals in one pass over the user's ratings:
+      total ratings, avg given, highs >=4.0, lows <=2.0 (conditional aggregation)
     Excludes placeholder movies with titles like 'Movie_123'.
     """
     start = time.time()
@@ -1984,23 +5491,15 @@ def get_user_statistics(user_id):
             ROUND(AVG(r.rating), 2) AS avg_rating_given,
             MIN(r.rating) AS min_rating_given,
             MAX(r.rating) AS max_rating_given,
-            (SELECT COUNT(*) 
-             FROM ratings r2 
-             INNER JOIN movies m2 ON r2.movieId = m2.movieId
-             WHERE r2.rating >= 4.0 AND r2.userId = u.userId 
-               AND m2.title NOT LIKE 'Movie_%%')
-                AS high_ratings_count,
-            (SELECT COUNT(*) 
-             FROM ratings r3
-             INNER JOIN movies m3 ON r3.movieId = m3.movieId
-             WHERE r3.rating <= 2.0 AND r3.userId = u.userId
-               AND m3.title NOT LIKE 'Movie_%%')
-                AS low_ratings_count
+            COALESCE(SUM(CASE WHEN r.rating >= 4.0 THEN 1 ELSE 0 END), 0) AS high_ratings_count,
+            COALESCE(SUM(CASE WHEN r.rating <= 2.0 THEN 1 ELSE 0 END), 0) AS low_ratings_count
         FROM users u
-        LEFT JOIN ratings r ON u.userId = r.userId
-        LEFT JOIN movies m ON r.movieId = m.movieId
+        LEFT JOIN (ratings r
+                   INNER JOIN movies m
+                       ON r.movieId = m.movieId
+                      AND m.is_placeholder = 0)
+            ON u.userId = r.userId
         WHERE u.userId = %s
-          AND (m.title NOT LIKE 'Movie_%%' OR m.title IS NULL)
         GROUP BY u.userId, u.username, u.email
     """
     conn = get_connection()
@@ -2101,7 +5600,7 @@ def find_movies_rated_by_all_active_users():
             GROUP BY userId 
             HAVING COUNT(*) > 10
         )
-        AND m.title NOT LIKE 'Movie_%%'
+        AND m.is_placeholder = 0
         GROUP BY m.movieId, m.title
         HAVING COUNT(DISTINCT r.userId) >= 5
         ORDER BY active_user_count DESC, avg_rating DESC
@@ -2135,7 +5634,7 @@ def find_movies_with_rating_variance():
             MAX(r.rating) as max_rating
         FROM movies m
         INNER JOIN ratings r ON m.movieId = r.movieId
-        WHERE m.title NOT LIKE 'Movie_%%'
+        WHERE m.is_placeholder = 0
         GROUP BY m.movieId, m.title
         HAVING COUNT(r.rating) >= 20
         ORDER BY rating_variance DESC
@@ -2166,7 +5665,7 @@ def get_movies_with_above_average_ratings():
             (SELECT ROUND(AVG(rating), 2) FROM ratings) as overall_avg
         FROM movies m
         INNER JOIN ratings r ON m.movieId = r.movieId
-        WHERE m.title NOT LIKE 'Movie_%%'
+        WHERE m.is_placeholder = 0
         GROUP BY m.movieId, m.title
         HAVING AVG(r.rating) > (SELECT AVG(rating) FROM ratings)
           AND COUNT(r.rating) >= 5
@@ -2183,6 +5682,382 @@ def get_movies_with_above_average_ratings():
     return rows, time.time() - start
 
 
+def get_rating_distribution():
+    """
+    GROUP BY FLOOR(rating) - histogram of whole-star ratings.
+    """
+    start = time.time()
+    sql = """
+        SELECT 
+            FLOOR(rating) AS rating_value,
+            COUNT(*) AS count
+        FROM ratings
+        GROUP BY FLOOR(rating)
+        ORDER BY rating_value
+    """
+    conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(sql)
+            rows = cur.fetchall()
+    finally:
+        conn.close()
+    return rows, time.time() - start
+
+
+def get_movies_by_year(min_year=1980, limit=45):
+    """
+    GROUP BY YEAR(release_date) with LEFT JOIN so unrated movies still count.
+    """
+    start = time.time()
+    sql = """
+        SELECT 
+            YEAR(m.release_date) AS year,
+            COUNT(DISTINCT m.movieId) AS movie_count,
+            ROUND(AVG(r.rating), 2) AS avg_rating,
+            COUNT(r.rating) AS total_ratings
+        FROM movies m
+        LEFT JOIN ratings r ON m.movieId = r.movieId
+        WHERE m.release_date IS NOT NULL
+          AND YEAR(m.release_date) >= %s
+          AND m.is_placeholder = 0
+        GROUP BY YEAR(m.release_date)
+        ORDER BY year DESC
+        LIMIT %s
+    """
+    conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(sql, (min_year, limit))
+            rows = cur.fetchall()
+    finally:
+        conn.close()
+    return rows, time.time() - start
+
+
+###############################################################################
+# 6B. COLUMNAR ANALYTICS SNAPSHOT (optional, requires NumPy)
+###############################################################################
+
+# The Analytics tab pushed the same GROUP BY work to MariaDB on every click.
+# When NumPy is installed we can keep RATINGS/MOVIES as in-memory column
+# arrays and answer the same questions with bincount-style groupbys.
+# The snapshot is loaded once and then refreshed incrementally using the
+# max(timestamp) seen so far as a watermark.
+ANALYTICS_REFRESH_SECONDS = float(os.getenv("ANALYTICS_REFRESH_SECONDS", "30"))
+ANALYTICS_FETCH_BATCH = 50000
+
+
+class ColumnarAnalytics:
+    """
+    In-memory column store for RATINGS and MOVIES.
+
+    ratings columns (one entry per rating row):
+        user_id   int64  (-1 where userId IS NULL after a user was deleted)
+        movie_id  int64
+        rating    float64
+        timestamp int64
+    movies columns (sorted by movie_id):
+        movie_id, release_year (0 = unknown), is_placeholder, titles (list)
+
+    Each public query returns (rows, elapsed) with the same row dicts as the
+    matching SQL helper, so the GUI can render either path.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.loaded = False
+        self.watermark = 0
+        self.loaded_at = 0.0
+        self.load_time = 0.0
+        self.last_refresh_rows = 0
+        self.full_reloads = 0
+        self.incremental_refreshes = 0
+
+    # ----------------------------------------------------------- loading
+    @staticmethod
+    def _fetch_rating_columns(cur, sql, params=()):
+        cur.execute(sql, params)
+        users, movies, ratings, stamps = [], [], [], []
+        while True:
+            chunk = cur.fetchmany(ANALYTICS_FETCH_BATCH)
+            if not chunk:
+                break
+            for user_id, movie_id, rating, ts in chunk:
+                users.append(-1 if user_id is None else user_id)
+                movies.append(movie_id)
+                ratings.append(float(rating))
+                stamps.append(ts)
+        return (
+            np.asarray(users, dtype=np.int64),
+            np.asarray(movies, dtype=np.int64),
+            np.asarray(ratings, dtype=np.float64),
+            np.asarray(stamps, dtype=np.int64),
+        )
+
+    def _load_movies(self, conn):
+        with conn.cursor(pymysql.cursors.SSCursor) as cur:
+            cur.execute("SELECT movieId, title, YEAR(release_date), is_placeholder FROM movies ORDER BY movieId")
+            rows = cur.fetchall()
+        self.m_movie_id = np.asarray([r[0] for r in rows], dtype=np.int64)
+        self.m_title = [r[1] for r in rows]
+        self.m_year = np.asarray([r[2] or 0 for r in rows], dtype=np.int64)
+        self.m_placeholder = np.asarray([bool(r[3]) for r in rows], dtype=bool)
+
+    def load(self):
+        """Full (re)load of both tables."""
+        start = time.time()
+        conn = get_connection()
+        try:
+            with conn.cursor(pymysql.cursors.SSCursor) as cur:
+                cols = self._fetch_rating_columns(
+                    cur, "SELECT userId, movieId, rating, timestamp FROM ratings"
+                )
+            self._load_movies(conn)
+        finally:
+            conn.close()
+        self.r_user_id, self.r_movie_id, self.r_rating, self.r_timestamp = cols
+        self.watermark = int(self.r_timestamp.max()) if len(self.r_timestamp) else 0
+        self.loaded = True
+        self.loaded_at = time.time()
+        self.load_time = self.loaded_at - start
+        self.full_reloads += 1
+        logger.info(f"Columnar snapshot loaded: {len(self.r_rating):,} ratings in {self.load_time:.2f}s")
+
+    def refresh(self):
+        """
+        Pull ratings newer than the watermark and reload MOVIES.
+        add_or_update_rating replaces a (userId, movieId) row with a new
+        timestamp, so incoming rows supersede any older row for the same pair.
+        Deletes are not visible through a watermark; if the row count no
+        longer matches MariaDB we fall back to a full reload.
+        """
+        conn = get_connection()
+        try:
+            with conn.cursor(pymysql.cursors.SSCursor) as cur:
+                new_cols = self._fetch_rating_columns(
+                    cur,
+                    "SELECT userId, movieId, rating, timestamp FROM ratings WHERE timestamp > %s",
+                    (self.watermark,)
+                )
+            with conn.cursor(pymysql.cursors.SSCursor) as cur:
+                cur.execute("SELECT COUNT(*) FROM ratings")
+                db_count = cur.fetchone()[0]
+            self._load_movies(conn)
+        finally:
+            conn.close()
+
+        n_user, n_movie, n_rating, n_ts = new_cols
+        if len(n_rating):
+            # Drop older rows for pairs that were just re-rated (user-owned rows only)
+            owned = n_user >= 0
+            if owned.any():
+                old_keys = self.r_user_id * (1 << 32) + self.r_movie_id
+                new_keys = n_user[owned] * (1 << 32) + n_movie[owned]
+                keep = ~np.isin(old_keys, new_keys) | (self.r_user_id < 0)
+                self.r_user_id = self.r_user_id[keep]
+                self.r_movie_id = self.r_movie_id[keep]
+                self.r_rating = self.r_rating[keep]
+                self.r_timestamp = self.r_timestamp[keep]
+            self.r_user_id = np.concatenate([self.r_user_id, n_user])
+            self.r_movie_id = np.concatenate([self.r_movie_id, n_movie])
+            self.r_rating = np.concatenate([self.r_rating, n_rating])
+            self.r_timestamp = np.concatenate([self.r_timestamp, n_ts])
+            self.watermark = max(self.watermark, int(n_ts.max()))
+
+        self.last_refresh_rows = len(n_rating)
+        self.loaded_at = time.time()
+        self.incremental_refreshes += 1
+        if db_count != len(self.r_rating):
+            logger.info(
+                f"Columnar snapshot drifted ({len(self.r_rating):,} vs {db_count:,} rows) - full reload"
+            )
+            self.load()
+
+    def ensure_fresh(self, max_age=ANALYTICS_REFRESH_SECONDS):
+        with self._lock:
+            if not self.loaded:
+                self.load()
+            elif time.time() - self.loaded_at > max_age:
+                self.refresh()
+
+    # ----------------------------------------------------------- helpers
+    def _movie_index(self):
+        """Position of each rating's movie in the sorted MOVIES columns (-1 if unknown)."""
+        idx = np.searchsorted(self.m_movie_id, self.r_movie_id)
+        idx = np.clip(idx, 0, max(len(self.m_movie_id) - 1, 0))
+        found = len(self.m_movie_id) > 0
+        valid = (self.m_movie_id[idx] == self.r_movie_id) if found else np.zeros(len(idx), dtype=bool)
+        return np.where(valid, idx, -1)
+
+    def _per_movie_aggregates(self):
+        """count, sum, sum of squares, min, max per movie position."""
+        n = len(self.m_movie_id)
+        idx = self._movie_index()
+        mask = idx >= 0
+        idx = idx[mask]
+        vals = self.r_rating[mask]
+        count = np.bincount(idx, minlength=n)
+        total = np.bincount(idx, weights=vals, minlength=n)
+        total_sq = np.bincount(idx, weights=vals * vals, minlength=n)
+        vmin = np.full(n, np.inf)
+        vmax = np.full(n, -np.inf)
+        np.minimum.at(vmin, idx, vals)
+        np.maximum.at(vmax, idx, vals)
+        return count, total, total_sq, vmin, vmax
+
+    # ----------------------------------------------------------- queries
+    def rating_distribution(self):
+        start = time.time()
+        self.ensure_fresh()
+        floors = np.floor(self.r_rating).astype(np.int64)
+        counts = np.bincount(floors)
+        rows = [
+            {"rating_value": value, "count": int(c)}
+            for value, c in enumerate(counts) if c > 0
+        ]
+        return rows, time.time() - start
+
+    def movies_by_year(self, min_year=1980, limit=45):
+        start = time.time()
+        self.ensure_fresh()
+        eligible = (self.m_year >= min_year) & ~self.m_placeholder
+        count, total, _, _, _ = self._per_movie_aggregates()
+        years = self.m_year[eligible]
+        if len(years) == 0:
+            return [], time.time() - start
+        base = years.min()
+        offs = years - base
+        movie_count = np.bincount(offs)
+        rating_count = np.bincount(offs, weights=count[eligible])
+        rating_sum = np.bincount(offs, weights=total[eligible])
+        rows = []
+        for off in np.nonzero(movie_count)[0][::-1][:limit]:
+            n_ratings = int(rating_count[off])
+            rows.append({
+                "year": int(base + off),
+                "movie_count": int(movie_count[off]),
+                "avg_rating": round(float(rating_sum[off]) / n_ratings, 2) if n_ratings else None,
+                "total_ratings": n_ratings,
+            })
+        return rows, time.time() - start
+
+    def rating_variance(self, min_votes=20, limit=20):
+        """Same population VARIANCE/STDDEV as MariaDB's VARIANCE()/STDDEV()."""
+        start = time.time()
+        self.ensure_fresh()
+        count, total, total_sq, vmin, vmax = self._per_movie_aggregates()
+        eligible = (count >= min_votes) & ~self.m_placeholder
+        pos = np.nonzero(eligible)[0]
+        c = count[pos]
+        mean = total[pos] / c
+        var = np.maximum(total_sq[pos] / c - mean * mean, 0.0)
+        order = pos[np.argsort(-var, kind="stable")][:limit]
+        rows = []
+        for p in order:
+            n = int(count[p])
+            m = float(total[p]) / n
+            v = max(float(total_sq[p]) / n - m * m, 0.0)
+            rows.append({
+                "movieId": int(self.m_movie_id[p]),
+                "title": self.m_title[p],
+                "vote_count": int(n),
+                "avg_rating": round(m, 2),
+                "rating_stddev": round(v ** 0.5, 2),
+                "rating_variance": round(v, 2),
+                "min_rating": float(vmin[p]),
+                "max_rating": float(vmax[p]),
+            })
+        return rows, time.time() - start
+
+    def above_average(self, min_votes=5, limit=20):
+        start = time.time()
+        self.ensure_fresh()
+        overall = float(self.r_rating.mean()) if len(self.r_rating) else 0.0
+        count, total, _, _, _ = self._per_movie_aggregates()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            avg = np.where(count > 0, total / np.maximum(count, 1), 0.0)
+        eligible = (count >= min_votes) & (avg > overall) & ~self.m_placeholder
+        pos = np.nonzero(eligible)[0]
+        order = pos[np.argsort(-np.round(avg[pos], 2), kind="stable")][:limit]
+        rows = [{
+            "movieId": int(self.m_movie_id[p]),
+            "title": self.m_title[p],
+            "vote_count": int(count[p]),
+            "avg_rating": round(float(avg[p]), 2),
+            "overall_avg": round(overall, 2),
+        } for p in order]
+        return rows, time.time() - start
+
+    def stats(self):
+        return {
+            "loaded": self.loaded,
+            "ratings": len(self.r_rating) if self.loaded else 0,
+            "movies": len(self.m_movie_id) if self.loaded else 0,
+            "watermark": self.watermark,
+            "load_time": self.load_time,
+            "full_reloads": self.full_reloads,
+            "incremental_refreshes": self.incremental_refreshes,
+            "last_refresh_rows": self.last_refresh_rows,
+        }
+
+
+columnar_analytics = ColumnarAnalytics() if HAS_NUMPY else None
+
+
+def _rows_match(sql_rows, col_rows, keys):
+    """Compare two result sets on the given keys (numbers to 2 decimals)."""
+    if len(sql_rows) != len(col_rows):
+        return False
+    for a, b in zip(sql_rows, col_rows):
+        for k in keys:
+            x, y = a.get(k), b.get(k)
+            if x is None or y is None:
+                if x is not y:
+                    return False
+            elif isinstance(x, str) or isinstance(y, str):
+                if x != y:
+                    return False
+            elif abs(float(x) - float(y)) > 0.005:
+                return False
+    return True
+
+
+def compare_analytics_engines():
+    """
+    Run each analytics query on both engines.
+    Returns a list of {name, sql_time, columnar_time, rows, match}.
+    Ordering ties can differ between engines, so variance/above-average
+    results are compared on the ordered metric column only.
+    """
+    if columnar_analytics is None:
+        return []
+    columnar_analytics.ensure_fresh()
+    checks = [
+        ("Rating Distribution", get_rating_distribution, columnar_analytics.rating_distribution,
+         ["rating_value", "count"]),
+        ("Movies by Year", get_movies_by_year, columnar_analytics.movies_by_year,
+         ["year", "movie_count", "avg_rating", "total_ratings"]),
+        ("Controversial Movies", find_movies_with_rating_variance, columnar_analytics.rating_variance,
+         ["rating_variance"]),
+        ("Above Average Movies", get_movies_with_above_average_ratings, columnar_analytics.above_average,
+         ["avg_rating"]),
+    ]
+    report = []
+    for name, sql_fn, col_fn, keys in checks:
+        sql_rows, sql_t = sql_fn()
+        col_rows, col_t = col_fn()
+        match = _rows_match(sql_rows, col_rows, keys)
+        report.append({
+            "name": name,
+            "sql_time": sql_t,
+            "columnar_time": col_t,
+            "rows": len(col_rows),
+            "match": match,
+        })
+    return report
+
+
 ###############################################################################
 # 7. LOGIN DIALOG
 ###############################################################################
@@ -2253,7 +6128,7 @@ class LoginDialog(tk.Toplevel):
         btn_row1 = tk.Frame(form, bg="white")
         btn_row1.grid(row=4, column=0, pady=(0, 8))
 
-        tk.Button(
+        self.login_btn = tk.Button(
             btn_row1,
             text="Login",
             command=self._do_login,
@@ -2266,7 +6141,8 @@ class LoginDialog(tk.Toplevel):
             cursor="hand2",
             width=12,
             borderwidth=0
-        ).pack(side="left", padx=4)
+        )
+        self.login_btn.pack(side="left", padx=4)
 
         tk.Button(
             btn_row1,
@@ -2308,7 +6184,17 @@ class LoginDialog(tk.Toplevel):
         if not u or not p:
             messagebox.showerror("Error", "Please enter both username and password", parent=self)
             return
-        user = authenticate_user(u, p)
+        if str(self.login_btn["state"]) == "disabled":
+            return  # a check is already running
+        # bcrypt takes a few hundred ms; keep the dialog responsive meanwhile
+        self.login_btn.config(state="disabled", text="Checking...")
+        when_done(self, run_auth_async(login_with_session, u, p), self._login_finished)
+
+    def _login_finished(self, user, error):
+        self.login_btn.config(state="normal", text="Login")
+        if error is not None:
+            messagebox.showerror("Login Failed", f"Could not check the login:\n{error}", parent=self)
+            return
         if user:
             self.user_info = user
             self.is_guest = False
@@ -2384,8 +6270,13 @@ class LoginDialog(tk.Toplevel):
                 messagebox.showerror("Error", "Password must be at least 6 characters", parent=create_dialog)
                 return
 
-            # Create the user (user_id will be auto-generated) - using public registration
-            ok, user_id = register_new_user(uname, email, pwd)
+            # Create the user (user_id will be auto-generated) - using public registration.
+            # Hashing runs off the Tk thread; the dialog stays responsive.
+            when_done(create_dialog, run_auth_async(register_new_user, uname, email, pwd),
+                      lambda result, error: account_created(uname, result, error))
+
+        def account_created(uname, result, error):
+            ok, user_id = result if error is None else (False, str(error))
             if ok:
                 messagebox.showinfo(
                     "Success",
@@ -4250,8 +8141,9 @@ class MovieApp(tk.Tk):
     def __init__(self, skip_login=False):
         super().__init__()
 
-        # First thing: LOGIN (unless skipping due to guest login/register)
-        if not skip_login:
+        # First thing: LOGIN (unless skipping due to guest login/register).
+        # A live saved session logs straight in without the password check.
+        if not skip_login and resume_saved_session() is None:
             login = LoginDialog(self)
             self.wait_window(login)
 
@@ -4469,6 +8361,39 @@ class MovieApp(tk.Tk):
         # apply permissions after widgets created
         self.apply_role_permissions()
 
+        # Notice a user id renumbering (renumber_users.py) even while idle
+        self._relogin_pending = False
+        on_user_ids_changed(lambda: self.after(0, self.relogin_after_renumber))
+        if CURRENT_USER.get("generation") is not None:
+            self.after(int(USER_GENERATION_POLL_SECONDS * 1000), self._poll_user_generation)
+
+    def _poll_user_generation(self):
+        """Drop the login once renumber_users.py has swapped in new user ids."""
+        try:
+            changed = read_user_generation() != CURRENT_USER.get("generation")
+        except pymysql.MySQLError as e:
+            log_event(auth_log, logging.DEBUG, "session.generation_check_failed", error=e)
+            changed = False
+        if changed:
+            drop_stale_login()
+        elif CURRENT_USER.get("generation") is not None:
+            self.after(int(USER_GENERATION_POLL_SECONDS * 1000), self._poll_user_generation)
+
+    def relogin_after_renumber(self):
+        """User ids changed under this login: back to the login dialog, like a logout."""
+        if self._relogin_pending:
+            return
+        self._relogin_pending = True
+        messagebox.showwarning(
+            "Please Log In Again",
+            "User IDs were renumbered by an administrator.\n"
+            "Please log in again to continue.",
+            parent=self
+        )
+        self.destroy()
+        app = MovieApp()
+        app.mainloop()
+
     def handle_guest_login(self):
         """Show login dialog for guest users"""
         login = LoginDialog(self, show_guest_options=True)
@@ -4520,6 +8445,9 @@ class MovieApp(tk.Tk):
         )
         
         if confirm:
+            # Revoke the saved session so the next start asks for the password again
+            end_current_session()
+
             # Reset CURRENT_USER to guest state
             CURRENT_USER = {
                 "userId": None,
@@ -4591,17 +8519,19 @@ class MovieApp(tk.Tk):
     # Helper to set text in Text widgets (read-only style)
     # ------------------------------------------------------------------
     def _set_text_widget(self, widget, content: str):
-        widget.config(state="normal")
-        widget.delete("1.0", "end")
-        widget.insert("1.0", content.rstrip() + "\n")
-        widget.config(state="disabled")
-        widget.see("1.0")  # Scroll to top
+        with tracer.span("tk.set_text", kind="render"):
+            widget.config(state="normal")
+            widget.delete("1.0", "end")
+            widget.insert("1.0", content.rstrip() + "\n")
+            widget.config(state="disabled")
+            widget.see("1.0")  # Scroll to top
 
     def _append_text_widget(self, widget, line: str):
-        widget.config(state="normal")
-        widget.insert("end", line.rstrip() + "\n")
-        widget.config(state="disabled")
-        widget.see("end")  # For append, we want to see the new line
+        with tracer.span("tk.append_text", kind="render"):
+            widget.config(state="normal")
+            widget.insert("end", line.rstrip() + "\n")
+            widget.config(state="disabled")
+            widget.see("end")  # For append, we want to see the new line
 
     # ------------------------------------------------------------------
     # TAB 1: MOVIES & SEARCH
@@ -4918,26 +8848,30 @@ class MovieApp(tk.Tk):
             self.current_page += 1
             self.display_current_page()
 
+    @traced_action
     def handle_view_details(self):
         sel = self.tree.selection()
         if not sel:
-            messagebox.showwarning(
-                "Selection Required",
-                "Please select a movie from the search results to view its details.\n\n"
-                "Click on any movie row in the table above.",
-                parent=self
-            )
+            with tracer.span("messagebox", kind="wait"):
+                messagebox.showwarning(
+                    "Selection Required",
+                    "Please select a movie from the search results to view its details.\n\n"
+                    "Click on any movie row in the table above.",
+                    parent=self
+                )
             return
         movie_id = self.tree.item(sel[0])["values"][0]
+        tracer.annotate(movie_id=movie_id)
 
         sql_info = get_movie_details(movie_id)
         if not sql_info:
-            messagebox.showerror(
-                "Movie Not Found",
-                f"Could not find movie details for Movie ID: {movie_id}\n\n"
-                "The movie may have been deleted from the database.",
-                parent=self
-            )
+            with tracer.span("messagebox", kind="wait"):
+                messagebox.showerror(
+                    "Movie Not Found",
+                    f"Could not find movie details for Movie ID: {movie_id}\n\n"
+                    "The movie may have been deleted from the database.",
+                    parent=self
+                )
             self._set_text_widget(self.details_text, "Movie not found in database.")
             return
 
@@ -5005,6 +8939,8 @@ class MovieApp(tk.Tk):
             lines.append("(No TMDB metadata / Mongo not found)")
 
         self._set_text_widget(self.details_text, "\n".join(lines))
+        with tracer.span("tk.update_idletasks", kind="render"):
+            self.details_text.update_idletasks()
 
     def handle_toggle_watchlist(self):
         """Smart toggle button - Add or Remove from watchlist based on current state"""
@@ -5169,6 +9105,18 @@ class MovieApp(tk.Tk):
         )
         self.btn_search_user.grid(row=0, column=3, padx=8, pady=0)
 
+        self.btn_import_users = ttk.Button(
+            button_frame, text="Import Users (CSV)", width=18, command=self.handle_import_users,
+            state="disabled"
+        )
+        self.btn_import_users.grid(row=0, column=4, padx=8, pady=0)
+
+        self.btn_bulk_delete_users = ttk.Button(
+            button_frame, text="Delete Users...", width=15, command=self.handle_bulk_delete_users,
+            state="disabled"
+        )
+        self.btn_bulk_delete_users.grid(row=0, column=5, padx=8, pady=0)
+
         # User status box with scrollbar
         user_status_frame = tk.Frame(user_wrapper, bg="white")
         user_status_frame.pack(fill="x", pady=(5, 0))
@@ -5346,6 +9294,10 @@ class MovieApp(tk.Tk):
                 self.btn_update_user.config(text="Update User")
             if hasattr(self, 'btn_delete_user'):
                 self.btn_delete_user.config(text="Delete User")
+            if hasattr(self, 'btn_import_users'):
+                self.btn_import_users.config(state="normal")
+            if hasattr(self, 'btn_bulk_delete_users'):
+                self.btn_bulk_delete_users.config(state="normal")
             
             if hasattr(self, 'user_log'):
                 self._append_user_log("[ADMIN] You can view/update/delete users. New users register via login screen.")
@@ -5485,8 +9437,24 @@ class MovieApp(tk.Tk):
             )
             return
 
-        # Pass password to update_user (None if empty)
-        ok = update_user(user_id, name, email, password if password else None)
+        if password:
+            # Hash off the Tk thread, then write
+            when_done(self, run_auth_async(hash_password, password),
+                      lambda pwd_hash, error: self._finish_update_user(user_id, name, email, password, pwd_hash, error))
+        else:
+            self._finish_update_user(user_id, name, email, None, None, None)
+
+    def _finish_update_user(self, user_id, name, email, password, pwd_hash, error):
+        if error is not None:
+            messagebox.showerror("Error", f"Could not hash the new password:\n{error}", parent=self)
+            return
+        ok = update_user(user_id, name, email, password_hash=pwd_hash)
+        if ok and pwd_hash:
+            # Sessions started with the old password end; this window keeps its own
+            try:
+                revoke_user_sessions(user_id, keep_token=load_session_token())
+            except pymysql.MySQLError as e:
+                log_event(auth_log, logging.WARNING, "session.revoke_failed", userId=user_id, error=e)
         if ok:
             password_msg = " and password" if password else ""
             self._append_user_log(f"✓ User {user_id} updated -> ({name}, {email}){password_msg}")
@@ -5511,6 +9479,108 @@ class MovieApp(tk.Tk):
                     text=f"Logged in as: {CURRENT_USER['username']} ({CURRENT_USER['role']})"
                 )
 
+    def handle_import_users(self):
+        """Admin: create users from a CSV (username,email[,password][,role]) without freezing the window."""
+        path = filedialog.askopenfilename(
+            parent=self, title="Import users from CSV",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            rows = read_user_csv(path)
+        except (OSError, ValueError, csv.Error) as e:
+            messagebox.showerror("Import Users", f"Could not read {os.path.basename(path)}:\n{e}", parent=self)
+            return
+        if not rows:
+            messagebox.showinfo("Import Users", "The file has no rows.", parent=self)
+            return
+
+        self.btn_import_users.config(state="disabled")
+        self._append_user_log(f"Importing {len(rows)} users from {os.path.basename(path)} "
+                              f"(rows without a password get '{BULK_USER_DEFAULT_PASSWORD}')...")
+        when_done(self, run_auth_async(bulk_add_users, rows),
+                  lambda report, error: self._import_users_finished(path, report, error), poll_ms=100)
+
+    def _import_users_finished(self, path, report, error):
+        self.btn_import_users.config(state="normal")
+        if error is not None:
+            self._append_user_log(f"✗ User import failed: {error}")
+            messagebox.showerror("Import Users", str(error), parent=self)
+            return
+        created, errors = report["created"], report["errors"]
+        self._append_user_log(f"✓ Imported {len(created)} users, {len(errors)} rows rejected")
+        for e in errors[:20]:
+            self._append_user_log(f"  line {e['line']}: {e['username'] or '(no username)'} - {e['reason']}")
+        if errors:
+            stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            report_path = write_user_import_errors(errors, os.path.join("rejects", f"user_import_{stamp}.csv"))
+            self._append_user_log(f"  All rejected rows: {report_path}")
+        messagebox.showinfo(
+            "Import Users",
+            f"Created {len(created)} users.\nRejected {len(errors)} rows (see the log below).",
+            parent=self
+        )
+
+    def handle_bulk_delete_users(self):
+        """Admin: delete many users (ratings kept, detached in small batches) in the background."""
+        text = simpledialog.askstring(
+            "Delete Users", "User IDs to delete (e.g. 12, 15, 40-60):", parent=self
+        )
+        if not text:
+            return
+        try:
+            user_ids = parse_user_id_list(text)
+        except ValueError as e:
+            messagebox.showerror("Delete Users", f"Could not read the user IDs:\n{e}", parent=self)
+            return
+        if CURRENT_USER["userId"] in user_ids:
+            messagebox.showerror("Delete Users", "You cannot delete your own admin account here.", parent=self)
+            return
+        if not user_ids or not messagebox.askyesno(
+            "Delete Users?",
+            f"Permanently delete {len(user_ids)} user account(s)?\n\n"
+            "Their ratings are kept (without a user) for the movie averages.\n"
+            "This action cannot be undone.",
+            icon='warning', parent=self
+        ):
+            return
+
+        self.btn_bulk_delete_users.config(state="disabled")
+        self._append_user_log(f"Deleting {len(user_ids)} users (ratings detached {USER_DELETE_BATCH} rows at a time)...")
+        updates = queue.Queue()
+        future = run_auth_async(functools.partial(
+            bulk_delete_users, user_ids, progress=lambda *state: updates.put(state)
+        ))
+
+        def _show_progress():
+            latest = None
+            while not updates.empty():
+                latest = updates.get_nowait()
+            if latest:
+                done, total, detached = latest
+                self._append_user_log(f"  ... {done}/{total} users deleted, {detached} ratings detached")
+            if not future.done():
+                self.after(1000, _show_progress)
+        self.after(1000, _show_progress)
+        when_done(self, future, self._bulk_delete_users_finished, poll_ms=100)
+
+    def _bulk_delete_users_finished(self, report, error):
+        self.btn_bulk_delete_users.config(state="normal")
+        if error is not None:
+            self._append_user_log(f"✗ User deletion failed: {error}")
+            messagebox.showerror("Delete Users", str(error), parent=self)
+            return
+        self._append_user_log(f"✓ Deleted {len(report['deleted'])} users, {report['ratings_detached']} ratings kept "
+                              f"without a user, {len(report['errors'])} failed")
+        for e in report["errors"][:20]:
+            self._append_user_log(f"  user {e['userId']}: {e['reason']}")
+        messagebox.showinfo(
+            "Delete Users",
+            f"Deleted {len(report['deleted'])} users.\nFailed: {len(report['errors'])} (see the log below).",
+            parent=self
+        )
+
     def handle_delete_user(self):
         try:
             user_id = int(self.user_id_var.get().strip())
@@ -6388,6 +10458,21 @@ class MovieApp(tk.Tk):
         ttk.Button(sidebar, text="Above Average Movies", command=self.handle_above_avg_movies, width=25).pack(pady=2)
         ttk.Button(sidebar, text="Genre Statistics", command=self.handle_genre_stats_analytics, width=25).pack(pady=2)
         
+        # Optional in-memory engine (NumPy column snapshot)
+        tk.Label(sidebar, text="Query Engine", font=("Arial", 9, "bold"), bg="#f0f0f0").pack(pady=(10,2))
+        self.columnar_engine_var = tk.BooleanVar(value=False)
+        engine_toggle = ttk.Checkbutton(
+            sidebar,
+            text="In-memory (NumPy)",
+            variable=self.columnar_engine_var
+        )
+        engine_toggle.pack(pady=2)
+        engine_compare_btn = ttk.Button(sidebar, text="Compare SQL vs In-memory", command=self.handle_compare_analytics_engines, width=25)
+        engine_compare_btn.pack(pady=2)
+        if columnar_analytics is None:
+            engine_toggle.config(state="disabled")
+            engine_compare_btn.config(state="disabled")
+        
         # Right results panel
         results_frame = ttk.LabelFrame(content, text="Results", padding=10)
         results_frame.pack(side="left", fill="both", expand=True)
@@ -6494,119 +10579,108 @@ class MovieApp(tk.Tk):
             FROM ratings r
             INNER JOIN users u ON r.userId = u.userId
             INNER JOIN movies m ON r.movieId = m.movieId
-            WHERE m.title NOT LIKE 'Movie_%%'
+            WHERE r.timestamp >= %s
+              AND m.is_placeholder = 0
             ORDER BY r.timestamp DESC
             LIMIT 50
         """
         
         start = time.time()
-        conn = get_connection()
-        try:
-            with conn.cursor() as cur:
-                cur.execute(sql)
-                rows = cur.fetchall()
-            elapsed = time.time() - start
-            
-            output = f"RECENT RATING ACTIVITY (Query time: {elapsed:.3f}s)\n{'='*80}\n\n"
-            output += f"{'Username':<20} {'Movie Title':<40} {'Rating':>8} {'Date/Time':<20}\n"
-            output += "-" * 80 + "\n"
-            
-            for r in rows:
-                # Handle NULL usernames
-                username = r['username'] or 'N/A'
-                username = username[:18] if len(username) > 18 else username
-                title = r['title'][:38] if len(r['title']) > 38 else r['title']
-                timestamp = datetime.fromtimestamp(r['timestamp']).strftime('%Y-%m-%d %H:%M:%S')
-                output += f"{username:<20} {title:<40} {r['rating']:>8.1f} {timestamp:<20}\n"
-            
-            output += "\n" + "="*80 + "\n"
-            output += f"Showing {len(rows)} most recent ratings\n"
-            self._set_text_widget(self.results_text_analytics, output)
-        finally:
-            conn.close()
+        rows = fetch_newest_ratings(sql, 50)
+        elapsed = time.time() - start
+        
+        output = f"RECENT RATING ACTIVITY (Query time: {elapsed:.3f}s)\n{'='*80}\n\n"
+        output += f"{'Username':<20} {'Movie Title':<40} {'Rating':>8} {'Date/Time':<20}\n"
+        output += "-" * 80 + "\n"
+        
+        for r in rows:
+            # Handle NULL usernames
+            username = r['username'] or 'N/A'
+            username = username[:18] if len(username) > 18 else username
+            title = r['title'][:38] if len(r['title']) > 38 else r['title']
+            timestamp = datetime.fromtimestamp(r['timestamp']).strftime('%Y-%m-%d %H:%M:%S')
+            output += f"{username:<20} {title:<40} {r['rating']:>8.1f} {timestamp:<20}\n"
+        
+        output += "\n" + "="*80 + "\n"
+        output += f"Showing {len(rows)} most recent ratings\n"
+        self._set_text_widget(self.results_text_analytics, output)
     
+    def _analytics_engine(self, sql_fn, columnar_fn):
+        """Run an analytics query on the selected engine -> (rows, elapsed, engine label)."""
+        if columnar_analytics is not None and self.columnar_engine_var.get():
+            rows, elapsed = columnar_fn()
+            return rows, elapsed, "In-memory"
+        rows, elapsed = sql_fn()
+        return rows, elapsed, "SQL"
+
     def handle_rating_dist_analytics(self):
-        sql = """
-            SELECT 
-                FLOOR(rating) AS rating_value,
-                COUNT(*) AS count
-            FROM ratings
-            GROUP BY FLOOR(rating)
-            ORDER BY rating_value
-        """
+        rows, elapsed, engine = self._analytics_engine(
+            get_rating_distribution,
+            lambda: columnar_analytics.rating_distribution()
+        )
         
-        start = time.time()
-        conn = get_connection()
-        try:
-            with conn.cursor() as cur:
-                cur.execute(sql)
-                rows = cur.fetchall()
-            elapsed = time.time() - start
-            
-            # Find max count for scaling
-            max_count = max(r['count'] for r in rows) if rows else 1
-            total = sum(r['count'] for r in rows)
-            
-            # Create bar chart
-            output = f"RATING DISTRIBUTION (Query time: {elapsed:.3f}s)\n"
-            output += "=" * 80 + "\n\n"
-            
-            for r in rows:
-                rating = r['rating_value']
-                count = r['count']
-                percentage = (count / total) * 100
-                bar_length = int((count / max_count) * 50)  # Scale to 50 chars max
-                bar = "█" * bar_length
-                
-                output += f"{rating:.0f} ⭐  {bar:<50} {count:>8,} ({percentage:>5.1f}%)\n"
+        # Find max count for scaling
+        max_count = max(r['count'] for r in rows) if rows else 1
+        total = sum(r['count'] for r in rows)
+        
+        # Create bar chart
+        output = f"RATING DISTRIBUTION (Query time: {elapsed:.3f}s, {engine})\n"
+        output += "=" * 80 + "\n\n"
+        
+        for r in rows:
+            rating = r['rating_value']
+            count = r['count']
+            percentage = (count / total) * 100
+            bar_length = int((count / max_count) * 50)  # Scale to 50 chars max
+            bar = "█" * bar_length
             
-            output += "\n" + "=" * 80 + "\n"
-            output += f"Total Ratings: {total:,}\n"
+            output += f"{rating:.0f} ⭐  {bar:<50} {count:>8,} ({percentage:>5.1f}%)\n"
+        
+        output += "\n" + "=" * 80 + "\n"
+        output += f"Total Ratings: {total:,}\n"
+        if total:
             output += f"Average Rating: {sum(r['rating_value'] * r['count'] for r in rows) / total:.2f}\n"
-            
-            self._set_text_widget(self.results_text_analytics, output)
-        finally:
-            conn.close()
+        
+        self._set_text_widget(self.results_text_analytics, output)
     
     def handle_movies_by_year_analytics(self):
-        sql = """
-            SELECT 
-                YEAR(m.release_date) AS year,
-                COUNT(DISTINCT m.movieId) AS movie_count,
-                ROUND(AVG(r.rating), 2) AS avg_rating,
-                COUNT(r.rating) AS total_ratings
-            FROM movies m
-            LEFT JOIN ratings r ON m.movieId = r.movieId
-            WHERE m.release_date IS NOT NULL
-              AND YEAR(m.release_date) >= 1980
-              AND m.title NOT LIKE 'Movie_%%'
-            GROUP BY YEAR(m.release_date)
-            ORDER BY year DESC
-            LIMIT 45
-        """
+        rows, elapsed, engine = self._analytics_engine(
+            get_movies_by_year,
+            lambda: columnar_analytics.movies_by_year()
+        )
         
-        start = time.time()
-        conn = get_connection()
-        try:
-            with conn.cursor() as cur:
-                cur.execute(sql)
-                rows = cur.fetchall()
-            elapsed = time.time() - start
-            
-            output = f"MOVIES BY YEAR (Query time: {elapsed:.3f}s)\n{'='*80}\n\n"
-            output += f"{'Year':<8} {'Movies':>8} {'Avg Rating':>12} {'Total Ratings':>15}\n"
-            output += "-" * 80 + "\n"
-            
-            for r in rows:
-                avg = f"{r['avg_rating']:.2f}" if r['avg_rating'] else "N/A"
-                output += f"{r['year']:<8} {r['movie_count']:>8} {avg:>12} {r['total_ratings']:>15,}\n"
-            
-            output += "\n" + "="*80 + "\n"
-            total_movies = sum(r['movie_count'] for r in rows)
-            output += f"Total movies (1980-present): {total_movies:,}\n"
-            self._set_text_widget(self.results_text_analytics, output)
-        finally:
-            conn.close()
+        output = f"MOVIES BY YEAR (Query time: {elapsed:.3f}s, {engine})\n{'='*80}\n\n"
+        output += f"{'Year':<8} {'Movies':>8} {'Avg Rating':>12} {'Total Ratings':>15}\n"
+        output += "-" * 80 + "\n"
+        
+        for r in rows:
+            avg = f"{r['avg_rating']:.2f}" if r['avg_rating'] else "N/A"
+            output += f"{r['year']:<8} {r['movie_count']:>8} {avg:>12} {r['total_ratings']:>15,}\n"
+        
+        output += "\n" + "="*80 + "\n"
+        total_movies = sum(r['movie_count'] for r in rows)
+        output += f"Total movies (1980-present): {total_movies:,}\n"
+        self._set_text_widget(self.results_text_analytics, output)
+    
+    def handle_compare_analytics_engines(self):
+        """Time each analytics query on MariaDB and on the NumPy snapshot."""
+        report = compare_analytics_engines()
+        snap = columnar_analytics.stats()
+        output = f"SQL vs IN-MEMORY ANALYTICS\n{'='*80}\n\n"
+        output += f"Snapshot: {snap['ratings']:,} ratings, {snap['movies']:,} movies "
+        output += f"(full load {snap['load_time']:.2f}s, watermark ts={snap['watermark']})\n\n"
+        output += f"{'Query':<24} {'SQL (ms)':>10} {'In-mem (ms)':>12} {'Speedup':>9} {'Rows':>6} {'Same result':>12}\n"
+        output += "-" * 80 + "\n"
+        for r in report:
+            sql_ms = r['sql_time'] * 1000
+            col_ms = r['columnar_time'] * 1000
+            speedup = f"{sql_ms / col_ms:.1f}x" if col_ms > 0 else "-"
+            same = "yes" if r['match'] else "NO"
+            output += f"{r['name']:<24} {sql_ms:>10.1f} {col_ms:>12.1f} {speedup:>9} {r['rows']:>6} {same:>12}\n"
+        output += "\n" + "="*80 + "\n"
+        output += f"Refreshes: {snap['incremental_refreshes']} incremental, {snap['full_reloads']} full\n"
+        self._set_text_widget(self.results_text_analytics, output)
+    
     
     def handle_user_stats_analytics(self):
         if not CURRENT_USER['userId']:
@@ -6701,8 +10775,11 @@ class MovieApp(tk.Tk):
     
     def handle_controversial_movies(self):
         """Movies with high rating variance - VARIANCE/STDDEV"""
-        rows, elapsed = find_movies_with_rating_variance()
-        output = f"CONTROVERSIAL MOVIES (Query time: {elapsed:.3f}s)\n{'='*80}\n\n"
+        rows, elapsed, engine = self._analytics_engine(
+            find_movies_with_rating_variance,
+            lambda: columnar_analytics.rating_variance()
+        )
+        output = f"CONTROVERSIAL MOVIES (Query time: {elapsed:.3f}s, {engine})\n{'='*80}\n\n"
         output += "Movies with highest rating disagreement (VARIANCE & STDDEV)\n\n"
         output += f"{'Movie Title':<45} {'Avg':>6} {'StdDev':>8} {'Variance':>10} {'Votes':>8}\n"
         output += "-" * 80 + "\n"
@@ -6718,8 +10795,11 @@ class MovieApp(tk.Tk):
     
     def handle_above_avg_movies(self):
         """Movies with above-average ratings - nested query in HAVING"""
-        rows, elapsed = get_movies_with_above_average_ratings()
-        output = f"ABOVE AVERAGE MOVIES (Query time: {elapsed:.3f}s)\n{'='*80}\n\n"
+        rows, elapsed, engine = self._analytics_engine(
+            get_movies_with_above_average_ratings,
+            lambda: columnar_analytics.above_average()
+        )
+        output = f"ABOVE AVERAGE MOVIES (Query time: {elapsed:.3f}s, {engine})\n{'='*80}\n\n"
         output += "Movies with ratings above the global average\n"
         output += "Uses nested subquery in HAVING clause\n\n"
         output += f"{'Movie Title':<50} {'Avg Rating':>12} {'Votes':>8}\n"
@@ -7171,7 +11251,7 @@ class MovieApp(tk.Tk):
             try:
                 with conn.cursor() as cur:
                     # Total movies
-                    cur.execute("SELECT COUNT(*) as count FROM movies WHERE title NOT LIKE 'Movie_%%'")
+                    cur.execute("SELECT COUNT(*) as count FROM movies WHERE is_placeholder = 0")
                     total_movies = cur.fetchone()['count']
                     
                     # Total ratings
@@ -7308,7 +11388,7 @@ class MovieApp(tk.Tk):
             LEFT JOIN ratings r ON m.movieId = r.movieId
             WHERE m.release_date IS NOT NULL
               AND YEAR(m.release_date) >= 1980
-              AND m.title NOT LIKE 'Movie_%%'
+              AND m.is_placeholder = 0
             GROUP BY YEAR(m.release_date)
             ORDER BY year DESC
             LIMIT 40
@@ -8080,7 +12160,7 @@ class MovieApp(tk.Tk):
 
             # Total movies
             with conn.cursor() as cur:
-                cur.execute("SELECT COUNT(*) as count FROM movies WHERE title NOT LIKE 'Movie_%%'")
+                cur.execute("SELECT COUNT(*) as count FROM movies WHERE is_placeholder = 0")
                 total_movies = cur.fetchone()['count']
                 self.admin_total_movies_label.config(text=str(total_movies))
 
@@ -8178,34 +12258,28 @@ class MovieApp(tk.Tk):
             FROM ratings r
             INNER JOIN users u ON r.userId = u.userId
             INNER JOIN movies m ON r.movieId = m.movieId
-            WHERE u.username IS NOT NULL
-              AND m.title NOT LIKE 'Movie_%%'
+            WHERE r.timestamp >= %s
+              AND u.username IS NOT NULL
+              AND m.is_placeholder = 0
             ORDER BY r.timestamp DESC
             LIMIT 20
         """
-        conn = get_connection()
-        try:
-            with conn.cursor() as cur:
-                cur.execute(sql)
-                rows = cur.fetchall()
-
-            lines = []
-            lines.append("=" * 100)
-            lines.append(f"{'USERNAME':<20} {'MOVIE':<40} {'RATING':<10} {'TIMESTAMP':<30}")
-            lines.append("=" * 100)
+        rows = fetch_newest_ratings(sql, 20)
 
-            for row in rows:
-                username = row['username'][:18]
-                title = row['title'][:38]
-                rating = f"{row['rating']}/5.0"
-                timestamp = str(row['rated_at'])
+        lines = []
+        lines.append("=" * 100)
+        lines.append(f"{'USERNAME':<20} {'MOVIE':<40} {'RATING':<10} {'TIMESTAMP':<30}")
+        lines.append("=" * 100)
 
-                lines.append(f"{username:<20} {title:<40} {rating:<10} {timestamp:<30}")
+        for row in rows:
+            username = row['username'][:18]
+            title = row['title'][:38]
+            rating = f"{row['rating']}/5.0"
+            timestamp = str(row['rated_at'])
 
-            self._set_text_widget(self.admin_activity_text, "\n".join(lines))
+            lines.append(f"{username:<20} {title:<40} {rating:<10} {timestamp:<30}")
 
-        finally:
-            conn.close()
+        self._set_text_widget(self.admin_activity_text, "\n".join(lines))
 
     # ------------------------------------------------------------------
     # TAB 6: ADMIN MOVIE MANAGEMENT
@@ -8490,6 +12564,21 @@ class MovieApp(tk.Tk):
             cursor="hand2",
             width=18
         ).pack(side="left", padx=5)
+        
+        self.btn_import_movies = tk.Button(
+            btn_row2,
+            text="Import Movies (CSV/JSONL)",
+            command=self.handle_import_movies,
+            bg="#795548",
+            fg="white",
+            font=("Arial", 9, "bold"),
+            padx=15,
+            pady=8,
+            relief="raised",
+            cursor="hand2",
+            width=22
+        )
+        self.btn_import_movies.pack(side="left", padx=5)
 
         # ===== Activity Log (spans full width at bottom) =====
         log_wrapper = ttk.LabelFrame(container, text="Activity Log - Real-time sync status", padding=10)
@@ -8533,6 +12622,7 @@ class MovieApp(tk.Tk):
     # UNIFIED MOVIE MANAGEMENT HANDLERS (Sync Both Databases)
     # ===================================================================
     
+    @traced_action
     def handle_unified_add_movie(self):
         """
         ADD MOVIE: Creates movie in BOTH MariaDB AND MongoDB automatically
@@ -8563,82 +12653,72 @@ class MovieApp(tk.Tk):
         
         # Validation
         if not title:
-            messagebox.showerror("Validation Error", "Title is required!", parent=self)
+            with tracer.span("messagebox", kind="wait"):
+                messagebox.showerror("Validation Error", "Title is required!", parent=self)
             return
         
         if release_date:
             try:
                 datetime.strptime(release_date, "%Y-%m-%d")
             except ValueError:
-                messagebox.showerror("Validation Error", "Invalid date format. Use YYYY-MM-DD", parent=self)
+                with tracer.span("messagebox", kind="wait"):
+                    messagebox.showerror("Validation Error", "Invalid date format. Use YYYY-MM-DD", parent=self)
                 return
         
         # Permission check
         if CURRENT_USER['role'] != 'admin':
             self._append_admin_movie_log("[ERROR] Permission denied - admin only")
-            messagebox.showerror("Permission Denied", "Only administrators can add movies", parent=self)
+            with tracer.span("messagebox", kind="wait"):
+                messagebox.showerror("Permission Denied", "Only administrators can add movies", parent=self)
             return
         
         self._append_admin_movie_log("="*80)
         self._append_admin_movie_log(f"[ADD MOVIE] Starting unified creation: '{title}'")
         
         try:
-            # STEP 1: Add to MariaDB
-            self._append_admin_movie_log("[1/4] Adding to MariaDB...")
-            ok, movie_id = add_movie_to_sql(title, release_date)
-            
-            if not ok:
-                self._append_admin_movie_log("[ERROR] Failed to add to MariaDB")
-                messagebox.showerror("Error", "Failed to add movie to MariaDB. Check Activity Log.", parent=self)
-                return
-            
-            self._append_admin_movie_log(f"[SUCCESS] MariaDB: Movie ID = {movie_id}")
-            self.admin_movie_id_var.set(str(movie_id))
-            
-            # STEP 2: Determine TMDB ID for MongoDB
+            # Determine TMDB ID for MongoDB (defaults to the new Movie ID)
+            tmdb_id_for_mongo = None
             if tmdb_id_input:
                 try:
                     tmdb_id_for_mongo = int(tmdb_id_input)
-                    self._append_admin_movie_log(f"[2/4] Using custom TMDB ID: {tmdb_id_for_mongo}")
                 except ValueError:
-                    tmdb_id_for_mongo = movie_id
-                    self._append_admin_movie_log(f"[2/4] Invalid TMDB ID, using Movie ID: {tmdb_id_for_mongo}")
-            else:
-                tmdb_id_for_mongo = movie_id
-                self._append_admin_movie_log(f"[2/4] Using Movie ID as TMDB ID: {tmdb_id_for_mongo}")
-            
-            # STEP 3: Add to MongoDB
-            self._append_admin_movie_log("[3/4] Adding to MongoDB...")
-            mongo_ok = add_movie_to_mongo(
-                tmdb_id=tmdb_id_for_mongo,
-                title=title,
-                overview=overview or "No overview available",
-                genres=genres or "Unknown",
-                keywords=keywords or "",
-                vote_average=rating,
-                vote_count=votes,
-                runtime=runtime,
-                release_date=release_date or "",
-                revenue=0,
-                original_language="en",
-                tagline="",
-                popularity=0
-            )
+                    self._append_admin_movie_log("[WARNING] Invalid TMDB ID, using Movie ID instead")
+            
+            # One MariaDB transaction: movie row + links + queued MongoDB upsert
+            self._append_admin_movie_log("[1/2] Saving to MariaDB (movie, links, MongoDB outbox)...")
+            with tracer.span("add_movie_with_outbox"):
+                ok, saved = add_movie_with_outbox(
+                    title, release_date,
+                    imdb_id=imdb_id or None,
+                    tmdb_id=tmdb_id_for_mongo,
+                    mongo_fields={
+                        "overview": overview or "No overview available",
+                        "genres": genres or "Unknown",
+                        "keywords": keywords or "",
+                        "vote_average": rating,
+                        "vote_count": votes,
+                        "runtime": runtime,
+                        "release_date": release_date or "",
+                    }
+                )
             
-            if mongo_ok:
-                self._append_admin_movie_log(f"[SUCCESS] MongoDB: TMDB ID = {tmdb_id_for_mongo}")
-            else:
-                self._append_admin_movie_log("[SKIPPED] MongoDB: Storage full or unavailable (movie still saved in MariaDB)")
+            if not ok:
+                self._append_admin_movie_log("[ERROR] Failed to save to MariaDB - nothing was written")
+                with tracer.span("messagebox", kind="wait"):
+                    messagebox.showerror("Error", "Failed to add movie to MariaDB. Check Activity Log.", parent=self)
+                return
             
-            # STEP 4: Create links
-            self._append_admin_movie_log("[4/4] Creating database links...")
-            link_ok = update_movie_links(movie_id, imdb_id=imdb_id or None, tmdb_id=tmdb_id_for_mongo)
-            if link_ok:
-                self._append_admin_movie_log(f"[SUCCESS] Links created: movieId={movie_id} ↔ tmdbId={tmdb_id_for_mongo}")
+            movie_id = saved["movieId"]
+            tracer.annotate(movie_id=movie_id, outbox_id=saved["outboxId"])
+            self.admin_movie_id_var.set(str(movie_id))
+            self._append_admin_movie_log(f"[SUCCESS] MariaDB: Movie ID = {movie_id}")
+            if saved["linked"]:
+                self._append_admin_movie_log(f"[SUCCESS] Links created: movieId={movie_id} ↔ tmdbId={saved['tmdbId']}")
             else:
-                self._append_admin_movie_log("[WARNING] Links creation failed (non-critical)")
+                self._append_admin_movie_log("[SKIPPED] Links: no IMDb ID given")
+            self._append_admin_movie_log(f"[2/2] MongoDB sync queued (outbox #{saved['outboxId']})")
+            self._watch_outbox(saved["outboxId"], f"MongoDB: TMDB ID = {saved['tmdbId']}")
             
-            # Success!
             self._append_admin_movie_log(f"[COMPLETE] ✓ Movie '{title}' added successfully!")
             self._append_admin_movie_log("="*80)
             
@@ -8646,20 +12726,14 @@ class MovieApp(tk.Tk):
             msg += f"Title: {title}\n"
             msg += f"MariaDB Movie ID: {movie_id}\n\n"
             msg += "✓ MariaDB: Created\n"
-            
-            if mongo_ok:
-                msg += f"✓ MongoDB: Created (TMDB ID: {tmdb_id_for_mongo})\n"
-            else:
-                msg += "⚠ MongoDB: Skipped (storage full or unavailable)\n"
-                
-            if link_ok:
-                msg += f"✓ Links: Created\n"
+            if saved["linked"]:
+                msg += f"✓ Links: Created (TMDB ID: {saved['tmdbId']})\n"
             else:
-                msg += "⚠ Links: Skipped\n"
+                msg += "⚠ Links: Skipped (no IMDb ID)\n"
+            msg += "⏳ MongoDB: Syncing in the background (see Activity Log)\n"
             
-            msg += "\nNote: Movie successfully saved in MariaDB database!"
-            
-            messagebox.showinfo("Success", msg, parent=self)
+            with tracer.span("messagebox", kind="wait"):
+                messagebox.showinfo("Success", msg, parent=self)
             
             # Clear form (keep Movie ID for reference)
             self.handle_unified_clear_form(keep_id=True)
@@ -8668,7 +12742,104 @@ class MovieApp(tk.Tk):
             import traceback
             self._append_admin_movie_log(f"[EXCEPTION] {str(e)}")
             self._append_admin_movie_log(f"{traceback.format_exc()}")
-            messagebox.showerror("Error", f"An error occurred:\n{str(e)}", parent=self)
+            tracer.annotate(error=str(e))
+            with tracer.span("messagebox", kind="wait"):
+                messagebox.showerror("Error", f"An error occurred:\n{str(e)}", parent=self)
+    
+    def handle_import_movies(self):
+        """Admin: bulk insert/update movies from a CSV or JSONL file; dry run first, then apply."""
+        if CURRENT_USER['role'] != 'admin':
+            messagebox.showerror("Permission Denied", "Only administrators can import movies", parent=self)
+            return
+        path = filedialog.askopenfilename(
+            parent=self, title="Import movies",
+            filetypes=[("CSV or JSON Lines", "*.csv *.jsonl *.ndjson"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            rows = read_movie_file(path)
+        except (OSError, ValueError, csv.Error) as e:
+            messagebox.showerror("Import Movies", f"Could not read {os.path.basename(path)}:\n{e}", parent=self)
+            return
+        if not rows:
+            messagebox.showinfo("Import Movies", "The file has no rows.", parent=self)
+            return
+
+        self.btn_import_movies.config(state="disabled")
+        self._append_admin_movie_log("="*80)
+        self._append_admin_movie_log(f"[IMPORT] Checking {len(rows)} rows from {os.path.basename(path)} (dry run)...")
+        when_done(self, run_auth_async(functools.partial(bulk_import_movies, rows, dry_run=True)),
+                  lambda report, error: self._import_movies_checked(path, rows, report, error), poll_ms=100)
+
+    def _import_movies_checked(self, path, rows, report, error):
+        if error is not None:
+            self.btn_import_movies.config(state="normal")
+            self._append_admin_movie_log(f"[ERROR] Movie import check failed: {error}")
+            messagebox.showerror("Import Movies", str(error), parent=self)
+            return
+        self._log_movie_import_errors(report)
+        summary = (f"{report['inserted']} new movies, {report['updated']} updates, "
+                   f"{report['errors']} rows rejected")
+        self._append_admin_movie_log(f"[DRY RUN] {summary}")
+        if not report["inserted"] and not report["updated"]:
+            self.btn_import_movies.config(state="normal")
+            messagebox.showinfo("Import Movies", f"Nothing to import.\n\n{summary}", parent=self)
+            return
+        if not messagebox.askyesno("Import Movies", f"Dry run: {summary}.\n\n"
+                                   "Write these movies to MariaDB and MongoDB now?", parent=self):
+            self.btn_import_movies.config(state="normal")
+            self._append_admin_movie_log("[IMPORT] Cancelled")
+            return
+        self._append_admin_movie_log("[IMPORT] Writing MOVIES/LINKS and MongoDB in batches...")
+        when_done(self, run_auth_async(bulk_import_movies, rows),
+                  lambda report, error: self._import_movies_finished(path, report, error), poll_ms=100)
+
+    def _import_movies_finished(self, path, report, error):
+        self.btn_import_movies.config(state="normal")
+        if error is not None:
+            self._append_admin_movie_log(f"[ERROR] Movie import failed: {error}")
+            messagebox.showerror("Import Movies", str(error), parent=self)
+            return
+        self._log_movie_import_errors(report)
+        self._append_admin_movie_log(f"[COMPLETE] ✓ {report['inserted']} movies added, {report['updated']} updated, "
+                                     f"{report['errors']} rows rejected")
+        if report["mongo_queued"]:
+            self._append_admin_movie_log(f"  {report['mongo_queued']} MongoDB writes queued in the outbox for retry")
+        if report["errors"] or report["mongo_queued"]:
+            stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            report_path = write_movie_import_report(report["results"],
+                                                    os.path.join("rejects", f"movie_import_{stamp}.csv"))
+            self._append_admin_movie_log(f"  Per-row results: {report_path}")
+        self._append_admin_movie_log("="*80)
+        messagebox.showinfo(
+            "Import Movies",
+            f"Added {report['inserted']} and updated {report['updated']} movies.\n"
+            f"Rejected {report['errors']} rows (see the Activity Log).",
+            parent=self
+        )
+
+    def _log_movie_import_errors(self, report):
+        rejected = [r for r in report["results"] if r["status"] == "error"]
+        for r in rejected[:20]:
+            self._append_admin_movie_log(f"  line {r['line']}: {r['title'] or '(no title)'} - {r['reason']}")
+
+    def _watch_outbox(self, outbox_id, label, waited_ms=0, last_state=None):
+        """Log when the relay has applied (or given up on) a queued MongoDB change."""
+        if outbox_id is None:
+            return
+        state = outbox_relay.status(outbox_id)
+        if state == "applied":
+            self._append_admin_movie_log(f"[SYNCED] {label} (outbox #{outbox_id})")
+        elif state == "dead":
+            self._append_admin_movie_log(f"[ERROR] MongoDB sync gave up after {OUTBOX_MAX_ATTEMPTS} attempts "
+                                         f"(outbox #{outbox_id}) - see logs/movies_db.log")
+        elif waited_ms >= 60000:
+            self._append_admin_movie_log(f"[PENDING] MongoDB not reachable yet; outbox #{outbox_id} stays queued")
+        else:
+            if state == "retry" and last_state != "retry":
+                self._append_admin_movie_log(f"[RETRY] MongoDB write failed, retrying (outbox #{outbox_id})")
+            self.after(500, self._watch_outbox, outbox_id, label, waited_ms + 500, state)
     
     def handle_unified_update_movie(self):
         """
@@ -8717,51 +12888,48 @@ class MovieApp(tk.Tk):
         
         try:
             movie_id_int = int(movie_id)
-            
-            # STEP 1: Update MariaDB
-            if title:
-                self._append_admin_movie_log("[1/3] Updating MariaDB...")
-                ok = update_movie_in_sql(movie_id_int, title=title, release_date=release_date)
-                if ok:
-                    self._append_admin_movie_log("[SUCCESS] MariaDB updated")
-                else:
-                    self._append_admin_movie_log("[WARNING] MariaDB update failed")
-            
-            # STEP 2: Update MongoDB
             tmdb_id_for_mongo = int(tmdb_id_input) if tmdb_id_input else movie_id_int
             
+            mongo_fields = None
             if any([title, genres, keywords, overview, rating > 0, votes > 0, runtime > 0]):
-                self._append_admin_movie_log(f"[2/3] Updating MongoDB (TMDB ID: {tmdb_id_for_mongo})...")
-                mongo_ok = add_movie_to_mongo(
-                    tmdb_id=tmdb_id_for_mongo,
-                    title=title or "Unknown",
-                    overview=overview or "",
-                    genres=genres or "",
-                    keywords=keywords or "",
-                    vote_average=rating,
-                    vote_count=votes,
-                    runtime=runtime,
-                    release_date=release_date or "",
-                    revenue=0,
-                    original_language="en",
-                    tagline="",
-                    popularity=0
-                )
-                if mongo_ok:
-                    self._append_admin_movie_log("[SUCCESS] MongoDB updated")
-                else:
-                    self._append_admin_movie_log("[WARNING] MongoDB update failed")
+                mongo_fields = {
+                    "overview": overview or "",
+                    "genres": genres or "",
+                    "keywords": keywords or "",
+                    "vote_average": rating,
+                    "vote_count": votes,
+                    "runtime": runtime,
+                    "release_date": release_date or "",
+                }
+            
+            # One MariaDB transaction: movie row + links + queued MongoDB upsert
+            self._append_admin_movie_log("[1/2] Updating MariaDB (movie, links, MongoDB outbox)...")
+            ok, saved = update_movie_with_outbox(
+                movie_id_int,
+                title=title or None,
+                release_date=release_date,
+                imdb_id=imdb_id or None,
+                tmdb_id=tmdb_id_for_mongo,
+                mongo_fields=mongo_fields
+            )
+            if not ok:
+                self._append_admin_movie_log("[ERROR] MariaDB update failed - nothing was written")
+                messagebox.showerror("Error", "Failed to update movie. Check Activity Log.", parent=self)
+                return
+            self._append_admin_movie_log("[SUCCESS] MariaDB and links updated" if saved["linked"]
+                                         else "[SUCCESS] MariaDB updated (links unchanged: no IMDb ID)")
             
-            # STEP 3: Update links
-            self._append_admin_movie_log("[3/3] Updating links...")
-            link_ok = update_movie_links(movie_id_int, imdb_id=imdb_id or None, tmdb_id=tmdb_id_for_mongo)
-            if link_ok:
-                self._append_admin_movie_log("[SUCCESS] Links updated")
+            if saved["outboxId"] is not None:
+                self._append_admin_movie_log(
+                    f"[2/2] MongoDB sync queued (TMDB ID: {tmdb_id_for_mongo}, outbox #{saved['outboxId']})"
+                )
+                self._watch_outbox(saved["outboxId"], f"MongoDB updated (TMDB ID: {tmdb_id_for_mongo})")
             
-            self._append_admin_movie_log(f"[COMPLETE] ✓ Movie ID {movie_id} updated in BOTH databases!")
+            self._append_admin_movie_log(f"[COMPLETE] ✓ Movie ID {movie_id} updated; MongoDB follows in the background")
             self._append_admin_movie_log("="*80)
             
-            messagebox.showinfo("Success", f"Movie ID {movie_id} updated successfully in BOTH databases!", parent=self)
+            messagebox.showinfo("Success", f"Movie ID {movie_id} updated successfully!\n\n"
+                                           "MongoDB is synced in the background (see Activity Log).", parent=self)
             
         except Exception as e:
             import traceback
@@ -8804,9 +12972,9 @@ class MovieApp(tk.Tk):
             movie_id_int = int(movie_id)
             tmdb_id = int(self.admin_tmdb_id_var.get().strip()) if self.admin_tmdb_id_var.get().strip() else movie_id_int
             
-            # STEP 1: Delete from MariaDB (also deletes from links due to CASCADE)
-            self._append_admin_movie_log("[1/2] Deleting from MariaDB...")
-            ok = delete_movie_from_sql(movie_id_int)
+            # One MariaDB transaction: ratings + links + movie row + queued MongoDB delete
+            self._append_admin_movie_log("[1/2] Deleting from MariaDB (and links)...")
+            ok, saved = delete_movie_with_outbox(movie_id_int, tmdb_id)
             if ok:
                 self._append_admin_movie_log("[SUCCESS] Deleted from MariaDB (and links)")
             else:
@@ -8814,15 +12982,10 @@ class MovieApp(tk.Tk):
                 messagebox.showerror("Error", "Failed to delete from MariaDB", parent=self)
                 return
             
-            # STEP 2: Delete from MongoDB
-            self._append_admin_movie_log(f"[2/2] Deleting from MongoDB (TMDB ID: {tmdb_id})...")
-            mongo_ok = delete_movie_from_mongo(tmdb_id)
-            if mongo_ok:
-                self._append_admin_movie_log("[SUCCESS] Deleted from MongoDB")
-            else:
-                self._append_admin_movie_log("[WARNING] MongoDB deletion failed (may not exist)")
+            self._append_admin_movie_log(f"[2/2] MongoDB delete queued (TMDB ID: {tmdb_id}, outbox #{saved['outboxId']})")
+            self._watch_outbox(saved["outboxId"], f"Deleted from MongoDB (TMDB ID: {tmdb_id})")
             
-            self._append_admin_movie_log(f"[COMPLETE] ✓ Movie ID {movie_id} deleted from BOTH databases!")
+            self._append_admin_movie_log(f"[COMPLETE] ✓ Movie ID {movie_id} deleted; MongoDB follows in the background")
             self._append_admin_movie_log("="*80)
             
             messagebox.showinfo("Success", f"Movie '{title}' deleted from BOTH databases!", parent=self)
@@ -10215,6 +14378,128 @@ Query: db.tmdb_movies.aggregate([...])"""
 
         genre_form.columnconfigure(1, weight=1)
 
+        # Test 6: In-process cache statistics
+        cache_wrapper = ttk.LabelFrame(left_container, text="Test 6: Cache Statistics", padding=10)
+        cache_wrapper.pack(fill="x", pady=(0, 10))
+
+        cache_form = tk.Frame(cache_wrapper, bg="white")
+        cache_form.pack(fill="x", pady=(5, 10))
+
+        ttk.Button(
+            cache_form,
+            text="Show Cache Stats",
+            command=self.handle_cache_stats
+        ).grid(row=0, column=0, padx=5, pady=5, sticky="ew")
+
+        ttk.Button(
+            cache_form,
+            text="Clear Caches",
+            command=self.handle_clear_caches
+        ).grid(row=1, column=0, padx=5, pady=5, sticky="ew")
+
+        tk.Label(
+            cache_form,
+            text="Hit/miss counts for movie details, ratings,\nwatchlist and the local TMDB cache.",
+            font=("Arial", 8, "italic"),
+            bg="white",
+            fg="#7f8c8d",
+            justify="left"
+        ).grid(row=2, column=0, padx=5, pady=(5, 0), sticky="w")
+
+        cache_form.columnconfigure(0, weight=1)
+
+        # Test 7: Benchmark suite (warmup + repeated iterations, percentiles)
+        suite_wrapper = ttk.LabelFrame(left_container, text="Test 7: Benchmark Suite", padding=10)
+        suite_wrapper.pack(fill="x", pady=(0, 10))
+
+        suite_form = tk.Frame(suite_wrapper, bg="white")
+        suite_form.pack(fill="x", pady=(5, 10))
+
+        ttk.Label(suite_form, text="Scenario:").grid(row=0, column=0, sticky="w", padx=5, pady=5)
+        self.bench_scenario_var = tk.StringVar(value="all")
+        ttk.Combobox(
+            suite_form,
+            textvariable=self.bench_scenario_var,
+            values=["all"] + list(BENCHMARK_SCENARIOS),
+            state="readonly",
+            width=22
+        ).grid(row=0, column=1, padx=5, pady=5, sticky="ew")
+
+        ttk.Label(suite_form, text="Iterations:").grid(row=1, column=0, sticky="w", padx=5, pady=5)
+        self.bench_iterations_var = tk.StringVar(value=str(BENCHMARK_ITERATIONS))
+        ttk.Entry(suite_form, textvariable=self.bench_iterations_var, width=25)\
+            .grid(row=1, column=1, padx=5, pady=5, sticky="ew")
+
+        ttk.Label(suite_form, text="Warmup:").grid(row=2, column=0, sticky="w", padx=5, pady=5)
+        self.bench_warmup_var = tk.StringVar(value=str(BENCHMARK_WARMUP))
+        ttk.Entry(suite_form, textvariable=self.bench_warmup_var, width=25)\
+            .grid(row=2, column=1, padx=5, pady=5, sticky="ew")
+
+        ttk.Button(
+            suite_form,
+            text="Run Benchmark Suite",
+            command=self.handle_benchmark_suite
+        ).grid(row=3, column=0, columnspan=2, padx=5, pady=(5, 0), sticky="ew")
+
+        tk.Label(
+            suite_form,
+            text="p50/p95/p99, stddev and throughput per scenario\n✓ Results saved as JSON in the benchmarks folder",
+            font=("Arial", 8, "italic"),
+            bg="white",
+            fg="#27ae60",
+            justify="left"
+        ).grid(row=4, column=0, columnspan=2, sticky="w", padx=5, pady=(5, 0))
+
+        suite_form.columnconfigure(1, weight=1)
+
+        # Test 8: Per-query instrumentation
+        qstats_wrapper = ttk.LabelFrame(left_container, text="Test 8: Query Stats", padding=10)
+        qstats_wrapper.pack(fill="x", pady=(0, 10))
+
+        qstats_form = tk.Frame(qstats_wrapper, bg="white")
+        qstats_form.pack(fill="x", pady=(5, 10))
+
+        ttk.Button(
+            qstats_form,
+            text="Show Query Stats",
+            command=self.handle_query_stats
+        ).grid(row=0, column=0, padx=5, pady=5, sticky="ew")
+
+        ttk.Button(
+            qstats_form,
+            text="Export Prometheus File",
+            command=self.handle_export_query_stats
+        ).grid(row=1, column=0, padx=5, pady=5, sticky="ew")
+
+        ttk.Button(
+            qstats_form,
+            text="Reset Query Stats",
+            command=self.handle_reset_query_stats
+        ).grid(row=2, column=0, padx=5, pady=5, sticky="ew")
+
+        ttk.Button(
+            qstats_form,
+            text="Show Slow Queries",
+            command=self.handle_slow_queries
+        ).grid(row=3, column=0, padx=5, pady=5, sticky="ew")
+
+        ttk.Button(
+            qstats_form,
+            text="Show Slowest Actions (Traces)",
+            command=self.handle_trace_summary
+        ).grid(row=4, column=0, padx=5, pady=5, sticky="ew")
+
+        tk.Label(
+            qstats_form,
+            text="Latency, rows, bytes and errors for every\nSQL execute and MongoDB command, by query name.",
+            font=("Arial", 8, "italic"),
+            bg="white",
+            fg="#7f8c8d",
+            justify="left"
+        ).grid(row=5, column=0, padx=5, pady=(5, 0), sticky="w")
+
+        qstats_form.columnconfigure(0, weight=1)
+
         # Right side: Results output
         right_container = tk.Frame(container, bg="#f0f0f0")
         right_container.pack(side="left", fill="both", expand=True, padx=(5, 10), pady=10)
@@ -10261,7 +14546,11 @@ Query: db.tmdb_movies.aggregate([...])"""
             "  Test 2: INSERT Performance - Bulk insert speed comparison\n" +
             "  Test 3: UPDATE Performance - Bulk update speed comparison\n" +
             "  Test 4: Data Integrity - Foreign key and primary key constraints\n" +
-            "  Test 5: Genre Search - SQL LIKE vs MongoDB regex genre filtering\n\n" +
+            "  Test 5: Genre Search - SQL LIKE vs MongoDB regex genre filtering\n" +
+            "  Test 6: Cache Statistics - hit rates of the in-process and TMDB caches\n" +
+            "  Test 7: Benchmark Suite - named scenarios with warmup and percentiles\n" +
+            "  Test 8: Query Stats - per-query latency histograms, rows, bytes, errors,\n" +
+            "          slow-query log with EXPLAIN plans, per-action traces\n\n" +
             "+---------------------------------------------------------------------------+\n" +
             "|                              PURPOSE                                      |\n" +
             "+---------------------------------------------------------------------------+\n" +
@@ -10278,12 +14567,167 @@ Query: db.tmdb_movies.aggregate([...])"""
         )
         self._set_text_widget(self.perf_output, welcome_msg)
 
+    def handle_cache_stats(self):
+        """Show hit/miss counters for every cache in the Performance output."""
+        out = []
+        out.append("=" * 80)
+        out.append("CACHE STATISTICS")
+        out.append("=" * 80)
+        out.append("")
+        out.append(f"{'Cache':<18} {'Entries':>8} {'Hits':>9} {'Misses':>9} {'Hit Rate':>9} {'Evicted':>8} {'Invalid.':>9}")
+        out.append("-" * 80)
+        for name, st in get_cache_stats().items():
+            out.append(
+                f"{name:<18} {st['entries']:>8} {st['hits']:>9} {st['misses']:>9} "
+                f"{st['hit_rate'] * 100:>8.1f}% {st.get('evictions', '-'):>8} {st.get('invalidations', '-'):>9}"
+            )
+        out.append("")
+        out.append(f"LRU capacity: {APP_CACHE_MAX_ENTRIES} entries per cache | TTL: {APP_CACHE_TTL_SECONDS:.0f}s")
+        if TMDB_CACHE_ENABLED:
+            out.append(f"TMDB cache file: {TMDB_CACHE_PATH}")
+        else:
+            out.append("TMDB cache: disabled")
+        out.append("=" * 80)
+        self._set_text_widget(self.perf_output, "\n".join(out))
+
+    def handle_query_stats(self):
+        """Per-query table of everything recorded by the instrumentation layer."""
+        rows = query_stats.snapshot()
+        out = []
+        out.append("=" * 100)
+        out.append("QUERY STATS (since start-up or last reset, slowest total time first)")
+        out.append("=" * 100)
+        out.append("")
+        if not rows:
+            out.append("No queries recorded yet.")
+        else:
+            out.append(f"{'Backend':<7} {'Query':<40} {'Calls':>6} {'Err':>4} {'Mean ms':>8} {'p50 ms':>8} "
+                       f"{'p95 ms':>8} {'Max ms':>8} {'Rows':>8} {'KB':>8}")
+            out.append("-" * 100)
+            for r in rows:
+                out.append(
+                    f"{r['backend']:<7} {r['query'][:40]:<40} {r['count']:>6} {r['errors']:>4} "
+                    f"{r['mean_ms']:>8.2f} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['max_ms']:>8.2f} "
+                    f"{r['rows']:>8} {r['bytes'] / 1024:>8.1f}"
+                )
+        out.append("")
+        out.append("p50/p95 are estimated from the latency histogram buckets.")
+        if QUERY_METRICS_PORT:
+            out.append(f"Prometheus endpoint: http://localhost:{QUERY_METRICS_PORT}/metrics")
+        out.append("=" * 100)
+        self._set_text_widget(self.perf_output, "\n".join(out))
+
+    def handle_export_query_stats(self):
+        path = export_query_stats()
+        self.handle_query_stats()
+        self._append_text_widget(self.perf_output, f"Prometheus text exported to {path}")
+
+    def handle_reset_query_stats(self):
+        query_stats.reset()
+        self.handle_query_stats()
+
+    def handle_trace_summary(self):
+        """Flame-style view of the slowest recent traced UI actions."""
+        out = []
+        out.append("=" * 100)
+        out.append(f"SLOWEST RECENT ACTIONS (last {len(tracer.recent)} traced, modal dialog time excluded)")
+        out.append(f"OTLP/JSON traces: {TRACE_LOG}")
+        out.append("=" * 100)
+        out.append("")
+        out.append(format_trace_summary())
+        out.append("=" * 100)
+        self._set_text_widget(self.perf_output, "\n".join(out))
+
+    def handle_slow_queries(self):
+        """Most recent slow queries with the plan summary captured by EXPLAIN."""
+        entries = list(slow_queries.recent)[-30:]
+        out = []
+        out.append("=" * 100)
+        out.append(f"SLOW QUERIES (>= {SLOW_QUERY_MS:.0f} ms, newest first) - full log: {SLOW_QUERY_LOG}")
+        out.append("=" * 100)
+        out.append("")
+        if not entries:
+            out.append("No slow queries captured yet.")
+        for e in reversed(entries):
+            scan = "  ⚠️ FULL SCAN" if e.get("full_scan") else ""
+            out.append(f"[{e['ts']}] {e['backend']} {e['query_name']}  {e['elapsed_ms']:.1f} ms, "
+                       f"{e['rows']} rows{scan}")
+            if e["backend"] == "mysql":
+                out.append(f"   SQL: {' '.join(e['sql'].split())[:200]}")
+                for t in e.get("tables", []):
+                    out.append(f"   {t['table']}: access={t['access_type']} key={t['key']} "
+                               f"rows≈{t['rows']} filtered={t['filtered']}")
+            else:
+                out.append(f"   {e['command']}: {json.dumps(e.get('filter'), default=str)[:200]}")
+                plan = e.get("explain")
+                if plan:
+                    out.append(f"   stages={' <- '.join(plan['winning_stages'])} "
+                               f"docsExamined={plan['totalDocsExamined']} keysExamined={plan['totalKeysExamined']} "
+                               f"returned={plan['nReturned']}")
+            if e.get("explain_error"):
+                out.append(f"   explain failed: {e['explain_error']}")
+            out.append("")
+        out.append("=" * 100)
+        self._set_text_widget(self.perf_output, "\n".join(out))
+
+    def handle_clear_caches(self):
+        clear_entity_caches()
+        self.handle_cache_stats()
+        self._append_text_widget(self.perf_output, "In-process caches cleared.")
+
+    def handle_benchmark_suite(self):
+        """Run the selected benchmark scenario(s) and save the results as JSON."""
+        try:
+            iterations = int(self.bench_iterations_var.get())
+            warmup = int(self.bench_warmup_var.get())
+            if iterations <= 0 or iterations > 1000 or warmup < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showwarning("Invalid Input", "Iterations must be 1-1000 and warmup 0 or more")
+            return
+
+        choice = self.bench_scenario_var.get()
+        names = None if choice == "all" else [choice]
+
+        self._set_text_widget(self.perf_output, f"\n{'='*80}\nRunning benchmark suite ({iterations} iterations, {warmup} warmup)...\nPlease wait...\n{'='*80}\n")
+        self.update()
+
+        def _progress(name, res):
+            self._append_text_widget(self.perf_output, f"  finished {name}: {res['status']}")
+            self.update()
+
+        history = list_benchmark_history()
+        results = run_benchmark_suite(names, iterations, warmup, progress=_progress)
+        path = save_benchmark_results(results)
+
+        out = []
+        out.append("=" * 80)
+        out.append("                        BENCHMARK SUITE RESULTS")
+        out.append("=" * 80)
+        out.append("")
+        out.append(format_benchmark_table(results))
+        out.append("")
+        out.append("Latencies in milliseconds, measured with time.perf_counter_ns.")
+        out.append(f"Results saved to: {path}")
+        if history:
+            # Compare against the most recent earlier run
+            out.append("")
+            out.append("-" * 80)
+            out.append("COMPARISON WITH PREVIOUS RUN")
+            out.append("-" * 80)
+            out.append(format_benchmark_comparison(compare_benchmark_runs(history[-1][1], results)))
+        out.append("=" * 80)
+        self._set_text_widget(self.perf_output, "\n".join(out))
+
     def handle_performance_test(self):
         kw = self.perf_keyword_var.get().strip()
         if not kw:
             messagebox.showwarning("Benchmark", "Enter a keyword.")
             return
 
+        self._set_text_widget(self.perf_output, f"\n{'='*80}\nRunning keyword search benchmark ({BENCHMARK_ITERATIONS} iterations)...\nPlease wait...\n{'='*80}\n")
+        self.update()
+
         metrics = compare_sql_vs_nosql_performance(kw)
         
         # Determine winner
@@ -10349,6 +14793,16 @@ Query: db.tmdb_movies.aggregate([...])"""
         out.append("")
         out.append(f"  NoSQL (MongoDB)    [{mongo_bar}] {mongo_time:.4f}s")
         out.append("")
+        sql_stats = metrics['sql_stats']
+        mongo_stats = metrics['mongo_stats']
+        out.append(f"  Median of {sql_stats['iterations']} timed runs after {sql_stats['warmup']} warmup runs (ms):")
+        out.append(f"  {'':<18} {'p50':>9} {'p95':>9} {'p99':>9} {'stddev':>9} {'ops/s':>9}")
+        for label, st in (("SQL (MariaDB)", sql_stats), ("NoSQL (MongoDB)", mongo_stats)):
+            out.append(
+                f"  {label:<18} {st['p50_ms']:>9.2f} {st['p95_ms']:>9.2f} {st['p99_ms']:>9.2f} "
+                f"{st['stddev_ms']:>9.2f} {st['throughput_ops']:>9.1f}"
+            )
+        out.append("")
         out.append("+---------------------------------------------------------------------------+")
         out.append("")
         out.append("")
@@ -10500,13 +14954,14 @@ Query: db.tmdb_movies.aggregate([...])"""
         out.append("           INSERT PERFORMANCE TEST RESULTS (ZERO IMPACT)")
         out.append("=" * 80)
         out.append("")
-        out.append(f"Records Tested: {results['record_count']}")
+        out.append(f"Records Tested: {results['record_count']} per run | Timed runs: {results['runs']} (median shown)")
         out.append("")
         out.append("+---------------------------------------------------------------------------+")
         out.append("|                         SQL (MariaDB) Results                             |")
         out.append("+---------------------------------------------------------------------------+")
         if results['sql_success']:
-            out.append(f"  Time:       {results['sql_time']:.3f}s")
+            out.append(f"  Time:       {results['sql_time']:.3f}s (p95 {results['sql_stats']['p95_ms'] / 1000:.3f}s, "
+                       f"stddev {results['sql_stats']['stddev_ms'] / 1000:.3f}s)")
             out.append(f"  Throughput: {results['sql_throughput']:.1f} inserts/sec")
             out.append(f"  Status:     ✓ SUCCESS (data deleted after test)")
         else:
@@ -10516,7 +14971,8 @@ Query: db.tmdb_movies.aggregate([...])"""
         out.append("|                         MongoDB Atlas Results                             |")
         out.append("+---------------------------------------------------------------------------+")
         if results['mongo_success']:
-            out.append(f"  Time:       {results['mongo_time']:.3f}s")
+            out.append(f"  Time:       {results['mongo_time']:.3f}s (p95 {results['mongo_stats']['p95_ms'] / 1000:.3f}s, "
+                       f"stddev {results['mongo_stats']['stddev_ms'] / 1000:.3f}s)")
             out.append(f"  Throughput: {results['mongo_throughput']:.1f} inserts/sec")
             out.append(f"  Status:     ✓ SUCCESS (data deleted after test)")
         else:
@@ -10562,13 +15018,14 @@ Query: db.tmdb_movies.aggregate([...])"""
         out.append("           UPDATE PERFORMANCE TEST RESULTS (ZERO IMPACT)")
         out.append("=" * 80)
         out.append("")
-        out.append(f"Records Tested: {results['record_count']}")
+        out.append(f"Records Tested: {results['record_count']} per run | Timed runs: {results['runs']} (median shown)")
         out.append("")
         out.append("+---------------------------------------------------------------------------+")
         out.append("|                         SQL (MariaDB) Results                             |")
         out.append("+---------------------------------------------------------------------------+")
         if results['sql_success']:
-            out.append(f"  Time:       {results['sql_time']:.3f}s")
+            out.append(f"  Time:       {results['sql_time']:.3f}s (p95 {results['sql_stats']['p95_ms'] / 1000:.3f}s, "
+                       f"stddev {results['sql_stats']['stddev_ms'] / 1000:.3f}s)")
             out.append(f"  Throughput: {results['sql_throughput']:.1f} updates/sec")
             out.append(f"  Status:     ✓ SUCCESS (original data restored)")
         else:
@@ -10578,7 +15035,8 @@ Query: db.tmdb_movies.aggregate([...])"""
         out.append("|                         MongoDB Atlas Results                             |")
         out.append("+---------------------------------------------------------------------------+")
         if results['mongo_success']:
-            out.append(f"  Time:       {results['mongo_time']:.3f}s")
+            out.append(f"  Time:       {results['mongo_time']:.3f}s (p95 {results['mongo_stats']['p95_ms'] / 1000:.3f}s, "
+                       f"stddev {results['mongo_stats']['stddev_ms'] / 1000:.3f}s)")
             out.append(f"  Throughput: {results['mongo_throughput']:.1f} updates/sec")
             out.append(f"  Status:     ✓ SUCCESS (original data restored)")
         else:
@@ -11197,6 +15655,7 @@ def test_concurrent_updates():
             with conn.cursor() as cur:
                 cur.execute("DELETE FROM ratings WHERE userId=%s AND movieId=%s", (test_user_id, test_movie_id))
             conn.commit()
+            invalidate_movie_caches(test_movie_id)
             print("\n[CLEANUP] Test data removed")
         finally:
             conn.close()
@@ -11221,6 +15680,22 @@ if __name__ == "__main__":
     # Test 3: Concurrent updates stress test
     # test_concurrent_updates()
     
+    # Prometheus scrape endpoint for the query instrumentation (QUERY_METRICS_PORT)
+    start_metrics_server()
+
+    # Apply admin movie saves still queued for MongoDB (movie outbox)
+    outbox_relay.start()
+
+    # Start the bcrypt workers while the window opens, not on the first login
+    threading.Thread(target=warm_auth_pool, daemon=True).start()
+
+    # Finish user deletions an earlier run was interrupted in
+    threading.Thread(target=finish_pending_user_deletions, daemon=True).start()
+
+    # Optionally pre-load the local TMDB cache without blocking the window
+    if TMDB_CACHE_WARM_ON_START:
+        threading.Thread(target=warm_tmdb_cache, daemon=True).start()
+
     # Check for AUTO_GUEST environment variable for Docker deployment
     auto_guest = os.getenv("AUTO_GUEST", "").lower() in ("true", "1", "yes")
     if auto_guest:
@@ -0,0 +1,563 @@
+"""
+INF2003 Movie Database - Index Advisor
+Looks at every index in movies_db together with how it is used and what the
+application actually runs, then:
+  - flags duplicate indexes (same effective key) and redundant ones (a left
+    prefix of another index or of the primary key)
+  - flags indexes with no reads since the server started (when
+    performance_schema or userstat is enabled)
+  - recommends covering indexes for hot queries whose plan scans a table
+  - writes a migration script with the DROP / CREATE statements
+
+Hot queries come from the app's own query log: the per-query statements
+recorded by gui.query_stats while a short benchmark workload runs, plus
+logs/slow_queries.jsonl. With --apply the migration is executed between two
+runs of a write-throughput benchmark (bulk inserts + rating upserts), so the
+cost of each index on writes is measured, not guessed.
+
+Examples:
+    python index_advisor.py                        # report + migration file
+    python index_advisor.py --no-workload          # only use the slow-query log
+    python index_advisor.py --drop-unused          # also drop indexes with no reads
+    python index_advisor.py --bench-writes 2000    # write benchmark only
+    python index_advisor.py --apply                # bench, apply migration, bench again
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+
+import gui
+
+# ============================================================
+# Configuration
+# ============================================================
+
+WORKLOAD_SCENARIOS = ["title_search", "advanced_search", "details_view", "top_n"]
+HOT_QUERY_LIMIT = 15           # hot statements that get an EXPLAIN
+SCAN_ROWS_THRESHOLD = 1000     # index scans reading more rows than this are worth a look
+MAX_INDEX_COLUMNS = 5          # wider "covering" indexes cost more on writes than they save
+SCAN_ACCESS_TYPES = ("ALL", "index")
+UNINDEXABLE_TYPES = ("text", "mediumtext", "longtext", "blob", "mediumblob", "longblob", "json")
+
+# ============================================================
+# Index Inventory & Usage
+# ============================================================
+
+def load_indexes(cur):
+    """{table: {index: {"columns": [...], "unique": bool, "type": "BTREE"}}}"""
+    cur.execute("""
+        SELECT TABLE_NAME, INDEX_NAME, NON_UNIQUE, COLUMN_NAME, INDEX_TYPE
+        FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE()
+        ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX
+    """)
+    indexes = defaultdict(dict)
+    for row in cur.fetchall():
+        idx = indexes[row["TABLE_NAME"]].setdefault(row["INDEX_NAME"], {
+            "columns": [], "unique": not row["NON_UNIQUE"], "type": row["INDEX_TYPE"],
+        })
+        idx["columns"].append(row["COLUMN_NAME"])
+    return indexes
+
+
+def load_columns(cur):
+    """{table: {column: data_type}} (lower-case column names)"""
+    cur.execute("""
+        SELECT TABLE_NAME, COLUMN_NAME, DATA_TYPE
+        FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE()
+    """)
+    columns = defaultdict(dict)
+    for row in cur.fetchall():
+        columns[row["TABLE_NAME"]][row["COLUMN_NAME"].lower()] = (row["COLUMN_NAME"], row["DATA_TYPE"])
+    return columns
+
+
+def load_index_usage(cur):
+    """
+    Index reads since server start -> (usage, source, uptime_s).
+    usage is {(table, index): reads}, or None when neither performance_schema
+    nor userstat (information_schema.INDEX_STATISTICS) is collecting.
+    """
+    cur.execute("SHOW GLOBAL STATUS LIKE 'Uptime'")
+    row = cur.fetchone()
+    uptime = int(row["Value"]) if row else 0
+
+    cur.execute("SELECT @@performance_schema AS ps")
+    if cur.fetchone()["ps"]:
+        cur.execute("""
+            SELECT OBJECT_NAME, INDEX_NAME, COUNT_READ
+            FROM performance_schema.table_io_waits_summary_by_index_usage
+            WHERE OBJECT_SCHEMA = DATABASE() AND INDEX_NAME IS NOT NULL
+        """)
+        usage = {(r["OBJECT_NAME"].lower(), r["INDEX_NAME"]): int(r["COUNT_READ"]) for r in cur.fetchall()}
+        return usage, "performance_schema", uptime
+
+    try:
+        cur.execute("SELECT @@userstat AS us")
+        if cur.fetchone()["us"]:
+            cur.execute("""
+                SELECT TABLE_NAME, INDEX_NAME, ROWS_READ
+                FROM information_schema.INDEX_STATISTICS
+                WHERE TABLE_SCHEMA = DATABASE()
+            """)
+            # Only indexes that were read appear; missing ones count as 0
+            usage = defaultdict(int)
+            for r in cur.fetchall():
+                usage[(r["TABLE_NAME"].lower(), r["INDEX_NAME"])] = int(r["ROWS_READ"])
+            return usage, "userstat", uptime
+    except gui.pymysql.MySQLError:
+        pass  # MySQL has no userstat
+    return None, None, uptime
+
+
+def effective_columns(index, primary):
+    """InnoDB appends the primary key to every secondary index."""
+    cols = [c.lower() for c in index["columns"]]
+    return cols + [c for c in primary if c not in cols]
+
+
+def find_redundant_indexes(indexes, usage=None):
+    """
+    Duplicate: same effective key as another index (keep the unique one,
+    then the more-read one, then the shorter name).
+    Redundant: declared columns are a strict left prefix of another BTREE
+    index or of the primary key; the longer index serves the same lookups.
+    """
+    findings = []
+    for table, table_indexes in sorted(indexes.items()):
+        primary = [c.lower() for c in table_indexes.get("PRIMARY", {}).get("columns", [])]
+        btree = {name: idx for name, idx in table_indexes.items() if idx["type"] == "BTREE"}
+        dropped = set()
+
+        def keep_rank(name):
+            reads = usage.get((table.lower(), name), 0) if usage else 0
+            return (name == "PRIMARY", btree[name]["unique"], reads, -len(name))
+
+        by_key = defaultdict(list)
+        for name, idx in btree.items():
+            by_key[tuple(effective_columns(idx, primary))].append(name)
+        for names in by_key.values():
+            if len(names) < 2:
+                continue
+            keep = max(names, key=keep_rank)
+            for name in names:
+                if name != keep and name != "PRIMARY" and not btree[name]["unique"]:
+                    dropped.add(name)
+                    findings.append({"table": table, "index": name, "kind": "duplicate", "of": keep,
+                                     "columns": btree[name]["columns"]})
+
+        for name, idx in btree.items():
+            if name in dropped or name == "PRIMARY" or idx["unique"]:
+                continue
+            cols = [c.lower() for c in idx["columns"]]
+            for other, other_idx in btree.items():
+                other_cols = [c.lower() for c in other_idx["columns"]]
+                if other == name or other in dropped or len(other_cols) <= len(cols):
+                    continue
+                if other_cols[:len(cols)] == cols:
+                    dropped.add(name)
+                    findings.append({"table": table, "index": name, "kind": "redundant", "of": other,
+                                     "columns": idx["columns"]})
+                    break
+    return findings
+
+
+def find_unused_indexes(indexes, usage, skip):
+    if usage is None:
+        return []
+    findings = []
+    for table, table_indexes in sorted(indexes.items()):
+        for name, idx in table_indexes.items():
+            if name == "PRIMARY" or idx["unique"] or (table, name) in skip:
+                continue
+            if usage.get((table.lower(), name), 0) == 0:
+                findings.append({"table": table, "index": name, "kind": "unused", "columns": idx["columns"]})
+    return findings
+
+# ============================================================
+# Hot Queries (app query log)
+# ============================================================
+
+def run_workload(iterations):
+    """Run the read-side benchmark scenarios so query_stats sees the hot statements."""
+    print(f"🔄 Running workload ({', '.join(WORKLOAD_SCENARIOS)}, {iterations} iterations each)...")
+    gui.run_benchmark_suite(WORKLOAD_SCENARIOS, iterations, warmup=1)
+
+
+def collect_hot_queries(slow_log=gui.SLOW_QUERY_LOG):
+    """[{name, calls, total_ms, statements}] from query_stats and the slow-query log, hottest first."""
+    hot = {}
+    for row in gui.query_stats.snapshot():
+        if row["backend"] != "mysql" or not row["statements"]:
+            continue
+        hot[row["query"]] = {"name": row["query"], "calls": row["count"],
+                             "total_ms": row["total_s"] * 1000, "statements": list(row["statements"])}
+    if os.path.exists(slow_log):
+        with open(slow_log, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry.get("backend") != "mysql" or not entry.get("sql"):
+                    continue
+                item = hot.setdefault(entry["query_name"], {"name": entry["query_name"], "calls": 0,
+                                                            "total_ms": 0.0, "statements": []})
+                item["calls"] += 1
+                item["total_ms"] += entry.get("elapsed_ms", 0.0)
+                if entry["sql"] not in item["statements"]:
+                    item["statements"].append(entry["sql"])
+    return sorted(hot.values(), key=lambda q: q["total_ms"], reverse=True)
+
+# ============================================================
+# Covering Index Recommendations
+# ============================================================
+
+_TABLE_REF_RE = re.compile(
+    r"\b(?:FROM|JOIN)\s+`?(\w+)`?(?:\s+(?:AS\s+)?`?(?!(?:ON|WHERE|JOIN|LEFT|RIGHT|INNER|CROSS|GROUP|ORDER"
+    r"|LIMIT|USING|HAVING|UNION)\b)(\w+)`?)?",
+    re.IGNORECASE,
+)
+_SELECTABLE_RE = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+
+
+def _plan_nodes(node, out):
+    """Every table access node of an EXPLAIN FORMAT=JSON tree."""
+    if isinstance(node, dict):
+        if "table_name" in node:
+            out.append(node)
+        for value in node.values():
+            _plan_nodes(value, out)
+    elif isinstance(node, list):
+        for value in node:
+            _plan_nodes(value, out)
+    return out
+
+
+def _column_refs(sql, alias, known, single_table):
+    """(equality, range, order, all) column lists for one table of the statement."""
+    prefix = rf"\b{re.escape(alias)}\." if not single_table else r"(?<![\w.])"
+    col = rf"{prefix}`?(\w+)`?"
+
+    def found(pattern):
+        out = []
+        for m in re.finditer(pattern, sql, re.IGNORECASE):
+            name = m.group(1).lower()
+            if name in known and known[name][0] not in out:
+                out.append(known[name][0])
+        return out
+
+    # Comparisons with a constant/placeholder seek; join columns only help as a fallback
+    eq = found(col + r"\s*(?:(?:=|<=>)\s*(?:%s|\?|'|-?\d)|\bIN\s*\()")
+    joins = [c for c in found(col + r"\s*=\s*`?\w+`?\.") + found(r"\.`?\w+`?\s*=\s*" + col) if c not in eq]
+    if not eq:
+        eq = list(dict.fromkeys(joins))
+    rng = found(col + r"\s*(?:>=|<=|>|<|\bBETWEEN\b|\bLIKE\s+'[^%_])")
+    order_clause = re.search(r"\b(?:ORDER|GROUP)\s+BY\s+(.*?)(?:\bLIMIT\b|\bHAVING\b|$)", sql, re.IGNORECASE | re.DOTALL)
+    order = []
+    if order_clause:
+        order = [c for c in found(col) if re.search(rf"\b{re.escape(c)}\b", order_clause.group(1), re.IGNORECASE)]
+    every = found(col)
+    return eq, rng, order, every
+
+
+def recommend_for_statement(cur, sql, indexes, columns):
+    """Covering-index suggestions for the scanned tables in one statement's plan."""
+    cur.execute("EXPLAIN FORMAT=JSON " + sql)
+    plan = json.loads(next(iter(cur.fetchone().values())))
+    nodes = _plan_nodes(plan, [])
+    refs = _TABLE_REF_RE.findall(sql)
+    # EXPLAIN reports the alias as table_name when the statement uses one
+    aliases = {}
+    for table, alias in refs:
+        aliases.setdefault((alias or table).lower(), (table, alias or table))
+    single_table = len(refs) == 1
+
+    suggestions = []
+    for node in nodes:
+        access = node.get("access_type")
+        rows = node.get("rows") or 0
+        if access not in SCAN_ACCESS_TYPES and not (rows > SCAN_ROWS_THRESHOLD and not node.get("using_index")):
+            continue
+        if node["table_name"].lower() not in aliases:
+            continue
+        table, alias = aliases[node["table_name"].lower()]
+        table_key = next((t for t in columns if t.lower() == table.lower()), None)
+        if table_key is None:
+            continue
+        known = {name: spec for name, spec in columns[table_key].items() if spec[1] not in UNINDEXABLE_TYPES}
+        eq, rng, order, every = _column_refs(sql, alias, known, single_table)
+        key = list(eq)
+        for c in (rng[:1] or order[:1]):
+            if c not in key:
+                key.append(c)
+        if not key:
+            continue
+        covering = key + [c for c in every if c not in key]
+        cols = covering if len(covering) <= MAX_INDEX_COLUMNS else key
+        existing = indexes.get(table_key, {})
+        if any([c.lower() for c in idx["columns"][:len(cols)]] == [c.lower() for c in cols]
+               for idx in existing.values()):
+            continue
+        name = ("idx_" + table_key.lower() + "_" + "_".join(c.lower() for c in cols))[:64]
+        suggestions.append({"table": table_key, "index": name, "columns": cols,
+                            "covering": cols == covering, "access_type": access, "rows": rows})
+    return suggestions
+
+
+def recommend_indexes(conn, hot_queries, indexes, columns):
+    recommendations = {}
+    with conn.cursor() as cur:
+        for q in hot_queries[:HOT_QUERY_LIMIT]:
+            for sql in q["statements"]:
+                if not _SELECTABLE_RE.match(sql):
+                    continue
+                try:
+                    suggestions = recommend_for_statement(cur, sql, indexes, columns)
+                except (gui.pymysql.MySQLError, ValueError, StopIteration) as e:
+                    print(f"  ⚠️  EXPLAIN failed for {q['name']}: {e}")
+                    continue
+                for s in suggestions:
+                    rec = recommendations.setdefault(s["index"], dict(s, queries=[]))
+                    if q["name"] not in rec["queries"]:
+                        rec["queries"].append(q["name"])
+    return list(recommendations.values())
+
+# ============================================================
+# Migration Script
+# ============================================================
+
+def build_migration(drops, creates):
+    statements = []
+    for d in drops:
+        reason = {"duplicate": f"duplicate of {d.get('of')}",
+                  "redundant": f"left prefix of {d.get('of')}",
+                  "unused": "no reads since server start"}[d["kind"]]
+        statements.append((f"{d['table']}.{d['index']} ({', '.join(d['columns'])}): {reason}",
+                           f"DROP INDEX IF EXISTS {d['index']} ON {d['table']};"))
+    for c in creates:
+        kind = "Covering index" if c["covering"] else "Index"
+        statements.append((f"{kind} for {', '.join(c['queries'])} ({c['access_type']} on {c['table']}, ~{c['rows']} rows)",
+                           f"CREATE INDEX IF NOT EXISTS {c['index']} ON {c['table']} ({', '.join(c['columns'])});"))
+    return statements
+
+
+def write_migration(statements, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("-- ============================================================\n")
+        f.write(f"-- Migration Script: index advisor output ({datetime.now():%Y-%m-%d %H:%M})\n")
+        f.write("-- Generated by index_advisor.py - review before applying\n")
+        f.write("-- ============================================================\n\n")
+        f.write(f"USE {gui.DB_NAME};\n\n")
+        for comment, sql in statements:
+            f.write(f"-- {comment}\n{sql}\n\n")
+        tables = sorted({sql.split(" ON ")[-1].split(" ")[0].rstrip(";") for _, sql in statements})
+        if tables:
+            f.write(f"ANALYZE TABLE {', '.join(tables)};\n")
+    return path
+
+# ============================================================
+# Write-throughput Benchmark
+# ============================================================
+
+def bench_writes(rows, runs, warmup=1):
+    """
+    Rating write paths against the current index set:
+      bulk_insert    executemany() of `rows` new ratings (import / bulk path)
+      rating_upsert  add_or_update_rating-style delete + insert, one row per transaction
+    Every inserted row has timestamp >= the start time and is deleted afterwards.
+    """
+    conn = gui.get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT userId FROM users ORDER BY RAND() LIMIT 200")
+            user_ids = [r["userId"] for r in cur.fetchall()]
+            cur.execute("SELECT movieId FROM movies ORDER BY RAND() LIMIT 500")
+            movie_ids = [r["movieId"] for r in cur.fetchall()]
+    finally:
+        conn.close()
+    if not user_ids or not movie_ids:
+        raise SystemExit("❌ Need users and movies in the database for the write benchmark")
+
+    start_ts = int(time.time())
+    next_ts = [start_ts]
+
+    def _rows(n):
+        batch = [(random.choice(user_ids), random.choice(movie_ids), round(random.uniform(0.5, 5.0), 1),
+                  next_ts[0] + i) for i in range(n)]
+        next_ts[0] += n
+        return batch
+
+    conn = gui.get_connection()
+    try:
+        def bulk_insert(_i):
+            batch = _rows(rows)
+            with conn.cursor() as cur:
+                cur.executemany(
+                    "INSERT INTO ratings (userId, movieId, rating, timestamp) VALUES (%s, %s, %s, %s)", batch)
+            conn.commit()
+
+        upserts = max(1, rows // 10)
+
+        def rating_upsert(_i):
+            for user_id, movie_id, rating, ts in _rows(upserts):
+                with conn.cursor() as cur:
+                    cur.execute("DELETE FROM ratings WHERE userId = %s AND movieId = %s AND timestamp >= %s",
+                                (user_id, movie_id, start_ts))
+                    cur.execute("INSERT INTO ratings (userId, movieId, rating, timestamp) VALUES (%s, %s, %s, %s)",
+                                (user_id, movie_id, rating, ts))
+                conn.commit()
+
+        results = {}
+        for name, fn, ops in (("bulk_insert", bulk_insert, rows), ("rating_upsert", rating_upsert, upserts)):
+            stats, _, errors = gui.measure_callable(fn, runs, warmup, ops_per_iteration=ops)
+            stats["rows_per_run"] = ops
+            results[name] = stats
+            if errors:
+                print(f"  ⚠️  {name}: {errors} failed runs")
+    finally:
+        try:
+            with conn.cursor() as cur:
+                cur.execute("DELETE FROM ratings WHERE timestamp >= %s", (start_ts,))
+            conn.commit()
+        finally:
+            conn.close()
+    return results
+
+
+def format_write_bench(label, results):
+    lines = [f"{label}:"]
+    for name, s in results.items():
+        lines.append(f"  {name:14s} {s['throughput_ops']:>10.1f} rows/s   p50 {s['p50_ms']:.1f} ms   "
+                     f"p95 {s['p95_ms']:.1f} ms   ({s['rows_per_run']} rows/run)")
+    return "\n".join(lines)
+
+
+def apply_migration(statements):
+    conn = gui.get_connection()
+    try:
+        with conn.cursor() as cur:
+            for comment, sql in statements:
+                print(f"  ▶ {sql}")
+                cur.execute(sql)
+        conn.commit()
+    finally:
+        conn.close()
+
+# ============================================================
+# Main Execution
+# ============================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recommend, prune and benchmark movies_db indexes")
+    parser.add_argument("--no-workload", action="store_true",
+                        help="do not run the benchmark workload; use the slow-query log only")
+    parser.add_argument("-n", "--iterations", type=int, default=10,
+                        help="iterations per workload scenario (default: 10)")
+    parser.add_argument("--drop-unused", action="store_true",
+                        help="also drop indexes with no reads since server start")
+    parser.add_argument("-o", "--output",
+                        help="migration path (default: benchmarks/index_migration_<time>.sql)")
+    parser.add_argument("--apply", action="store_true",
+                        help="run the write benchmark, apply the migration, run it again")
+    parser.add_argument("--bench-writes", type=int, metavar="ROWS",
+                        help="only run the write benchmark with ROWS rows per bulk run")
+    parser.add_argument("--bench-rows", type=int, default=1000, help="rows per bulk write run (default: 1000)")
+    parser.add_argument("--bench-runs", type=int, default=5, help="timed write runs (default: 5)")
+    args = parser.parse_args(argv)
+
+    print("\n" + "=" * 80)
+    print("🎬 INF2003 MOVIE DATABASE - INDEX ADVISOR")
+    print("=" * 80)
+
+    if args.bench_writes:
+        print(format_write_bench("Write throughput", bench_writes(args.bench_writes, args.bench_runs)))
+        return 0
+
+    if not args.no_workload:
+        run_workload(args.iterations)
+
+    conn = gui.get_connection()
+    try:
+        with conn.cursor() as cur:
+            indexes = load_indexes(cur)
+            columns = load_columns(cur)
+            usage, usage_source, uptime = load_index_usage(cur)
+        hot = collect_hot_queries()
+        recommendations = recommend_indexes(conn, hot, indexes, columns)
+    finally:
+        conn.close()
+
+    redundant = find_redundant_indexes(indexes, usage)
+    unused = find_unused_indexes(indexes, usage, {(d["table"], d["index"]) for d in redundant})
+
+    print(f"\n📚 {sum(len(v) for v in indexes.values())} indexes on {len(indexes)} tables")
+    if usage is None:
+        print("   Index usage: not available (enable performance_schema=ON or userstat=1)")
+    else:
+        print(f"   Index usage: {usage_source}, {uptime / 3600:.1f} h since server start")
+
+    print("\n🔁 Duplicate / redundant indexes:")
+    for d in redundant or [None]:
+        print(f"   {d['table']}.{d['index']} ({', '.join(d['columns'])}) - {d['kind']} of {d['of']}"
+              if d else "   none")
+    print("\n💤 Unused indexes:")
+    for d in unused or [None]:
+        print(f"   {d['table']}.{d['index']} ({', '.join(d['columns'])})" if d else "   none")
+
+    print(f"\n🔥 Hot queries ({len(hot)} recorded, top {min(len(hot), HOT_QUERY_LIMIT)} explained):")
+    for q in hot[:HOT_QUERY_LIMIT]:
+        print(f"   {q['name'][:40]:40s} {q['calls']:>6} calls {q['total_ms']:>10.1f} ms")
+    print("\n🧭 Recommended indexes:")
+    for r in recommendations or [None]:
+        print(f"   {r['table']}({', '.join(r['columns'])}){' [covering]' if r['covering'] else ''} "
+              f"<- {', '.join(r['queries'])}" if r else "   none")
+
+    drops = redundant + (unused if args.drop_unused else [])
+    statements = build_migration(drops, recommendations)
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    path = write_migration(statements, args.output or os.path.join(gui.BENCHMARK_RESULTS_DIR,
+                                                                   f"index_migration_{stamp}.sql"))
+    print(f"\n💾 Migration written to {path} ({len(statements)} statements)")
+
+    if not args.apply:
+        return 0
+    if not statements:
+        print("Nothing to apply.")
+        return 0
+
+    print("\n⏱️  Write benchmark BEFORE...")
+    before = bench_writes(args.bench_rows, args.bench_runs)
+    print(format_write_bench("Before", before))
+    print("\n🛠️  Applying migration...")
+    apply_migration(statements)
+    print("\n⏱️  Write benchmark AFTER...")
+    after = bench_writes(args.bench_rows, args.bench_runs)
+    print(format_write_bench("After", after))
+
+    print("\nChange in write throughput:")
+    for name in before:
+        b, a = before[name]["throughput_ops"], after[name]["throughput_ops"]
+        change = (a - b) / b * 100 if b else 0.0
+        print(f"  {name:14s} {b:>10.1f} -> {a:>10.1f} rows/s ({change:+.1f}%)")
+
+    report_path = os.path.join(gui.BENCHMARK_RESULTS_DIR, f"index_advisor_{stamp}.json")
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump({"migration": path, "statements": [sql for _, sql in statements],
+                   "before": before, "after": after,
+                   "environment": gui.collect_benchmark_environment()}, f, indent=2, default=str)
+    print(f"\n💾 Report saved to {report_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
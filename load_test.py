@@ -0,0 +1,446 @@
+"""
+INF2003 Movie Database - Multi-user Load Generator
+Spawns N headless virtual users (threads) that run a weighted mix of the same
+data-layer calls the GUI makes: title searches, details views, genre searches,
+rating upserts through the RATING_LOCKS protocol and watchlist edits.
+Each concurrency level reports throughput, latency percentiles, lock
+contention and deadlock/retry counts.
+
+The virtual users are dedicated load-test accounts working on hidden
+placeholder movies, both created for the run and deleted afterwards (with
+their ratings, watchlist rows and locks), so no real user's data is touched.
+
+Examples:
+    python load_test.py --users 1,2,5,10 --duration 30
+    python load_test.py --users 20 --hot-movies 5 --mix rate=70,details=30
+    USE_LOCAL_MONGO=true python load_test.py --seed-local-mongo 5000
+"""
+
+import argparse
+import contextlib
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+
+import gui
+
+# ============================================================
+# Configuration
+# ============================================================
+
+DEFAULT_MIX = "search=30,details=30,genre=10,rate=20,watchlist=10"
+SEARCH_KEYWORDS = ["love", "star", "man", "night", "war", "day", "life", "king"]
+GENRES = ["Action", "Comedy", "Drama", "Horror", "Thriller", "Romance", "Science Fiction"]
+
+def parse_mix(text):
+    """'search=30,rate=20' -> [('search', 30.0), ('rate', 20.0)]"""
+    mix = []
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"unknown operation '{name}' (choose from {', '.join(OPERATIONS)})")
+        mix.append((name, float(weight or 1)))
+    return mix
+
+# ============================================================
+# Working Set (load-test fixtures)
+# ============================================================
+
+# Like the rating_upsert benchmark fixture in gui.py: accounts without a
+# password hash (they cannot log in) and hidden placeholder movies
+LOADTEST_USERNAME = "__loadtest_{}__"
+LOADTEST_MOVIE_TITLE = "__loadtest__ {}"
+
+
+class WorkingSet:
+    """Load-test users and movies the virtual users work on; remove() deletes them again."""
+
+    def __init__(self, users, movies):
+        self.users = users        # [(userId, username)]
+        self.movies = movies      # [movieId]
+
+    def remove(self):
+        """Delete the fixtures; ratings, watchlist rows and locks go with them."""
+        conn = gui.get_connection()
+        try:
+            conn.begin()
+            with conn.cursor() as cur:
+                for movie_id in self.movies:
+                    gui._delete_movie_rows(cur, movie_id)
+                if self.users:
+                    cur.execute(
+                        f"DELETE FROM users WHERE userId IN ({','.join(['%s'] * len(self.users))})",
+                        [u for u, _ in self.users]
+                    )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        gui.clear_entity_caches()
+
+
+def create_working_set(num_users, hot_movies):
+    """
+    Create (or reuse, after an interrupted run) the load-test users and a small
+    'hot' set of placeholder movies.
+    Fewer hot movies means more virtual users competing for the same locks.
+    """
+    users, movies = [], []
+    conn = gui.get_connection()
+    try:
+        with conn.cursor() as cur:
+            for i in range(num_users):
+                username = LOADTEST_USERNAME.format(i)
+                cur.execute("SELECT userId FROM users WHERE username = %s", (username,))
+                row = cur.fetchone()
+                if row:
+                    user_id = row["userId"]
+                else:
+                    user_id = gui.user_ids.next_id()
+                    cur.execute("INSERT INTO users (userId, username, email, role) VALUES (%s, %s, NULL, 'user')",
+                                (user_id, username))
+                users.append((user_id, username))
+            for i in range(hot_movies):
+                title = LOADTEST_MOVIE_TITLE.format(i)
+                cur.execute("SELECT movieId FROM movies WHERE title = %s AND is_placeholder = 1 LIMIT 1", (title,))
+                row = cur.fetchone()
+                if row:
+                    movie_id = row["movieId"]
+                else:
+                    movie_id = gui.movie_ids.next_id()
+                    cur.execute("INSERT INTO movies (movieId, title, is_placeholder) VALUES (%s, %s, 1)",
+                                (movie_id, title))
+                movies.append(movie_id)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    return WorkingSet(users, movies)
+
+
+def seed_local_mongo(limit):
+    """
+    Fill an EMPTY local MongoDB stand-in with synthetic TMDB documents for
+    movies in LINKS, so genre searches have something to hit. Never runs
+    against Atlas.
+    """
+    if not gui.USE_LOCAL_MONGO:
+        print("⚠️  --seed-local-mongo needs USE_LOCAL_MONGO=true; not touching the cloud collection")
+        return 0
+    if gui.tmdb_collection is None:
+        print("⚠️  Local MongoDB not reachable - nothing seeded")
+        return 0
+    if gui.tmdb_collection.estimated_document_count() > 0:
+        print("✅ Local MongoDB already has documents - not seeding")
+        return 0
+
+    conn = gui.get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                """SELECT l.tmdbId, m.title FROM links l
+                   INNER JOIN movies m ON m.movieId = l.movieId
+                   WHERE l.tmdbId IS NOT NULL LIMIT %s""",
+                (limit,)
+            )
+            rows = cur.fetchall()
+    finally:
+        conn.close()
+
+    rng = random.Random(2003)
+    docs = [{
+        "id": r["tmdbId"],
+        "title": r["title"],
+        "genres": ", ".join(rng.sample(GENRES, rng.randint(1, 3))),
+        "keywords": ", ".join(rng.sample(SEARCH_KEYWORDS, 2)),
+        "overview": "",
+        "vote_average": round(rng.uniform(1.0, 9.5), 1),
+        "popularity": round(rng.uniform(0.5, 100.0), 2),
+        "runtime": rng.randint(70, 180),
+    } for r in rows]
+    if docs:
+        gui.tmdb_collection.insert_many(docs)
+        gui.tmdb_collection.create_index("id")
+    print(f"✅ Seeded {len(docs)} documents into local MongoDB")
+    return len(docs)
+
+# ============================================================
+# Virtual Users
+# ============================================================
+
+class LoadMetrics:
+    """Latency samples and counters shared by all virtual users of one level."""
+
+    def __init__(self):
+        self.samples = defaultdict(list)   # op -> [ns]
+        self.lock_wait = []                # ns spent waiting for a free movie lock
+        self.counters = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, op, elapsed_ns, ok=True):
+        with self._lock:
+            if ok:
+                self.samples[op].append(elapsed_ns)
+            else:
+                self.counters[f"{op}_errors"] += 1
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    def wait(self, elapsed_ns):
+        with self._lock:
+            self.lock_wait.append(elapsed_ns)
+
+
+class VirtualUser(threading.Thread):
+    """One simulated GUI session, acting as one of the load-test accounts."""
+
+    def __init__(self, user, ws, mix, stop_at, metrics, options, seed):
+        super().__init__(daemon=True)
+        self.user_id, self.username = user
+        # Passed to add_or_update_rating instead of touching gui.CURRENT_USER
+        self.identity = {"userId": self.user_id, "username": self.username, "email": None, "role": "user"}
+        self.ws = ws
+        self.ops = [name for name, _ in mix]
+        self.weights = [weight for _, weight in mix]
+        self.stop_at = stop_at
+        self.metrics = metrics
+        self.options = options
+        self.rng = random.Random(seed)
+
+    def run(self):
+        think = self.options["think_ms"] / 1000
+        while time.monotonic() < self.stop_at:
+            op = self.rng.choices(self.ops, self.weights)[0]
+            t0 = time.perf_counter_ns()
+            try:
+                ok = OPERATIONS[op](self)
+            except Exception as e:
+                gui.logger.warning(f"[LOADGEN] {self.username} {op} failed: {e}")
+                ok = False
+            self.metrics.record(op, time.perf_counter_ns() - t0, ok)
+            if think:
+                time.sleep(self.rng.uniform(0, 2 * think))
+
+    def _movie(self):
+        return self.rng.choice(self.ws.movies)
+
+    def op_search(self):
+        gui.search_movies_by_title(self.rng.choice(SEARCH_KEYWORDS))
+        return True
+
+    def op_details(self):
+        movie_id = self._movie()
+        if self.options["cold_cache"]:
+            gui.movie_details_cache.invalidate(gui._entity_key(movie_id))
+        return gui.get_movie_details(movie_id) is not None
+
+    def op_genre(self):
+        gui.search_movies_by_genre_mongo(self.rng.choice(GENRES))
+        return True
+
+    def op_rate(self):
+        """Rating upsert following the GUI's lock protocol: check -> acquire -> write -> release."""
+        movie_id = self._movie()
+        wait_start = time.perf_counter_ns()
+        for attempt in range(self.options["lock_retries"] + 1):
+            holder = gui.check_movie_lock(movie_id, self.username)
+            if holder is None:
+                break
+            self.metrics.count("lock_blocked")
+            time.sleep(self.options["lock_backoff_ms"] / 1000 * (attempt + 1))
+        else:
+            self.metrics.count("lock_gave_up")
+            return True
+        self.metrics.wait(time.perf_counter_ns() - wait_start)
+
+        if not gui.acquire_rating_lock(self.user_id, movie_id, self.username):
+            return False
+        try:
+            # check_movie_lock + acquire is not atomic; count how often two
+            # sessions both believe they hold the same movie
+            if gui.check_movie_lock(movie_id, self.username) is not None:
+                self.metrics.count("lock_races")
+            ok = gui.add_or_update_rating(self.user_id, movie_id, self.rng.choice(RATING_VALUES),
+                                          acting_user=self.identity)
+            if not ok:
+                self.metrics.count("rating_rollbacks")
+            return ok
+        finally:
+            gui.release_rating_lock(self.user_id, movie_id)
+
+    def op_watchlist(self):
+        movie_id = self._movie()
+        if gui.is_in_watchlist(self.user_id, movie_id):
+            return gui.remove_from_watchlist(self.user_id, movie_id)
+        return gui.add_to_watchlist(self.user_id, movie_id, notes="load test", priority="low")
+
+
+RATING_VALUES = [x / 2 for x in range(1, 11)]
+
+OPERATIONS = {
+    "search": VirtualUser.op_search,
+    "details": VirtualUser.op_details,
+    "genre": VirtualUser.op_genre,
+    "rate": VirtualUser.op_rate,
+    "watchlist": VirtualUser.op_watchlist,
+}
+
+# ============================================================
+# Load Levels
+# ============================================================
+
+def run_level(num_users, ws, mix, duration, options):
+    """Run `num_users` virtual users for `duration` seconds and summarise."""
+    metrics = LoadMetrics()
+    tx_before = gui.get_tx_retry_stats()
+    stop_at = time.monotonic() + duration
+    users = [
+        VirtualUser(ws.users[i], ws, mix, stop_at, metrics, options, seed=i)
+        for i in range(num_users)
+    ]
+    started = time.perf_counter()
+    with open(os.devnull, "w") as devnull, \
+            (contextlib.redirect_stdout(devnull) if not options["verbose"] else contextlib.nullcontext()):
+        for u in users:
+            u.start()
+        for u in users:
+            u.join()
+    elapsed = time.perf_counter() - started
+
+    tx_after = gui.get_tx_retry_stats()
+    all_samples = [s for samples in metrics.samples.values() for s in samples]
+    errors = sum(v for k, v in metrics.counters.items() if k.endswith("_errors"))
+    overall = gui.summarize_samples(all_samples)
+    return {
+        "users": num_users,
+        "duration_s": elapsed,
+        "operations": len(all_samples),
+        "errors": errors,
+        "throughput_ops": len(all_samples) / elapsed if elapsed > 0 else 0.0,
+        "latency": overall,
+        "by_operation": {op: gui.summarize_samples(s) for op, s in sorted(metrics.samples.items())},
+        "lock_wait": gui.summarize_samples(metrics.lock_wait),
+        "counters": dict(metrics.counters),
+        "transactions": {k: tx_after[k] - tx_before[k] for k in tx_after},
+    }
+
+
+def format_level_table(levels):
+    lines = [
+        f"{'users':>5} {'ops/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'err':>5} "
+        f"{'blocked':>8} {'races':>6} {'deadlk':>7} {'lockwt':>7} {'retries':>8}",
+        "-" * 88,
+    ]
+    for lv in levels:
+        c, tx, lat = lv["counters"], lv["transactions"], lv["latency"]
+        lines.append(
+            f"{lv['users']:>5} {lv['throughput_ops']:>9.1f} {lat['p50_ms']:>8.2f} {lat['p95_ms']:>8.2f} "
+            f"{lat['p99_ms']:>8.2f} {lv['errors']:>5} {c.get('lock_blocked', 0):>8} {c.get('lock_races', 0):>6} "
+            f"{tx['deadlocks']:>7} {tx['lock_wait_timeouts']:>7} {tx['retries']:>8}"
+        )
+    return "\n".join(lines)
+
+# ============================================================
+# Main Execution
+# ============================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Multi-user load generator for the movie database")
+    parser.add_argument("--users", default="1,2,5,10",
+                        help="comma-separated concurrency levels (default: 1,2,5,10)")
+    parser.add_argument("--duration", type=float, default=20,
+                        help="seconds per concurrency level (default: 20)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"operation weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--hot-movies", type=int, default=20,
+                        help="size of the movie set users work on; smaller = more lock contention")
+    parser.add_argument("--think-ms", type=float, default=0, help="mean think time between operations")
+    parser.add_argument("--lock-retries", type=int, default=3, help="re-checks of a busy movie lock")
+    parser.add_argument("--lock-backoff-ms", type=float, default=50, help="backoff step between lock re-checks")
+    parser.add_argument("--cold-cache", action="store_true", help="bypass the movie details cache")
+    parser.add_argument("--seed-local-mongo", type=int, metavar="N", default=0,
+                        help="seed an empty local MongoDB (USE_LOCAL_MONGO=true) with N synthetic documents")
+    parser.add_argument("-o", "--output", help="JSON output path (default: benchmarks/load_<time>.json)")
+    parser.add_argument("--verbose", action="store_true", help="keep per-call console output and INFO logs")
+    args = parser.parse_args(argv)
+
+    try:
+        levels = sorted({int(x) for x in args.users.split(",") if x.strip()})
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+    if not levels or levels[0] <= 0:
+        parser.error("--users needs positive integers")
+    if args.hot_movies <= 0:
+        parser.error("--hot-movies needs a positive integer")
+
+    if not args.verbose:
+        # gui's own logger plus the movieapp.* subsystem loggers (sql, locks, ...)
+        gui.logger.setLevel(logging.WARNING)
+        logging.getLogger("movieapp").setLevel(logging.WARNING)
+
+    print("\n" + "=" * 88)
+    print("🎬 INF2003 MOVIE DATABASE - MULTI-USER LOAD TEST")
+    print("=" * 88)
+
+    if args.seed_local_mongo:
+        seed_local_mongo(args.seed_local_mongo)
+    if gui.tmdb_collection is None and any(op == "genre" for op, _ in mix):
+        print("⚠️  MongoDB not connected - dropping 'genre' from the mix")
+        mix = [(op, w) for op, w in mix if op != "genre"]
+
+    ws = create_working_set(levels[-1], args.hot_movies)
+    print(f"✅ Working set: {len(ws.users)} load-test users x {len(ws.movies)} placeholder movies")
+    print(f"   Mix: {', '.join(f'{op}={w:g}' for op, w in mix)} | {args.duration:g}s per level\n")
+
+    options = {
+        "think_ms": args.think_ms,
+        "lock_retries": args.lock_retries,
+        "lock_backoff_ms": args.lock_backoff_ms,
+        "cold_cache": args.cold_cache,
+        "verbose": args.verbose,
+    }
+
+    results = {
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "mix": dict(mix),
+        "duration_per_level_s": args.duration,
+        "hot_movies": len(ws.movies),
+        "options": options,
+        "mongo": "local" if gui.USE_LOCAL_MONGO else ("atlas" if gui.tmdb_collection is not None else "none"),
+        "levels": [],
+    }
+    try:
+        for n in levels:
+            print(f"▶ {n} virtual user(s)...", flush=True)
+            level = run_level(n, ws, mix, args.duration, options)
+            results["levels"].append(level)
+            print(f"  {level['operations']} ops, {level['throughput_ops']:.1f} ops/s, "
+                  f"p95 {level['latency']['p95_ms']:.2f} ms, {level['errors']} errors")
+    except KeyboardInterrupt:
+        print("\n⚠️  Interrupted - removing load-test data")
+    finally:
+        ws.remove()
+        print("✅ Load-test users and movies removed")
+
+    if results["levels"]:
+        print("\n" + format_level_table(results["levels"]))
+        path = args.output or os.path.join(
+            gui.BENCHMARK_RESULTS_DIR, f"load_{time.strftime('%Y%m%d_%H%M%S')}.json"
+        )
+        print(f"\n💾 Results saved to {gui.save_benchmark_results(results, path)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
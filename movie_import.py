@@ -0,0 +1,79 @@
+"""
+INF2003 Movie Database - Bulk Movie Import
+Loads a catalog drop (CSV or JSON Lines) into both stores: MOVIES and LINKS
+in MariaDB with multi-row upserts, and tmdb_movies in MongoDB with unordered
+bulk_write batches running in parallel. Same code as the admin tab's
+"Import Movies" button (gui.bulk_import_movies).
+
+Columns / keys: title and optionally movieId, release_date (YYYY-MM-DD),
+imdbId, tmdbId, overview, genres, keywords, vote_average, vote_count,
+revenue, runtime, original_language, tagline, popularity. A row with a known
+movieId (or a tmdbId already in LINKS) updates that movie; any other row adds
+a new one. Every row gets a result line in the report.
+
+Examples:
+    python movie_import.py catalog.csv --dry-run      # validate + classify only
+    python movie_import.py catalog.jsonl
+    python movie_import.py catalog.csv --chunk 2000 --report reports/catalog.csv
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+import gui
+
+# ============================================================
+# Main Execution
+# ============================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk insert/update movies in MariaDB and MongoDB")
+    parser.add_argument("path", help="CSV or JSON Lines (.jsonl / .ndjson) file")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="validate and report what would be inserted/updated; write nothing")
+    parser.add_argument("--chunk", type=int, default=gui.BULK_MOVIE_CHUNK,
+                        help=f"rows per MariaDB transaction and MongoDB batch (default: {gui.BULK_MOVIE_CHUNK})")
+    parser.add_argument("--report", help="per-row results CSV (default: rejects/movie_import_<time>.csv)")
+    args = parser.parse_args(argv)
+    if args.chunk <= 0:
+        parser.error("--chunk must be positive")
+
+    try:
+        rows = gui.read_movie_file(args.path)
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not read {args.path}: {e}")
+        return 1
+
+    print("\n" + "=" * 80)
+    print(f"🎬 INF2003 MOVIE DATABASE - BULK MOVIE IMPORT{' (DRY RUN)' if args.dry_run else ''}")
+    print("=" * 80)
+    print(f"📄 {len(rows)} rows in {args.path}")
+
+    def _progress(done, total):
+        print(f"  ... {done}/{total} rows written to MariaDB", flush=True)
+
+    # The import runs with the database credentials of this machine; act as an admin
+    gui.CURRENT_USER.update({"userId": None, "username": "MOVIE_IMPORT", "email": None, "role": "admin"})
+    started = time.perf_counter()
+    report = gui.bulk_import_movies(rows, dry_run=args.dry_run, chunk_size=args.chunk, progress=_progress)
+    elapsed = time.perf_counter() - started
+
+    for r in [r for r in report["results"] if r["status"] == "error"][:20]:
+        print(f"  ⚠️  line {r['line']}: {r['title'] or '(no title)'} - {r['reason']}")
+    verb = "would be" if args.dry_run else "were"
+    print(f"\n✅ {report['inserted']} movies {verb} added, {report['updated']} {verb} updated, "
+          f"{report['errors']} rows rejected ({elapsed:.2f} s)")
+    if report["mongo_queued"]:
+        print(f"⏳ {report['mongo_queued']} MongoDB writes queued in MOVIE_OUTBOX; the app's relay applies them")
+
+    path = args.report or os.path.join("rejects", f"movie_import_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+    gui.write_movie_import_report(report["results"], path)
+    print(f"💾 Per-row results saved to {path}")
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,759 @@
+"""
+INF2003 Movie Database - Online User ID Renumbering
+Closes the gaps in USERS.userId (1, 2, 3, ... N in userId order) while the
+app keeps serving reads and writes. Replaces 7_renumber_user_ids.sql, which
+turned foreign key checks off and rewrote USERS, RATINGS and RATING_LOCKS
+with single big UPDATE ... JOINs, locking those tables for the whole run.
+
+This is a one-off operator step, run by hand when the gaps matter; it is not
+part of start.sh or the setup scripts. Only one run can be active: every run
+that changes anything holds GET_LOCK('renumber_users') for its whole length.
+
+How it works (the shadow-table approach of pt-online-schema-change):
+  1. mapping   USER_ID_MAP (old_userId -> new_userId) is built once and kept
+  2. shadows   USERS and every table that refers to it (RATINGS, WATCHLIST,
+               RATING_LOCKS, USER_SESSIONS) get an empty copy <table>__renum
+               with the same indexes and foreign keys (pointing at the shadow
+               USERS)
+  3. triggers  trg_renum_* on the live tables mirror every insert / update /
+               delete into the shadow with userId translated, so writes made
+               during the copy are kept; a user who registers meanwhile gets
+               the next new id from USER_ID_MAP's AUTO_INCREMENT
+  4. copy      rows are copied in primary key order, --batch rows per
+               transaction with --sleep-ms between batches; each batch reads
+               with LOCK IN SHARE MODE under READ COMMITTED, so only the rows
+               of that batch are locked, and only briefly. The last key of
+               every table is saved in USER_RENUMBER_PROGRESS with the batch,
+               so running the tool again resumes where it stopped (the
+               triggers keep mirroring in between)
+  5. swap      row counts are compared in one snapshot, then a single
+               RENAME TABLE swaps every live table with its shadow; the old
+               tables stay as <table>__old. Triggers move with a renamed
+               table, so copies of the app's own triggers
+               (trg_ratings_check_insert, trg_ratings_stats_*, ...) wait on
+               the shadows beforehand, inactive until the swap; afterwards
+               they take back the original names under a brief LOCK TABLES.
+               ID_SEQUENCES 'users' never moves back (running processes may
+               hold id blocks above the new MAX(userId))
+
+The same RENAME swaps in USER_ID_GENERATION (20_user_id_generation.sql) with
+the generation bumped. Running GUIs re-check it before every user-scoped
+write and while idle, and send their user back to the login dialog, so no
+window keeps writing under a pre-swap userId.
+
+Examples:
+    python renumber_users.py --dry-run          # show the mapping, change nothing
+    python renumber_users.py                    # copy + swap (asks first)
+    python renumber_users.py --yes --batch 500 --sleep-ms 50
+    python renumber_users.py --no-swap          # copy only; the next run swaps
+    python renumber_users.py --status
+    python renumber_users.py --abort            # drop shadows, triggers and progress
+    python renumber_users.py --cleanup          # after a swap: drop the __old tables and the map
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+
+import pymysql
+
+import gui
+
+# ============================================================
+# Configuration
+# ============================================================
+
+DEFAULT_BATCH = 1000
+DEFAULT_SLEEP_MS = 20
+SWAP_LOCK_WAIT_SECONDS = 5   # RENAME TABLE waits at most this long for running queries ...
+SWAP_ATTEMPTS = 10           # ... and is retried this many times
+
+MAP_TABLE = "user_id_map"
+PROGRESS_TABLE = "user_renumber_progress"
+GENERATION_TABLE = "user_id_generation"
+RUN_LOCK = "renumber_users"
+SHADOW_SUFFIX = "__renum"
+OLD_SUFFIX = "__old"
+TRIGGER_PREFIX = "trg_renum_"
+STANDBY_SUFFIX = "__swap"   # app trigger copies created on the shadows before the swap
+SAMPLE_IDS = 8
+
+
+def _q(name):
+    return f"`{name}`"
+
+
+def _run(sql, params=None, fetch=False):
+    """One statement on its own connection (DDL commits implicitly anyway)."""
+    conn = gui.get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(sql, params)
+            rows = cur.fetchall() if fetch else None
+        conn.commit()
+        return rows
+    finally:
+        conn.close()
+
+
+def acquire_run_lock():
+    """Connection holding GET_LOCK(RUN_LOCK) until it is closed; None if another run has it."""
+    conn = gui.get_connection()
+    with conn.cursor() as cur:
+        cur.execute("SELECT GET_LOCK(%s, 0) AS got", (RUN_LOCK,))
+        got = cur.fetchone()["got"]
+    if got != 1:
+        conn.close()
+        return None
+    return conn
+
+
+def _table_exists(name):
+    rows = _run(
+        """
+        SELECT 1 FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        """,
+        (name,), fetch=True
+    )
+    return bool(rows)
+
+# ============================================================
+# Schema Discovery
+# ============================================================
+
+class TableInfo:
+    """Columns, primary key and foreign keys of one table that holds a userId."""
+
+    def __init__(self, name, columns, pk, foreign_keys):
+        self.name = name
+        self.columns = columns
+        self.pk = pk
+        self.foreign_keys = foreign_keys  # [(columns, ref_table, ref_columns, delete_rule, update_rule)]
+
+    @property
+    def shadow(self):
+        return self.name + SHADOW_SUFFIX
+
+    @property
+    def old(self):
+        return self.name + OLD_SUFFIX
+
+
+def discover_tables():
+    """USERS first, then every table with a foreign key to USERS plus RATINGS (trigger-enforced)."""
+    rows = _run(
+        """
+        SELECT DISTINCT TABLE_NAME FROM information_schema.KEY_COLUMN_USAGE
+        WHERE TABLE_SCHEMA = DATABASE()
+          AND REFERENCED_TABLE_NAME = 'users'
+          AND REFERENCED_COLUMN_NAME = 'userId'
+        """,
+        fetch=True
+    )
+    children = {r["TABLE_NAME"].lower() for r in rows}
+    children.add("ratings")
+    names = ["users"] + sorted(n for n in children
+                               if n != "users" and not n.endswith((SHADOW_SUFFIX, OLD_SUFFIX)))
+    return [describe_table(n) for n in names if _table_exists(n)]
+
+
+def describe_table(name):
+    columns = [r["COLUMN_NAME"] for r in _run(
+        """
+        SELECT COLUMN_NAME FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        ORDER BY ORDINAL_POSITION
+        """,
+        (name,), fetch=True
+    )]
+    pk = [r["COLUMN_NAME"] for r in _run(
+        """
+        SELECT COLUMN_NAME FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = 'PRIMARY'
+        ORDER BY SEQ_IN_INDEX
+        """,
+        (name,), fetch=True
+    )]
+    if not pk:
+        raise RuntimeError(f"{name} has no primary key; it cannot be copied in keyset order")
+    if "userId" not in columns:
+        raise RuntimeError(f"{name} has no userId column")
+
+    fks = {}
+    for r in _run(
+        """
+        SELECT k.CONSTRAINT_NAME, k.COLUMN_NAME, k.REFERENCED_TABLE_NAME, k.REFERENCED_COLUMN_NAME,
+               rc.DELETE_RULE, rc.UPDATE_RULE
+        FROM information_schema.KEY_COLUMN_USAGE k
+        INNER JOIN information_schema.REFERENTIAL_CONSTRAINTS rc
+            ON rc.CONSTRAINT_SCHEMA = k.CONSTRAINT_SCHEMA
+           AND rc.CONSTRAINT_NAME = k.CONSTRAINT_NAME
+           AND rc.TABLE_NAME = k.TABLE_NAME
+        WHERE k.TABLE_SCHEMA = DATABASE() AND k.TABLE_NAME = %s
+          AND k.REFERENCED_TABLE_NAME IS NOT NULL
+        ORDER BY k.CONSTRAINT_NAME, k.ORDINAL_POSITION
+        """,
+        (name,), fetch=True
+    ):
+        fk = fks.setdefault(r["CONSTRAINT_NAME"], ([], r["REFERENCED_TABLE_NAME"].lower(), [],
+                                                   r["DELETE_RULE"], r["UPDATE_RULE"]))
+        fk[0].append(r["COLUMN_NAME"])
+        fk[2].append(r["REFERENCED_COLUMN_NAME"])
+    return TableInfo(name, columns, pk, list(fks.values()))
+
+# ============================================================
+# Mapping
+# ============================================================
+
+def plan_mapping():
+    """(total users, users whose id changes, sample [(old, new)]) without writing anything."""
+    ids = [r["userId"] for r in _run("SELECT userId FROM users ORDER BY userId", fetch=True)]
+    moved = [(old, new) for new, old in enumerate(ids, start=1) if old != new]
+    return len(ids), len(moved), moved[:SAMPLE_IDS]
+
+
+def fill_mapping():
+    """
+    Map every user not mapped yet, in userId order. An empty map is numbered
+    1..N; users added later (before the mirror trigger existed) take the next
+    AUTO_INCREMENT id, like the ones the trigger registers.
+    """
+    conn = gui.get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"SELECT EXISTS (SELECT 1 FROM {MAP_TABLE}) AS filled")
+            if not cur.fetchone()["filled"]:
+                cur.execute(
+                    f"""
+                    INSERT INTO {MAP_TABLE} (old_userId, new_userId)
+                    SELECT userId, ROW_NUMBER() OVER (ORDER BY userId)
+                    FROM users
+                    """
+                )
+            else:
+                cur.execute(
+                    f"""
+                    INSERT INTO {MAP_TABLE} (old_userId)
+                    SELECT userId
+                    FROM users
+                    WHERE userId NOT IN (SELECT old_userId FROM {MAP_TABLE})
+                    ORDER BY userId
+                    ON DUPLICATE KEY UPDATE old_userId = VALUES(old_userId)
+                    """
+                )
+            added = cur.rowcount
+        conn.commit()
+        return added
+    finally:
+        conn.close()
+
+# ============================================================
+# Shadow Tables & Mirror Triggers
+# ============================================================
+
+def _mapped(ref):
+    """SQL for the new id of ref.userId (NULL stays NULL)."""
+    return f"COALESCE((SELECT new_userId FROM {MAP_TABLE} WHERE old_userId = {ref}.userId), {ref}.userId)"
+
+
+def _values(table, ref):
+    return ", ".join(_mapped(ref) if c == "userId" else f"{ref}.{_q(c)}" for c in table.columns)
+
+
+def _upsert(table, ref):
+    cols = ", ".join(_q(c) for c in table.columns)
+    rest = [c for c in table.columns if c not in table.pk] or table.pk
+    updates = ", ".join(f"{_q(c)} = VALUES({_q(c)})" for c in rest)
+    return (f"INSERT INTO {_q(table.shadow)} ({cols}) VALUES ({_values(table, ref)}) "
+            f"ON DUPLICATE KEY UPDATE {updates};")
+
+
+def _delete_old_key(table):
+    where = " AND ".join(
+        f"{_q(c)} <=> {_mapped('OLD') if c == 'userId' else f'OLD.{_q(c)}'}" for c in table.pk
+    )
+    return f"DELETE FROM {_q(table.shadow)} WHERE {where};"
+
+
+def trigger_sql(table):
+    """{trigger name: CREATE TRIGGER ...} mirroring the table into its shadow."""
+    name = f"{TRIGGER_PREFIX}{table.name}"
+    register = ""
+    if table.name == "users":
+        # New users get the next new id as they register. new_userId is AUTO_INCREMENT,
+        # so concurrent signups never read MAX() or collide on the same id.
+        register = f"""
+                INSERT INTO {MAP_TABLE} (old_userId) VALUES (NEW.userId)
+                ON DUPLICATE KEY UPDATE old_userId = old_userId;"""
+    key_changed = " OR ".join(f"NOT (OLD.{_q(c)} <=> NEW.{_q(c)})" for c in table.pk)
+    return {
+        f"{name}_ins": f"""
+            CREATE TRIGGER {name}_ins AFTER INSERT ON {_q(table.name)} FOR EACH ROW
+            BEGIN{register}
+                {_upsert(table, 'NEW')}
+            END""",
+        f"{name}_upd": f"""
+            CREATE TRIGGER {name}_upd AFTER UPDATE ON {_q(table.name)} FOR EACH ROW
+            BEGIN
+                IF {key_changed} THEN
+                    {_delete_old_key(table)}
+                END IF;
+                {_upsert(table, 'NEW')}
+            END""",
+        f"{name}_del": f"""
+            CREATE TRIGGER {name}_del AFTER DELETE ON {_q(table.name)} FOR EACH ROW
+            BEGIN
+                {_delete_old_key(table)}
+            END""",
+    }
+
+
+def prepare_table(table, in_set):
+    """Fresh shadow (indexes + foreign keys) and mirror triggers; recorded in the progress table."""
+    for trigger in trigger_sql(table):
+        _run(f"DROP TRIGGER IF EXISTS {trigger}")
+    _run(f"DROP TABLE IF EXISTS {_q(table.shadow)}")
+    _run(f"CREATE TABLE {_q(table.shadow)} LIKE {_q(table.name)}")  # keeps indexes and partitions, not FKs
+    for cols, ref, ref_cols, on_delete, on_update in table.foreign_keys:
+        ref = ref + SHADOW_SUFFIX if ref in in_set else ref
+        _run(
+            f"ALTER TABLE {_q(table.shadow)} ADD FOREIGN KEY ({', '.join(map(_q, cols))}) "
+            f"REFERENCES {_q(ref)} ({', '.join(map(_q, ref_cols))}) "
+            f"ON DELETE {on_delete} ON UPDATE {on_update}"
+        )
+    if table.name == "users":
+        fill_mapping()
+    for sql in trigger_sql(table).values():
+        _run(sql)
+    if table.name == "users":
+        fill_mapping()  # users inserted before the trigger existed
+    _run(f"INSERT INTO {PROGRESS_TABLE} (table_name) VALUES (%s)", (table.name,))
+
+# ============================================================
+# Batched Copy
+# ============================================================
+
+def _key_compare(cols, values, strict, last):
+    """Keyset predicate: (a, b) > (x, y) -> a > x OR (a = x AND b > y)."""
+    col = f"t.{_q(cols[0])}"
+    if len(cols) == 1:
+        return f"{col} {last} %s", [values[0]]
+    rest, params = _key_compare(cols[1:], values[1:], strict, last)
+    return f"({col} {strict} %s OR ({col} = %s AND {rest}))", [values[0], values[0]] + params
+
+
+def load_progress():
+    if not _table_exists(PROGRESS_TABLE):
+        return None
+    rows = _run(f"SELECT * FROM {PROGRESS_TABLE}", fetch=True)
+    return {r["table_name"]: r for r in rows}
+
+
+def copy_table(table, state, batch, sleep_ms):
+    """Copy the rows after the saved key, `batch` per transaction; each batch saves its last key."""
+    last_key = json.loads(state["last_key"]) if state and state["last_key"] else None
+    copied = state["rows_copied"] if state else 0
+    total = _run(f"SELECT COUNT(*) AS n FROM {_q(table.name)}", fetch=True)[0]["n"]
+    progress = Progress(table.name, total, copied)
+
+    pk_cols = ", ".join(f"t.{_q(c)}" for c in table.pk)
+    select = ", ".join("COALESCE(m.new_userId, t.userId)" if c == "userId" else f"t.{_q(c)}"
+                       for c in table.columns)
+    conn = gui.get_connection()
+    try:
+        with conn.cursor() as cur:
+            # Locking reads under READ COMMITTED take record locks only (no gap locks)
+            cur.execute("SET SESSION TRANSACTION ISOLATION LEVEL READ COMMITTED")
+            while True:
+                conds, params = [], []
+                if last_key:
+                    after, after_params = _key_compare(table.pk, last_key, ">", ">")
+                    conds.append(after)
+                    params += after_params
+                cur.execute(
+                    f"SELECT {pk_cols} FROM {_q(table.name)} t WHERE {' AND '.join(conds) or 'TRUE'} "
+                    f"ORDER BY {pk_cols} LIMIT 1 OFFSET %s",
+                    params + [batch - 1]
+                )
+                end = cur.fetchone()
+                if end:
+                    end_key = [end[c] for c in table.pk]
+                    upto, upto_params = _key_compare(table.pk, end_key, "<", "<=")
+                    conds.append(upto)
+                    params += upto_params
+                cur.execute(
+                    f"""
+                    INSERT IGNORE INTO {_q(table.shadow)} ({', '.join(map(_q, table.columns))})
+                    SELECT {select}
+                    FROM {_q(table.name)} t
+                    LEFT JOIN {MAP_TABLE} m ON m.old_userId = t.userId
+                    WHERE {' AND '.join(conds) or 'TRUE'}
+                    LOCK IN SHARE MODE
+                    """,
+                    params
+                )
+                if end is None:
+                    cur.execute(
+                        f"UPDATE {PROGRESS_TABLE} SET done = 1, rows_copied = GREATEST(rows_copied, %s) "
+                        f"WHERE table_name = %s",
+                        (total, table.name)
+                    )
+                    conn.commit()
+                    progress.advance(max(0, total - progress.done))
+                    return
+                last_key = end_key
+                copied += batch
+                cur.execute(
+                    f"UPDATE {PROGRESS_TABLE} SET last_key = %s, rows_copied = %s WHERE table_name = %s",
+                    (json.dumps(last_key, default=str), copied, table.name)
+                )
+                conn.commit()
+                progress.advance(batch)
+                if sleep_ms:
+                    time.sleep(sleep_ms / 1000.0)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+class Progress:
+    def __init__(self, label, total, done=0):
+        self.label = label
+        self.total = total
+        self.done = done
+        self.started = time.perf_counter()
+        self._start_done = done
+
+    def advance(self, n):
+        self.done += n
+        elapsed = time.perf_counter() - self.started
+        pct = f"{min(100.0, 100.0 * self.done / self.total):5.1f}%" if self.total else "100.0%"
+        rate = (self.done - self._start_done) / elapsed if elapsed > 0 else 0
+        print(f"  {self.label}: {min(self.done, self.total)}/{self.total} ({pct}) {rate:,.0f} rows/s", flush=True)
+
+# ============================================================
+# Swap
+# ============================================================
+
+def verify_counts(tables):
+    """{table: (live, shadow)} for tables whose counts differ, read in one snapshot."""
+    conn = gui.get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("START TRANSACTION WITH CONSISTENT SNAPSHOT")
+            diffs = {}
+            for t in tables:
+                cur.execute(f"SELECT COUNT(*) AS n FROM {_q(t.name)}")
+                live = cur.fetchone()["n"]
+                cur.execute(f"SELECT COUNT(*) AS n FROM {_q(t.shadow)}")
+                shadow = cur.fetchone()["n"]
+                if live != shadow:
+                    diffs[t.name] = (live, shadow)
+        conn.commit()
+        return diffs
+    finally:
+        conn.close()
+
+
+def app_triggers(tables):
+    """The app's own triggers on the swapped tables (they stay with the renamed old tables)."""
+    names = [t.name for t in tables]
+    return _run(
+        f"""
+        SELECT TRIGGER_NAME, EVENT_OBJECT_TABLE, ACTION_TIMING, EVENT_MANIPULATION, ACTION_STATEMENT
+        FROM information_schema.TRIGGERS
+        WHERE TRIGGER_SCHEMA = DATABASE()
+          AND EVENT_OBJECT_TABLE IN ({', '.join(['%s'] * len(names))})
+          AND TRIGGER_NAME NOT LIKE %s
+        ORDER BY EVENT_OBJECT_TABLE, EVENT_MANIPULATION, ACTION_TIMING, ACTION_ORDER
+        """,
+        names + [TRIGGER_PREFIX.replace("_", "\\_") + "%"], fetch=True
+    )
+
+
+def prepare_generation():
+    """Shadow USER_ID_GENERATION holding the next generation, swapped in with the tables. Returns it."""
+    shadow, old = GENERATION_TABLE + SHADOW_SUFFIX, GENERATION_TABLE + OLD_SUFFIX
+    _run(f"DROP TABLE IF EXISTS {_q(shadow)}, {_q(old)}")
+    _run(f"CREATE TABLE {_q(shadow)} LIKE {_q(GENERATION_TABLE)}")
+    _run(f"INSERT INTO {_q(shadow)} (id, generation) SELECT id, generation + 1 FROM {_q(GENERATION_TABLE)}")
+    return _run(f"SELECT generation FROM {_q(shadow)}", fetch=True)[0]["generation"]
+
+
+def _create_trigger(cur, name, t, table, body):
+    cur.execute(
+        f"CREATE TRIGGER {name} {t['ACTION_TIMING']} {t['EVENT_MANIPULATION']} "
+        f"ON {_q(table)} FOR EACH ROW {body}"
+    )
+
+
+def _retry_busy(cur, sql, what):
+    """Run DDL that needs the tables' metadata locks, retrying while the app's queries hold them."""
+    for attempt in range(1, SWAP_ATTEMPTS + 1):
+        try:
+            cur.execute(sql)
+            return
+        except pymysql.OperationalError as e:
+            if e.args[0] != 1205 or attempt == SWAP_ATTEMPTS:
+                raise
+            print(f"  ⏳ tables busy, retrying {what} ({attempt}/{SWAP_ATTEMPTS})")
+
+
+def swap(tables):
+    """
+    RENAME the shadows in. Triggers stay with their table, so the app's own
+    triggers (foreign key checks, cascades, MOVIE_RATING_STATS upkeep) would
+    leave with the old tables. Copies of them are put on the shadows first;
+    they do nothing until the swapped-in USER_ID_GENERATION carries the new
+    generation, so rows the mirror triggers copy over are not counted twice.
+    After the RENAME the copies give way to triggers with the original names
+    while the live tables are write-locked, so no write ever runs without them.
+    """
+    triggers = app_triggers(tables)
+    generation = prepare_generation()
+    names = [t.name for t in tables] + [GENERATION_TABLE]
+    renames = ", ".join(
+        [f"{_q(n)} TO {_q(n + OLD_SUFFIX)}" for n in names] +
+        [f"{_q(n + SHADOW_SUFFIX)} TO {_q(n)}" for n in names]
+    )
+    conn = gui.get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SET SESSION lock_wait_timeout = %s", (SWAP_LOCK_WAIT_SECONDS,))
+            for t in triggers:
+                standby = t["TRIGGER_NAME"] + STANDBY_SUFFIX
+                cur.execute(f"DROP TRIGGER IF EXISTS {standby}")
+                _create_trigger(
+                    cur, standby, t, t["EVENT_OBJECT_TABLE"] + SHADOW_SUFFIX,
+                    f"BEGIN IF (SELECT generation FROM {GENERATION_TABLE}) = {int(generation)} THEN "
+                    f"{t['ACTION_STATEMENT']}; END IF; END"
+                )
+
+            _retry_busy(cur, f"RENAME TABLE {renames}", "the swap")
+
+            # The old tables take no more writes: drop their mirror triggers and free the
+            # original trigger names
+            for table in tables:
+                for trigger in trigger_sql(table):
+                    cur.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            for t in triggers:
+                cur.execute(f"DROP TRIGGER IF EXISTS {t['TRIGGER_NAME']}")
+
+            # Original names back on the live tables; no write runs while both sets exist
+            _retry_busy(cur, "LOCK TABLES " + ", ".join(f"{_q(t.name)} WRITE" for t in tables), "the trigger move")
+            try:
+                for t in triggers:
+                    _create_trigger(cur, t["TRIGGER_NAME"], t, t["EVENT_OBJECT_TABLE"], t["ACTION_STATEMENT"])
+                    cur.execute(f"DROP TRIGGER IF EXISTS {t['TRIGGER_NAME'] + STANDBY_SUFFIX}")
+            finally:
+                cur.execute("UNLOCK TABLES")
+        conn.commit()
+    finally:
+        conn.close()
+
+    try:
+        # Running processes may still hold id blocks reserved above the new MAX(userId),
+        # so the sequence only ever moves forward (16_id_sequences.sql)
+        _run("UPDATE id_sequences SET next_id = GREATEST(next_id, (SELECT COALESCE(MAX(userId), 0) + 1 FROM users)) "
+             "WHERE name = 'users'")
+    except pymysql.ProgrammingError:
+        pass  # 16_id_sequences.sql not applied yet
+    _run(f"DROP TABLE IF EXISTS {PROGRESS_TABLE}")
+    gui.clear_entity_caches()
+    return len(triggers)
+
+# ============================================================
+# Status / Abort / Cleanup
+# ============================================================
+
+def show_status(progress):
+    if progress is None:
+        print("No renumbering in progress.")
+        return
+    mapped = _run(
+        f"SELECT COUNT(*) AS n, SUM(old_userId <> new_userId) AS moved FROM {MAP_TABLE}", fetch=True
+    )[0]
+    print(f"🔢 {mapped['n']} users mapped, {mapped['moved'] or 0} get a new id")
+    for name, row in progress.items():
+        state = "copied" if row["done"] else f"copying (last key {row['last_key'] or '-'})"
+        print(f"  {name:20s} {row['rows_copied']:>10} rows  {state}")
+
+
+def abort(tables):
+    conn = gui.get_connection()
+    try:
+        with conn.cursor() as cur:
+            for table in tables:
+                for trigger in trigger_sql(table):
+                    cur.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            cur.execute("SET SESSION foreign_key_checks = 0")
+            for table in reversed(tables):
+                cur.execute(f"DROP TABLE IF EXISTS {_q(table.shadow)}")
+            cur.execute(f"DROP TABLE IF EXISTS {PROGRESS_TABLE}, {MAP_TABLE}, "
+                        f"{_q(GENERATION_TABLE + SHADOW_SUFFIX)}")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def cleanup(tables):
+    conn = gui.get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SET SESSION foreign_key_checks = 0")
+            for table in reversed(tables):
+                cur.execute(f"DROP TABLE IF EXISTS {_q(table.old)}")
+            cur.execute(f"DROP TABLE IF EXISTS {MAP_TABLE}, {_q(GENERATION_TABLE + OLD_SUFFIX)}")
+        conn.commit()
+    finally:
+        conn.close()
+
+# ============================================================
+# Main Execution
+# ============================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Renumber USERS.userId to 1..N without taking the app offline")
+    parser.add_argument("--batch", type=int, default=DEFAULT_BATCH,
+                        help=f"rows copied per transaction (default: {DEFAULT_BATCH})")
+    parser.add_argument("--sleep-ms", type=int, default=DEFAULT_SLEEP_MS,
+                        help=f"pause between batches to leave room for the app (default: {DEFAULT_SLEEP_MS})")
+    parser.add_argument("--dry-run", action="store_true", help="show the mapping; change nothing")
+    parser.add_argument("--no-swap", action="store_true",
+                        help="stop after the copy; the shadows stay in sync until the next run swaps")
+    parser.add_argument("-y", "--yes", action="store_true", help="do not ask before starting")
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument("--status", action="store_true", help="show the progress of a run and exit")
+    action.add_argument("--abort", action="store_true",
+                        help="drop the shadow tables, triggers, mapping and progress of an unfinished run")
+    action.add_argument("--cleanup", action="store_true",
+                        help="drop the __old tables and USER_ID_MAP kept by the last swap")
+    args = parser.parse_args(argv)
+    if args.batch <= 0 or args.sleep_ms < 0:
+        parser.error("--batch must be positive and --sleep-ms must not be negative")
+
+    if args.status:
+        show_status(load_progress())
+        return 0
+    if args.dry_run and not (args.abort or args.cleanup):
+        return run(args)
+    lock = acquire_run_lock()
+    if lock is None:
+        print(f"❌ Another renumber_users.py run holds the '{RUN_LOCK}' lock - wait for it or check --status")
+        return 1
+    try:
+        return run(args)
+    finally:
+        lock.close()  # releases the lock
+
+
+def run(args):
+    """Everything but --status; main() holds the run lock around it unless this is a dry run."""
+    progress = load_progress()
+    tables = discover_tables()
+    if args.abort:
+        abort(tables)
+        gui.log_event(gui.sql_log, logging.INFO, "users.renumber_aborted")
+        print("🗑️  Shadow tables, triggers and progress dropped; the live tables were never touched")
+        return 0
+    if args.cleanup:
+        if progress is not None:
+            print("❌ A renumbering is in progress - finish it or use --abort")
+            return 1
+        cleanup(tables)
+        print("🗑️  Dropped the __old tables and USER_ID_MAP")
+        return 0
+
+    print("\n" + "=" * 80)
+    print(f"🔢 INF2003 MOVIE DATABASE - ONLINE USER ID RENUMBERING{' (DRY RUN)' if args.dry_run else ''}")
+    print("=" * 80)
+    print(f"📋 Tables: {', '.join(t.name for t in tables)}")
+
+    if not _table_exists(GENERATION_TABLE):
+        print(f"❌ {GENERATION_TABLE.upper()} is missing - run 20_user_id_generation.sql first")
+        return 1
+
+    if progress is None:
+        total, moved, sample = plan_mapping()
+        print(f"👥 {total} users, {moved} get a new id")
+        for old, new in sample:
+            print(f"      {old} -> {new}")
+        if not moved:
+            print("✅ User ids are already 1..N - nothing to do")
+            return 0
+        if args.dry_run:
+            return 0
+        leftovers = [t.old for t in tables if _table_exists(t.old)]
+        if leftovers:
+            print(f"❌ {', '.join(leftovers)} from the last swap still exist - check them, then run --cleanup")
+            return 1
+        if not args.yes and input("Start renumbering? [y/N] ").strip().lower() != "y":
+            print("Cancelled.")
+            return 1
+        _run(f"DROP TABLE IF EXISTS {MAP_TABLE}")
+        _run(f"""
+            CREATE TABLE {MAP_TABLE} (
+                old_userId INT PRIMARY KEY,
+                new_userId INT NOT NULL AUTO_INCREMENT,
+                UNIQUE KEY uq_new_userId (new_userId)
+            ) ENGINE=InnoDB
+        """)
+        _run(f"""
+            CREATE TABLE {PROGRESS_TABLE} (
+                table_name VARCHAR(64) PRIMARY KEY,
+                last_key VARCHAR(255) NULL,
+                rows_copied BIGINT NOT NULL DEFAULT 0,
+                done TINYINT(1) NOT NULL DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+            ) ENGINE=InnoDB
+        """)
+        progress = {}
+        gui.log_event(gui.sql_log, logging.INFO, "users.renumber_started", users=total, moved=moved)
+    else:
+        print("↩️  Resuming the run in progress")
+        show_status(progress)
+        if args.dry_run:
+            return 0
+
+    started = time.perf_counter()
+    in_set = {t.name for t in tables}
+    for table in tables:
+        state = progress.get(table.name)
+        if state is None:
+            print(f"\n📦 {table.name}: shadow table + mirror triggers")
+            prepare_table(table, in_set)
+        elif state["done"]:
+            print(f"\n✅ {table.name}: already copied")
+            continue
+        else:
+            print(f"\n📦 {table.name}: resuming")
+        copy_table(table, state, args.batch, args.sleep_ms)
+
+    if args.no_swap:
+        print(f"\n⏸️  Copy complete ({time.perf_counter() - started:.1f} s); the triggers keep the shadows "
+              "in sync - run again to swap")
+        return 0
+
+    diffs = verify_counts(tables)
+    if diffs:
+        for name, (live, shadow) in diffs.items():
+            print(f"  ❌ {name}: {live} live rows vs {shadow} in the shadow")
+        print("Not swapping; run again to retry or --abort to start over")
+        return 1
+    moved_triggers = swap(tables)
+    elapsed = time.perf_counter() - started
+    gui.log_event(gui.sql_log, logging.INFO, "users.renumber_swapped",
+                  tables=len(tables), triggers=moved_triggers, seconds=round(elapsed, 1))
+    print(f"\n✅ Swapped {len(tables)} tables ({elapsed:.1f} s); old ones kept as *{OLD_SUFFIX}, "
+          f"old -> new ids in {MAP_TABLE.upper()}")
+    print("   Users whose id changed need to log in again. Drop the backups with --cleanup.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -45,9 +45,20 @@ mysql -h "$DB_HOST" -P 3306 --protocol=tcp --skip-ssl -u "$DB_USER" -p"$DB_PASS"
 mysql -h "$DB_HOST" -P 3306 --protocol=tcp --skip-ssl -u "$DB_USER" -p"$DB_PASS" "$DB_NAME" < 4_add_security_features.sql 2>&1 || echo "Security features script done"
 mysql -h "$DB_HOST" -P 3306 --protocol=tcp --skip-ssl -u "$DB_USER" -p"$DB_PASS" "$DB_NAME" < 5_update_user_names.sql 2>&1 || echo "User names script done"
 mysql -h "$DB_HOST" -P 3306 --protocol=tcp --skip-ssl -u "$DB_USER" -p"$DB_PASS" "$DB_NAME" < 6_create_watchlist.sql 2>&1 || echo "Watchlist script done"
-mysql -h "$DB_HOST" -P 3306 --protocol=tcp --skip-ssl -u "$DB_USER" -p"$DB_PASS" "$DB_NAME" < 7_renumber_user_ids.sql 2>&1 || echo "Renumber script done"
+mysql -h "$DB_HOST" -P 3306 --protocol=tcp --skip-ssl -u "$DB_USER" -p"$DB_PASS" "$DB_NAME" < 7_transfer_admin_ratings.sql 2>&1 || echo "Admin ratings transfer done"
 mysql -h "$DB_HOST" -P 3306 --protocol=tcp --skip-ssl -u "$DB_USER" -p"$DB_PASS" "$DB_NAME" < 8_update_ratings_schema.sql 2>&1 || echo "Ratings schema script done"
 mysql -h "$DB_HOST" -P 3306 --protocol=tcp --skip-ssl -u "$DB_USER" -p"$DB_PASS" "$DB_NAME" < 9_clean_test_accounts.sql 2>&1 || echo "Clean test accounts done"
+mysql -h "$DB_HOST" -P 3306 --protocol=tcp --skip-ssl -u "$DB_USER" -p"$DB_PASS" "$DB_NAME" < 10_delta_import.sql 2>&1 || echo "Delta import script done"
+mysql -h "$DB_HOST" -P 3306 --protocol=tcp --skip-ssl -u "$DB_USER" -p"$DB_PASS" "$DB_NAME" < 11_partition_ratings.sql 2>&1 || echo "Ratings partitioning script done"
+mysql -h "$DB_HOST" -P 3306 --protocol=tcp --skip-ssl -u "$DB_USER" -p"$DB_PASS" "$DB_NAME" < 12_prune_redundant_indexes.sql 2>&1 || echo "Index pruning script done"
+mysql -h "$DB_HOST" -P 3306 --protocol=tcp --skip-ssl -u "$DB_USER" -p"$DB_PASS" "$DB_NAME" < 13_covering_user_history.sql 2>&1 || echo "User history index script done"
+mysql -h "$DB_HOST" -P 3306 --protocol=tcp --skip-ssl -u "$DB_USER" -p"$DB_PASS" "$DB_NAME" < 14_placeholder_flag.sql 2>&1 || echo "Placeholder flag script done"
+mysql -h "$DB_HOST" -P 3306 --protocol=tcp --skip-ssl -u "$DB_USER" -p"$DB_PASS" "$DB_NAME" < 15_user_sessions.sql 2>&1 || echo "User sessions script done"
+mysql -h "$DB_HOST" -P 3306 --protocol=tcp --skip-ssl -u "$DB_USER" -p"$DB_PASS" "$DB_NAME" < 16_id_sequences.sql 2>&1 || echo "ID sequences script done"
+mysql -h "$DB_HOST" -P 3306 --protocol=tcp --skip-ssl -u "$DB_USER" -p"$DB_PASS" "$DB_NAME" < 17_movie_outbox.sql 2>&1 || echo "Movie outbox script done"
+mysql -h "$DB_HOST" -P 3306 --protocol=tcp --skip-ssl -u "$DB_USER" -p"$DB_PASS" "$DB_NAME" < 18_user_tombstones.sql 2>&1 || echo "User tombstones script done"
+mysql -h "$DB_HOST" -P 3306 --protocol=tcp --skip-ssl -u "$DB_USER" -p"$DB_PASS" "$DB_NAME" < 19_rating_stats_triggers.sql 2>&1 || echo "Rating stats triggers script done"
+mysql -h "$DB_HOST" -P 3306 --protocol=tcp --skip-ssl -u "$DB_USER" -p"$DB_PASS" "$DB_NAME" < 20_user_id_generation.sql 2>&1 || echo "User id generation script done"
 
 echo "Starting GUI application..."
 python gui.py